@@ -1,14 +1,13 @@
 #!/usr/bin/env python3
 
 import requests
-import json
 import sys
-import os
 import time
 
-# Get base URL from environment
-BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://world-store-en.preview.
-API_BASE = f"{BASE_URL}/api"
+from tools.api_client import API_BASE, BASE_URL, ApiClient, scoped_email
+
+# Base URL comes from NEXT_PUBLIC_BASE_URL (see tools/api_client.py)
+api = ApiClient()
 
 def test_account_sales_api():
     """Test PUBG Account Sales API endpoints for PINLY project"""
@@ -38,40 +37,30 @@ def test_account_sales_api():
     user_data = {
         "firstName": "Test",
         "lastName": "User",
-        "email": f"testuser{int(time.time())}@example.com",  # Unique email
+        "email": scoped_email(f"testuser{int(time.time())}@example.com"),  # Unique email
         "phone": "5551234567",
         "password": "testpass123",
         "confirmPassword": "testpass123"
     }
     
-    admin_token = None
-    user_token = None
     test_account_id = None
-    test_user_id = None
     
     try:
         # 1. Admin Login to get token
         print("\n1️⃣ Testing Admin Login...")
-        login_response = requests.post(f"{API_BASE}/admin/login", json=admin_credentials)
-        print(f"Status: {login_response.status_code}")
+        admin_token = api.admin_token(admin_credentials)
         
-        if login_response.status_code != 200:
-            print(f"❌ Admin login failed: {login_response.text}")
-            return False
-            
-        login_data = login_response.json()
-        if not login_data.get('success'):
-            print(f"❌ Admin login failed: {login_data}")
+        if not admin_token:
+            print("❌ Admin login failed")
             return False
             
-        admin_token = login_data['data']['token']
         print("✅ Admin login successful")
         
         admin_headers = {"Authorization": f"Bearer {admin_token}"}
         
         # 2. Test GET /api/accounts (Public - should return empty initially)
         print("\n2️⃣ Testing GET /api/accounts (Public - List all active accounts)...")
-        accounts_response = requests.get(f"{API_BASE}/accounts")
+        accounts_response = api.get(f"{API_BASE}/accounts")
         print(f"Status: {accounts_response.status_code}")
         
         if accounts_response.status_code != 200:
@@ -88,7 +77,7 @@ def test_account_sales_api():
         
         # 3. Test GET /api/admin/accounts (Admin - should require auth)
         print("\n3️⃣ Testing GET /api/admin/accounts (Admin - requires auth)...")
-        admin_accounts_response = requests.get(f"{API_BASE}/admin/accounts", headers=admin_headers)
+        admin_accounts_response = api.get(f"{API_BASE}/admin/accounts", headers=admin_headers)
         print(f"Status: {admin_accounts_response.status_code}")
         
         if admin_accounts_response.status_code != 200:
@@ -104,7 +93,7 @@ def test_account_sales_api():
         
         # 4. Test GET /api/admin/accounts without auth (should 401)
         print("\n4️⃣ Testing GET /api/admin/accounts without auth (should 401)...")
-        no_auth_response = requests.get(f"{API_BASE}/admin/accounts")
+        no_auth_response = api.get(f"{API_BASE}/admin/accounts")
         print(f"Status: {no_auth_response.status_code}")
         
         if no_auth_response.status_code != 401:
@@ -115,7 +104,7 @@ def test_account_sales_api():
         
         # 5. Test POST /api/admin/accounts (Create new account)
         print("\n5️⃣ Testing POST /api/admin/accounts (Create new account)...")
-        create_response = requests.post(f"{API_BASE}/admin/accounts", json=test_account, headers=admin_headers)
+        create_response = api.post(f"{API_BASE}/admin/accounts", json=test_account, headers=admin_headers)
         print(f"Status: {create_response.status_code}")
         
         if create_response.status_code != 200:
@@ -144,7 +133,7 @@ def test_account_sales_api():
         invalid_account = test_account.copy()
         del invalid_account['title']
         
-        invalid_response = requests.post(f"{API_BASE}/admin/accounts", json=invalid_account, headers=admin_headers)
+        invalid_response = api.post(f"{API_BASE}/admin/accounts", json=invalid_account, headers=admin_headers)
         print(f"Status: {invalid_response.status_code}")
         
         if invalid_response.status_code != 400:
@@ -155,7 +144,7 @@ def test_account_sales_api():
         
         # 7. Test GET /api/accounts/:id (Public - single account detail)
         print("\n7️⃣ Testing GET /api/accounts/:id (Public - single account detail)...")
-        single_account_response = requests.get(f"{API_BASE}/accounts/{test_account_id}")
+        single_account_response = api.get(f"{API_BASE}/accounts/{test_account_id}")
         print(f"Status: {single_account_response.status_code}")
         
         if single_account_response.status_code != 200:
@@ -185,7 +174,7 @@ def test_account_sales_api():
         
         # 8. Test GET /api/accounts/:id with invalid ID (should 404)
         print("\n8️⃣ Testing GET /api/accounts/:id with invalid ID (should 404)...")
-        invalid_id_response = requests.get(f"{API_BASE}/accounts/invalid-id-123")
+        invalid_id_response = api.get(f"{API_BASE}/accounts/invalid-id-123")
         print(f"Status: {invalid_id_response.status_code}")
         
         if invalid_id_response.status_code != 404:
@@ -203,7 +192,7 @@ def test_account_sales_api():
             "level": 55
         }
         
-        update_response = requests.put(f"{API_BASE}/admin/accounts/{test_account_id}", json=update_data, headers=admin_headers)
+        update_response = api.put(f"{API_BASE}/admin/accounts/{test_account_id}", json=update_data, headers=admin_headers)
         print(f"Status: {update_response.status_code}")
         
         if update_response.status_code != 200:
@@ -231,7 +220,7 @@ def test_account_sales_api():
         
         # 10. Test PUT /api/admin/accounts/:id with invalid ID (should 404)
         print("\n🔟 Testing PUT /api/admin/accounts/:id with invalid ID (should 404)...")
-        invalid_update_response = requests.put(f"{API_BASE}/admin/accounts/invalid-id", json=update_data, headers=admin_headers)
+        invalid_update_response = api.put(f"{API_BASE}/admin/accounts/invalid-id", json=update_data, headers=admin_headers)
         print(f"Status: {invalid_update_response.status_code}")
         
         if invalid_update_response.status_code != 404:
@@ -242,20 +231,12 @@ def test_account_sales_api():
         
         # 11. Create a test user for order testing
         print("\n1️⃣1️⃣ Creating test user for order testing...")
-        register_response = requests.post(f"{API_BASE}/auth/register", json=user_data)
-        print(f"Status: {register_response.status_code}")
+        user_token = api.user_token(user_data["email"], user_data["password"], register_data=user_data)
         
-        if register_response.status_code != 200:
-            print(f"❌ User registration failed: {register_response.text}")
-            return False
-            
-        register_data = register_response.json()
-        if not register_data.get('success'):
-            print(f"❌ User registration failed: {register_data}")
+        if not user_token:
+            print("❌ User registration failed")
             return False
             
-        user_token = register_data['data']['token']
-        test_user_id = register_data['data']['user']['id']
         print("✅ Test user created successfully")
         
         user_headers = {"Authorization": f"Bearer {user_token}"}
@@ -267,7 +248,7 @@ def test_account_sales_api():
             "paymentMethod": "balance"
         }
         
-        no_auth_order_response = requests.post(f"{API_BASE}/account-orders", json=order_data)
+        no_auth_order_response = api.post(f"{API_BASE}/account-orders", json=order_data)
         print(f"Status: {no_auth_order_response.status_code}")
         
         if no_auth_order_response.status_code != 401:
@@ -280,7 +261,7 @@ def test_account_sales_api():
         print("\n1️⃣3️⃣ Testing POST /api/account-orders with missing accountId (should 400)...")
         invalid_order_data = {"paymentMethod": "balance"}
         
-        invalid_order_response = requests.post(f"{API_BASE}/account-orders", json=invalid_order_data, headers=user_headers)
+        invalid_order_response = api.post(f"{API_BASE}/account-orders", json=invalid_order_data, headers=user_headers)
         print(f"Status: {invalid_order_response.status_code}")
         
         if invalid_order_response.status_code != 400:
@@ -296,7 +277,7 @@ def test_account_sales_api():
             "paymentMethod": "balance"
         }
         
-        invalid_account_response = requests.post(f"{API_BASE}/account-orders", json=invalid_account_order, headers=user_headers)
+        invalid_account_response = api.post(f"{API_BASE}/account-orders", json=invalid_account_order, headers=user_headers)
         print(f"Status: {invalid_account_response.status_code}")
         
         if invalid_account_response.status_code != 404:
@@ -317,7 +298,7 @@ def test_account_sales_api():
             "paymentMethod": "balance"
         }
         
-        insufficient_balance_response = requests.post(f"{API_BASE}/account-orders", json=balance_order_data, headers=user_headers)
+        insufficient_balance_response = api.post(f"{API_BASE}/account-orders", json=balance_order_data, headers=user_headers)
         print(f"Status: {insufficient_balance_response.status_code}")
         
         if insufficient_balance_response.status_code != 400:
@@ -338,7 +319,7 @@ def test_account_sales_api():
             "paymentMethod": "card"
         }
         
-        card_order_response = requests.post(f"{API_BASE}/account-orders", json=card_order_data, headers=user_headers)
+        card_order_response = api.post(f"{API_BASE}/account-orders", json=card_order_data, headers=user_headers)
         print(f"Status: {card_order_response.status_code}")
         
         # This might fail if Shopier settings are not configured, which is expected
@@ -357,7 +338,7 @@ def test_account_sales_api():
             if card_data.get('success'):
                 print("✅ Card payment order created successfully")
                 # Account should be reserved
-                reserved_account_response = requests.get(f"{API_BASE}/admin/accounts/{test_account_id}", headers=admin_headers)
+                reserved_account_response = api.get(f"{API_BASE}/admin/accounts/{test_account_id}", headers=admin_headers)
                 if reserved_account_response.status_code == 200:
                     reserved_account = reserved_account_response.json()['data']
                     if reserved_account['status'] == 'reserved':
@@ -376,9 +357,9 @@ def test_account_sales_api():
         
         # First, let's mark the account as sold to test delete protection
         sold_update = {"status": "sold"}
-        requests.put(f"{API_BASE}/admin/accounts/{test_account_id}", json=sold_update, headers=admin_headers)
+        api.put(f"{API_BASE}/admin/accounts/{test_account_id}", json=sold_update, headers=admin_headers)
         
-        delete_sold_response = requests.delete(f"{API_BASE}/admin/accounts/{test_account_id}", headers=admin_headers)
+        delete_sold_response = api.delete(f"{API_BASE}/admin/accounts/{test_account_id}", headers=admin_headers)
         print(f"Status: {delete_sold_response.status_code}")
         
         if delete_sold_response.status_code != 400:
@@ -397,9 +378,9 @@ def test_account_sales_api():
         
         # Change status back to available for deletion test
         available_update = {"status": "available"}
-        requests.put(f"{API_BASE}/admin/accounts/{test_account_id}", json=available_update, headers=admin_headers)
+        api.put(f"{API_BASE}/admin/accounts/{test_account_id}", json=available_update, headers=admin_headers)
         
-        delete_response = requests.delete(f"{API_BASE}/admin/accounts/{test_account_id}", headers=admin_headers)
+        delete_response = api.delete(f"{API_BASE}/admin/accounts/{test_account_id}", headers=admin_headers)
         print(f"Status: {delete_response.status_code}")
         
         if delete_response.status_code != 200:
@@ -416,7 +397,7 @@ def test_account_sales_api():
         
         # 19. Verify account is deleted
         print("\n2️⃣0️⃣ Verifying account deletion...")
-        verify_delete_response = requests.get(f"{API_BASE}/accounts/{test_account_id}")
+        verify_delete_response = api.get(f"{API_BASE}/accounts/{test_account_id}")
         print(f"Status: {verify_delete_response.status_code}")
         
         if verify_delete_response.status_code != 404:
@@ -427,7 +408,7 @@ def test_account_sales_api():
         
         # 20. Test DELETE /api/admin/accounts/:id with invalid ID (should 404)
         print("\n2️⃣1️⃣ Testing DELETE /api/admin/accounts/:id with invalid ID (should 404)...")
-        invalid_delete_response = requests.delete(f"{API_BASE}/admin/accounts/invalid-id", headers=admin_headers)
+        invalid_delete_response = api.delete(f"{API_BASE}/admin/accounts/invalid-id", headers=admin_headers)
         print(f"Status: {invalid_delete_response.status_code}")
         
         if invalid_delete_response.status_code != 404:
@@ -4,15 +4,14 @@ Admin User Password Change Endpoint Testing Script
 Tests PUT /api/admin/users/{userId}/password endpoint according to the review request
 """
 
-import requests
-import json
 import time
 import uuid
 from datetime import datetime
 
+from tools.api_client import API_BASE, ApiClient, scoped_email
+
 # Configuration
-BASE_URL = "http://localhost:3000"
-API_BASE = f"{BASE_URL}/api"
+api = ApiClient()
 
 # Test data
 ADMIN_CREDENTIALS = {
@@ -46,19 +45,12 @@ class AdminPasswordChangeTester:
     def admin_login(self):
         """Login as admin to get token"""
         try:
-            response = requests.post(f"{API_BASE}/admin/login", json=ADMIN_CREDENTIALS)
-            print(f"DEBUG: Admin login response status: {response.status_code}")
-            print(f"DEBUG: Admin login response: {response.text}")
-            
-            if response.status_code == 200:
-                data = response.json()
-                # Handle both direct token and nested data.token formats
-                self.admin_token = data.get('token') or data.get('data', {}).get('token')
-                print(f"DEBUG: Admin token: {self.admin_token[:50]}..." if self.admin_token else "No token found")
+            self.admin_token = api.admin_token(ADMIN_CREDENTIALS)
+            if self.admin_token:
                 self.log_result("Admin Login", True, "Admin login successful")
                 return True
             else:
-                self.log_result("Admin Login", False, f"Admin login failed: {response.status_code} - {response.text}")
+                self.log_result("Admin Login", False, "Admin login failed")
                 return False
         except Exception as e:
             self.log_result("Admin Login", False, f"Admin login error: {str(e)}")
@@ -72,12 +64,12 @@ class AdminPasswordChangeTester:
             user_data = {
                 "firstName": "Test",
                 "lastName": "User",
-                "email": f"testuser_{unique_id}@example.com",
+                "email": scoped_email(f"testuser_{unique_id}@example.com"),
                 "phone": "5551234567",
                 "password": "oldpassword123"
             }
             
-            response = requests.post(f"{API_BASE}/auth/register", json=user_data)
+            response = api.post(f"{API_BASE}/auth/register", json=user_data)
             if response.status_code == 200:
                 data = response.json()
                 user_data_response = data.get('data', {}) if 'data' in data else data
@@ -96,7 +88,7 @@ class AdminPasswordChangeTester:
         """Test 1: Call endpoint without admin token - should return 401"""
         try:
             fake_user_id = "test-user-id"
-            response = requests.put(
+            response = api.put(
                 f"{API_BASE}/admin/users/{fake_user_id}/password",
                 json={"newPassword": "newpass123"}
             )
@@ -117,7 +109,7 @@ class AdminPasswordChangeTester:
             headers = {"Authorization": f"Bearer {self.admin_token}"}
             fake_user_id = "non-existent-user-id"
             
-            response = requests.put(
+            response = api.put(
                 f"{API_BASE}/admin/users/{fake_user_id}/password",
                 json={"newPassword": "newpass123"},
                 headers=headers
@@ -140,7 +132,7 @@ class AdminPasswordChangeTester:
         try:
             headers = {"Authorization": f"Bearer {self.admin_token}"}
             
-            response = requests.put(
+            response = api.put(
                 f"{API_BASE}/admin/users/{self.test_user_id}/password",
                 json={"newPassword": "12345"},  # 5 characters
                 headers=headers
@@ -168,7 +160,7 @@ class AdminPasswordChangeTester:
             headers = {"Authorization": f"Bearer {self.admin_token}"}
             new_password = "newpassword123"
             
-            response = requests.put(
+            response = api.put(
                 f"{API_BASE}/admin/users/{self.test_user_id}/password",
                 json={"newPassword": new_password},
                 headers=headers
@@ -197,7 +189,7 @@ class AdminPasswordChangeTester:
                 "password": "newpassword123"  # The new password we set
             }
             
-            response = requests.post(f"{API_BASE}/auth/login", json=login_data)
+            response = api.post(f"{API_BASE}/auth/login", json=login_data)
             
             if response.status_code == 200:
                 data = response.json()
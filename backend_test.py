@@ -4,14 +4,10 @@ Backend Test Script for IBAN Payment Flow
 Tests the complete IBAN payment flow from user registration to admin approval.
 """
 
-import requests
-import json
-import time
-import sys
+from tools.api_client import API_BASE, ApiClient, scoped_email
 
 # Configuration
-BASE_URL = "https://world-store-en.preview."
-API_BASE = f"{BASE_URL}/api"
+api = ApiClient()
 
 def print_test_result(test_name, success, details=""):
     """Print formatted test result"""
@@ -30,57 +26,26 @@ def test_iban_payment_flow():
     user_data = {
         "firstName": "Test",
         "lastName": "User",
-        "email": "test-iban@test.com",
+        "email": scoped_email("test-iban@test.com"),
         "phone": "5551234567",
         "password": "Test123!"
     }
     
-    user_token = None
-    admin_token = None
     product_id = None
     order_id = None
     
     try:
-        # Step 1: User Registration
+        # Step 1: User Registration (or login if the user already exists)
         print("Step 1: Testing user registration...")
-        response = requests.post(f"{API_BASE}/auth/register", json=user_data)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success") and data.get("data") and data["data"].get("token"):
-                user_token = data["data"]["token"]
-                print_test_result("User Registration", True, f"User registered successfully with token")
-            else:
-                print_test_result("User Registration", False, f"Invalid response: {data}")
-                return
-        else:
-            # Check if email already exists (409)
-            if response.status_code == 409:
-                # Try to login with existing user
-                print("    Email exists, trying to login...")
-                login_response = requests.post(f"{API_BASE}/auth/login", json={
-                    "email": user_data["email"],
-                    "password": user_data["password"]
-                })
-                
-                if login_response.status_code == 200:
-                    login_data = login_response.json()
-                    if login_data.get("success") and login_data.get("data") and login_data["data"].get("token"):
-                        user_token = login_data["data"]["token"]
-                        print_test_result("User Registration (Login)", True, f"Logged in with existing user")
-                    else:
-                        print_test_result("User Registration", False, f"Login failed: {login_data}")
-                        return
-                else:
-                    print_test_result("User Registration", False, f"Login failed with status {login_response.status_code}")
-                    return
-            else:
-                print_test_result("User Registration", False, f"HTTP {response.status_code}: {response.text}")
-                return
+        user_token = api.user_token(user_data["email"], user_data["password"], register_data=user_data)
+        if not user_token:
+            print_test_result("User Registration", False, "Neither login nor registration returned a token")
+            return
+        print_test_result("User Registration", True, "User token obtained")
 
         # Step 2: Get Products
         print("Step 2: Testing get products...")
-        response = requests.get(f"{API_BASE}/products")
+        response = api.get(f"{API_BASE}/products")
         
         if response.status_code == 200:
             data = response.json()
@@ -107,7 +72,7 @@ def test_iban_payment_flow():
         }
         
         headers = {"Authorization": f"Bearer {user_token}"}
-        response = requests.post(f"{API_BASE}/orders", json=order_data, headers=headers)
+        response = api.post(f"{API_BASE}/orders", json=order_data, headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -125,7 +90,7 @@ def test_iban_payment_flow():
 
         # Step 4: Verify Order Status
         print("Step 4: Verifying order status...")
-        response = requests.get(f"{API_BASE}/account/orders/{order_id}", headers=headers)
+        response = api.get(f"{API_BASE}/account/orders/{order_id}", headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -154,7 +119,7 @@ def test_iban_payment_flow():
             "senderName": "Test Kullanici"
         }
         
-        response = requests.post(f"{API_BASE}/orders/{order_id}/iban-notify", json=notify_data, headers=headers)
+        response = api.post(f"{API_BASE}/orders/{order_id}/iban-notify", json=notify_data, headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -169,7 +134,7 @@ def test_iban_payment_flow():
 
         # Step 6: Verify IBAN Status Changed to "notified"
         print("Step 6: Verifying IBAN status changed to 'notified'...")
-        response = requests.get(f"{API_BASE}/account/orders/{order_id}", headers=headers)
+        response = api.get(f"{API_BASE}/account/orders/{order_id}", headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -194,33 +159,17 @@ def test_iban_payment_flow():
 
         # Step 7: Admin Login
         print("Step 7: Testing admin login...")
-        admin_credentials = [
-            {"username": "admin", "password": "admin123"},
-            {"email": "admin@pinly.com.tr", "password": "admin123"},
-            {"email": "admin", "password": "admin123"},
-        ]
-        
-        admin_login_success = False
-        for creds in admin_credentials:
-            response = requests.post(f"{API_BASE}/admin/login", json=creds)
-            
-            if response.status_code == 200:
-                data = response.json()
-                if data.get("success") and data.get("data") and data["data"].get("token"):
-                    admin_token = data["data"]["token"]
-                    admin_login_success = True
-                    print_test_result("Admin Login", True, f"Admin logged in successfully with: {creds.get('username') or creds.get('email')}")
-                    break
-        
-        if not admin_login_success:
+        admin_token = api.admin_token()
+        if not admin_token:
             print_test_result("Admin Login", False, f"All admin login attempts failed")
             print("    Note: This is OK if admin user is not configured. Testing stops at step 6.")
             return
+        print_test_result("Admin Login", True, "Admin logged in successfully")
 
         # Step 8: Admin Approve IBAN Payment
         print("Step 8: Testing admin IBAN approval...")
         admin_headers = {"Authorization": f"Bearer {admin_token}"}
-        response = requests.post(f"{API_BASE}/admin/orders/{order_id}/approve-iban", headers=admin_headers)
+        response = api.post(f"{API_BASE}/admin/orders/{order_id}/approve-iban", headers=admin_headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -235,7 +184,7 @@ def test_iban_payment_flow():
 
         # Step 9: Verify Order Status Changed to "paid"
         print("Step 9: Verifying order status changed to 'paid'...")
-        response = requests.get(f"{API_BASE}/account/orders/{order_id}", headers=headers)
+        response = api.get(f"{API_BASE}/account/orders/{order_id}", headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -7,14 +7,13 @@ Tests the 3 fixed endpoints:
 3. POST /api/admin/settings/shopierv2 (Admin auth required)
 """
 
-import requests
 import json
 import sys
-import os
+
+from tools.api_client import API_BASE, ApiClient, scoped_email
 
 # Configuration
-BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'http://localhost:3000')
-API_BASE = f"{BASE_URL}/api"
+api = ApiClient()
 
 def print_test_result(test_name, success, details=""):
     """Print formatted test result"""
@@ -29,7 +28,6 @@ def test_shopierv2_endpoints():
     print("🔧 Testing Shopier V2 Endpoints (Re-Test)")
     print("=" * 60)
     
-    admin_token = None
     test_order_id = None
     
     try:
@@ -40,18 +38,12 @@ def test_shopierv2_endpoints():
         print("-" * 60)
         
         admin_credentials = {"username": "admin", "password": "admin123"}
-        response = requests.post(f"{API_BASE}/admin/login", json=admin_credentials)
+        admin_token = api.admin_token(admin_credentials)
         
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success") and data.get("data") and data["data"].get("token"):
-                admin_token = data["data"]["token"]
-                print_test_result("Admin Login", True, f"Admin logged in successfully")
-            else:
-                print_test_result("Admin Login", False, f"Invalid response: {data}")
-                return False
+        if admin_token:
+            print_test_result("Admin Login", True, f"Admin logged in successfully")
         else:
-            print_test_result("Admin Login", False, f"HTTP {response.status_code}: {response.text}")
+            print_test_result("Admin Login", False, "Admin login failed")
             return False
 
         admin_headers = {"Authorization": f"Bearer {admin_token}"}
@@ -66,36 +58,20 @@ def test_shopierv2_endpoints():
         user_data = {
             "firstName": "Shopier",
             "lastName": "Test",
-            "email": "shopierv2-test@test.com",
+            "email": scoped_email("shopierv2-test@test.com"),
             "phone": "5551234567",
             "password": "Test123!"
         }
         
-        response = requests.post(f"{API_BASE}/auth/register", json=user_data)
-        user_token = None
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get("success") and data.get("data") and data["data"].get("token"):
-                user_token = data["data"]["token"]
-                print(f"    ✓ User registered successfully")
-        elif response.status_code == 409:
-            # User exists, try login
-            login_response = requests.post(f"{API_BASE}/auth/login", json={
-                "email": user_data["email"],
-                "password": user_data["password"]
-            })
-            if login_response.status_code == 200:
-                login_data = login_response.json()
-                if login_data.get("success") and login_data.get("data") and login_data["data"].get("token"):
-                    user_token = login_data["data"]["token"]
-                    print(f"    ✓ User logged in successfully")
+        user_token = api.user_token(user_data["email"], user_data["password"], register_data=user_data)
+        if user_token:
+            print(f"    ✓ User logged in successfully")
         
         if not user_token:
             print(f"    ⚠ Could not get user token, will use existing order if available")
         
         # Get products
-        response = requests.get(f"{API_BASE}/products")
+        response = api.get(f"{API_BASE}/products")
         product_id = None
         
         if response.status_code == 200:
@@ -116,7 +92,7 @@ def test_shopierv2_endpoints():
             }
             
             user_headers = {"Authorization": f"Bearer {user_token}"}
-            response = requests.post(f"{API_BASE}/orders", json=order_data, headers=user_headers)
+            response = api.post(f"{API_BASE}/orders", json=order_data, headers=user_headers)
             
             if response.status_code == 200:
                 data = response.json()
@@ -129,7 +105,7 @@ def test_shopierv2_endpoints():
         
         # If we couldn't create an order, try to find an existing one
         if not test_order_id:
-            response = requests.get(f"{API_BASE}/admin/orders", headers=admin_headers)
+            response = api.get(f"{API_BASE}/admin/orders", headers=admin_headers)
             if response.status_code == 200:
                 data = response.json()
                 orders = data.get("data", [])
@@ -148,7 +124,7 @@ def test_shopierv2_endpoints():
         print("-" * 60)
         
         # Test with valid orderId
-        response = requests.get(f"{API_BASE}/payment/shopierv2/status?orderId={test_order_id}")
+        response = api.get(f"{API_BASE}/payment/shopierv2/status?orderId={test_order_id}")
         
         print(f"Request: GET {API_BASE}/payment/shopierv2/status?orderId={test_order_id}")
         print(f"Response Status: {response.status_code}")
@@ -180,7 +156,7 @@ def test_shopierv2_endpoints():
                 f"Unexpected status code: {response.status_code}")
         
         # Test without orderId (should return 400)
-        response = requests.get(f"{API_BASE}/payment/shopierv2/status")
+        response = api.get(f"{API_BASE}/payment/shopierv2/status")
         
         print(f"\nRequest: GET {API_BASE}/payment/shopierv2/status (no orderId)")
         print(f"Response Status: {response.status_code}")
@@ -202,7 +178,7 @@ def test_shopierv2_endpoints():
         print("-" * 60)
         
         # Test without authentication (should return 401)
-        response = requests.get(f"{API_BASE}/admin/settings/shopierv2")
+        response = api.get(f"{API_BASE}/admin/settings/shopierv2")
         
         print(f"Request: GET {API_BASE}/admin/settings/shopierv2 (no auth)")
         print(f"Response Status: {response.status_code}")
@@ -218,7 +194,7 @@ def test_shopierv2_endpoints():
                 f"Expected 401, got {response.status_code}")
         
         # Test with admin authentication (should return 200)
-        response = requests.get(f"{API_BASE}/admin/settings/shopierv2", headers=admin_headers)
+        response = api.get(f"{API_BASE}/admin/settings/shopierv2", headers=admin_headers)
         
         print(f"\nRequest: GET {API_BASE}/admin/settings/shopierv2 (with admin token)")
         print(f"Response Status: {response.status_code}")
@@ -271,7 +247,7 @@ def test_shopierv2_endpoints():
             "closeDelaySeconds": 30
         }
         
-        response = requests.post(f"{API_BASE}/admin/settings/shopierv2", json=test_settings)
+        response = api.post(f"{API_BASE}/admin/settings/shopierv2", json=test_settings)
         
         print(f"Request: POST {API_BASE}/admin/settings/shopierv2 (no auth)")
         print(f"Response Status: {response.status_code}")
@@ -291,7 +267,7 @@ def test_shopierv2_endpoints():
             "referencePrefix": "TEST"
         }
         
-        response = requests.post(f"{API_BASE}/admin/settings/shopierv2", 
+        response = api.post(f"{API_BASE}/admin/settings/shopierv2", 
             json=invalid_settings, headers=admin_headers)
         
         print(f"\nRequest: POST {API_BASE}/admin/settings/shopierv2 (missing required fields)")
@@ -308,7 +284,7 @@ def test_shopierv2_endpoints():
                 f"Expected 400, got {response.status_code}")
         
         # Test with valid data (should return 200)
-        response = requests.post(f"{API_BASE}/admin/settings/shopierv2", 
+        response = api.post(f"{API_BASE}/admin/settings/shopierv2", 
             json=test_settings, headers=admin_headers)
         
         print(f"\nRequest: POST {API_BASE}/admin/settings/shopierv2 (valid data)")
@@ -330,7 +306,7 @@ def test_shopierv2_endpoints():
                 f"Expected 200, got {response.status_code}")
         
         # Verify settings were saved by retrieving them
-        response = requests.get(f"{API_BASE}/admin/settings/shopierv2", headers=admin_headers)
+        response = api.get(f"{API_BASE}/admin/settings/shopierv2", headers=admin_headers)
         
         print(f"\nRequest: GET {API_BASE}/admin/settings/shopierv2 (verify save)")
         print(f"Response Status: {response.status_code}")
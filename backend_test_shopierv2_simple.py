@@ -4,16 +4,14 @@ Simplified Shopier V2 Backend Test
 Tests OSB webhook handler and status endpoint without requiring external API calls
 """
 
-import requests
-import json
-import hmac
-import hashlib
-import os
+import sys
 from uuid import uuid4
 
+from tools.api_client import API_BASE, ApiClient, scoped_email
+from tools.signing import osb_signature
+
 # Configuration
-BASE_URL = os.getenv("NEXT_PUBLIC_BASE_URL", "http://localhost:3000")
-API_BASE = f"{BASE_URL}/api"
+api = ApiClient()
 
 # Shopier V2 Configuration
 SHOPIER_V2_OSB_KEY = "b4bfe50c039d9a9935b0b77c565d0a2c"
@@ -30,13 +28,7 @@ def print_test_result(test_name, success, details=""):
 
 def generate_osb_signature(order_id, reference, amount, currency, status):
     """Generate HMAC-SHA256 signature for OSB webhook"""
-    verification_string = f"{order_id}{reference}{amount}{currency}{status}"
-    signature = hmac.new(
-        SHOPIER_V2_OSB_KEY.encode('utf-8'),
-        verification_string.encode('utf-8'),
-        hashlib.sha256
-    ).hexdigest()
-    return signature
+    return osb_signature(order_id, reference, amount, currency, status, SHOPIER_V2_OSB_KEY)
 
 def test_shopier_v2_webhooks():
     """Test Shopier V2 OSB webhook handler and status endpoint"""
@@ -60,7 +52,7 @@ def test_shopier_v2_webhooks():
             "signature": "INVALID_SIGNATURE_ABCDEF123456"
         }
         
-        response = requests.post(f"{API_BASE}/payment/shopierv2/osb", json=webhook_payload_invalid)
+        response = api.post(f"{API_BASE}/payment/shopierv2/osb", json=webhook_payload_invalid)
         
         if response.status_code == 403:
             data = response.json()
@@ -77,19 +69,18 @@ def test_shopier_v2_webhooks():
         print("\n📦 TEST 2: Create Test Order for Webhook Testing")
         print("-" * 70)
         
-        # Login as user
-        user_data = {"email": "shopierv2-test@test.com", "password": "Test123!"}
-        login_response = requests.post(f"{API_BASE}/auth/login", json=user_data)
+        # Register the user (isolated runs start without it, see tools/run_suites.py) or log in
+        user_data = {"email": scoped_email("shopierv2-test@test.com"), "password": "Test123!"}
+        user_token = api.user_token(user_data["email"], user_data["password"], register_data={
+            "firstName": "Shopier", "lastName": "Test", "phone": "5551234567"
+        })
         
-        if login_response.status_code != 200:
-            print_test_result("User Login", False, f"Cannot proceed without user login: {login_response.status_code}")
+        if not user_token:
+            print_test_result("User Login", False, "Cannot proceed without user login")
             return
         
-        user_token = login_response.json()['data']['token']
-        user_id = login_response.json()['data']['user']['id']
-        
         # Get a product
-        products_response = requests.get(f"{API_BASE}/products")
+        products_response = api.get(f"{API_BASE}/products")
         products = products_response.json()['data']
         product_id = products[0]['id']
         product_title = products[0]['title']
@@ -104,7 +95,7 @@ def test_shopier_v2_webhooks():
         }
         
         headers = {"Authorization": f"Bearer {user_token}"}
-        order_response = requests.post(f"{API_BASE}/orders", json=order_data, headers=headers)
+        order_response = api.post(f"{API_BASE}/orders", json=order_data, headers=headers)
         
         if order_response.status_code != 200:
             print_test_result("Test Order Creation", False, f"HTTP {order_response.status_code}: {order_response.text[:200]}")
@@ -148,7 +139,7 @@ def test_shopier_v2_webhooks():
         print(f"  Reference: {webhook_reference}")
         print(f"  Signature: {correct_signature[:30]}...")
         
-        response = requests.post(f"{API_BASE}/payment/shopierv2/osb", json=webhook_payload_valid)
+        response = api.post(f"{API_BASE}/payment/shopierv2/osb", json=webhook_payload_valid)
         
         if response.status_code == 200:
             data = response.json()
@@ -168,7 +159,7 @@ def test_shopier_v2_webhooks():
         import time
         time.sleep(1)  # Wait for processing
         
-        response = requests.get(f"{API_BASE}/account/orders/{order_id}", headers=headers)
+        response = api.get(f"{API_BASE}/account/orders/{order_id}", headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -192,7 +183,7 @@ def test_shopier_v2_webhooks():
         print("\n🔁 TEST 5: Test Idempotency (Duplicate Webhook)")
         print("-" * 70)
         
-        response = requests.post(f"{API_BASE}/payment/shopierv2/osb", json=webhook_payload_valid)
+        response = api.post(f"{API_BASE}/payment/shopierv2/osb", json=webhook_payload_valid)
         
         if response.status_code == 200:
             data = response.json()
@@ -209,7 +200,7 @@ def test_shopier_v2_webhooks():
         print("\n📊 TEST 6: Status Polling Endpoint")
         print("-" * 70)
         
-        response = requests.get(f"{API_BASE}/payment/shopierv2/status?orderId={order_id}")
+        response = api.get(f"{API_BASE}/payment/shopierv2/status?orderId={order_id}")
         
         if response.status_code == 200:
             data = response.json()
@@ -234,14 +225,13 @@ def test_shopier_v2_webhooks():
         print("-" * 70)
         
         # Admin login
-        admin_response = requests.post(f"{API_BASE}/admin/login", json={"username": "admin", "password": "admin123"})
+        admin_token = api.admin_token({"username": "admin", "password": "admin123"})
         
-        if admin_response.status_code == 200:
-            admin_token = admin_response.json()['data']['token']
+        if admin_token:
             admin_headers = {"Authorization": f"Bearer {admin_token}"}
             
             # Test GET endpoint
-            response = requests.get(f"{API_BASE}/admin/settings/shopierv2", headers=admin_headers)
+            response = api.get(f"{API_BASE}/admin/settings/shopierv2", headers=admin_headers)
             
             if response.status_code == 200:
                 print_test_result("Admin Settings GET", True, f"Endpoint implemented: {response.json()}")
@@ -252,7 +242,7 @@ def test_shopier_v2_webhooks():
             
             # Test POST endpoint
             settings_data = {"apiKey": "test_key", "osbUsername": "test_user", "osbKey": "test_key"}
-            response = requests.post(f"{API_BASE}/admin/settings/shopierv2", json=settings_data, headers=admin_headers)
+            response = api.post(f"{API_BASE}/admin/settings/shopierv2", json=settings_data, headers=admin_headers)
             
             if response.status_code == 200:
                 print_test_result("Admin Settings POST", True, f"Endpoint implemented: {response.json()}")
@@ -261,7 +251,7 @@ def test_shopier_v2_webhooks():
             else:
                 print_test_result("Admin Settings POST", False, f"HTTP {response.status_code}: {response.text[:200]}")
         else:
-            print_test_result("Admin Login", False, f"Cannot test admin endpoints: {admin_response.status_code}")
+            print_test_result("Admin Login", False, "Cannot test admin endpoints: admin login failed")
 
         # ========================================
         # FINAL SUMMARY
@@ -282,4 +272,8 @@ def test_shopier_v2_webhooks():
         traceback.print_exc()
 
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        # Concurrent duplicate-delivery benchmark, see tools/osb_webhook_bench.py
+        from tools.osb_webhook_bench import main
+        sys.exit(main([arg for arg in sys.argv[1:] if arg != "--benchmark"]))
     test_shopier_v2_webhooks()
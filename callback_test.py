@@ -3,13 +3,13 @@
 Callback Security Tests - Focused test for callback validation
 """
 
-import requests
-import json
 import time
 import hashlib
-from datetime import datetime
 
-BASE_URL = "https://world-store-en.preview."
+from tools.api_client import API_BASE, ApiClient
+
+BASE_URL = API_BASE
+api = ApiClient()
 ADMIN_USERNAME = "admin"
 ADMIN_PASSWORD = "admin123"
 TEST_SHOPIER_API_SECRET = "test_secret_abcdef"
@@ -35,13 +35,8 @@ def setup():
     global admin_token, test_product_id
     
     # Login
-    response = requests.post(
-        f"{BASE_URL}/admin/login",
-        json={"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD},
-        timeout=10
-    )
-    if response.status_code == 200:
-        admin_token = response.json()['data']['token']
+    admin_token = api.admin_token({"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+    if admin_token:
         print("✅ Admin login successful")
     else:
         print("❌ Admin login failed")
@@ -55,7 +50,7 @@ def setup():
         "apiSecret": TEST_SHOPIER_API_SECRET,
         "mode": "production"
     }
-    response = requests.post(
+    response = api.post(
         f"{BASE_URL}/admin/settings/payments",
         json=payload,
         headers=headers,
@@ -68,7 +63,7 @@ def setup():
         return False
     
     # Get products
-    response = requests.get(f"{BASE_URL}/products", timeout=10)
+    response = api.get(f"{BASE_URL}/products", timeout=10)
     if response.status_code == 200:
         products = response.json()['data']
         test_product_id = products[0]['id']
@@ -85,7 +80,7 @@ def test_callback_correct_hash():
     
     try:
         # Create order
-        order_response = requests.post(
+        order_response = api.post(
             f"{BASE_URL}/orders",
             json={"productId": test_product_id, "playerId": "7777777777", "playerName": "CallbackTest#7777"},
             timeout=10
@@ -117,7 +112,7 @@ def test_callback_correct_hash():
             "hash": correct_hash
         }
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/payment/shopier/callback",
             json=callback_payload,
             timeout=10
@@ -161,7 +156,7 @@ def test_callback_incorrect_hash():
     
     try:
         # Create order
-        order_response = requests.post(
+        order_response = api.post(
             f"{BASE_URL}/orders",
             json={"productId": test_product_id, "playerId": "8888888888", "playerName": "WrongHashTest#8888"},
             timeout=10
@@ -185,7 +180,7 @@ def test_callback_incorrect_hash():
             "hash": wrong_hash
         }
         
-        response = requests.post(
+        response = api.post(
             f"{BASE_URL}/payment/shopier/callback",
             json=callback_payload,
             timeout=10
@@ -224,7 +219,7 @@ def test_immutable_status_transitions():
     
     try:
         # Create order
-        order_response = requests.post(
+        order_response = api.post(
             f"{BASE_URL}/orders",
             json={"productId": test_product_id, "playerId": "9999999999", "playerName": "ImmutableTest#9999"},
             timeout=10
@@ -248,7 +243,7 @@ def test_immutable_status_transitions():
             "hash": hash1
         }
         
-        response1 = requests.post(f"{BASE_URL}/payment/shopier/callback", json=callback1, timeout=10)
+        response1 = api.post(f"{BASE_URL}/payment/shopier/callback", json=callback1, timeout=10)
         if response1.status_code != 200:
             print_result(False, f"Failed to set order to FAILED: {response1.text}")
             return False
@@ -265,7 +260,7 @@ def test_immutable_status_transitions():
             "hash": hash2
         }
         
-        response2 = requests.post(f"{BASE_URL}/payment/shopier/callback", json=callback2, timeout=10)
+        response2 = api.post(f"{BASE_URL}/payment/shopier/callback", json=callback2, timeout=10)
         
         print(f"   Second callback response: {response2.status_code}")
         print(f"   Response body: {response2.text}")
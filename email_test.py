@@ -1,13 +1,13 @@
 #!/usr/bin/env python3
 
-import requests
-import json
 import time
 import sys
 from datetime import datetime
 
+from tools.api_client import BASE_URL, ApiClient, scoped_email
+
 # Configuration
-BASE_URL = "https://world-store-en.preview."
+api = ApiClient()
 ADMIN_USERNAME = "admin"
 ADMIN_PASSWORD = "admin123"
 
@@ -21,23 +21,12 @@ def log_test(test_name, status, details=""):
 def admin_login():
     """Login as admin and return JWT token"""
     try:
-        response = requests.post(f"{BASE_URL}/api/admin/login", json={
-            "username": ADMIN_USERNAME,
-            "password": ADMIN_PASSWORD
-        })
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('success'):
-                token = data['data']['token']
-                log_test("Admin Login", "PASS", f"Token obtained: {token[:20]}...")
-                return token
-            else:
-                log_test("Admin Login", "FAIL", f"Login failed: {data.get('error', 'Unknown error')}")
-                return None
-        else:
-            log_test("Admin Login", "FAIL", f"HTTP {response.status_code}: {response.text}")
-            return None
+        token = api.admin_token({"username": ADMIN_USERNAME, "password": ADMIN_PASSWORD})
+        if token:
+            log_test("Admin Login", "PASS", f"Token obtained: {token[:20]}...")
+            return token
+        log_test("Admin Login", "FAIL", "Login failed")
+        return None
     except Exception as e:
         log_test("Admin Login", "FAIL", f"Exception: {str(e)}")
         return None
@@ -47,10 +36,10 @@ def user_register_and_login():
     try:
         # Generate unique email
         timestamp = int(time.time())
-        email = f"testuser{timestamp}@example.com"
+        email = scoped_email(f"testuser{timestamp}@example.com")
         
         # Register user
-        register_response = requests.post(f"{BASE_URL}/api/auth/register", json={
+        register_response = api.post(f"{BASE_URL}/api/auth/register", json={
             "firstName": "Test",
             "lastName": "User",
             "email": email,
@@ -78,7 +67,7 @@ def user_register_and_login():
 def test_email_settings_get_unauthorized():
     """Test GET /api/admin/email/settings without admin auth"""
     try:
-        response = requests.get(f"{BASE_URL}/api/admin/email/settings")
+        response = api.get(f"{BASE_URL}/api/admin/email/settings")
         
         if response.status_code == 401:
             log_test("Email Settings GET (Unauthorized)", "PASS", "Correctly rejected unauthorized access")
@@ -94,7 +83,7 @@ def test_email_settings_get_authorized(admin_token):
     """Test GET /api/admin/email/settings with admin auth"""
     try:
         headers = {"Authorization": f"Bearer {admin_token}"}
-        response = requests.get(f"{BASE_URL}/api/admin/email/settings", headers=headers)
+        response = api.get(f"{BASE_URL}/api/admin/email/settings", headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -134,7 +123,7 @@ def test_email_settings_post(admin_token):
             "testRecipientEmail": "recipient@test.com"
         }
         
-        response = requests.post(f"{BASE_URL}/api/admin/email/settings", 
+        response = api.post(f"{BASE_URL}/api/admin/email/settings", 
                                headers=headers, json=settings_data)
         
         if response.status_code == 200:
@@ -168,7 +157,7 @@ def test_email_settings_post_with_masked_password(admin_token):
             "testRecipientEmail": "recipient@test.com"
         }
         
-        response = requests.post(f"{BASE_URL}/api/admin/email/settings", 
+        response = api.post(f"{BASE_URL}/api/admin/email/settings", 
                                headers=headers, json=settings_data)
         
         if response.status_code == 200:
@@ -189,7 +178,7 @@ def test_email_settings_post_with_masked_password(admin_token):
 def test_email_logs_get_unauthorized():
     """Test GET /api/admin/email/logs without admin auth"""
     try:
-        response = requests.get(f"{BASE_URL}/api/admin/email/logs")
+        response = api.get(f"{BASE_URL}/api/admin/email/logs")
         
         if response.status_code == 401:
             log_test("Email Logs GET (Unauthorized)", "PASS", "Correctly rejected unauthorized access")
@@ -205,7 +194,7 @@ def test_email_logs_get_authorized(admin_token):
     """Test GET /api/admin/email/logs with admin auth"""
     try:
         headers = {"Authorization": f"Bearer {admin_token}"}
-        response = requests.get(f"{BASE_URL}/api/admin/email/logs", headers=headers)
+        response = api.get(f"{BASE_URL}/api/admin/email/logs", headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -227,7 +216,7 @@ def test_email_test_unauthorized():
     """Test POST /api/admin/email/test without admin auth"""
     try:
         headers = {"Content-Type": "application/json"}
-        response = requests.post(f"{BASE_URL}/api/admin/email/test", headers=headers, json={})
+        response = api.post(f"{BASE_URL}/api/admin/email/test", headers=headers, json={})
         
         if response.status_code == 401:
             log_test("Test Email POST (Unauthorized)", "PASS", "Correctly rejected unauthorized access")
@@ -243,7 +232,7 @@ def test_email_test_authorized(admin_token):
     """Test POST /api/admin/email/test with admin auth"""
     try:
         headers = {"Authorization": f"Bearer {admin_token}", "Content-Type": "application/json"}
-        response = requests.post(f"{BASE_URL}/api/admin/email/test", headers=headers, json={})
+        response = api.post(f"{BASE_URL}/api/admin/email/test", headers=headers, json={})
         
         # This will likely fail without real SMTP credentials, but should test the logic
         if response.status_code == 400:
@@ -309,7 +298,7 @@ def test_welcome_email_trigger(user_token, user_id, user_email, admin_token):
     try:
         # Check email logs for welcome email
         headers = {"Authorization": f"Bearer {admin_token}"}
-        response = requests.get(f"{BASE_URL}/api/admin/email/logs", headers=headers)
+        response = api.get(f"{BASE_URL}/api/admin/email/logs", headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -336,7 +325,7 @@ def test_password_change_email_trigger(user_token, user_id, admin_token):
     try:
         # Change user password
         headers = {"Authorization": f"Bearer {user_token}"}
-        response = requests.put(f"{BASE_URL}/api/account/password", 
+        response = api.put(f"{BASE_URL}/api/account/password", 
                                headers=headers, 
                                json={
                                    "currentPassword": "testpass123",
@@ -354,7 +343,7 @@ def test_password_change_email_trigger(user_token, user_id, admin_token):
                 
                 # Check email logs for password change email
                 admin_headers = {"Authorization": f"Bearer {admin_token}"}
-                logs_response = requests.get(f"{BASE_URL}/api/admin/email/logs", headers=admin_headers)
+                logs_response = api.get(f"{BASE_URL}/api/admin/email/logs", headers=admin_headers)
                 
                 if logs_response.status_code == 200:
                     logs_data = logs_response.json()
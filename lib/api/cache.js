@@ -0,0 +1,248 @@
+/**
+ * Response Cache
+ * In-memory LRU cache for API responses, bounded by entry count and by
+ * (approximate, JSON-encoded) size. Entries carry tags so a write can drop
+ * everything built from the data it changed - invalidateTags('products') -
+ * without scanning keys.
+ *
+ * Each entry is fresh for `ttl` ms and may then be served stale for another
+ * `staleTtl` ms while one background refresh replaces it
+ * (stale-while-revalidate). Expired entries are dropped when read and by a
+ * periodic sweep, so keys that are never read again don't linger.
+ *
+ * Loads are single-flight: concurrent misses on a key wait for the one load
+ * already in flight instead of each querying the database again.
+ */
+
+const DEFAULT_TTL = 60000;
+
+function sizeOf(value) {
+  try {
+    return Buffer.byteLength(JSON.stringify(value) ?? '');
+  } catch (error) {
+    return 0;
+  }
+}
+
+export class ResponseCache {
+  /**
+   * @param {Object} options
+   * @param {number} options.maxEntries - Evict least recently used entries beyond this
+   * @param {number} options.maxBytes - Evict least recently used entries beyond this size
+   * @param {number} options.staleTtl - Default stale-while-revalidate window (ms)
+   * @param {number} options.sweepIntervalMs - Periodic expiry sweep, 0 disables it
+   */
+  constructor({ maxEntries = 1000, maxBytes = 32 * 1024 * 1024, staleTtl = 60000, sweepIntervalMs = 30000 } = {}) {
+    this.maxEntries = maxEntries;
+    this.maxBytes = maxBytes;
+    this.staleTtl = staleTtl;
+    this.entries = new Map(); // key -> entry; Map order is LRU order (oldest first)
+    this.tags = new Map(); // tag -> Set of keys
+    this.loading = new Map(); // key -> { token, promise } of the load in flight
+    this.bytes = 0;
+    this.counters = {
+      hits: 0,
+      staleHits: 0,
+      misses: 0,
+      coalesced: 0,
+      sets: 0,
+      evictions: 0,
+      expirations: 0,
+      invalidations: 0,
+      refreshes: 0,
+      refreshErrors: 0,
+      oversized: 0
+    };
+
+    if (sweepIntervalMs > 0) {
+      this.sweeper = setInterval(() => this.sweep(), sweepIntervalMs);
+      this.sweeper.unref?.();
+    }
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  // Entry for a key, or null once it is past its stale window
+  lookup(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return null;
+    if (Date.now() > entry.staleUntil) {
+      this.remove(key);
+      this.counters.expirations++;
+      return null;
+    }
+    // Move to the most recently used end
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry;
+  }
+
+  /**
+   * Fresh cached value, or null
+   */
+  get(key) {
+    const entry = this.lookup(key);
+    if (!entry || Date.now() > entry.expiry) {
+      this.counters.misses++;
+      return null;
+    }
+    this.counters.hits++;
+    return entry.value;
+  }
+
+  /**
+   * Store a value
+   * @param {string} key - Cache key
+   * @param {*} value - Anything JSON-serializable
+   * @param {Object} options - { ttl, staleTtl, tags }
+   */
+  set(key, value, { ttl = DEFAULT_TTL, staleTtl = this.staleTtl, tags = [] } = {}) {
+    this.remove(key);
+
+    const bytes = sizeOf(value);
+    if (bytes > this.maxBytes) {
+      this.counters.oversized++;
+      return;
+    }
+
+    const now = Date.now();
+    const entry = { value, expiry: now + ttl, staleUntil: now + ttl + staleTtl, tags, bytes };
+    this.entries.set(key, entry);
+    this.bytes += bytes;
+    for (const tag of tags) {
+      if (!this.tags.has(tag)) this.tags.set(tag, new Set());
+      this.tags.get(tag).add(key);
+    }
+    this.counters.sets++;
+
+    // Evict from the least recently used end
+    for (const oldest of this.entries.keys()) {
+      if (this.entries.size <= this.maxEntries && this.bytes <= this.maxBytes) break;
+      this.remove(oldest);
+      this.counters.evictions++;
+    }
+  }
+
+  /**
+   * Cached value for a key, loading (and caching) it on a miss. Concurrent
+   * misses share one load. A stale entry is returned as is while a single
+   * background load refreshes it.
+   * @param {string} key - Cache key
+   * @param {Object} options - { ttl, staleTtl, tags }
+   * @param {Function} load - async () => value
+   */
+  async fetch(key, options, load) {
+    const entry = this.lookup(key);
+    if (entry) {
+      if (Date.now() <= entry.expiry) {
+        this.counters.hits++;
+        return entry.value;
+      }
+      this.counters.staleHits++;
+      this.refresh(key, options, load);
+      return entry.value;
+    }
+
+    this.counters.misses++;
+    const inFlight = this.loading.get(key);
+    if (inFlight) {
+      this.counters.coalesced++;
+      return inFlight.promise;
+    }
+    return this.load(key, options, load);
+  }
+
+  // Run a load for a key, caching its result unless the key was invalidated
+  // while it ran (the value may predate the write)
+  load(key, options, load) {
+    const token = {};
+    const promise = Promise.resolve()
+      .then(load)
+      .then(value => {
+        if (value !== undefined && this.loading.get(key)?.token === token) this.set(key, value, options);
+        return value;
+      })
+      .finally(() => {
+        if (this.loading.get(key)?.token === token) this.loading.delete(key);
+      });
+    this.loading.set(key, { token, promise, tags: options?.tags || [] });
+    return promise;
+  }
+
+  refresh(key, options, load) {
+    if (this.loading.has(key)) return;
+    this.counters.refreshes++;
+    this.load(key, options, load).catch(error => {
+      this.counters.refreshErrors++;
+      console.error(`Cache refresh failed for ${key}:`, error.message);
+    });
+  }
+
+  remove(key) {
+    const entry = this.entries.get(key);
+    if (!entry) return false;
+    this.entries.delete(key);
+    this.bytes -= entry.bytes;
+    for (const tag of entry.tags) {
+      const keys = this.tags.get(tag);
+      keys?.delete(key);
+      if (keys?.size === 0) this.tags.delete(tag);
+    }
+    return true;
+  }
+
+  delete(key) {
+    this.loading.delete(key);
+    if (this.remove(key)) this.counters.invalidations++;
+  }
+
+  /**
+   * Drop every entry carrying any of the tags
+   */
+  invalidateTags(...tags) {
+    for (const tag of tags) {
+      for (const key of [...(this.tags.get(tag) || [])]) {
+        this.delete(key);
+      }
+    }
+    // Loads of keys not cached yet are only known to the in-flight map
+    for (const [key, { tags: loadTags }] of this.loading) {
+      if (tags.some(tag => loadTags.includes(tag))) this.loading.delete(key);
+    }
+  }
+
+  clear() {
+    this.counters.invalidations += this.entries.size;
+    this.loading.clear();
+    this.entries.clear();
+    this.tags.clear();
+    this.bytes = 0;
+  }
+
+  // Drop entries past their stale window
+  sweep() {
+    const now = Date.now();
+    for (const [key, entry] of this.entries) {
+      if (now > entry.staleUntil) {
+        this.remove(key);
+        this.counters.expirations++;
+      }
+    }
+  }
+
+  stats() {
+    const lookups = this.counters.hits + this.counters.staleHits + this.counters.misses;
+    return {
+      ...this.counters,
+      hitRate: lookups ? Math.round(((this.counters.hits + this.counters.staleHits) / lookups) * 1000) / 1000 : null,
+      entries: this.entries.size,
+      bytes: this.bytes,
+      tags: this.tags.size,
+      loading: this.loading.size,
+      maxEntries: this.maxEntries,
+      maxBytes: this.maxBytes
+    };
+  }
+}
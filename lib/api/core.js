@@ -0,0 +1,1991 @@
+/**
+ * API core
+ * Database connection and setup, auth, rate limiting, caching and the
+ * notification, payment and audit helpers shared by the modules in ./routes.
+ */
+
+import { MongoClient } from 'mongodb';
+import jwt from 'jsonwebtoken';
+import { v4 as uuidv4 } from 'uuid';
+import { decrypt } from '@/lib/crypto';
+import nodemailer from 'nodemailer';
+import { runMigrations } from './migrations.js';
+import { ResponseCache } from './cache.js';
+import { createRateLimitStore, slidingWindow } from './rate-limit.js';
+
+const MONGO_URL = process.env.MONGO_URL;
+const DB_NAME = process.env.DB_NAME || 'pinly_store';
+export const JWT_SECRET = process.env.JWT_SECRET || 'pnly-x9k2m-secret-jwt-2025-!@#$%^&*';
+export const BASE_URL = process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000';
+export const APP_VERSION = '1.0.0';
+
+// DijiPin API Configuration
+export const DIJIPIN_API_URL = process.env.DIJIPIN_API_URL || 'https://dijipinapi.dijipin.com';
+export const DIJIPIN_API_TOKEN = process.env.DIJIPIN_API_TOKEN;
+export const DIJIPIN_API_KEY = process.env.DIJIPIN_API_KEY;
+
+// NetGSM API Configuration
+export const NETGSM_API_URL = process.env.NETGSM_API_URL || 'https://api.netgsm.com.tr';
+
+// ============================================
+// RESPONSE CACHE (LRU, tag invalidation, stale-while-revalidate)
+// ============================================
+export const responseCache = new ResponseCache({
+  maxEntries: parseInt(process.env.API_CACHE_MAX_ENTRIES || '1000'),
+  maxBytes: parseInt(process.env.API_CACHE_MAX_MB || '32') * 1024 * 1024,
+  staleTtl: 60000 // serve stale for up to a minute while refreshing
+});
+
+// ============================================
+// DISPOSABLE EMAIL DOMAINS LIST
+// ============================================
+export const DISPOSABLE_EMAIL_DOMAINS = [
+  '10minutemail.com', '10minmail.com', 'tempmail.com', 'temp-mail.org',
+  'guerrillamail.com', 'guerrillamail.org', 'throwaway.email', 'mailinator.com',
+  'yopmail.com', 'sharklasers.com', 'spam4.me', 'trashmail.com',
+  'fakeinbox.com', 'getnada.com', 'dispostable.com', 'maildrop.cc',
+  'mohmal.com', 'tempail.com', 'emailondeck.com', 'mintemail.com',
+  'tempr.email', 'discard.email', 'mailnesia.com', 'mt2009.com',
+  'mytemp.email', 'tmpmail.org', 'tmpmail.net', 'tempinbox.com',
+  'burnermail.io', 'throwawaymail.com', 'mailcatch.com', 'temp-mail.io',
+  'fakemailgenerator.com', 'emailfake.com', 'generator.email', 'inboxkitten.com'
+];
+
+// ============================================
+// DEFAULT RISK SETTINGS
+// ============================================
+export const DEFAULT_RISK_SETTINGS = {
+  isEnabled: true,
+  isTestMode: false,
+  thresholds: {
+    cleanMax: 29,
+    suspiciousMax: 59,
+    riskyMin: 60
+  },
+  weights: {
+    // Phone rules
+    phoneEmpty: 40,
+    phoneTRNotStartsWith5: 30,
+    phoneInvalidLength: 20,
+    phoneMultipleAccounts: 50,
+    // Email rules
+    disposableEmail: 40,
+    emailNotVerified: 20,
+    // Account & Behavior
+    accountAgeLess10Min: 30,
+    accountAgeLess1Hour: 20,
+    firstOrder: 10,
+    fastCheckout: 20,
+    // IP & Device
+    emptyUserAgent: 20,
+    multipleAccountsSameIP: 30,
+    multipleOrdersSameIP1Hour: 40,
+    // Amount based
+    amountOver300: 10,
+    amountOver750: 20,
+    amountOver1500: 35,
+    firstOrderHighAmount: 25,
+    // Blacklist
+    blacklistHit: 100
+  },
+  hardBlocks: {
+    invalidPhone: true,
+    blacklistHit: true
+  },
+  suspiciousAutoApprove: false, // If false, suspicious orders need manual approval
+  updatedAt: new Date(),
+  updatedBy: 'system'
+};
+
+// ============================================
+// RATE LIMITING CONFIG
+// ============================================
+const RATE_LIMITS = {
+  '/api/auth/login': { limit: 5, windowMs: 60000, keyType: 'ip' },
+  '/api/auth/register': { limit: 3, windowMs: 60000, keyType: 'ip' },
+  '/api/orders': { limit: 10, windowMs: 60000, keyType: 'ip+user' },
+  '/api/player/resolve': { limit: 30, windowMs: 60000, keyType: 'ip' },
+  '/api/support': { limit: 10, windowMs: 60000, keyType: 'user' },
+  '/api/admin': { limit: 60, windowMs: 60000, keyType: 'user' },
+};
+
+// Brute force config
+export const BRUTE_FORCE_CONFIG = {
+  user: { maxAttempts: 5, lockoutMs: 10 * 60 * 1000 }, // 5 fails -> 10 min lockout
+  admin: { maxAttempts: 3, lockoutMs: 30 * 60 * 1000 }, // 3 fails -> 30 min lockout
+};
+
+// Sliding window counters; RATE_LIMIT_STORE=mongo shares them between workers (see ./rate-limit.js)
+export const rateLimitStore = createRateLimitStore('rl', getDb);
+export const bruteForceStore = createRateLimitStore('bf', getDb);
+
+// ============================================
+// RATE LIMITING FUNCTIONS
+// ============================================
+export function getClientIP(request) {
+  const forwarded = request.headers.get('x-forwarded-for');
+  if (forwarded) {
+    return forwarded.split(',')[0].trim();
+  }
+  return request.headers.get('x-real-ip') || 'unknown';
+}
+
+function getRateLimitKey(pathname, request, user = null) {
+  const ip = getClientIP(request);
+  
+  // Find matching rate limit config
+  let config = null;
+  for (const [path, cfg] of Object.entries(RATE_LIMITS)) {
+    if (pathname.startsWith(path)) {
+      config = cfg;
+      break;
+    }
+  }
+  
+  if (!config) return null;
+  
+  let key = pathname;
+  if (config.keyType === 'ip') {
+    key = `${pathname}:ip:${ip}`;
+  } else if (config.keyType === 'user' && user) {
+    key = `${pathname}:user:${user.id}`;
+  } else if (config.keyType === 'ip+user') {
+    key = user ? `${pathname}:user:${user.id}` : `${pathname}:ip:${ip}`;
+  } else {
+    key = `${pathname}:ip:${ip}`;
+  }
+  
+  return { key, config };
+}
+
+export async function checkRateLimit(pathname, request, user = null) {
+  const result = getRateLimitKey(pathname, request, user);
+  if (!result) return { allowed: true };
+  
+  const { key, config } = result;
+  const now = Date.now();
+  
+  let counts;
+  try {
+    counts = await rateLimitStore.increment(key, config.windowMs, now);
+  } catch (error) {
+    // Fail open: a store outage must not take the API down with it
+    console.error('Rate limit store error:', error.message);
+    return { allowed: true };
+  }
+  
+  // count includes the hit just recorded
+  const { count, retryAfterMs } = slidingWindow(counts.current, counts.previous, config.windowMs, config.limit, now);
+  
+  if (count > config.limit) {
+    return { allowed: false, retryAfter: Math.max(1, Math.ceil(retryAfterMs / 1000)), remaining: 0 };
+  }
+  
+  return { allowed: true, remaining: Math.max(0, Math.floor(config.limit - count)) };
+}
+
+// ============================================
+// BRUTE FORCE PROTECTION
+// ============================================
+function getBruteForceKey(email, ip, isAdmin = false) {
+  return `${isAdmin ? 'admin' : 'user'}:${email}:${ip}`;
+}
+
+export async function checkBruteForce(email, ip, isAdmin = false) {
+  const key = getBruteForceKey(email, ip, isAdmin);
+  const now = Date.now();
+  
+  let lockedUntil;
+  try {
+    lockedUntil = await bruteForceStore.lockedUntil(key, now);
+  } catch (error) {
+    console.error('Brute force store error:', error.message);
+    return { allowed: true };
+  }
+  
+  if (lockedUntil) {
+    const retryAfter = Math.ceil((lockedUntil - now) / 1000);
+    return { allowed: false, locked: true, retryAfter };
+  }
+  
+  return { allowed: true };
+}
+
+export async function recordFailedLogin(email, ip, isAdmin = false) {
+  const key = getBruteForceKey(email, ip, isAdmin);
+  const config = isAdmin ? BRUTE_FORCE_CONFIG.admin : BRUTE_FORCE_CONFIG.user;
+  const now = Date.now();
+  
+  // Failures are counted over a sliding window of 2x the lockout time
+  const windowMs = config.lockoutMs * 2;
+  const entry = { attempts: 1 };
+  try {
+    const counts = await bruteForceStore.increment(key, windowMs, now);
+    entry.attempts = Math.ceil(slidingWindow(counts.current, counts.previous, windowMs, config.maxAttempts, now).count);
+    
+    if (entry.attempts >= config.maxAttempts) {
+      // Start over once the lockout ends
+      entry.lockedUntil = now + config.lockoutMs;
+      await bruteForceStore.reset(key);
+      await bruteForceStore.lock(key, entry.lockedUntil);
+    }
+  } catch (error) {
+    console.error('Brute force store error:', error.message);
+  }
+  
+  return entry;
+}
+
+export async function clearBruteForce(email, ip, isAdmin = false) {
+  const key = getBruteForceKey(email, ip, isAdmin);
+  try {
+    await bruteForceStore.reset(key);
+  } catch (error) {
+    console.error('Brute force store error:', error.message);
+  }
+}
+
+// ============================================
+// HELPER - GET NEXT MIDNIGHT (for spin wheel)
+// ============================================
+export function getNextMidnight() {
+  const now = new Date();
+  const tomorrow = new Date(now);
+  tomorrow.setDate(tomorrow.getDate() + 1);
+  tomorrow.setHours(0, 0, 0, 0);
+  return tomorrow.toISOString();
+}
+
+// ============================================
+// DIJIPIN API FUNCTIONS
+// ============================================
+
+// DijiPin ürün ID eşleştirme (Pinly ürün title -> DijiPin customerStoreProductID)
+// TOP-UP ürünleri - Direkt UC Yükleme
+// Products/Detail endpoint'inden alınan customerStoreProductID değerleri
+export const DIJIPIN_PRODUCT_MAP = {
+  '60 UC': 234,    // Top-Up PubG Mobile 60 UC - TR (productID: 265)
+  '60 uc': 234,
+  '60UC': 234,
+  '60uc': 234,
+  '325 UC': 235,   // Top-Up PubG Mobile 325 UC - TR (productID: 266)
+  '325 uc': 235,
+  '325UC': 235,
+  '325uc': 235
+};
+
+// DijiPin desteklenen ürünleri kontrol et (sadece 60 UC ve 325 UC)
+function isDijipinEligibleProduct(productTitle) {
+  if (!productTitle) return false;
+  const title = productTitle.toLowerCase().trim();
+  // Sadece 60 UC veya 325 UC içeren ürünler
+  return (title.includes('60') && title.includes('uc')) || 
+         (title.includes('325') && title.includes('uc'));
+}
+
+// DijiPin ürün ID'sini bul (TOP-UP customerStoreProductID)
+function getDijipinProductId(productTitle) {
+  if (!productTitle) return null;
+  const title = productTitle.toLowerCase().trim();
+  
+  if (title.includes('60') && title.includes('uc')) {
+    return 234; // Top-Up PubG Mobile 60 UC - TR
+  }
+  if (title.includes('325') && title.includes('uc')) {
+    return 235; // Top-Up PubG Mobile 325 UC - TR
+  }
+  return null;
+}
+
+// DijiPin bakiye sorgulama
+export async function getDijipinBalance() {
+  if (!DIJIPIN_API_TOKEN) {
+    console.log('DijiPin API token not configured');
+    return null;
+  }
+  
+  try {
+    const response = await fetch(`${DIJIPIN_API_URL}/Customer/Get`, {
+      method: 'GET',
+      headers: {
+        'Authorization': `Bearer ${DIJIPIN_API_TOKEN}`,
+        'Apikey': DIJIPIN_API_KEY,
+        'Content-Type': 'application/json'
+      }
+    });
+    
+    const data = await response.json();
+    console.log('DijiPin balance response:', JSON.stringify(data));
+    
+    if (data.success) {
+      // Tüm bakiye bilgilerini döndür
+      return {
+        balance: data.data.balance,
+        currencyCode: data.data.currencyCode || 'TL',
+        customerName: `${data.data.firstName} ${data.data.lastName}`,
+        email: data.data.email
+      };
+    }
+    console.log('DijiPin balance failed:', data.message);
+    return null;
+  } catch (error) {
+    console.error('DijiPin balance check error:', error);
+    return null;
+  }
+}
+
+// DijiPin sipariş oluşturma (TOP-UP - Direkt UC Yükleme)
+export async function createDijipinOrder(productTitle, quantity, pubgId) {
+  if (!DIJIPIN_API_TOKEN) {
+    console.log('DijiPin API token not configured');
+    return { success: false, error: 'DijiPin API yapılandırılmamış' };
+  }
+  
+  if (!pubgId) {
+    console.log('PUBG ID is required for DijiPin order');
+    return { success: false, error: 'PUBG ID gerekli' };
+  }
+  
+  // Ürün ID'sini bul (customerStoreProductID)
+  const dijipinProductId = getDijipinProductId(productTitle);
+  
+  if (!dijipinProductId) {
+    console.log('DijiPin product not found for:', productTitle);
+    return { success: false, error: 'Bu ürün DijiPin entegrasyonunda bulunamadı (sadece 60 UC ve 325 UC desteklenir)' };
+  }
+  
+  console.log(`DijiPin order: Product "${productTitle}" -> DijiPin customerStoreProductID: ${dijipinProductId}, PUBG ID: ${pubgId}`);
+  
+  try {
+    const response = await fetch(`${DIJIPIN_API_URL}/Order/Create`, {
+      method: 'POST',
+      headers: {
+        'Authorization': `Bearer ${DIJIPIN_API_TOKEN}`,
+        'Apikey': DIJIPIN_API_KEY,
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({
+        basketData: [
+          {
+            customerStoreProductID: dijipinProductId,
+            quantity: quantity || 1,
+            requireData: [
+              {
+                productRequireID: 1,
+                identifier: "user_id",
+                title: "Oyuncu ID",
+                value: pubgId.toString()
+              }
+            ]
+          }
+        ]
+      })
+    });
+    
+    const data = await response.json();
+    console.log('DijiPin order response:', JSON.stringify(data));
+    
+    if (data.success) {
+      return {
+        success: true,
+        orderId: data.data.orderID,
+        details: data.data.details,
+        message: data.message
+      };
+    } else {
+      return {
+        success: false,
+        error: data.message || 'DijiPin sipariş hatası',
+        errorCode: data.errorCode
+      };
+    }
+  } catch (error) {
+    console.error('DijiPin order create error:', error);
+    return { success: false, error: 'DijiPin bağlantı hatası: ' + error.message };
+  }
+}
+
+// DijiPin sipariş durumu sorgulama
+async function getDijipinOrderStatus(orderId) {
+  if (!DIJIPIN_API_TOKEN) {
+    return null;
+  }
+  
+  try {
+    const response = await fetch(`${DIJIPIN_API_URL}/Order/Get?orderID=${orderId}`, {
+      method: 'GET',
+      headers: {
+        'Authorization': `Bearer ${DIJIPIN_API_TOKEN}`,
+        'Content-Type': 'application/json'
+      }
+    });
+    
+    const data = await response.json();
+    return data;
+  } catch (error) {
+    console.error('DijiPin order status error:', error);
+    return null;
+  }
+}
+
+// ============================================
+// SHOPINEXT API FUNCTIONS
+// ============================================
+
+// Shopinext API Base URLs
+export const SHOPINEXT_API_URL = 'https://api.shopinext.com';
+export const SHOPINEXT_API_URL_TEST = 'https://api.dev.shopinext.com';
+
+// Get or refresh Shopinext access token
+async function getShopinextToken(db) {
+  // First try environment variables
+  const envClientId = process.env.SHOPINEXT_CLIENT_ID;
+  const envClientSecret = process.env.SHOPINEXT_CLIENT_SECRET;
+  const envDomain = process.env.SHOPINEXT_DOMAIN;
+  const envMode = process.env.SHOPINEXT_MODE || 'production';
+  
+  let settings;
+  
+  if (envClientId && envClientSecret && envDomain) {
+    // Use environment variables
+    settings = {
+      clientId: envClientId,
+      clientSecret: envClientSecret,
+      domain: envDomain,
+      mode: envMode,
+      fromEnv: true
+    };
+    console.log('Using Shopinext settings from environment variables');
+  } else {
+    // Fall back to database
+    settings = await db.collection('shopinext_settings').findOne({ isActive: true });
+    if (!settings) {
+      console.log('Shopinext settings not found in database or environment');
+      return { error: 'Shopinext ayarları bulunamadı. Lütfen .env dosyasına veya admin panelinden ayarları yapın.' };
+    }
+  }
+
+  // Check if we have a valid cached token
+  const cachedToken = await db.collection('shopinext_tokens').findOne({ isActive: true });
+  
+  if (cachedToken) {
+    const tokenExpiry = new Date(cachedToken.accessTokenValidity);
+    const now = new Date();
+    
+    // If token is still valid (with 5 min buffer)
+    if (tokenExpiry > new Date(now.getTime() + 5 * 60 * 1000)) {
+      return {
+        accessToken: cachedToken.accessToken,
+        settings
+      };
+    }
+    
+    // Try to refresh token
+    const refreshExpiry = new Date(cachedToken.refreshTokenValidity);
+    if (refreshExpiry > now) {
+      const refreshResult = await refreshShopinextToken(db, settings, cachedToken.refreshToken);
+      if (refreshResult) {
+        return {
+          accessToken: refreshResult.accessToken,
+          settings
+        };
+      }
+    }
+  }
+  
+  // Get new token
+  const authResult = await authenticateShopinext(db, settings);
+  if (!authResult) {
+    return { error: 'Shopinext kimlik doğrulama başarısız. IP adresi veya domain yetkili olmayabilir.' };
+  }
+  return authResult;
+}
+
+// Authenticate with Shopinext API
+async function authenticateShopinext(db, settings) {
+  try {
+    // Get credentials - from env or decrypt from db
+    const clientId = settings.fromEnv ? settings.clientId : decrypt(settings.clientId);
+    const clientSecret = settings.fromEnv ? settings.clientSecret : decrypt(settings.clientSecret);
+    const apiUrl = settings.mode === 'test' ? SHOPINEXT_API_URL_TEST : SHOPINEXT_API_URL;
+    
+    console.log('Shopinext authenticate:', { apiUrl, domain: settings.domain, mode: settings.mode, fromEnv: !!settings.fromEnv });
+    
+    const response = await fetch(`${apiUrl}/authenticate`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Domain': settings.domain
+      },
+      body: JSON.stringify({
+        client_id: clientId,
+        client_secret: clientSecret
+      })
+    });
+    
+    const responseText = await response.text();
+    console.log('Shopinext auth raw response:', responseText);
+    
+    let data;
+    try {
+      data = JSON.parse(responseText);
+    } catch (e) {
+      console.error('Shopinext auth response parse error:', e.message);
+      return null;
+    }
+    
+    console.log('Shopinext auth response:', JSON.stringify(data));
+    
+    if (data.status === 1) {
+      // Save token to database
+      await db.collection('shopinext_tokens').updateMany({}, { $set: { isActive: false } });
+      await db.collection('shopinext_tokens').insertOne({
+        id: uuidv4(),
+        accessToken: data.access_token,
+        refreshToken: data.refresh_token,
+        accessTokenValidity: data.access_token_validity,
+        refreshTokenValidity: data.refresh_token_validity,
+        isActive: true,
+        createdAt: new Date()
+      });
+      
+      return {
+        accessToken: data.access_token,
+        settings
+      };
+    }
+    
+    // Log specific error codes
+    if (data.error_code || data.errorCode) {
+      const errorCode = data.error_code || data.errorCode;
+      console.error('Shopinext auth error code:', errorCode, '- Message:', data.message || data.error);
+      // SNE10: IP adresi yetkili değil
+      // SNE11: Domain yetkili değil
+      // SNE1: Kimlik bilgileri yanlış
+    }
+    
+    console.error('Shopinext auth failed:', data);
+    return null;
+  } catch (error) {
+    console.error('Shopinext auth error:', error.message);
+    return null;
+  }
+}
+
+// Refresh Shopinext token
+async function refreshShopinextToken(db, settings, refreshToken) {
+  try {
+    const apiUrl = settings.mode === 'test' ? SHOPINEXT_API_URL_TEST : SHOPINEXT_API_URL;
+    
+    const response = await fetch(`${apiUrl}/refreshToken`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Domain': settings.domain
+      },
+      body: JSON.stringify({
+        refresh_token: refreshToken
+      })
+    });
+    
+    const data = await response.json();
+    
+    if (data.status === 1) {
+      // Update token in database
+      await db.collection('shopinext_tokens').updateMany({}, { $set: { isActive: false } });
+      await db.collection('shopinext_tokens').insertOne({
+        id: uuidv4(),
+        accessToken: data.access_token,
+        refreshToken: data.refresh_token,
+        accessTokenValidity: data.access_token_validity,
+        refreshTokenValidity: data.refresh_token_validity,
+        isActive: true,
+        createdAt: new Date()
+      });
+      
+      return {
+        accessToken: data.access_token
+      };
+    }
+    
+    return null;
+  } catch (error) {
+    console.error('Shopinext token refresh error:', error);
+    return null;
+  }
+}
+
+// Create Shopinext payment
+export async function createShopinextPayment(db, order, user, product) {
+  const tokenResult = await getShopinextToken(db);
+  
+  if (!tokenResult || tokenResult.error) {
+    console.error('Failed to get Shopinext token:', tokenResult?.error);
+    return { success: false, error: tokenResult?.error || 'Shopinext bağlantısı kurulamadı' };
+  }
+  
+  if (!tokenResult.accessToken) {
+    console.error('No access token in result');
+    return { success: false, error: 'Shopinext token alınamadı' };
+  }
+  
+  const { accessToken, settings } = tokenResult;
+  const apiUrl = settings.mode === 'test' ? SHOPINEXT_API_URL_TEST : SHOPINEXT_API_URL;
+  
+  try {
+    // Prepare customer info
+    const firstName = user.firstName || 'Müşteri';
+    const lastName = user.lastName || user.firstName || 'Müşteri';
+    const email = user.email;
+    const phone = (user.phone || '').replace(/[\s\-\(\)\+]/g, '').replace(/^0/, '');
+    
+    // Format phone for Shopinext
+    // billing_phone: without country code (5445553366)
+    // shipping_phone: with country code (905445553366)
+    const billingPhone = phone.startsWith('90') ? phone.substring(2) : phone;
+    const shippingPhone = phone.startsWith('90') ? phone : '90' + phone;
+    // Use same masking as Shopier - add random suffix to email
+    const maskedEmail = maskEmailForShopier(email);
+    console.log('Shopinext using masked email:', maskedEmail, 'original:', email);
+    
+    // Prepare payment request - Dijital ürün için is_digital: 1
+    const paymentPayload = {
+      firstname: firstName,
+      surname: lastName,
+      email: maskedEmail,
+      amount: parseFloat(order.amount.toFixed(2)),
+      currency: 'TRY',
+      max_installment: 1,
+      merchant_order_id: order.id,
+      identity_number: '11111111111', // Dijital ürünler için varsayılan TC
+      company: '',
+      tax_office: '',
+      tax_number: '',
+      is_digital: 1, // Dijital ürün
+      order_products: [{
+        name: product.title,
+        quantity: 1,
+        price: parseFloat(order.amount.toFixed(2)),
+        total: parseFloat(order.amount.toFixed(2))
+      }],
+      billing_info: {
+        billing_firstname: firstName,
+        billing_surname: lastName,
+        billing_address: 'Dijital Ürün',
+        billing_city: 'İstanbul',
+        billing_state: 'İstanbul',
+        billing_postal_code: '34000',
+        billing_country: 'TR',
+        billing_country_code: '+90',
+        billing_phone: billingPhone
+      },
+      shipping_info: {
+        shipping_firstname: firstName,
+        shipping_surname: lastName,
+        shipping_address: 'Dijital Ürün',
+        shipping_city: 'İstanbul',
+        shipping_state: 'İstanbul',
+        shipping_postal_code: '34000',
+        shipping_country: 'TR',
+        shipping_country_code: '+90',
+        shipping_phone: shippingPhone
+      },
+      success_url: `${BASE_URL}/payment/success?orderId=${order.id}`,
+      fail_url: `${BASE_URL}/payment/failed?orderId=${order.id}`,
+      callback_url: `${BASE_URL}/api/payments/shopinext/callback`,
+      language: 'TR'
+    };
+    
+    console.log('Shopinext payment request:', JSON.stringify({ ...paymentPayload, identity_number: '***' }));
+    
+    const response = await fetch(`${apiUrl}/createPayment`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${accessToken}`,
+        'Domain': settings.domain
+      },
+      body: JSON.stringify(paymentPayload)
+    });
+    
+    const data = await response.json();
+    console.log('Shopinext payment response:', JSON.stringify(data));
+    
+    if (data.status === 1 && data.redirect_url) {
+      // Log payment request
+      await db.collection('payment_requests').insertOne({
+        id: uuidv4(),
+        orderId: order.id,
+        provider: 'shopinext',
+        paymentId: data.payment_id,
+        amount: order.amount,
+        status: 'pending',
+        redirectUrl: data.redirect_url,
+        createdAt: new Date()
+      });
+      
+      return {
+        success: true,
+        paymentId: data.payment_id,
+        redirectUrl: data.redirect_url
+      };
+    }
+    
+    console.error('Shopinext payment failed:', data);
+    return { 
+      success: false, 
+      error: data.message || data.error || 'Ödeme oluşturulamadı',
+      errorCode: data.error_code || data.errorCode,
+      details: JSON.stringify(data)
+    };
+  } catch (error) {
+    console.error('Shopinext payment error:', error);
+    return { success: false, error: 'Shopinext bağlantı hatası' };
+  }
+}
+
+// Generate Shopinext callback hash for verification
+// Hash: sha256(client_id + client_secret)
+export function generateShopinextHash(clientId, clientSecret) {
+  const crypto = require('crypto');
+  const data = clientId + clientSecret;
+  return crypto.createHash('sha256').update(data).digest('hex');
+}
+
+// ============================================
+// AUDIT LOG FUNCTIONS
+// ============================================
+export async function logAuditAction(db, action, actorId, entityType, entityId, request, meta = {}) {
+  try {
+    const auditLog = {
+      id: uuidv4(),
+      action,
+      actorId,
+      entityType,
+      entityId,
+      ip: getClientIP(request),
+      userAgent: request.headers.get('user-agent') || 'unknown',
+      meta,
+      createdAt: new Date()
+    };
+    
+    await db.collection('audit_logs').insertOne(auditLog);
+    return auditLog;
+  } catch (error) {
+    console.error('Failed to log audit action:', error);
+    return null;
+  }
+}
+
+// Audit action types
+export const AUDIT_ACTIONS = {
+  PRODUCT_CREATE: 'product.create',
+  PRODUCT_UPDATE: 'product.update',
+  PRODUCT_DELETE: 'product.delete',
+  STOCK_ADD: 'stock.add',
+  STOCK_ASSIGN: 'stock.assign',
+  STOCK_RESET: 'stock.reset',
+  ORDER_STATUS_CHANGE: 'order.status_change',
+  SITE_SETTINGS_UPDATE: 'settings.site_update',
+  OAUTH_SETTINGS_UPDATE: 'settings.oauth_update',
+  PAYMENT_SETTINGS_UPDATE: 'settings.payment_update',
+  EMAIL_SETTINGS_UPDATE: 'settings.email_update',
+  USER_CREATE: 'user.create',
+  USER_LOGIN: 'user.login',
+  USER_LOGIN_FAILED: 'user.login_failed',
+  ADMIN_LOGIN: 'admin.login',
+  ADMIN_LOGIN_FAILED: 'admin.login_failed',
+  TICKET_CREATE: 'ticket.create',
+  TICKET_REPLY: 'ticket.reply',
+  TICKET_CLOSE: 'ticket.close',
+  ORDER_RISK_FLAG: 'order.risk_flag',
+  ORDER_MANUAL_APPROVE: 'order.manual_approve',
+  ORDER_MANUAL_REFUND: 'order.manual_refund',
+  ORDER_VERIFICATION_SUBMIT: 'order.verification_submit',
+  ORDER_VERIFICATION_APPROVE: 'order.verification_approve',
+  ORDER_VERIFICATION_REJECT: 'order.verification_reject',
+};
+
+// ============================================
+// RISK SCORING SYSTEM (Dynamic from DB)
+// ============================================
+
+export async function calculateOrderRisk(db, order, user, request) {
+  // Get risk settings from database or use defaults
+  let riskSettings = await db.collection('risk_settings').findOne({ id: 'main' });
+  if (!riskSettings) {
+    riskSettings = { ...DEFAULT_RISK_SETTINGS, id: 'main' };
+  }
+
+  // If risk system is disabled, return clean status
+  if (!riskSettings.isEnabled) {
+    return {
+      score: 0,
+      status: 'CLEAR',
+      reasons: [],
+      calculatedAt: new Date(),
+      settingsSnapshot: { isEnabled: false }
+    };
+  }
+
+  let score = 0;
+  const reasons = [];
+  const ip = getClientIP(request);
+  const userAgent = request.headers.get('user-agent') || '';
+  const weights = riskSettings.weights || DEFAULT_RISK_SETTINGS.weights;
+  const thresholds = riskSettings.thresholds || DEFAULT_RISK_SETTINGS.thresholds;
+
+  // ============================================
+  // BLACKLIST CHECKS (Priority)
+  // ============================================
+  const blacklistChecks = await checkBlacklist(db, {
+    email: user.email,
+    phone: user.phone,
+    ip: ip,
+    playerId: order.playerId,
+    emailDomain: user.email?.split('@')[1]
+  });
+
+  if (blacklistChecks.hit) {
+    if (riskSettings.hardBlocks?.blacklistHit) {
+      return {
+        score: 100,
+        status: 'BLOCKED',
+        reasons: blacklistChecks.reasons,
+        calculatedAt: new Date(),
+        hardBlock: true,
+        hardBlockReason: 'blacklist'
+      };
+    } else {
+      score += weights.blacklistHit || 100;
+      reasons.push(...blacklistChecks.reasons);
+    }
+  }
+
+  // ============================================
+  // PHONE RULES
+  // ============================================
+  const phone = user.phone?.replace(/[\s\-\(\)\+]/g, '') || '';
+  
+  // Phone empty
+  if (!phone || phone.length === 0) {
+    score += weights.phoneEmpty || 40;
+    reasons.push({ code: 'PHONE_EMPTY', label: 'Telefon numarası boş', points: weights.phoneEmpty || 40 });
+  } else {
+    // TR phone check - Site varsayılan olarak TR için çalışıyor
+    // TR numaraları 5 ile başlamalı (05xx veya 5xx formatında)
+    const cleanPhone = phone.replace(/^(90|0)/, ''); // Remove country code and leading 0
+    
+    // Check if phone starts with 5 (Turkish mobile numbers)
+    if (!cleanPhone.startsWith('5')) {
+      score += weights.phoneTRNotStartsWith5 || 30;
+      reasons.push({ code: 'PHONE_TR_FORMAT', label: 'TR telefon numarası 5 ile başlamalı', points: weights.phoneTRNotStartsWith5 || 30 });
+    }
+    
+    // Phone length check (should be 10 digits for TR after removing country code)
+    if (cleanPhone.length !== 10) {
+      score += weights.phoneInvalidLength || 20;
+      reasons.push({ code: 'PHONE_LENGTH', label: `Telefon uzunluğu geçersiz (${cleanPhone.length} hane)`, points: weights.phoneInvalidLength || 20 });
+    }
+  }
+
+  // Same phone with 2+ accounts
+  if (phone && phone.length >= 10) {
+    const accountsWithPhone = await db.collection('users').countDocuments({ 
+      phone: { $regex: phone.slice(-10) },
+      id: { $ne: user.id }
+    });
+    if (accountsWithPhone >= 1) {
+      score += weights.phoneMultipleAccounts || 50;
+      reasons.push({ code: 'PHONE_MULTI_ACCOUNT', label: `Aynı telefonla ${accountsWithPhone + 1} hesap`, points: weights.phoneMultipleAccounts || 50 });
+    }
+  }
+
+  // ============================================
+  // EMAIL RULES
+  // ============================================
+  const emailDomain = user.email?.split('@')[1]?.toLowerCase() || '';
+  
+  // Check disposable email
+  const allDisposableDomains = await getDisposableDomains(db);
+  if (allDisposableDomains.includes(emailDomain)) {
+    score += weights.disposableEmail || 40;
+    reasons.push({ code: 'DISPOSABLE_EMAIL', label: 'Geçici e-posta adresi', points: weights.disposableEmail || 40 });
+  }
+
+  // Email not verified (if system supports verification)
+  if (user.emailVerified === false && weights.emailNotVerified > 0) {
+    score += weights.emailNotVerified || 20;
+    reasons.push({ code: 'EMAIL_NOT_VERIFIED', label: 'E-posta doğrulanmamış', points: weights.emailNotVerified || 20 });
+  }
+
+  // ============================================
+  // ACCOUNT & BEHAVIOR RULES
+  // ============================================
+  const accountAgeMs = new Date() - new Date(user.createdAt);
+  const accountAgeMinutes = accountAgeMs / (1000 * 60);
+  const accountAgeHours = accountAgeMs / (1000 * 60 * 60);
+
+  // Account age < 10 minutes
+  if (accountAgeMinutes < 10) {
+    score += weights.accountAgeLess10Min || 30;
+    reasons.push({ code: 'ACCOUNT_VERY_NEW', label: 'Hesap yaşı 10 dakikadan az', points: weights.accountAgeLess10Min || 30 });
+  } else if (accountAgeHours < 1) {
+    // Account age < 1 hour
+    score += weights.accountAgeLess1Hour || 20;
+    reasons.push({ code: 'ACCOUNT_NEW', label: 'Hesap yaşı 1 saatten az', points: weights.accountAgeLess1Hour || 20 });
+  }
+
+  // First order check
+  const previousOrders = await db.collection('orders').countDocuments({ 
+    userId: user.id, 
+    status: { $in: ['paid', 'completed'] } 
+  });
+  const isFirstOrder = previousOrders === 0;
+  if (isFirstOrder) {
+    score += weights.firstOrder || 10;
+    reasons.push({ code: 'FIRST_ORDER', label: 'İlk sipariş', points: weights.firstOrder || 10 });
+  }
+
+  // Fast checkout (login to checkout < 30 seconds)
+  if (user.lastLoginAt) {
+    const timeSinceLogin = new Date() - new Date(user.lastLoginAt);
+    if (timeSinceLogin < 30000) { // 30 seconds
+      score += weights.fastCheckout || 20;
+      reasons.push({ code: 'FAST_CHECKOUT', label: 'Çok hızlı checkout (30 sn altı)', points: weights.fastCheckout || 20 });
+    }
+  }
+
+  // ============================================
+  // IP & DEVICE RULES
+  // ============================================
+  
+  // Empty or very short user agent
+  if (!userAgent || userAgent.length < 20) {
+    score += weights.emptyUserAgent || 20;
+    reasons.push({ code: 'SUSPICIOUS_UA', label: 'Şüpheli user-agent', points: weights.emptyUserAgent || 20 });
+  }
+
+  // Multiple accounts from same IP
+  if (ip && ip !== 'unknown') {
+    const accountsFromIP = await db.collection('users').countDocuments({
+      'meta.lastIP': ip,
+      id: { $ne: user.id }
+    });
+    if (accountsFromIP >= 2) {
+      score += weights.multipleAccountsSameIP || 30;
+      reasons.push({ code: 'IP_MULTI_ACCOUNT', label: `Aynı IP'den ${accountsFromIP + 1} hesap`, points: weights.multipleAccountsSameIP || 30 });
+    }
+
+    // Multiple orders from same IP in last hour
+    const ordersFromIP = await db.collection('orders').countDocuments({
+      'meta.ip': ip,
+      createdAt: { $gte: new Date(Date.now() - 60 * 60 * 1000) },
+      id: { $ne: order.id }
+    });
+    if (ordersFromIP >= 3) {
+      score += weights.multipleOrdersSameIP1Hour || 40;
+      reasons.push({ code: 'IP_MULTI_ORDER', label: `Aynı IP'den ${ordersFromIP + 1} sipariş (1 saat)`, points: weights.multipleOrdersSameIP1Hour || 40 });
+    }
+  }
+
+  // ============================================
+  // AMOUNT BASED RULES
+  // ============================================
+  const amount = order.amount || 0;
+
+  if (amount >= 1500) {
+    score += weights.amountOver1500 || 35;
+    reasons.push({ code: 'HIGH_AMOUNT_1500', label: `Yüksek tutar: ₺${amount}`, points: weights.amountOver1500 || 35 });
+  } else if (amount >= 750) {
+    score += weights.amountOver750 || 20;
+    reasons.push({ code: 'HIGH_AMOUNT_750', label: `Yüksek tutar: ₺${amount}`, points: weights.amountOver750 || 20 });
+  } else if (amount >= 300) {
+    score += weights.amountOver300 || 10;
+    reasons.push({ code: 'MEDIUM_AMOUNT', label: `Orta tutar: ₺${amount}`, points: weights.amountOver300 || 10 });
+  }
+
+  // First order + high amount (750+)
+  if (isFirstOrder && amount >= 750) {
+    score += weights.firstOrderHighAmount || 25;
+    reasons.push({ code: 'FIRST_ORDER_HIGH', label: 'İlk siparişte yüksek tutar', points: weights.firstOrderHighAmount || 25 });
+  }
+
+  // ============================================
+  // DETERMINE STATUS
+  // ============================================
+  const finalScore = Math.min(score, 100);
+  let status;
+  
+  if (finalScore <= thresholds.cleanMax) {
+    status = 'CLEAR';
+  } else if (finalScore <= thresholds.suspiciousMax) {
+    status = 'SUSPICIOUS';
+  } else {
+    status = 'FLAGGED';
+  }
+
+  // Log risk calculation
+  await db.collection('risk_logs').insertOne({
+    id: uuidv4(),
+    orderId: order.id,
+    userId: user.id,
+    score: finalScore,
+    status,
+    reasons,
+    ip,
+    userAgent: userAgent.substring(0, 500), // Truncate for storage
+    isTestMode: riskSettings.isTestMode,
+    createdAt: new Date()
+  });
+
+  return {
+    score: finalScore,
+    status: riskSettings.isTestMode ? 'CLEAR' : status, // In test mode, always return CLEAR for delivery
+    actualStatus: status, // Real status for display
+    reasons,
+    calculatedAt: new Date(),
+    isTestMode: riskSettings.isTestMode
+  };
+}
+
+// Check blacklist helper
+async function checkBlacklist(db, data) {
+  const hits = [];
+  
+  // Check email
+  if (data.email) {
+    const emailBlacklist = await db.collection('blacklist').findOne({
+      type: 'email',
+      value: data.email.toLowerCase(),
+      isActive: true
+    });
+    if (emailBlacklist) {
+      hits.push({ code: 'BLACKLIST_EMAIL', label: `Kara listede e-posta: ${data.email}`, points: 100 });
+    }
+  }
+
+  // Check email domain
+  if (data.emailDomain) {
+    const domainBlacklist = await db.collection('blacklist').findOne({
+      type: 'domain',
+      value: data.emailDomain.toLowerCase(),
+      isActive: true
+    });
+    if (domainBlacklist) {
+      hits.push({ code: 'BLACKLIST_DOMAIN', label: `Kara listede domain: ${data.emailDomain}`, points: 100 });
+    }
+  }
+
+  // Check phone
+  if (data.phone) {
+    const cleanPhone = data.phone.replace(/[\s\-\(\)\+]/g, '');
+    const phoneBlacklist = await db.collection('blacklist').findOne({
+      type: 'phone',
+      value: { $regex: cleanPhone.slice(-10) },
+      isActive: true
+    });
+    if (phoneBlacklist) {
+      hits.push({ code: 'BLACKLIST_PHONE', label: `Kara listede telefon`, points: 100 });
+    }
+  }
+
+  // Check IP
+  if (data.ip && data.ip !== 'unknown') {
+    const ipBlacklist = await db.collection('blacklist').findOne({
+      type: 'ip',
+      value: data.ip,
+      isActive: true
+    });
+    if (ipBlacklist) {
+      hits.push({ code: 'BLACKLIST_IP', label: `Kara listede IP: ${data.ip}`, points: 100 });
+    }
+  }
+
+  // Check Player ID
+  if (data.playerId) {
+    const playerBlacklist = await db.collection('blacklist').findOne({
+      type: 'playerId',
+      value: data.playerId,
+      isActive: true
+    });
+    if (playerBlacklist) {
+      hits.push({ code: 'BLACKLIST_PLAYER', label: `Kara listede oyuncu ID: ${data.playerId}`, points: 100 });
+    }
+  }
+
+  return {
+    hit: hits.length > 0,
+    reasons: hits
+  };
+}
+
+// Get disposable domains (built-in + custom from DB)
+async function getDisposableDomains(db) {
+  const customDomains = await db.collection('blacklist').find({
+    type: 'domain',
+    isActive: true
+  }).toArray();
+  
+  const customList = customDomains.map(d => d.value.toLowerCase());
+  return [...new Set([...DISPOSABLE_EMAIL_DOMAINS, ...customList])];
+}
+
+// ============================================
+// INPUT VALIDATION HELPERS
+// ============================================
+function sanitizeString(str) {
+  if (typeof str !== 'string') return str;
+  // Remove MongoDB operators
+  return str.replace(/\$|\./g, '');
+}
+
+function sanitizeObject(obj) {
+  if (typeof obj !== 'object' || obj === null) return obj;
+  
+  const sanitized = Array.isArray(obj) ? [] : {};
+  
+  for (const [key, value] of Object.entries(obj)) {
+    const sanitizedKey = sanitizeString(key);
+    if (typeof value === 'object' && value !== null) {
+      sanitized[sanitizedKey] = sanitizeObject(value);
+    } else if (typeof value === 'string') {
+      sanitized[sanitizedKey] = sanitizeString(value);
+    } else {
+      sanitized[sanitizedKey] = value;
+    }
+  }
+  
+  return sanitized;
+}
+
+function validateEmail(email) {
+  const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+  return emailRegex.test(email);
+}
+
+function validatePhone(phone) {
+  const phoneRegex = /^[0-9]{10,15}$/;
+  return phoneRegex.test(phone.replace(/[\s\-\(\)]/g, ''));
+}
+
+// ============================================
+// SHOPIER EMAIL MASKING - Gerçek e-posta yerine sahte e-posta gönder
+// ============================================
+export function maskEmailForShopier(email) {
+  if (!email || typeof email !== 'string') return email;
+  
+  // E-postayı @ işaretinden böl
+  const parts = email.split('@');
+  if (parts.length !== 2) return email;
+  
+  const localPart = parts[0];
+  const domain = parts[1];
+  
+  // 1-2 rastgele karakter oluştur (harf + sayı karışık)
+  const chars = 'abcdefghijklmnopqrstuvwxyz0123456789';
+  const randomLength = Math.random() > 0.5 ? 2 : 1; // %50 ihtimalle 1 veya 2 karakter
+  let randomSuffix = '';
+  for (let i = 0; i < randomLength; i++) {
+    randomSuffix += chars.charAt(Math.floor(Math.random() * chars.length));
+  }
+  
+  // Yeni e-posta: localpart + rastgele karakterler + @domain
+  return `${localPart}${randomSuffix}@${domain}`;
+}
+
+// ============================================
+// NETGSM SMS SERVICE
+// ============================================
+
+async function getSmsSettings(db) {
+  const settings = await db.collection('sms_settings').findOne({ id: 'main' });
+  console.log('SMS Settings raw:', settings ? { enabled: settings.enabled, usercode: settings.usercode, hasPassword: !!settings.password } : 'null');
+  
+  if (!settings || !settings.enabled) {
+    console.log('SMS settings disabled or not found');
+    return null;
+  }
+  
+  // Decrypt password
+  if (settings.password) {
+    try {
+      settings.password = decrypt(settings.password);
+      console.log('SMS password decrypted successfully');
+    } catch (error) {
+      console.error('Failed to decrypt SMS password, trying as plain text');
+      // Şifre düz metin olabilir, decrypt etmeden kullan
+    }
+  }
+  
+  return settings;
+}
+
+// Telefon numarasını NetGSM formatına çevir (905xxxxxxxxx)
+function formatPhoneForNetgsm(phone) {
+  if (!phone) return null;
+  
+  // Tüm boşluk, tire, parantez temizle
+  let cleaned = phone.replace(/[\s\-\(\)\+]/g, '');
+  
+  // Başındaki 0'ı kaldır ve 90 ekle
+  if (cleaned.startsWith('0')) {
+    cleaned = '90' + cleaned.substring(1);
+  }
+  // Eğer 5 ile başlıyorsa 90 ekle
+  else if (cleaned.startsWith('5')) {
+    cleaned = '90' + cleaned;
+  }
+  // Eğer 90 ile başlamıyorsa 90 ekle
+  else if (!cleaned.startsWith('90')) {
+    cleaned = '90' + cleaned;
+  }
+  
+  return cleaned;
+}
+
+// NetGSM SMS Gönder - YENİ API v2
+export async function sendSms(db, phone, message, type = 'general', orderId = null) {
+  const settings = await getSmsSettings(db);
+  
+  if (!settings) {
+    console.log('SMS disabled or not configured');
+    return { success: false, reason: 'disabled' };
+  }
+  
+  const formattedPhone = formatPhoneForNetgsm(phone);
+  if (!formattedPhone || formattedPhone.length < 12) {
+    console.log('Invalid phone number for SMS:', phone);
+    return { success: false, reason: 'invalid_phone' };
+  }
+  
+  try {
+    // NetGSM API URL - YENİ v2 endpoint
+    const apiUrl = `${NETGSM_API_URL}/sms/rest/v2/send`;
+    
+    // Basic Auth credentials (Base64 encoded)
+    const credentials = Buffer.from(`${settings.usercode}:${settings.password}`).toString('base64');
+    
+    // JSON payload
+    const payload = {
+      msgheader: settings.msgheader || 'PINLY',
+      messages: [
+        {
+          msg: message,
+          no: formattedPhone
+        }
+      ],
+      encoding: 'TR', // Türkçe karakter desteği
+      iysfilter: '0' // Bilgilendirme SMS'i (İYS kontrolsüz)
+    };
+    
+    console.log(`Sending SMS to ${formattedPhone}: ${message.substring(0, 50)}...`);
+    
+    const response = await fetch(apiUrl, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        'Authorization': `Basic ${credentials}`
+      },
+      body: JSON.stringify(payload)
+    });
+    
+    const result = await response.json();
+    console.log('NetGSM response:', JSON.stringify(result));
+    
+    // Başarılı yanıt kontrolü
+    const isSuccess = result.code === '00' || result.code === '01' || result.code === '02';
+    
+    // SMS log kaydet
+    await db.collection('sms_logs').insertOne({
+      id: uuidv4(),
+      phone: formattedPhone,
+      message: message,
+      type: type,
+      orderId: orderId,
+      status: isSuccess ? 'sent' : 'failed',
+      response: JSON.stringify(result),
+      jobId: result.jobid || null,
+      createdAt: new Date()
+    });
+    
+    if (isSuccess) {
+      console.log(`SMS sent successfully to ${formattedPhone}, jobId: ${result.jobid}`);
+      return { success: true, response: result, jobId: result.jobid };
+    } else {
+      console.error(`SMS failed: ${result.code} - ${result.description || 'Unknown error'}`);
+      return { success: false, reason: 'api_error', response: result };
+    }
+    
+  } catch (error) {
+    console.error('SMS send error:', error);
+    
+    // Hata log kaydet
+    await db.collection('sms_logs').insertOne({
+      id: uuidv4(),
+      phone: formattedPhone,
+      message: message,
+      type: type,
+      orderId: orderId,
+      status: 'error',
+      error: error.message,
+      createdAt: new Date()
+    });
+    
+    return { success: false, reason: 'error', error: error.message };
+  }
+}
+
+// Ödeme Başarılı SMS
+export async function sendPaymentSuccessSms(db, order, user, productTitle) {
+  // Ayarları kontrol et
+  const settings = await getSmsSettings(db);
+  if (!settings || !settings.sendOnPayment) {
+    console.log('Payment SMS disabled');
+    return { success: false, reason: 'disabled' };
+  }
+  
+  const customerName = user.firstName || user.name || 'Müşteri';
+  const message = `${customerName} Merhaba siparisin onaylandi lutfen siparislerim kismindaki kodunu aktif et. Sorulariniz icin sitemizden canli destek kismina yazabilirsiniz. Calisma saatleri: 14:00-22:00 her gun - PINLY`;
+  return sendSms(db, user.phone, message, 'payment_success', order.id);
+}
+
+// Teslimat SMS - Devre dışı (sadece ödeme SMS'i aktif)
+export async function sendDeliverySms(db, order, user, productTitle) {
+  // Teslimat SMS'i devre dışı - sadece ödeme SMS'i gönderilecek
+  console.log('Delivery SMS disabled - only payment SMS active');
+  return { success: false, reason: 'disabled' };
+}
+
+// Hesap Teslimat SMS - Devre dışı (sadece ödeme SMS'i aktif)
+export async function sendAccountDeliverySms(db, order, user, accountTitle) {
+  // Teslimat SMS'i devre dışı - sadece ödeme SMS'i gönderilecek
+  console.log('Account delivery SMS disabled - only payment SMS active');
+  return { success: false, reason: 'disabled' };
+}
+
+// Terk Edilmiş Sipariş SMS - Ödeme yapmayanlar için hatırlatma
+export async function sendAbandonedOrderSms(db, order, user) {
+  // Ayarları kontrol et
+  const settings = await getSmsSettings(db);
+  if (!settings || !settings.enabled) {
+    console.log('Abandoned order SMS disabled');
+    return { success: false, reason: 'disabled' };
+  }
+  
+  const customerName = user.firstName || user.name || 'Müşteri';
+  const message = `${customerName} Merhaba, siparisini tamamlamayi unuttun mu? Hemen odeme yap pinly.com.tr - PINLY`;
+  return sendSms(db, user.phone, message, 'abandoned_order', order.id);
+}
+
+export async function sendPaymentFailedSms(db, order, user) {
+  const settings = await getSmsSettings(db);
+  if (!settings || !settings.enabled) {
+    console.log('Payment failed SMS disabled');
+    return { success: false, reason: 'disabled' };
+  }
+  
+  const customerName = user.firstName || user.name || 'Müşteri';
+  const message = `${customerName} Merhaba, odemeniz basarisiz oldu. Garanti Bankasi kartlari su anda bakimdadir. Lutfen baska bir banka karti ile tekrar deneyin. pinly.com.tr - PINLY`;
+  return sendSms(db, user.phone, message, 'payment_failed', order.id);
+}
+
+// ============================================
+// EMAIL SERVICE
+// ============================================
+
+export async function getEmailSettings(db) {
+  const settings = await db.collection('email_settings').findOne({ id: 'main' });
+  if (!settings) return null;
+  
+  // Decrypt SMTP password
+  if (settings.smtpPass) {
+    try {
+      settings.smtpPass = decrypt(settings.smtpPass);
+    } catch (error) {
+      console.error('Failed to decrypt SMTP password');
+      return null;
+    }
+  }
+  
+  return settings;
+}
+
+export async function createTransporter(settings) {
+  if (!settings || !settings.enableEmail) return null;
+  
+  return nodemailer.createTransport({
+    host: settings.smtpHost,
+    port: parseInt(settings.smtpPort) || 587,
+    secure: settings.smtpSecure === true || settings.smtpPort === '465',
+    auth: {
+      user: settings.smtpUser,
+      pass: settings.smtpPass
+    },
+    // Anti-spam headers
+    dkim: settings.dkim || undefined
+  });
+}
+
+// Generate plain text version from HTML (for multipart emails)
+export function htmlToPlainText(html) {
+  return html
+    .replace(/<style[^>]*>[\s\S]*?<\/style>/gi, '')
+    .replace(/<script[^>]*>[\s\S]*?<\/script>/gi, '')
+    .replace(/<[^>]+>/g, '')
+    .replace(/\s+/g, ' ')
+    .replace(/&nbsp;/g, ' ')
+    .replace(/&amp;/g, '&')
+    .replace(/&lt;/g, '<')
+    .replace(/&gt;/g, '>')
+    .replace(/&quot;/g, '"')
+    .trim();
+}
+
+// Email log to prevent duplicates
+async function checkEmailSent(db, type, userId, orderId = null, ticketId = null) {
+  const query = { type, userId };
+  if (orderId) query.orderId = orderId;
+  if (ticketId) query.ticketId = ticketId;
+  
+  const existing = await db.collection('email_logs').findOne(query);
+  return !!existing;
+}
+
+async function logEmail(db, type, userId, to, status, orderId = null, ticketId = null, error = null) {
+  await db.collection('email_logs').insertOne({
+    id: uuidv4(),
+    type,
+    userId,
+    orderId,
+    ticketId,
+    to,
+    status,
+    error: error ? error.message : null,
+    createdAt: new Date()
+  });
+}
+
+// Premium HTML Email Template Generator - Spam-Free Version
+export function generateEmailTemplate(content, settings = {}) {
+  const siteName = settings.siteName || 'PINLY';
+  
+  // Çok basit ve temiz HTML - spam filtrelerinden kaçınmak için
+  return `<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width">
+<title>${siteName}</title>
+</head>
+<body style="font-family:Arial,sans-serif;font-size:14px;line-height:1.5;color:#333;margin:0;padding:20px;background:#fff;">
+
+<p style="font-size:18px;font-weight:bold;color:#1e40af;margin:0 0 20px 0;">${siteName}</p>
+
+<p style="font-size:16px;font-weight:bold;margin:0 0 15px 0;">${content.title}</p>
+
+${content.body.replace(/<p>/g, '<p style="margin:0 0 10px 0;">').replace(/<ul>/g, '<ul style="margin:10px 0;padding-left:20px;">').replace(/<li>/g, '<li style="margin:5px 0;">')}
+
+${content.cta ? `
+<p style="margin:20px 0;">
+<a href="${content.cta.url}" style="color:#1e40af;text-decoration:underline;">${content.cta.text}</a>
+</p>
+` : ''}
+
+${content.codes ? `
+<p style="margin:20px 0 10px 0;font-weight:bold;">Kodlariniz:</p>
+${content.codes.map(code => `<p style="margin:5px 0;padding:10px;background:#f5f5f5;font-family:monospace;border:1px solid #ddd;">${code}</p>`).join('')}
+<p style="margin:10px 0;color:#c00;font-size:12px;">Bu kodlari kimseyle paylasmayin.</p>
+` : ''}
+
+${content.info ? `<p style="margin:15px 0;padding:10px;background:#e7f3ff;border-left:3px solid #1e40af;">${content.info}</p>` : ''}
+
+${content.warning ? `<p style="margin:15px 0;padding:10px;background:#fff3cd;border-left:3px solid #ffc107;">${content.warning}</p>` : ''}
+
+<hr style="border:none;border-top:1px solid #eee;margin:30px 0 15px 0;">
+
+<p style="font-size:12px;color:#999;margin:0;">${siteName}</p>
+
+</body>
+</html>`;
+}
+
+// Email Sending Functions
+async function sendEmail(db, type, to, content, userId, orderId = null, ticketId = null, skipDuplicateCheck = false) {
+  const settings = await getEmailSettings(db);
+  
+  if (!settings || !settings.enableEmail) {
+    console.log('Email disabled or not configured');
+    return { success: false, reason: 'disabled' };
+  }
+  
+  // Check for duplicates (unless skipped)
+  if (!skipDuplicateCheck) {
+    const alreadySent = await checkEmailSent(db, type, userId, orderId, ticketId);
+    if (alreadySent) {
+      console.log(`Duplicate email prevented: ${type} for user ${userId}`);
+      return { success: false, reason: 'duplicate' };
+    }
+  }
+  
+  try {
+    const transporter = await createTransporter(settings);
+    if (!transporter) {
+      return { success: false, reason: 'transporter_failed' };
+    }
+    
+    // Get site settings for template
+    const siteSettings = await db.collection('site_settings').findOne({ id: 'main' });
+    
+    const html = generateEmailTemplate(content, {
+      logoUrl: siteSettings?.logoUrl,
+      siteName: siteSettings?.siteName || 'PINLY'
+    });
+    
+    // Plain text version for multipart (helps avoid spam)
+    const text = htmlToPlainText(html);
+    
+    await transporter.sendMail({
+      from: `"${settings.fromName}" <${settings.fromEmail}>`,
+      replyTo: settings.fromEmail,
+      to,
+      subject: content.subject,
+      text: text, // Plain text version
+      html: html, // HTML version
+      headers: {
+        'X-Priority': '3',
+        'X-Mailer': 'PINLY Mailer',
+        'Precedence': 'bulk',
+        'X-Auto-Response-Suppress': 'OOF, AutoReply'
+      }
+    });
+    
+    await logEmail(db, type, userId, to, 'sent', orderId, ticketId);
+    console.log(`Email sent: ${type} to ${to}`);
+    return { success: true };
+    
+  } catch (error) {
+    console.error(`Email send failed: ${error.message}`);
+    await logEmail(db, type, userId, to, 'failed', orderId, ticketId, error);
+    return { success: false, reason: 'send_failed', error: error.message };
+  }
+}
+
+// Specific Email Templates
+export async function sendWelcomeEmail(db, user) {
+  const content = {
+    subject: `Hos geldin ${user.firstName}`,
+    title: `Merhaba ${user.firstName}`,
+    body: `
+      <p>PINLY ailesine hos geldin!</p>
+      <p>Hesabin basariyla olusturuldu. Artik en uygun fiyatlarla UC satin alabilir ve aninda teslimat alabilirsin.</p>
+    `,
+    cta: {
+      text: 'Alisverise Basla',
+      url: BASE_URL
+    }
+  };
+  
+  return sendEmail(db, 'welcome', user.email, content, user.id);
+}
+
+export async function sendOrderCreatedEmail(db, order, user, product) {
+  const content = {
+    subject: `Siparisiniz alindi - ${order.id.slice(-8)}`,
+    title: 'Siparisiniz Alindi',
+    body: `
+      <p>Merhaba ${user.firstName},</p>
+      <p>Siparisiniz basariyla olusturuldu. Odeme islemini tamamladiktan sonra teslimat yapilacaktir.</p>
+      
+      <p style="margin-top:20px;"><strong>Siparis Detaylari:</strong></p>
+      <ul>
+        <li>Siparis No: ${order.id.slice(-8)}</li>
+        <li>Urun: ${product.title}</li>
+        <li>Toplam: ${product.price.toFixed(2)} TL</li>
+      </ul>
+    `,
+    cta: {
+      text: 'Siparisi Goruntule',
+      url: `${BASE_URL}/account/orders/${order.id}`
+    }
+  };
+  
+  return sendEmail(db, 'order_created', user.email, content, user.id, order.id);
+}
+
+export async function sendPaymentSuccessEmail(db, order, user, product) {
+  const content = {
+    subject: `Odemeniz alindi - ${order.id.slice(-8)}`,
+    title: 'Odeme Basarili',
+    body: `
+      <p>Merhaba ${user.firstName},</p>
+      <p>Odemeniz basariyla alindi. Siparisiniz isleme alindi ve teslimat hazirlaniyor.</p>
+      
+      <p style="margin-top:20px;"><strong>Siparis Bilgileri:</strong></p>
+      <ul>
+        <li>Siparis No: ${order.id.slice(-8)}</li>
+        <li>Urun: ${product.title}</li>
+        <li>Odenen Tutar: ${product.price.toFixed(2)} TL</li>
+      </ul>
+    `,
+    cta: {
+      text: 'Siparis Durumunu Kontrol Et',
+      url: `${BASE_URL}/account/orders/${order.id}`
+    },
+    info: 'Teslimat tamamlandiginda size tekrar bilgi verecegiz.'
+  };
+  
+  return sendEmail(db, 'paid', user.email, content, user.id, order.id);
+}
+
+export async function sendDeliveredEmail(db, order, user, product, codes) {
+  const content = {
+    subject: `Teslimat tamamlandi - ${order.id.slice(-8)}`,
+    title: 'Teslimat Tamamlandi',
+    body: `
+      <p>Merhaba ${user.firstName},</p>
+      <p>Siparisiniz basariyla teslim edildi.</p>
+      
+      <p style="margin-top:20px;"><strong>Siparis Bilgileri:</strong></p>
+      <ul>
+        <li>Urun: ${product.title}</li>
+      </ul>
+    `,
+    codes: codes,
+    cta: {
+      text: 'Siparis Detaylarini Gor',
+      url: `${BASE_URL}/account/orders/${order.id}`
+    }
+  };
+  
+  return sendEmail(db, 'delivered', user.email, content, user.id, order.id);
+}
+
+export async function sendPaymentFailedEmail(db, order, user) {
+  const productTitle = order.productTitle || order.accountTitle || 'Ürün';
+  const content = {
+    subject: `Ödeme başarısız - ${order.id.slice(-8)}`,
+    title: 'Ödeme Tamamlanamadı',
+    body: `
+      <p>Merhaba ${user.firstName},</p>
+      <p>Siparişiniz için yapılan ödeme işlemi başarısız oldu.</p>
+      
+      <div style="background:#fff3cd;border:1px solid #ffc107;border-radius:8px;padding:16px;margin:20px 0;">
+        <p style="margin:0 0 8px 0;font-weight:bold;color:#856404;">⚠️ Banka Bakım Bildirimi</p>
+        <p style="margin:0;color:#856404;font-size:14px;">Garanti Bankası ödeme sistemleri şu anda bakımdadır. Lütfen <strong>farklı bir banka kartı</strong> ile tekrar deneyin veya <strong>IBAN (Havale/EFT)</strong> seçeneği ile ödeme yapın.</p>
+      </div>
+
+      <div style="background:#d4edda;border:1px solid #28a745;border-radius:8px;padding:16px;margin:20px 0;">
+        <p style="margin:0 0 8px 0;font-weight:bold;color:#155724;">💳 Ne Yapabilirsiniz?</p>
+        <ul style="margin:0;padding-left:20px;color:#155724;font-size:14px;">
+          <li style="margin-bottom:6px;">Farklı bir banka kartı ile tekrar ödeme yapabilirsiniz</li>
+          <li><strong>IBAN (Havale/EFT)</strong> seçeneği ile anında ödeme yapabilirsiniz</li>
+        </ul>
+      </div>
+      
+      <p style="margin-top:20px;"><strong>Sipariş Bilgileri:</strong></p>
+      <ul>
+        <li>Sipariş No: ${order.id.slice(-8)}</li>
+        <li>Ürün: ${productTitle}</li>
+        <li>Tutar: ${(order.amount || 0).toFixed(2)} TL</li>
+      </ul>
+    `,
+    cta: {
+      text: 'Tekrar Dene',
+      url: `${BASE_URL}`
+    }
+  };
+  
+  return sendEmail(db, 'payment_failed', user.email, content, user.id, order.id);
+}
+
+async function sendPendingStockEmail(db, order, user, product, message) {
+  const content = {
+    subject: `Stok bekleniyor - ${order.id.slice(-8)}`,
+    title: 'Siparisiniz Beklemede',
+    body: `
+      <p>Merhaba ${user.firstName},</p>
+      <p>Odemeniz alindi ancak su anda bu urun icin stok bulunmamaktadir.</p>
+      <p><strong>Durum:</strong> ${message || 'Stok bekleniyor'}</p>
+      
+      <p style="margin-top:20px;"><strong>Siparis Bilgileri:</strong></p>
+      <ul>
+        <li>Siparis No: ${order.id.slice(-8)}</li>
+        <li>Urun: ${product.title}</li>
+      </ul>
+    `,
+    cta: {
+      text: 'Siparis Durumunu Takip Et',
+      url: `${BASE_URL}/account/orders/${order.id}`
+    },
+    info: 'Stok geldiginde siparisiniz otomatik olarak teslim edilecek ve size bilgi verilecektir.'
+  };
+  
+  return sendEmail(db, 'pending', user.email, content, user.id, order.id);
+}
+
+export async function sendSupportReplyEmail(db, ticket, user, adminMessage) {
+  const preview = adminMessage.length > 200 ? adminMessage.substring(0, 200) + '...' : adminMessage;
+  
+  const content = {
+    subject: `Destek talebinize yanit var - ${ticket.id.slice(-8)}`,
+    title: 'Destek Ekibinden Yanit',
+    body: `
+      <p>Merhaba ${user.firstName},</p>
+      <p>Destek talebinize yanit verildi.</p>
+      
+      <p style="margin-top:20px;"><strong>Talep:</strong> ${ticket.subject}</p>
+      <p style="padding:15px;background:#f5f5f5;border-left:3px solid #1e40af;">
+        "${preview}"
+          </p>
+      </p>
+    `,
+    cta: {
+      text: 'Yaniti Goruntule',
+      url: `${BASE_URL}/account/support/${ticket.id}`
+    },
+    info: 'Artik siz de yanit verebilirsiniz.'
+  };
+  
+  // Support replies can be multiple, so skip duplicate check
+  return sendEmail(db, 'support_reply', user.email, content, user.id, null, ticket.id, true);
+}
+
+export async function sendPasswordChangedEmail(db, user) {
+  const content = {
+    subject: 'Sifreniz degistirildi',
+    title: 'Sifre Degisikligi Bildirimi',
+    body: `
+      <p>Merhaba ${user.firstName},</p>
+      <p>Hesabinizin sifresi basariyla degistirildi.</p>
+      
+      <p style="margin-top:20px;">
+        Tarih: ${new Date().toLocaleString('tr-TR')}<br>
+        Hesap: ${user.email}
+      </p>
+    `,
+    warning: 'Bu islemi siz yapmadiysan, hemen destek ekibiyle iletisime gecin!',
+    cta: {
+      text: 'Destek Talebi Olustur',
+      url: `${BASE_URL}/account/support/new`
+    }
+  };
+  
+  // Password change emails should always send (skip duplicate)
+  return sendEmail(db, 'password_changed', user.email, content, user.id, null, null, true);
+}
+
+// Password Reset Email
+export async function sendPasswordResetEmail(db, user, resetToken) {
+  const resetLink = `${BASE_URL}/reset-password?token=${resetToken}`;
+  
+  const content = {
+    subject: 'Şifre Sıfırlama Talebi',
+    title: 'Şifre Sıfırlama',
+    body: `
+      <p>Merhaba ${user.firstName || 'Değerli Müşterimiz'},</p>
+      <p>Hesabınız için şifre sıfırlama talebinde bulundunuz.</p>
+      <p>Yeni şifrenizi oluşturmak için aşağıdaki butona tıklayın:</p>
+    `,
+    warning: 'Bu link 1 saat içinde geçerliliğini yitirecektir. Bu talebi siz yapmadıysanız, bu e-postayı görmezden gelebilirsiniz.',
+    cta: {
+      text: 'Şifremi Sıfırla',
+      url: resetLink
+    }
+  };
+  
+  return sendEmail(db, 'password_reset', user.email, content, user.id, null, null, true);
+}
+
+export async function sendVerificationRejectedEmail(db, order, user, rejectionReason) {
+  const content = {
+    subject: `Doğrulama reddedildi - ${order.id.slice(-8)}`,
+    title: 'Doğrulama Reddedildi',
+    body: `
+      <p>Merhaba ${user.firstName},</p>
+      <p>Maalesef yüksek tutarlı siparişiniz için gönderdiğiniz doğrulama belgeleri uygun bulunmadı.</p>
+      
+      <p style="margin-top:20px;"><strong>Sipariş Bilgileri:</strong></p>
+      <ul>
+        <li>Sipariş No: ${order.id.slice(-8)}</li>
+        <li>Tutar: ${order.amount.toFixed(2)} TL</li>
+      </ul>
+      
+      <p style="margin-top:20px;"><strong>Red Sebebi:</strong></p>
+      <p style="padding:15px;background:#fff3cd;border-left:3px solid #ffc107;">
+        ${rejectionReason || 'Doğrulama belgeleri uygun değil'}
+      </p>
+    `,
+    warning: 'Siparişiniz iptal edildi ve para iadesi işlemi başlatıldı. İade süreci 3-5 iş günü sürebilir.',
+    cta: {
+      text: 'Destek Talebi Oluştur',
+      url: `${BASE_URL}/account/support/new`
+    }
+  };
+  
+  return sendEmail(db, 'verification_rejected', user.email, content, user.id, order.id);
+}
+
+export async function sendVerificationRequiredEmail(db, order, user, product) {
+  const content = {
+    subject: `Doğrulama gerekli - ${order.id.slice(-8)}`,
+    title: 'Yüksek Tutarlı Sipariş - Doğrulama Gerekli',
+    body: `
+      <p>Merhaba ${user.firstName},</p>
+      <p>Yüksek tutarlı siparişiniz için güvenlik doğrulaması gereklidir.</p>
+      
+      <p style="margin-top:20px;"><strong>Sipariş Bilgileri:</strong></p>
+      <ul>
+        <li>Sipariş No: ${order.id.slice(-8)}</li>
+        <li>Ürün: ${product.title}</li>
+        <li>Tutar: ${order.amount.toFixed(2)} TL</li>
+      </ul>
+      
+      <p style="margin-top:20px;"><strong>Gerekli Belgeler:</strong></p>
+      <ul>
+        <li>Kimlik fotoğrafı (TC kimlik kartı ön yüz)</li>
+        <li>Ödeme dekontu/ekran görüntüsü</li>
+      </ul>
+    `,
+    info: 'Doğrulama belgeleri onaylandıktan sonra siparişiniz teslim edilecektir.',
+    cta: {
+      text: 'Doğrulama Belgelerini Yükle',
+      url: `${BASE_URL}/account/orders/${order.id}`
+    }
+  };
+  
+  return sendEmail(db, 'verification_required', user.email, content, user.id, order.id);
+}
+
+let cachedClient = null;
+let cachedDb = null;
+
+export async function getDb() {
+  if (cachedDb && cachedClient) {
+    return cachedDb;
+  }
+  
+  if (!cachedClient) {
+    const options = {
+      maxPoolSize: 10,
+      minPoolSize: 2,
+      maxIdleTimeMS: 30000,
+      connectTimeoutMS: 10000,
+      socketTimeoutMS: 45000,
+      serverSelectionTimeoutMS: 10000,
+      retryWrites: true,
+      w: 'majority'
+    };
+    
+    cachedClient = await MongoClient.connect(MONGO_URL, options);
+    
+    // Handle connection errors
+    cachedClient.on('error', (err) => {
+      console.error('MongoDB connection error:', err);
+      cachedClient = null;
+      cachedDb = null;
+    });
+    
+    cachedClient.on('close', () => {
+      console.log('MongoDB connection closed');
+      cachedClient = null;
+      cachedDb = null;
+    });
+  }
+  
+  cachedDb = cachedClient.db(DB_NAME);
+  return cachedDb;
+}
+
+// Mock Player Resolver
+const mockPlayerNames = [
+  'ShadowHunter', 'DragonSlayer', 'PhoenixRising', 'ThunderStrike',
+  'NightWolf', 'IceBreaker', 'FireStorm', 'DarkKnight',
+  'GhostRider', 'WarriorKing', 'CyberNinja', 'BloodMoon'
+];
+
+function getMockPlayerName(playerId) {
+  const index = parseInt(playerId) % mockPlayerNames.length;
+  return `${mockPlayerNames[index]}#${playerId.slice(-4)}`;
+}
+
+// Verify JWT Token
+export function verifyToken(request) {
+  const authHeader = request.headers.get('authorization');
+  if (!authHeader || !authHeader.startsWith('Bearer ')) {
+    return null;
+  }
+  const token = authHeader.substring(7);
+  try {
+    const decoded = jwt.verify(token, JWT_SECRET);
+    return decoded;
+  } catch (error) {
+    return null;
+  }
+}
+
+// Verify token AND check logoutAllAt (async - for critical operations)
+async function verifyTokenSecure(request, db) {
+  const decoded = verifyToken(request);
+  if (!decoded) return null;
+  
+  const user = await db.collection('users').findOne({ id: decoded.id });
+  if (!user) return null;
+  
+  // Check if token was issued before "logout all" timestamp
+  if (user.logoutAllAt && decoded.iat) {
+    const logoutTime = Math.floor(new Date(user.logoutAllAt).getTime() / 1000);
+    if (decoded.iat < logoutTime) {
+      return null; // Token invalidated
+    }
+  }
+  
+  return decoded;
+}
+
+// Verify Admin Token (requires username field, not type)
+// Verify Admin Token (requires admin/destek/izleyici role + logoutAllAt check)
+async function verifyAdminTokenSecure(request, db) {
+  const user = await verifyTokenSecure(request, db);
+  if (!user) return null;
+  if (user.role !== 'admin' && user.role !== 'destek' && user.role !== 'izleyici') return null;
+  return user;
+}
+
+export function verifyAdminToken(request) {
+  const user = verifyToken(request);
+  if (!user) return null;
+  if (user.role !== 'admin' && user.role !== 'destek' && user.role !== 'izleyici') {
+    return null;
+  }
+  
+  return user;
+}
+
+// Helper function to return 403 for non-admin users
+function requireAdmin(request) {
+  const user = verifyToken(request);
+  if (!user) {
+    return { error: 'Yetkisiz erişim', status: 401 };
+  }
+  if (user.role !== 'admin' && user.role !== 'destek' && user.role !== 'izleyici') {
+    return { error: 'Admin yetkisi gerekli', status: 403 };
+  }
+  return { user };
+}
+
+// Initialize DB: pending schema migrations run once per process (see
+// lib/api/migrations.js); every later call awaits the settled promise
+let dbInitialized = null;
+
+export function initializeDb() {
+  if (!dbInitialized) {
+    dbInitialized = getDb()
+      .then(db => runMigrations(db))
+      .catch(error => {
+        dbInitialized = null;
+        throw error;
+      });
+  }
+  return dbInitialized;
+}
@@ -0,0 +1,430 @@
+/**
+ * Schema Migrations
+ * Versioned, run-once database changes. Each migration is applied at most once
+ * per database and recorded in `schema_migrations`; runMigrations() holds a
+ * lock document there while it works, so several server processes starting
+ * together don't run the same migration twice.
+ *
+ * Append new migrations with the next number. Never edit, rename or reorder
+ * one that has shipped: databases that already ran it won't run it again.
+ */
+
+import bcrypt from 'bcryptjs';
+import { v4 as uuidv4 } from 'uuid';
+
+const MIGRATIONS_COLLECTION = 'schema_migrations';
+const LOCK_ID = 'lock';
+const LOCK_TTL_MS = 5 * 60 * 1000; // a crashed process releases the lock after this
+const LOCK_POLL_MS = 500;
+const LOCK_REFRESH_MS = LOCK_TTL_MS / 5; // keeps the lock alive through a long migration
+
+// Indexes for the query shapes in tools/explain_check.py, as [keys, options]
+const INDEXES = {
+  users: [
+    [{ id: 1 }, { unique: true }],
+    [{ email: 1 }, { unique: true }],
+    [{ phone: 1 }],
+    [{ createdAt: -1 }],
+    [{ 'meta.lastIP': 1 }],
+  ],
+  products: [
+    [{ id: 1 }, { unique: true }],
+    [{ active: 1, sortOrder: 1 }],
+  ],
+  orders: [
+    [{ id: 1 }, { unique: true }],
+    [{ userId: 1, createdAt: -1 }],
+    [{ userEmail: 1 }],
+    [{ createdAt: -1 }],
+    [{ status: 1, createdAt: -1 }],
+    [{ 'risk.status': 1, createdAt: -1 }],
+    [{ 'delivery.status': 1, createdAt: -1 }],
+    [{ 'delivery.method': 1, createdAt: -1 }],
+    [{ 'meta.ip': 1, createdAt: -1 }],
+    [{ 'verification.status': 1, 'verification.submittedAt': -1 }],
+  ],
+  account_orders: [
+    [{ id: 1 }, { unique: true }],
+    [{ userId: 1, createdAt: -1 }],
+    [{ createdAt: -1 }],
+    [{ status: 1, createdAt: -1 }],
+    [{ 'risk.status': 1, 'delivery.status': 1 }],
+  ],
+  stock: [
+    [{ productId: 1, status: 1, createdAt: 1 }],
+    [{ productId: 1, createdAt: -1 }],
+  ],
+  accounts: [
+    [{ id: 1 }, { unique: true }],
+    [{ active: 1, status: 1, order: 1 }],
+  ],
+  account_stock: [
+    [{ accountId: 1, status: 1 }],
+    [{ accountId: 1, createdAt: -1 }],
+  ],
+  blacklist: [
+    [{ type: 1, value: 1, isActive: 1 }],
+    [{ type: 1, createdAt: -1 }],
+  ],
+  settings: [
+    [{ type: 1 }],
+  ],
+  audit_logs: [
+    [{ createdAt: -1 }],
+    [{ action: 1, createdAt: -1 }],
+    [{ entityType: 1, createdAt: -1 }],
+    [{ actorId: 1, createdAt: -1 }],
+  ],
+  risk_logs: [
+    [{ createdAt: -1 }],
+    [{ status: 1, createdAt: -1 }],
+  ],
+  email_logs: [
+    [{ type: 1, userId: 1, orderId: 1 }],
+    [{ createdAt: -1 }],
+  ],
+  sms_logs: [
+    [{ createdAt: -1 }],
+    [{ phone: 1 }],
+  ],
+  payments: [
+    [{ orderId: 1 }],
+  ],
+  payment_requests: [
+    [{ orderId: 1, provider: 1 }],
+  ],
+  shopierv2_sessions: [
+    [{ orderId: 1, status: 1 }],
+    [{ orderId: 1, createdAt: -1 }],
+    [{ shopierOrderId: 1 }],
+    [{ reference: 1 }],
+    [{ status: 1, expiresAt: 1 }],
+  ],
+  password_resets: [
+    [{ token: 1 }],
+  ],
+  tickets: [
+    [{ userId: 1, updatedAt: -1 }],
+    [{ userId: 1, createdAt: -1 }],
+    [{ status: 1, updatedAt: -1 }],
+  ],
+  support_tickets: [
+    [{ userId: 1 }],
+    [{ status: 1, updatedAt: -1 }],
+  ],
+  ticket_messages: [
+    [{ ticketId: 1, createdAt: 1 }],
+  ],
+  balance_transactions: [
+    [{ userId: 1, createdAt: -1 }],
+  ],
+  reviews: [
+    [{ game: 1, approved: 1, createdAt: -1 }],
+    [{ approved: 1, createdAt: -1 }],
+  ],
+  daily_deals: [
+    [{ productId: 1, active: 1, endTime: 1 }],
+  ],
+  legal_pages: [
+    [{ slug: 1, isActive: 1 }],
+  ],
+  blog_posts: [
+    [{ slug: 1 }],
+    [{ status: 1, publishedAt: -1 }],
+  ],
+  spin_history: [
+    [{ userId: 1, createdAt: -1 }],
+    [{ createdAt: -1 }],
+  ],
+};
+
+function defaultProducts() {
+  return [
+    {
+      id: uuidv4(),
+      title: '60 UC',
+      ucAmount: 60,
+      price: 25,
+      discountPrice: 19.99,
+      discountPercent: 20,
+      game: 'pubg',
+      featured: false,
+      active: true,
+      sortOrder: 1,
+      imageUrl: 'https://images.unsplash.com/photo-1538481199705-c710c4e965fc?w=400&h=300&fit=crop',
+      createdAt: new Date()
+    },
+    {
+      id: uuidv4(),
+      title: '325 UC',
+      ucAmount: 325,
+      price: 100,
+      discountPrice: 89.99,
+      discountPercent: 10,
+      game: 'pubg',
+      featured: false,
+      active: true,
+      sortOrder: 2,
+      imageUrl: 'https://images.unsplash.com/photo-1552820728-8b83bb6b773f?w=400&h=300&fit=crop',
+      createdAt: new Date()
+    },
+    {
+      id: uuidv4(),
+      title: '660 UC',
+      ucAmount: 660,
+      price: 200,
+      discountPrice: 179.99,
+      discountPercent: 10,
+      game: 'pubg',
+      featured: false,
+      active: true,
+      sortOrder: 3,
+      imageUrl: 'https://images.unsplash.com/photo-1579373903781-fd5c0c30c4cd?w=400&h=300&fit=crop',
+      createdAt: new Date()
+    },
+    {
+      id: uuidv4(),
+      title: '1800 UC',
+      ucAmount: 1800,
+      price: 500,
+      discountPrice: 449.99,
+      discountPercent: 10,
+      game: 'pubg',
+      featured: false,
+      active: true,
+      sortOrder: 4,
+      imageUrl: 'https://images.unsplash.com/photo-1542751371-adc38448a05e?w=400&h=300&fit=crop',
+      createdAt: new Date()
+    },
+    {
+      id: uuidv4(),
+      title: '3850 UC',
+      ucAmount: 3850,
+      price: 1000,
+      discountPrice: 899.99,
+      discountPercent: 10,
+      game: 'pubg',
+      featured: false,
+      active: true,
+      sortOrder: 5,
+      imageUrl: 'https://images.unsplash.com/photo-1511512578047-dfb367046420?w=400&h=300&fit=crop',
+      createdAt: new Date()
+    }
+  ];
+}
+
+/**
+ * Create indexes one by one. An index that can't be built (e.g. a unique index
+ * over existing duplicates) is logged and reported instead of failing the
+ * migration, so it can't keep the API from starting.
+ */
+async function createIndexes(db, indexes) {
+  const result = { created: 0, failed: [] };
+  for (const [collection, specs] of Object.entries(indexes)) {
+    for (const [keys, options = {}] of specs) {
+      try {
+        await db.collection(collection).createIndex(keys, options);
+        result.created++;
+      } catch (error) {
+        console.error(`Index ${collection} ${JSON.stringify(keys)} failed:`, error.message);
+        result.failed.push({ collection, keys, error: error.message });
+      }
+    }
+  }
+  return result;
+}
+
+export const MIGRATIONS = [
+  {
+    id: '001-products-image-url',
+    description: "Rename products.image to imageUrl",
+    async up(db) {
+      await db.collection('products').updateMany(
+        { image: { $exists: true }, imageUrl: { $exists: false } },
+        { $rename: { image: 'imageUrl' } }
+      );
+    }
+  },
+  {
+    id: '002-products-game',
+    description: "Default products.game to 'pubg'",
+    async up(db) {
+      await db.collection('products').updateMany(
+        { game: { $exists: false } },
+        { $set: { game: 'pubg' } }
+      );
+    }
+  },
+  {
+    id: '003-products-featured',
+    description: 'Default products.featured to false',
+    async up(db) {
+      await db.collection('products').updateMany(
+        { featured: { $exists: false } },
+        { $set: { featured: false } }
+      );
+    }
+  },
+  {
+    id: '004-default-products',
+    description: 'Seed the UC products into an empty catalogue',
+    async up(db) {
+      const productsCount = await db.collection('products').countDocuments();
+      if (productsCount === 0) {
+        await db.collection('products').insertMany(defaultProducts());
+      }
+    }
+  },
+  {
+    id: '005-default-admin',
+    description: 'Create the default admin user',
+    async up(db) {
+      const adminCount = await db.collection('admin_users').countDocuments();
+      if (adminCount === 0) {
+        const hashedPassword = await bcrypt.hash('admin123', 10);
+        await db.collection('admin_users').insertOne({
+          id: uuidv4(),
+          username: 'admin',
+          passwordHash: hashedPassword,
+          createdAt: new Date()
+        });
+      }
+    }
+  },
+  {
+    id: '006-dijipin-settings',
+    description: 'Enable DijiPin for 60 UC and 325 UC',
+    async up(db) {
+      const dijipinSettings = await db.collection('settings').findOne({ type: 'dijipin' });
+      if (!dijipinSettings) {
+        await db.collection('settings').insertOne({
+          type: 'dijipin',
+          isEnabled: true,
+          supportedProducts: ['60 UC', '325 UC'],
+          createdAt: new Date(),
+          updatedAt: new Date(),
+          updatedBy: 'system'
+        });
+      }
+    }
+  },
+  {
+    id: '007-spin-history-user-id',
+    description: 'Copy spin_history.oderId (a typo for userId) to userId',
+    async up(db) {
+      const result = await db.collection('spin_history').updateMany(
+        { oderId: { $exists: true }, userId: { $exists: false } },
+        [{ $set: { userId: '$oderId' } }]
+      );
+      return { modified: result.modifiedCount };
+    }
+  },
+  {
+    id: '008-indexes',
+    description: 'Indexes for the API query shapes (replaces add-indexes.js)',
+    async up(db) {
+      return createIndexes(db, INDEXES);
+    }
+  },
+  {
+    id: '009-rate-limits',
+    description: 'TTL and key indexes for the shared rate limit store (lib/api/rate-limit.js)',
+    async up(db) {
+      return createIndexes(db, {
+        rate_limits: [
+          [{ expiresAt: 1 }, { expireAfterSeconds: 0 }],
+          [{ key: 1 }],
+        ],
+      });
+    }
+  },
+];
+
+function sleep(ms) {
+  return new Promise(resolve => setTimeout(resolve, ms));
+}
+
+async function pendingMigrations(collection) {
+  const applied = await collection
+    .find({ appliedAt: { $exists: true } }, { projection: { _id: 1 } })
+    .toArray();
+  const appliedIds = new Set(applied.map(doc => doc._id));
+  return MIGRATIONS.filter(migration => !appliedIds.has(migration.id));
+}
+
+/**
+ * Take or refresh the migration lock
+ * @returns {Promise<boolean>} false while another process holds it
+ */
+async function acquireLock(collection, owner) {
+  const now = new Date();
+  try {
+    // Matches a free, expired or own lock; otherwise the upsert hits the
+    // existing _id and fails with a duplicate key error
+    await collection.updateOne(
+      { _id: LOCK_ID, $or: [{ owner }, { expiresAt: { $lt: now } }] },
+      { $set: { owner, lockedAt: now, expiresAt: new Date(now.getTime() + LOCK_TTL_MS) } },
+      { upsert: true }
+    );
+    return true;
+  } catch (error) {
+    if (error.code === 11000) return false;
+    throw error;
+  }
+}
+
+/**
+ * Apply every pending migration in order
+ * @param {Object} db - MongoDB database instance
+ * @returns {Promise<string[]>} Ids of the migrations this call applied
+ */
+export async function runMigrations(db) {
+  const collection = db.collection(MIGRATIONS_COLLECTION);
+
+  // Fast path: everything applied, one query
+  if ((await pendingMigrations(collection)).length === 0) {
+    return [];
+  }
+
+  const owner = uuidv4();
+  while (!(await acquireLock(collection, owner))) {
+    await sleep(LOCK_POLL_MS);
+  }
+
+  // Refresh the lock while a migration runs (an index build can outlast LOCK_TTL_MS)
+  const heartbeat = setInterval(() => {
+    acquireLock(collection, owner).catch(error => {
+      console.error('Migration lock refresh failed:', error.message);
+    });
+  }, LOCK_REFRESH_MS);
+  heartbeat.unref?.();
+
+  const applied = [];
+  try {
+    // Another process may have applied them while we waited for the lock
+    for (const migration of await pendingMigrations(collection)) {
+      const startedAt = Date.now();
+      const result = await migration.up(db);
+      try {
+        await collection.insertOne({
+          _id: migration.id,
+          description: migration.description,
+          appliedAt: new Date(),
+          durationMs: Date.now() - startedAt,
+          ...(result ? { result } : {})
+        });
+      } catch (error) {
+        // Recorded by a process that took over an expired lock: already applied
+        if (error.code !== 11000) throw error;
+        console.warn(`Migration ${migration.id} was recorded by another process`);
+        continue;
+      }
+      applied.push(migration.id);
+      console.log(`Migration ${migration.id} applied in ${Date.now() - startedAt} ms`);
+    }
+  } finally {
+    clearInterval(heartbeat);
+    await collection.deleteOne({ _id: LOCK_ID, owner });
+  }
+  return applied;
+}
@@ -0,0 +1,197 @@
+/**
+ * Rate Limit Stores
+ * Counters behind checkRateLimit() and the brute force checks in ./core.js.
+ *
+ * Counts use a sliding window: each key keeps a counter for the current and
+ * the previous fixed window, and the previous one is weighted by how much of
+ * it still overlaps the sliding window ending now. That gives no burst at a
+ * window edge and costs one atomic increment per hit.
+ *
+ *   MemoryRateLimitStore  per process, bounded and swept; fine for one worker
+ *   MongoRateLimitStore   shared by every worker through the `rate_limits`
+ *                         collection (TTL index on expiresAt, migration 009)
+ *
+ * RATE_LIMIT_STORE=mongo selects the shared store, anything else the memory one.
+ */
+
+const COLLECTION = 'rate_limits';
+const DUPLICATE_KEY = 11000;
+
+/**
+ * Sliding window estimate from the two fixed window counts
+ * @returns {{ count: number, retryAfterMs: number }} retryAfterMs is how long
+ *   until one more hit fits under `limit` (0 if it already does)
+ */
+export function slidingWindow(current, previous, windowMs, limit, now = Date.now()) {
+  const elapsed = (now % windowMs) / windowMs;
+  const count = previous * (1 - elapsed) + current;
+  const room = limit - 1;
+
+  let retryAfterMs = 0;
+  if (count > room) {
+    if (current <= room) {
+      // The previous window fades out enough before this one ends
+      retryAfterMs = (1 - (room - current) / previous - elapsed) * windowMs;
+    } else {
+      // Wait for this window to become the previous one and fade in turn
+      retryAfterMs = (1 - elapsed) * windowMs + (1 - room / current) * windowMs;
+    }
+  }
+  return { count, retryAfterMs: Math.max(0, Math.ceil(retryAfterMs)) };
+}
+
+export class MemoryRateLimitStore {
+  /**
+   * @param {Object} options
+   * @param {number} options.maxKeys - Drop the least recently hit keys beyond this
+   * @param {number} options.sweepIntervalMs - Periodic expiry sweep, 0 disables it
+   */
+  constructor({ maxKeys = 100000, sweepIntervalMs = 60000 } = {}) {
+    this.maxKeys = maxKeys;
+    this.counters = new Map(); // key -> { window, current, previous, expiresAt }; Map order is LRU order
+    this.locks = new Map(); // key -> lockedUntil (ms)
+
+    if (sweepIntervalMs > 0) {
+      this.sweeper = setInterval(() => this.sweep(), sweepIntervalMs);
+      this.sweeper.unref?.();
+    }
+  }
+
+  get size() {
+    return this.counters.size + this.locks.size;
+  }
+
+  /**
+   * Count a hit
+   * @returns {Promise<{ current: number, previous: number }>} the two window counts after it
+   */
+  async increment(key, windowMs, now = Date.now()) {
+    const window = Math.floor(now / windowMs);
+    let entry = this.counters.get(key);
+
+    if (!entry || entry.window < window - 1) {
+      entry = { window, current: 0, previous: 0 };
+    } else if (entry.window === window - 1) {
+      entry = { window, current: 0, previous: entry.current };
+    }
+    entry.current++;
+    entry.expiresAt = (window + 2) * windowMs;
+
+    this.counters.delete(key);
+    this.counters.set(key, entry);
+    for (const oldest of this.counters.keys()) {
+      if (this.counters.size <= this.maxKeys) break;
+      this.counters.delete(oldest);
+    }
+    return { current: entry.current, previous: entry.previous };
+  }
+
+  async lockedUntil(key, now = Date.now()) {
+    const until = this.locks.get(key);
+    if (until === undefined) return null;
+    if (now >= until) {
+      this.locks.delete(key);
+      return null;
+    }
+    return until;
+  }
+
+  async lock(key, until) {
+    this.locks.set(key, until);
+  }
+
+  async reset(key) {
+    this.counters.delete(key);
+    this.locks.delete(key);
+  }
+
+  // Drop counters and locks that no longer affect any decision
+  sweep(now = Date.now()) {
+    for (const [key, entry] of this.counters) {
+      if (now >= entry.expiresAt) this.counters.delete(key);
+    }
+    for (const [key, until] of this.locks) {
+      if (now >= until) this.locks.delete(key);
+    }
+  }
+}
+
+export class MongoRateLimitStore {
+  /**
+   * @param {Function} getDb - async () => Db
+   * @param {string} namespace - Keeps stores sharing the collection apart
+   */
+  constructor(getDb, namespace) {
+    this.getDb = getDb;
+    this.namespace = namespace;
+  }
+
+  // Nothing is held in process
+  get size() {
+    return 0;
+  }
+
+  async collection() {
+    return (await this.getDb()).collection(COLLECTION);
+  }
+
+  async increment(key, windowMs, now = Date.now()) {
+    const collection = await this.collection();
+    const window = Math.floor(now / windowMs);
+    const id = w => `${this.namespace}:${key}:${w}`;
+
+    const bump = () => collection.findOneAndUpdate(
+      { _id: id(window) },
+      {
+        $inc: { count: 1 },
+        $setOnInsert: { key: `${this.namespace}:${key}`, expiresAt: new Date((window + 2) * windowMs) }
+      },
+      { upsert: true, returnDocument: 'after' }
+    );
+
+    const [current, previous] = await Promise.all([
+      // Two first hits can race to insert the same window; the loser's retry finds it
+      bump().catch(error => {
+        if (error.code === DUPLICATE_KEY) return bump();
+        throw error;
+      }),
+      collection.findOne({ _id: id(window - 1) })
+    ]);
+    return { current: current?.count || 1, previous: previous?.count || 0 };
+  }
+
+  async lockedUntil(key, now = Date.now()) {
+    const collection = await this.collection();
+    const lock = await collection.findOne({ _id: `${this.namespace}:lock:${key}` });
+    if (!lock || now >= lock.expiresAt.getTime()) return null;
+    return lock.expiresAt.getTime();
+  }
+
+  async lock(key, until) {
+    const collection = await this.collection();
+    await collection.updateOne(
+      { _id: `${this.namespace}:lock:${key}` },
+      { $set: { key: `${this.namespace}:${key}`, expiresAt: new Date(until) } },
+      { upsert: true }
+    );
+  }
+
+  async reset(key) {
+    const collection = await this.collection();
+    await collection.deleteMany({ key: `${this.namespace}:${key}` });
+  }
+}
+
+/**
+ * Store for one kind of limit, per RATE_LIMIT_STORE
+ * @param {string} namespace - e.g. 'rl', 'bf'
+ * @param {Function} getDb - async () => Db, used by the shared store
+ */
+export function createRateLimitStore(namespace, getDb) {
+  if (process.env.RATE_LIMIT_STORE === 'mongo') {
+    return new MongoRateLimitStore(getDb, namespace);
+  }
+  return new MemoryRateLimitStore({
+    maxKeys: parseInt(process.env.RATE_LIMIT_MAX_KEYS || '100000')
+  });
+}
@@ -0,0 +1,139 @@
+/**
+ * API Router
+ * Per-method route tables: exact paths in a Map, parameterized paths in a
+ * segment trie, so finding the handlers for a request costs one lookup plus
+ * one walk over its path segments instead of a chain of comparisons.
+ *
+ * Path syntax:
+ *   /api/orders            exact
+ *   /api/orders/:id        `:name` matches one non-empty segment
+ *   /api/payment/fail/*    `*` (last segment only) matches the rest of the path,
+ *                          like pathname.startsWith('/api/payment/fail/')
+ *
+ * Several routes may match the same path. match() returns all of them, most
+ * specific first: exact paths, then trie routes with static segments before
+ * `:name` before `*` at each level, then registration order. So
+ * /api/orders/recent wins over /api/orders/:id wherever either is registered.
+ * The dispatcher tries them in turn: a handler that returns undefined passes
+ * the request on to the next one, just like an `if` block that did not return.
+ */
+
+function createNode() {
+  return { children: new Map(), param: null, routes: [], wildcard: [] };
+}
+
+export class Router {
+  constructor() {
+    this.tables = new Map();
+    this.seq = 0;
+  }
+
+  table(method) {
+    if (!this.tables.has(method)) {
+      this.tables.set(method, { exact: new Map(), root: createNode() });
+    }
+    return this.tables.get(method);
+  }
+
+  /**
+   * Register a handler
+   * @param {string} method - HTTP method
+   * @param {string|string[]} paths - Path pattern(s), see the module comment
+   * @param {Function} handler - async (ctx) => Response | undefined
+   * @param {Object} options - Per-route flags read by the dispatcher
+   */
+  add(method, paths, handler, options = {}) {
+    const table = this.table(method);
+    const route = { handler, options, seq: this.seq++ };
+
+    for (const path of Array.isArray(paths) ? paths : [paths]) {
+      const segments = path.split('/').filter(Boolean);
+
+      if (!segments.some(s => s.startsWith(':') || s === '*')) {
+        if (!table.exact.has(path)) table.exact.set(path, []);
+        table.exact.get(path).push({ ...route, paramNames: [] });
+        continue;
+      }
+
+      let node = table.root;
+      const paramNames = [];
+      segments.forEach((segment, i) => {
+        if (segment === '*') {
+          if (i !== segments.length - 1) throw new Error(`Wildcard must be the last segment: ${path}`);
+          return;
+        }
+        if (segment.startsWith(':')) {
+          paramNames.push(segment.slice(1));
+          node.param = node.param || createNode();
+          node = node.param;
+        } else {
+          if (!node.children.has(segment)) node.children.set(segment, createNode());
+          node = node.children.get(segment);
+        }
+      });
+
+      if (segments[segments.length - 1] === '*') {
+        node.wildcard.push({ ...route, paramNames });
+      } else {
+        node.routes.push({ ...route, paramNames });
+      }
+    }
+    return this;
+  }
+
+  get(paths, handler, options) {
+    return this.add('GET', paths, handler, options);
+  }
+
+  post(paths, handler, options) {
+    return this.add('POST', paths, handler, options);
+  }
+
+  put(paths, handler, options) {
+    return this.add('PUT', paths, handler, options);
+  }
+
+  delete(paths, handler, options) {
+    return this.add('DELETE', paths, handler, options);
+  }
+
+  /**
+   * All routes matching a path, most specific first
+   * @param {string} method - HTTP method
+   * @param {string} pathname - Request path
+   * @returns {Array<{handler: Function, options: Object, params: Object}>}
+   */
+  match(method, pathname) {
+    const table = this.tables.get(method);
+    if (!table) return [];
+
+    const found = (table.exact.get(pathname) || []).map(route => ({ route, values: [] }));
+
+    // Static segments before `:name` before `*`; empty segments (e.g. a
+    // trailing slash) never match a static or `:name` segment
+    const segments = pathname.split('/').slice(1);
+    const walk = (node, i, values) => {
+      if (i === segments.length) {
+        for (const route of node.routes) found.push({ route, values });
+        return;
+      }
+      const segment = segments[i];
+      if (segment) {
+        const child = node.children.get(segment);
+        if (child) walk(child, i + 1, values);
+        if (node.param) walk(node.param, i + 1, [...values, segment]);
+      }
+      for (const route of node.wildcard) found.push({ route, values });
+    };
+    walk(table.root, 0, []);
+
+    const seen = new Set();
+    return found
+      .filter(({ route }) => !seen.has(route.seq) && seen.add(route.seq))
+      .map(({ route, values }) => ({
+        handler: route.handler,
+        options: route.options,
+        params: Object.fromEntries(route.paramNames.map((name, i) => [name, values[i]])),
+      }));
+  }
+}
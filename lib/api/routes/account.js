@@ -0,0 +1,2370 @@
+/**
+ * Signed-in user routes: profile, orders, balance, spin wheel and support tickets.
+ */
+
+import { NextResponse } from 'next/server';
+import bcrypt from 'bcryptjs';
+import jwt from 'jsonwebtoken';
+import { v4 as uuidv4 } from 'uuid';
+import { decrypt } from '@/lib/crypto';
+import { saveUploadedFile } from '@/lib/fileUpload';
+import * as shopierV2Service from '@/lib/shopierv2/service';
+import {
+  JWT_SECRET, BASE_URL, getNextMidnight, createShopinextPayment, logAuditAction, AUDIT_ACTIONS,
+  maskEmailForShopier, sendPaymentSuccessSms, sendOrderCreatedEmail, sendDeliveredEmail,
+  sendPasswordChangedEmail, sendVerificationRequiredEmail, verifyToken, responseCache
+} from '../core.js';
+
+export function register(router) {
+  // User: Get single order by ID
+  router.get('/api/account/orders/:id', async ({ request, db, pathname }) => {
+    try {
+      const authUser = verifyToken(request);
+      if (!authUser || authUser.type !== 'user') {
+        return NextResponse.json(
+          { success: false, error: 'Giriş yapmalısınız' },
+          { status: 401 }
+        );
+      }
+
+      const orderId = pathname.match(/^\/api\/account\/orders\/([^\/]+)$/)[1];
+      
+      const order = await db.collection('orders').findOne({ 
+        id: orderId, 
+        userId: authUser.id 
+      });
+
+      if (!order) {
+        return NextResponse.json(
+          { success: false, error: 'Sipariş bulunamadı' },
+          { status: 404 }
+        );
+      }
+
+      // Hide internal risk data
+      const userOrder = { ...order };
+      delete userOrder.risk;
+      delete userOrder.meta;
+
+      return NextResponse.json({
+        success: true,
+        data: userOrder
+      });
+    } catch (error) {
+      console.error('Single order fetch error:', error);
+      return NextResponse.json(
+        { success: false, error: 'Sipariş getirilemedi' },
+        { status: 500 }
+      );
+    }
+  });
+
+  // User: Get all orders
+  router.get('/api/account/orders', async ({ request, db }) => {
+    const authUser = verifyToken(request);
+    if (!authUser || authUser.type !== 'user') {
+      return NextResponse.json(
+        { success: false, error: 'Giriş yapmalısınız' },
+        { status: 401 }
+      );
+    }
+
+    // Get user's orders - Show all relevant orders
+    const orders = await db.collection('orders')
+      .find({ 
+        userId: authUser.id,
+        $or: [
+          { status: 'paid' },
+          { status: 'failed' },
+          { status: 'refunded' },
+          { paymentMethod: 'card', status: 'pending' },
+          { paymentMethod: 'payyeen', status: 'pending' },
+          { paymentMethod: 'balance' },
+          { paymentMethod: 'iban', 'ibanPayment.status': 'notified' },
+          { paymentMethod: 'iban', 'ibanPayment.status': 'approved' },
+          { delivery: { $exists: true, $ne: null } }
+        ]
+      })
+      .sort({ createdAt: -1 })
+      .toArray();
+
+    // Transform orders - hide risk details, show user-friendly message
+    const userOrders = orders.map(order => {
+      const userOrder = { ...order };
+      
+      // Hide internal risk data from users
+      delete userOrder.risk;
+      delete userOrder.meta;
+      
+      // Show user-friendly delivery status
+      if (order.delivery?.status === 'hold') {
+        userOrder.userDeliveryStatus = 'review';
+        userOrder.userDeliveryMessage = 'Siparişiniz kontrol aşamasındadır. En kısa sürede sonuçlandırılacaktır.';
+      } else if (order.delivery?.status === 'pending') {
+        userOrder.userDeliveryStatus = 'pending';
+        userOrder.userDeliveryMessage = 'Siparişiniz hazırlanıyor.';
+      } else if (order.delivery?.status === 'delivered') {
+        userOrder.userDeliveryStatus = 'delivered';
+        userOrder.userDeliveryMessage = 'Siparişiniz teslim edildi.';
+      } else if (order.delivery?.status === 'cancelled') {
+        userOrder.userDeliveryStatus = 'cancelled';
+        userOrder.userDeliveryMessage = 'Sipariş iptal edildi / iade yapıldı.';
+      }
+      
+      return userOrder;
+    });
+
+    return NextResponse.json({
+      success: true,
+      data: userOrders
+    });
+  });
+
+  // User: Get single order details
+  router.get('/api/account/orders/:id', async ({ request, db, pathname }) => {
+    const authUser = verifyToken(request);
+    if (!authUser || authUser.type !== 'user') {
+      return NextResponse.json(
+        { success: false, error: 'Giriş yapmalısınız' },
+        { status: 401 }
+      );
+    }
+
+    const orderId = pathname.split('/').pop();
+    const order = await db.collection('orders').findOne({ 
+      id: orderId, 
+      userId: authUser.id // Only allow user to see their own orders
+    });
+
+    if (!order) {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Get payment details
+    const payment = await db.collection('payments').findOne({ orderId });
+
+    return NextResponse.json({
+      success: true,
+      data: { order, payment }
+    });
+  });
+
+  // Public: Get order summary for payment success page (limited data - no sensitive info)
+  router.get('/api/orders/:id/summary', async ({ db, pathname }) => {
+    const orderId = pathname.match(/^\/api\/orders\/([^\/]+)\/summary$/)[1];
+    
+    const order = await db.collection('orders').findOne({ id: orderId });
+    
+    if (!order) {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş bulunamadı' },
+        { status: 404 }
+      );
+    }
+    
+    return NextResponse.json({
+      success: true,
+      data: {
+        id: order.id,
+        productId: order.productId,
+        productTitle: order.productTitle,
+        amount: order.amount || order.totalAmount,
+        totalAmount: order.totalAmount || order.amount,
+        quantity: order.quantity || 1,
+        status: order.status,
+        paymentMethod: order.paymentMethod,
+        customer: order.customer ? {
+          firstName: order.customer.firstName,
+          lastName: order.customer.lastName,
+          email: order.customer.email,
+          phone: order.customer.phone
+        } : null,
+        verification: order.verification ? {
+          required: order.verification.required,
+          status: order.verification.status,
+          submittedAt: order.verification.submittedAt
+        } : null,
+        delivery: order.delivery ? {
+          status: order.delivery.status
+        } : null,
+        createdAt: order.createdAt
+      }
+    });
+  });
+
+  // User: Get my profile
+  router.get('/api/account/me', async ({ request, db }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    // Token has 'id' field for user ID
+    const userId = userData.id || userData.userId;
+    const user = await db.collection('users').findOne({ id: userId });
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Kullanıcı bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Get order statistics
+    const orderCount = await db.collection('orders').countDocuments({ userId: user.id });
+    const lastOrder = await db.collection('orders')
+      .findOne({ userId: user.id }, { sort: { createdAt: -1 } });
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        id: user.id,
+        email: user.email,
+        firstName: user.firstName || '',
+        lastName: user.lastName || '',
+        phone: user.phone || '',
+        createdAt: user.createdAt,
+        stats: {
+          totalOrders: orderCount,
+          lastOrderDate: lastOrder?.createdAt || null,
+          lastOrderStatus: lastOrder?.status || null
+        }
+      }
+    });
+  });
+
+  // User: Get my recent orders (for dashboard)
+  router.get('/api/account/orders/recent', async ({ request, db }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    const userId = userData.id || userData.userId;
+    const orders = await db.collection('orders')
+      .find({ userId })
+      .sort({ createdAt: -1 })
+      .limit(3)
+      .toArray();
+
+    return NextResponse.json({ success: true, data: orders });
+  });
+
+  // User: Get my support tickets
+  router.get('/api/support/tickets', async ({ request, db }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    const userId = userData.id || userData.userId;
+    const tickets = await db.collection('tickets')
+      .find({ userId })
+      .sort({ updatedAt: -1 })
+      .toArray();
+
+    return NextResponse.json({ success: true, data: tickets });
+  });
+
+  // User: Get single ticket with messages
+  router.get('/api/support/tickets/:id', async ({ request, db, pathname }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    const ticketId = pathname.split('/').pop();
+    const userId = userData.id || userData.userId;
+    
+    const ticket = await db.collection('tickets').findOne({ id: ticketId, userId });
+    if (!ticket) {
+      return NextResponse.json(
+        { success: false, error: 'Talep bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    const messages = await db.collection('ticket_messages')
+      .find({ ticketId })
+      .sort({ createdAt: 1 })
+      .toArray();
+
+    return NextResponse.json({ 
+      success: true, 
+      data: { ticket, messages } 
+    });
+  });
+
+  // Kullanıcının indirim bakiyesini getir
+  router.get('/api/user/discount-balance', async ({ request, db }) => {
+    const authHeader = request.headers.get('authorization');
+    if (!authHeader) {
+      return NextResponse.json({ success: false, error: 'Giriş yapmalısınız' }, { status: 401 });
+    }
+    
+    const token = authHeader.replace('Bearer ', '');
+    let decoded;
+    try {
+      decoded = jwt.verify(token, JWT_SECRET);
+    } catch (e) {
+      return NextResponse.json({ success: false, error: 'Geçersiz token' }, { status: 401 });
+    }
+    
+    const spinUser = await db.collection('users').findOne({ id: decoded.userId });
+    if (!spinUser) {
+      return NextResponse.json({ success: false, error: 'Kullanıcı bulunamadı' }, { status: 404 });
+    }
+    
+    // İndirim süresi dolmuş mu kontrol et
+    let discountBalance = spinUser.discountBalance || 0;
+    let discountMinOrder = spinUser.discountMinOrder || 0;
+    let discountExpiry = spinUser.discountExpiry;
+    
+    if (discountExpiry && new Date(discountExpiry) < new Date()) {
+      await db.collection('users').updateOne(
+        { id: spinUser.id },
+        { $unset: { discountBalance: '', discountMinOrder: '', discountExpiry: '', discountSource: '' } }
+      );
+      discountBalance = 0;
+      discountMinOrder = 0;
+      discountExpiry = null;
+    }
+    
+    // Bugün çevirmiş mi?
+    const today = new Date().toISOString().split('T')[0];
+    const lastSpin = spinUser.lastSpinDate ? new Date(spinUser.lastSpinDate).toISOString().split('T')[0] : null;
+    const canSpin = lastSpin !== today;
+    
+    return NextResponse.json({
+      success: true,
+      data: {
+        discountBalance,
+        discountMinOrder,
+        discountExpiry,
+        canSpin,
+        nextSpinTime: canSpin ? null : getNextMidnight(),
+        lastSpinDate: spinUser.lastSpinDate
+      }
+    });
+  });
+
+  // Customer: Get verification status
+  router.get('/api/account/orders/:id/verification', async ({ request, db, pathname }) => {
+    const user = verifyToken(request);
+    if (!user || user.type !== 'user') {
+      return NextResponse.json({ success: false, error: 'Giriş gerekli' }, { status: 401 });
+    }
+
+    const orderId = pathname.match(/^\/api\/account\/orders\/([^\/]+)\/verification$/)[1];
+    
+    const order = await db.collection('orders').findOne({ id: orderId, userId: user.id });
+    if (!order) {
+      return NextResponse.json({ success: false, error: 'Sipariş bulunamadı' }, { status: 404 });
+    }
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        required: order.verification?.required || false,
+        status: order.verification?.status || 'not_required',
+        identityPhoto: order.verification?.identityPhoto || null,
+        paymentReceipt: order.verification?.paymentReceipt || null,
+        submittedAt: order.verification?.submittedAt || null,
+        reviewedAt: order.verification?.reviewedAt || null,
+        rejectionReason: order.verification?.rejectionReason || null
+      }
+    });
+  });
+
+  // User: Get own balance
+  router.get('/api/account/balance', async ({ request, db }) => {
+    const user = verifyToken(request);
+    if (!user || user.type !== 'user') {
+      return NextResponse.json({ success: false, error: 'Giriş gerekli' }, { status: 401 });
+    }
+
+    const userData = await db.collection('users').findOne({ id: user.id });
+    
+    return NextResponse.json({
+      success: true,
+      data: {
+        balance: userData?.balance || 0
+      }
+    });
+  });
+
+  // User: Get balance transaction history
+  router.get('/api/account/balance/transactions', async ({ request, db, searchParams }) => {
+    const user = verifyToken(request);
+    if (!user || user.type !== 'user') {
+      return NextResponse.json({ success: false, error: 'Giriş gerekli' }, { status: 401 });
+    }
+
+    const page = parseInt(searchParams.get('page') || '1');
+    const limit = parseInt(searchParams.get('limit') || '20');
+    const skip = (page - 1) * limit;
+
+    const [transactions, total] = await Promise.all([
+      db.collection('balance_transactions')
+        .find({ userId: user.id })
+        .sort({ createdAt: -1 })
+        .skip(skip)
+        .limit(limit)
+        .toArray(),
+      db.collection('balance_transactions').countDocuments({ userId: user.id })
+    ]);
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        transactions,
+        pagination: {
+          total,
+          page,
+          limit,
+          pages: Math.ceil(total / limit)
+        }
+      }
+    });
+  });
+
+  // ============================================
+  // SPIN WHEEL - ÇARK ÇEVİRME (POST) - Body parse gerektirmez
+  // ============================================
+  router.post('/api/spin-wheel/spin', async ({ request, db }) => {
+    const authHeader = request.headers.get('authorization');
+    if (!authHeader) {
+      return NextResponse.json({ success: false, error: 'Giriş yapmalısınız' }, { status: 401 });
+    }
+    
+    const spinToken = authHeader.replace('Bearer ', '');
+    let spinDecoded;
+    try {
+      spinDecoded = jwt.verify(spinToken, JWT_SECRET);
+    } catch (e) {
+      return NextResponse.json({ success: false, error: 'Geçersiz token' }, { status: 401 });
+    }
+    
+    const spinUser = await db.collection('users').findOne({ id: spinDecoded.userId });
+    if (!spinUser) {
+      return NextResponse.json({ success: false, error: 'Kullanıcı bulunamadı' }, { status: 404 });
+    }
+    
+    // Çark ayarlarını al
+    const wheelSettings = await db.collection('settings').findOne({ type: 'spin_wheel' }) || {
+      isEnabled: true,
+      prizes: [
+        { id: 1, name: '150₺ İndirim', amount: 150, minOrder: 1500, chance: 2, color: '#FFD700' },
+        { id: 2, name: '100₺ İndirim', amount: 100, minOrder: 1000, chance: 5, color: '#FF6B00' },
+        { id: 3, name: '50₺ İndirim', amount: 50, minOrder: 500, chance: 15, color: '#3B82F6' },
+        { id: 4, name: '25₺ İndirim', amount: 25, minOrder: 250, chance: 25, color: '#10B981' },
+        { id: 5, name: '10₺ İndirim', amount: 10, minOrder: 100, chance: 30, color: '#8B5CF6' },
+        { id: 6, name: 'Boş - Tekrar Dene', amount: 0, minOrder: 0, chance: 23, color: '#6B7280' }
+      ],
+      expiryDays: 7
+    };
+    
+    if (!wheelSettings.isEnabled) {
+      return NextResponse.json({ success: false, error: 'Çark şu an aktif değil' }, { status: 400 });
+    }
+    
+    // Bugün çevirmiş mi kontrol et
+    const today = new Date().toISOString().split('T')[0];
+    const lastSpin = spinUser.lastSpinDate ? new Date(spinUser.lastSpinDate).toISOString().split('T')[0] : null;
+    
+    if (lastSpin === today) {
+      return NextResponse.json({ 
+        success: false, 
+        error: 'Bugün zaten çevirdiniz! Yarın tekrar deneyin.',
+        nextSpinTime: getNextMidnight()
+      }, { status: 400 });
+    }
+    
+    // Ödül seç (ağırlıklı rastgele)
+    const prizes = wheelSettings.prizes;
+    const totalChance = prizes.reduce((sum, p) => sum + p.chance, 0);
+    let random = Math.random() * totalChance;
+    let selectedPrize = prizes[prizes.length - 1];
+    
+    for (const prize of prizes) {
+      random -= prize.chance;
+      if (random <= 0) {
+        selectedPrize = prize;
+        break;
+      }
+    }
+    
+    // Kullanıcıyı güncelle
+    const expiryDate = new Date();
+    expiryDate.setDate(expiryDate.getDate() + (wheelSettings.expiryDays || 7));
+    
+    const updateData = {
+      lastSpinDate: new Date()
+    };
+    
+    // Eğer ödül varsa (boş değilse) indirim ekle
+    if (selectedPrize.amount > 0) {
+      updateData.discountBalance = selectedPrize.amount;
+      updateData.discountMinOrder = selectedPrize.minOrder;
+      updateData.discountExpiry = expiryDate;
+      updateData.discountSource = 'spin_wheel';
+    }
+    
+    await db.collection('users').updateOne(
+      { id: spinUser.id },
+      { $set: updateData }
+    );
+    
+    // Spin geçmişine kaydet
+    await db.collection('spin_history').insertOne({
+      id: uuidv4(),
+      userId: spinUser.id,
+      userName: spinUser.name || spinUser.email,
+      prizeId: selectedPrize.id,
+      prizeName: selectedPrize.name,
+      prizeAmount: selectedPrize.amount,
+      minOrder: selectedPrize.minOrder,
+      createdAt: new Date()
+    });
+    
+    return NextResponse.json({
+      success: true,
+      prize: {
+        id: selectedPrize.id,
+        name: selectedPrize.name,
+        amount: selectedPrize.amount,
+        minOrder: selectedPrize.minOrder,
+        color: selectedPrize.color,
+        expiryDate: selectedPrize.amount > 0 ? expiryDate : null
+      },
+      message: selectedPrize.amount > 0 
+        ? `Tebrikler! ${selectedPrize.amount}₺ indirim kazandınız!` 
+        : 'Maalesef boş çıktı, yarın tekrar deneyin!'
+    });
+  }, { rawBody: true });
+
+  // Customer: Upload verification documents
+  router.post('/api/account/orders/:id/verification', async ({ request, db, pathname }) => {
+    const user = verifyToken(request);
+    if (!user || user.type !== 'user') {
+      return NextResponse.json({ success: false, error: 'Giriş gerekli' }, { status: 401 });
+    }
+
+    const orderId = pathname.match(/^\/api\/account\/orders\/([^\/]+)\/verification$/)[1];
+    
+    // Get order and verify ownership
+    const order = await db.collection('orders').findOne({ id: orderId, userId: user.id });
+    if (!order) {
+      return NextResponse.json({ success: false, error: 'Sipariş bulunamadı' }, { status: 404 });
+    }
+
+    // Check if verification is required (either marked or high-value order)
+    const orderAmount = order.totalAmount || order.amount || 0;
+    const requiresVerification = order.verification?.required || orderAmount >= 3000;
+
+    if (!requiresVerification) {
+      return NextResponse.json({ success: false, error: 'Bu sipariş için doğrulama gerekli değil' }, { status: 400 });
+    }
+
+    // Initialize verification object if not exists (for old orders)
+    if (!order.verification) {
+      await db.collection('orders').updateOne(
+        { id: orderId },
+        {
+          $set: {
+            verification: {
+              required: true,
+              status: 'pending',
+              identityPhoto: null,
+              paymentReceipt: null,
+              submittedAt: null,
+              reviewedAt: null,
+              reviewedBy: null,
+              rejectionReason: null
+            }
+          }
+        }
+      );
+      // Refresh order data
+      order.verification = {
+        required: true,
+        status: 'pending',
+        identityPhoto: null,
+        paymentReceipt: null,
+        submittedAt: null,
+        reviewedAt: null,
+        reviewedBy: null,
+        rejectionReason: null
+      };
+    }
+
+    // Check if already submitted
+    if (order.verification.status !== 'pending' || order.verification.submittedAt) {
+      return NextResponse.json({ success: false, error: 'Doğrulama belgeleri zaten gönderilmiş' }, { status: 400 });
+    }
+
+    // Parse multipart form data
+    const formData = await request.formData();
+    const identityFile = formData.get('identityPhoto');
+    const receiptFile = formData.get('paymentReceipt');
+
+    if (!identityFile || !receiptFile) {
+      return NextResponse.json({ success: false, error: 'Kimlik fotoğrafı ve ödeme dekontu zorunludur' }, { status: 400 });
+    }
+
+    // Save files to /public/uploads/verifications/
+    let identityUrl, receiptUrl;
+    try {
+      identityUrl = await saveUploadedFile(identityFile, 'verifications');
+      receiptUrl = await saveUploadedFile(receiptFile, 'verifications');
+    } catch (error) {
+      return NextResponse.json({ success: false, error: error.message }, { status: 400 });
+    }
+
+    // Update order with verification documents
+    await db.collection('orders').updateOne(
+      { id: orderId },
+      {
+        $set: {
+          'verification.identityPhoto': identityUrl,
+          'verification.paymentReceipt': receiptUrl,
+          'verification.submittedAt': new Date(),
+          'delivery.status': 'verification_pending',
+          'delivery.message': 'Doğrulama belgeleri inceleniyor'
+        }
+      }
+    );
+
+    // Log admin notification
+    await logAuditAction(db, AUDIT_ACTIONS.ORDER_VERIFICATION_SUBMIT, user.id, 'order', orderId, request, {
+      identityPhoto: identityUrl,
+      paymentReceipt: receiptUrl
+    });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Doğrulama belgeleri başarıyla yüklendi. Admin incelemesi bekleniyor.'
+    });
+  }, { rawBody: true });
+
+  // Create order (AUTH REQUIRED)
+  router.post('/api/orders', async ({ request, db, body }) => {
+    // Verify user authentication
+    const authUser = verifyToken(request);
+    if (!authUser || authUser.type !== 'user') {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş vermek için giriş yapmalısınız', code: 'AUTH_REQUIRED' },
+        { status: 401 }
+      );
+    }
+
+    const { productId, playerId, playerName, paymentMethod, termsAccepted, termsAcceptedAt, quantity: rawQty } = body;
+    const quantity = Math.min(10, Math.max(1, parseInt(rawQty) || 1)); // 1-10 arası
+    
+    if (!productId || !playerId || !playerName) {
+      return NextResponse.json(
+        { success: false, error: 'Eksik bilgi' },
+        { status: 400 }
+      );
+    }
+
+    // Get user details for customer snapshot
+    const user = await db.collection('users').findOne({ id: authUser.id });
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Kullanıcı bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Validate user has required customer information
+    if (!user.firstName || !user.lastName || !user.email || !user.phone) {
+      return NextResponse.json(
+        { success: false, error: 'Profil bilgileriniz eksik. Lütfen hesap ayarlarından tamamlayın.', code: 'INCOMPLETE_PROFILE' },
+        { status: 400 }
+      );
+    }
+
+    // Get product (price controlled by backend - NO FRONTEND PRICE TRUST)
+    const product = await db.collection('products').findOne({ id: productId });
+    if (!product) {
+      return NextResponse.json(
+        { success: false, error: 'Ürün bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // ============================================
+    // 💰 BALANCE PAYMENT FLOW
+    // ============================================
+    if (paymentMethod === 'balance') {
+      const userBalance = user.balance || 0;
+      const orderAmount = product.discountPrice || product.price || 0;
+
+      // Check sufficient balance
+      if (userBalance < orderAmount) {
+        return NextResponse.json(
+          { success: false, error: `Yetersiz bakiye. Mevcut: ${userBalance.toFixed(2)} ₺, Gerekli: ${orderAmount.toFixed(2)} ₺` },
+          { status: 400 }
+        );
+      }
+
+      // Create customer snapshot
+      const customerSnapshot = {
+        firstName: user.firstName,
+        lastName: user.lastName,
+        email: user.email,
+        phone: user.phone
+      };
+
+      // Create order with PAID status (balance payment)
+      const order = {
+        id: uuidv4(),
+        userId: user.id,
+        productId,
+        productTitle: product.title,
+        productImageUrl: product.imageUrl || null,
+        playerId,
+        playerName,
+        customer: customerSnapshot,
+        status: 'paid', // Already paid with balance
+        paymentMethod: 'balance',
+        amount: orderAmount, // Added amount field
+        totalAmount: orderAmount,
+        currency: 'TRY',
+        termsAccepted: termsAccepted || false,
+        termsAcceptedAt: termsAcceptedAt ? new Date(termsAcceptedAt) : new Date(),
+        delivery: {
+          status: 'pending',
+          message: 'Stok atanıyor...',
+          items: []
+        },
+        createdAt: new Date(),
+        updatedAt: new Date()
+      };
+
+      // Deduct balance
+      const newBalance = userBalance - orderAmount;
+      await db.collection('users').updateOne(
+        { id: user.id },
+        { $set: { balance: newBalance, updatedAt: new Date() } }
+      );
+
+      // Create balance transaction record
+      await db.collection('balance_transactions').insertOne({
+        id: uuidv4(),
+        userId: user.id,
+        type: 'order_payment',
+        amount: -orderAmount,
+        balanceBefore: userBalance,
+        balanceAfter: newBalance,
+        description: `Sipariş ödemesi: ${product.title}`,
+        orderId: order.id,
+        createdAt: new Date()
+      });
+
+      // Insert order
+      await db.collection('orders').insertOne(order);
+
+      // SMS gönder - Bakiye ile ödeme başarılı
+      sendPaymentSuccessSms(db, order, user, product.title).catch(err =>
+        console.error('Balance payment SMS failed:', err)
+      );
+
+      // Check if high-value order (>= 3000 TL) - requires verification
+      if (orderAmount >= 3000) {
+        await db.collection('orders').updateOne(
+          { id: order.id },
+          {
+            $set: {
+              verification: {
+                required: true,
+                status: 'pending',
+                identityPhoto: null,
+                paymentReceipt: null,
+                submittedAt: null,
+                reviewedAt: null,
+                reviewedBy: null,
+                rejectionReason: null
+              },
+              delivery: {
+                status: 'verification_required',
+                message: 'Yüksek tutarlı sipariş - Kimlik ve ödeme dekontu doğrulaması gerekli',
+                items: []
+              }
+            }
+          }
+        );
+
+        sendVerificationRequiredEmail(db, order, user, product).catch(err => 
+          console.error('Verification required email failed:', err)
+        );
+
+        return NextResponse.json({
+          success: true,
+          message: 'Sipariş oluşturuldu. Doğrulama gerekli.',
+          data: { orderId: order.id, requiresVerification: true }
+        });
+      }
+
+      // Auto-assign stock for orders < 3000 TL
+      const assignedStock = await db.collection('stock').findOneAndUpdate(
+        { productId, status: 'available' },
+        { 
+          $set: { 
+            status: 'assigned',
+            orderId: order.id,
+            assignedAt: new Date()
+          }
+        },
+        { 
+          returnDocument: 'after',
+          sort: { createdAt: 1 }
+        }
+      );
+
+      if (assignedStock && assignedStock.value) {
+        const stockCode = assignedStock.value;
+        
+        await db.collection('orders').updateOne(
+          { id: order.id },
+          {
+            $set: {
+              delivery: {
+                status: 'delivered',
+                items: [stockCode],
+                stockId: assignedStock.id || assignedStock._id,
+                assignedAt: new Date()
+              }
+            }
+          }
+        );
+
+        // Send delivered email
+        sendDeliveredEmail(db, order, user, product, [stockCode]).catch(err => 
+          console.error('Delivered email failed:', err)
+        );
+
+        await logAuditAction(db, AUDIT_ACTIONS.ORDER_COMPLETE, user.id, 'order', order.id, request, {
+          paymentMethod: 'balance',
+          stockAssigned: true
+        });
+
+        return NextResponse.json({
+          success: true,
+          message: 'Sipariş tamamlandı',
+          data: { orderId: order.id }
+        });
+      } else {
+        // No stock available
+        await db.collection('orders').updateOne(
+          { id: order.id },
+          {
+            $set: {
+              delivery: {
+                status: 'pending',
+                message: 'Stok bekleniyor',
+                items: []
+              }
+            }
+          }
+        );
+
+        await logAuditAction(db, AUDIT_ACTIONS.ORDER_CREATE, user.id, 'order', order.id, request, {
+          paymentMethod: 'balance',
+          stockAssigned: false
+        });
+
+        return NextResponse.json({
+          success: true,
+          message: 'Sipariş oluşturuldu. Stok bekleniyor.',
+          data: { orderId: order.id }
+        });
+      }
+    }
+
+    // ============================================
+    // 💳 SHOPINEXT PAYMENT FLOW
+    // ============================================
+    if (paymentMethod === 'shopinext') {
+      // Check if Shopinext is configured (env or database)
+      const envClientId = process.env.SHOPINEXT_CLIENT_ID;
+      const envClientSecret = process.env.SHOPINEXT_CLIENT_SECRET;
+      const envDomain = process.env.SHOPINEXT_DOMAIN;
+      
+      const shopinextSettings = await db.collection('shopinext_settings').findOne({ isActive: true });
+      
+      const isConfigured = (envClientId && envClientSecret && envDomain) || shopinextSettings;
+      
+      if (!isConfigured) {
+        return NextResponse.json(
+          { success: false, error: 'Shopinext ödeme sistemi yapılandırılmamış.' },
+          { status: 503 }
+        );
+      }
+
+      // Create customer snapshot
+      const customerSnapshot = {
+        firstName: user.firstName,
+        lastName: user.lastName,
+        email: user.email,
+        phone: user.phone
+      };
+
+      // Create order with PENDING status
+      const orderAmount = product.discountPrice || product.price || product.finalPrice || product.salePrice || 0;
+      
+      const order = {
+        id: uuidv4(),
+        userId: user.id,
+        productId,
+        productTitle: product.title,
+        productImageUrl: product.imageUrl || null,
+        playerId,
+        playerName,
+        customer: customerSnapshot,
+        status: 'pending',
+        amount: orderAmount,
+        totalAmount: orderAmount,
+        currency: 'TRY',
+        paymentMethod: 'shopinext',
+        termsAccepted: termsAccepted || false,
+        termsAcceptedAt: termsAcceptedAt ? new Date(termsAcceptedAt) : new Date(),
+        createdAt: new Date(),
+        updatedAt: new Date()
+      };
+
+      await db.collection('orders').insertOne(order);
+
+      // Send order created email
+      sendOrderCreatedEmail(db, order, user, product).catch(err => 
+        console.error('Order created email failed:', err)
+      );
+
+      // Create Shopinext payment
+      const paymentResult = await createShopinextPayment(db, order, user, product);
+      
+      if (!paymentResult.success) {
+        // Update order to failed
+        await db.collection('orders').updateOne(
+          { id: order.id },
+          { $set: { status: 'failed', error: paymentResult.error, updatedAt: new Date() } }
+        );
+        
+        return NextResponse.json(
+          { success: false, error: paymentResult.error || 'Ödeme başlatılamadı' },
+          { status: 400 }
+        );
+      }
+
+      return NextResponse.json({
+        success: true,
+        data: {
+          orderId: order.id,
+          paymentUrl: paymentResult.redirectUrl,
+          paymentProvider: 'shopinext'
+        }
+      });
+    }
+
+    // ============================================
+    // 💳 SHOPPIYEN PAYMENT FLOW (Quick Checkout)
+    // ============================================
+    if (paymentMethod === 'payyeen') {
+      const SHOPPIYEN_API_ID = process.env.SHOPPIYEN_API_ID || '92';
+      const SHOPPIYEN_API_KEY = process.env.SHOPPIYEN_API_KEY || '';
+      
+      if (!SHOPPIYEN_API_KEY) {
+        return NextResponse.json(
+          { success: false, error: 'Shoppiyen ödeme sistemi yapılandırılmamış.' },
+          { status: 503 }
+        );
+      }
+
+      // Create customer snapshot
+      const customerSnapshot = {
+        firstName: user.firstName,
+        lastName: user.lastName,
+        email: user.email,
+        phone: user.phone
+      };
+
+      const unitPrice = product.discountPrice || product.price || product.finalPrice || product.salePrice || 0;
+      const orderAmount = unitPrice * quantity;
+
+      const order = {
+        id: uuidv4(),
+        userId: user.id,
+        productId,
+        productTitle: product.title,
+        productImageUrl: product.imageUrl || null,
+        playerId,
+        playerName,
+        customer: customerSnapshot,
+        status: 'pending',
+        amount: orderAmount,
+        totalAmount: orderAmount,
+        quantity: quantity,
+        currency: 'TRY',
+        paymentMethod: 'payyeen',
+        termsAccepted: termsAccepted || false,
+        termsAcceptedAt: termsAcceptedAt ? new Date(termsAcceptedAt) : new Date(),
+        createdAt: new Date(),
+        updatedAt: new Date()
+      };
+
+      await db.collection('orders').insertOne(order);
+
+      // Send order created email
+      sendOrderCreatedEmail(db, order, user, product).catch(err => 
+        console.error('Order created email failed:', err)
+      );
+
+      // Build Shoppiyen Quick Checkout signature
+      const crypto = require('crypto');
+      const timestamp = Math.floor(Date.now() / 1000).toString();
+      
+      const payload = {
+        api_id: SHOPPIYEN_API_ID,
+        amount: orderAmount.toFixed(2),
+        cancel_url: `${BASE_URL}/api/payment/payyeen/fail/${order.id}`,
+        currency: 'TRY',
+        description: `PINLY-${order.id}`,
+        order_id: order.id,
+        success_url: `${BASE_URL}/api/payment/payyeen/success/${order.id}`,
+        ts: timestamp
+      };
+
+      // Sort keys alphabetically and build query string (RFC3986)
+      const sortedKeys = Object.keys(payload).sort();
+      const queryString = sortedKeys.map(key => `${encodeURIComponent(key)}=${encodeURIComponent(payload[key])}`).join('&');
+      const signature = crypto.createHmac('sha256', SHOPPIYEN_API_KEY).update(queryString).digest('hex');
+
+      const formData = {
+        ...payload,
+        signature: signature
+      };
+
+      // Store payment request for audit trail
+      await db.collection('payment_requests').insertOne({
+        orderId: order.id,
+        provider: 'shoppiyen',
+        description: formData.description,
+        amount: orderAmount,
+        currency: 'TRY',
+        apiId: SHOPPIYEN_API_ID,
+        createdAt: new Date()
+      });
+
+      return NextResponse.json({
+        success: true,
+        data: {
+          orderId: order.id,
+          paymentUrl: 'https://shoppiyen.com/checkout/quick',
+          formData: formData,
+          paymentProvider: 'payyeen'
+        }
+      });
+    }
+
+    // ============================================
+    // 🏦 IBAN PAYMENT FLOW
+    // ============================================
+    if (paymentMethod === 'iban') {
+      const customerSnapshot = {
+        firstName: user.firstName,
+        lastName: user.lastName,
+        email: user.email,
+        phone: user.phone
+      };
+
+      const unitPrice = product.discountPrice || product.price || 0;
+      const orderAmount = unitPrice * quantity;
+
+      const order = {
+        id: uuidv4(),
+        userId: user.id,
+        productId,
+        productTitle: product.title,
+        productImageUrl: product.imageUrl || null,
+        playerId,
+        playerName,
+        customer: customerSnapshot,
+        status: 'pending',
+        amount: orderAmount,
+        totalAmount: orderAmount,
+        quantity: quantity,
+        currency: 'TRY',
+        paymentMethod: 'iban',
+        ibanPayment: {
+          status: 'waiting', // waiting, notified, approved, rejected
+          notifiedAt: null,
+          senderName: null,
+          approvedAt: null,
+          approvedBy: null
+        },
+        termsAccepted: termsAccepted || false,
+        termsAcceptedAt: termsAcceptedAt ? new Date(termsAcceptedAt) : new Date(),
+        createdAt: new Date(),
+        updatedAt: new Date()
+      };
+
+      await db.collection('orders').insertOne(order);
+
+      return NextResponse.json({
+        success: true,
+        data: {
+          orderId: order.id,
+          paymentProvider: 'iban',
+          amount: orderAmount
+        }
+      });
+    }
+
+    // ============================================
+    // 💳 CARD PAYMENT FLOW (SHOPIER V2)
+    // ============================================
+    if (paymentMethod === 'shopierv2') {
+      // Shopier V2 uses environment variables (no database settings needed)
+      // Customer snapshot
+      const customerSnapshot = {
+        firstName: user.firstName,
+        lastName: user.lastName,
+        email: user.email,
+        phone: user.phone
+      };
+
+    // Create order with PENDING status
+    const unitPrice = product.discountPrice || product.price || product.finalPrice || product.salePrice || product.currentPrice || product.sellingPrice || 0;
+    const orderAmount = unitPrice * quantity;
+    
+    console.log('========================================');
+    console.log('📦 SHOPIER V2 - ORDER CREATION');
+    console.log('Product ID:', product.id);
+    console.log('Product Title:', product.title);
+    console.log('Unit Price:', unitPrice);
+    console.log('Quantity:', quantity);
+    console.log('Total Amount:', orderAmount);
+    console.log('========================================');
+    
+    const order = {
+      id: uuidv4(),
+      userId: user.id,
+      productId,
+      productTitle: product.title,
+      productImageUrl: product.imageUrl || null,
+      playerId,
+      playerName,
+      customer: customerSnapshot,
+      status: 'pending',
+      amount: orderAmount,
+      totalAmount: orderAmount,
+      quantity: quantity,
+      currency: 'TRY',
+      paymentMethod: 'shopierv2',
+      termsAccepted: termsAccepted || false,
+      termsAcceptedAt: termsAcceptedAt ? new Date(termsAcceptedAt) : new Date(),
+      createdAt: new Date(),
+      updatedAt: new Date()
+    };
+
+    await db.collection('orders').insertOne(order);
+
+    // Send order created email (async)
+    sendOrderCreatedEmail(db, order, user, product).catch(err => 
+      console.error('Order created email failed:', err)
+    );
+
+    // Create Shopier V2 payment session
+    const sessionResult = await shopierV2Service.createPaymentSession(db, order, {
+      userId: user.id,
+      firstName: user.firstName,
+      lastName: user.lastName,
+      email: user.email,
+      phone: user.phone
+    });
+
+    if (!sessionResult.success) {
+      return NextResponse.json(
+        { success: false, error: sessionResult.error || 'Ödeme oturumu oluşturulamadı' },
+        { status: 500 }
+      );
+    }
+
+    console.log('✅ Shopier V2 session created:', sessionResult.sessionId);
+
+    // Update order with payment URL and session info
+    await db.collection('orders').updateOne(
+      { id: order.id },
+      {
+        $set: {
+          'meta.shopierV2PaymentUrl': sessionResult.paymentUrl,
+          'meta.shopierV2SessionId': sessionResult.sessionId,
+          'meta.shopierV2OrderId': sessionResult.shopierOrderId,
+          updatedAt: new Date()
+        }
+      }
+    );
+
+      // Return payment URL for iframe
+      return NextResponse.json({
+        success: true,
+        data: {
+          order,
+          paymentUrl: sessionResult.paymentUrl,
+          sessionId: sessionResult.sessionId,
+          shopierOrderId: sessionResult.shopierOrderId,
+          expiresIn: 900 // 15 minutes
+        }
+      });
+    }
+  });
+
+  // ============================================
+  // 🏦 IBAN PAYMENT ENDPOINTS
+  // ============================================
+
+  // IBAN: User notifies payment (sends sender name)
+  router.post('/api/orders/:id/iban-notify', async ({ request, db, pathname, body }) => {
+    const orderId = pathname.split('/')[3];
+    const authUser = verifyToken(request);
+    if (!authUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const { senderName } = body;
+    if (!senderName || senderName.trim().length < 3) {
+      return NextResponse.json({ success: false, error: 'Ad Soyad gereklidir (en az 3 karakter)' }, { status: 400 });
+    }
+
+    const order = await db.collection('orders').findOne({ id: orderId, userId: authUser.id });
+    if (!order) {
+      return NextResponse.json({ success: false, error: 'Sipariş bulunamadı' }, { status: 404 });
+    }
+
+    if (order.paymentMethod !== 'iban') {
+      return NextResponse.json({ success: false, error: 'Bu sipariş IBAN ödemesi değil' }, { status: 400 });
+    }
+
+    await db.collection('orders').updateOne(
+      { id: orderId },
+      { 
+        $set: { 
+          'ibanPayment.status': 'notified',
+          'ibanPayment.senderName': senderName.trim(),
+          'ibanPayment.notifiedAt': new Date(),
+          updatedAt: new Date()
+        } 
+      }
+    );
+
+    return NextResponse.json({ success: true, message: 'Ödeme bildirimi alındı' });
+  });
+
+  // IBAN: Mark success page as shown (prevent redirect loop)
+  router.post('/api/orders/:id/mark-success-shown', async ({ request, db, pathname }) => {
+    const oid = pathname.split('/')[3];
+    const authUser = verifyToken(request);
+    if (!authUser) {
+      return NextResponse.json({ success: true });
+    }
+    await db.collection('orders').updateOne(
+      { id: oid, userId: authUser.id },
+      { $set: { ibanSuccessShown: true, updatedAt: new Date() } }
+    );
+    return NextResponse.json({ success: true });
+  });
+
+  // IBAN: Poll order status (for waiting page)
+  router.post('/api/orders/:id/status', async ({ request, db, pathname }) => {
+    const orderId = pathname.split('/')[3];
+    const authUser = verifyToken(request);
+    if (!authUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const order = await db.collection('orders').findOne({ id: orderId, userId: authUser.id });
+    if (!order) {
+      return NextResponse.json({ success: false, error: 'Sipariş bulunamadı' }, { status: 404 });
+    }
+
+    return NextResponse.json({ 
+      success: true, 
+      data: { 
+        status: order.status,
+        ibanStatus: order.ibanPayment?.status || null,
+        deliveryStatus: order.delivery?.status || null
+      } 
+    });
+  });
+
+  // User: Create support ticket
+  router.post('/api/support/tickets', async ({ request, db, body }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    const userId = userData.id || userData.userId;
+    const { subject, category, message } = body;
+
+    if (!subject || !category || !message) {
+      return NextResponse.json(
+        { success: false, error: 'Konu, kategori ve mesaj zorunludur' },
+        { status: 400 }
+      );
+    }
+
+    if (subject.length < 5) {
+      return NextResponse.json(
+        { success: false, error: 'Konu en az 5 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    if (message.length < 10) {
+      return NextResponse.json(
+        { success: false, error: 'Mesaj en az 10 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    const validCategories = ['odeme', 'teslimat', 'hesap', 'diger'];
+    if (!validCategories.includes(category)) {
+      return NextResponse.json(
+        { success: false, error: 'Geçersiz kategori' },
+        { status: 400 }
+      );
+    }
+
+    // Rate limit: max 3 tickets per 10 minutes
+    const tenMinutesAgo = new Date(Date.now() - 10 * 60 * 1000);
+    const recentTickets = await db.collection('tickets').countDocuments({
+      userId,
+      createdAt: { $gte: tenMinutesAgo }
+    });
+
+    if (recentTickets >= 3) {
+      return NextResponse.json(
+        { success: false, error: 'Çok fazla talep oluşturdunuz. 10 dakika bekleyin.' },
+        { status: 429 }
+      );
+    }
+
+    // Check if user already has an open ticket (not closed)
+    const openTicket = await db.collection('tickets').findOne({
+      userId,
+      status: { $ne: 'closed' }
+    });
+
+    if (openTicket) {
+      return NextResponse.json(
+        { success: false, error: 'Zaten açık bir destek talebiniz var. Mevcut talebiniz kapatıldıktan sonra yeni talep açabilirsiniz.' },
+        { status: 400 }
+      );
+    }
+
+    // Create ticket
+    const ticket = {
+      id: uuidv4(),
+      userId,
+      subject,
+      category,
+      status: 'waiting_admin',
+      lastMessageBy: 'user',
+      userCanReply: false,
+      createdAt: new Date(),
+      updatedAt: new Date()
+    };
+
+    await db.collection('tickets').insertOne(ticket);
+
+    // Create first message
+    const ticketMessage = {
+      id: uuidv4(),
+      ticketId: ticket.id,
+      sender: 'user',
+      message,
+      createdAt: new Date()
+    };
+
+    await db.collection('ticket_messages').insertOne(ticketMessage);
+
+    // 🤖 Otomatik admin yanıtı
+    const autoReply = {
+      id: uuidv4(),
+      ticketId: ticket.id,
+      sender: 'admin',
+      adminUsername: 'admin',
+      message: 'Canlı desteğe bağlanarak bilgi alın. Çalışma saatleri sabah 08:30 - akşam 22:00 arasında aktif olmaktadır. Bu süre içinde bağlanarak bilgi alabilirsiniz. Lütfen bağlanmadan, bilgi almadan herhangi bir işlem yapmayınız. Teşekkür ederiz.',
+      isAutoReply: true,
+      createdAt: new Date(Date.now() + 1000) // 1 saniye sonra (sıralama için)
+    };
+    await db.collection('ticket_messages').insertOne(autoReply);
+
+    // Ticket durumunu güncelle - admin yanıt verdi
+    await db.collection('tickets').updateOne(
+      { id: ticket.id },
+      { $set: { status: 'waiting_user', userCanReply: true, lastMessageBy: 'admin', updatedAt: new Date() } }
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: 'Destek talebiniz oluşturuldu',
+      data: ticket
+    });
+  });
+
+  // User: Send message to ticket
+  router.post('/api/support/tickets/:id/messages', async ({ request, db, pathname, body }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    const ticketId = pathname.split('/')[4];
+    const userId = userData.id || userData.userId;
+    const { message } = body;
+
+    // Kullanıcı sadece metin mesaj gönderebilir
+    if (!message || message.length < 2) {
+      return NextResponse.json(
+        { success: false, error: 'Mesaj en az 2 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    // Get ticket and verify ownership
+    const ticket = await db.collection('tickets').findOne({ id: ticketId, userId });
+    if (!ticket) {
+      return NextResponse.json(
+        { success: false, error: 'Talep bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Check if user can reply
+    if (!ticket.userCanReply) {
+      return NextResponse.json(
+        { success: false, error: 'Admin yanıtı bekleniyor. Şu anda mesaj gönderemezsiniz.' },
+        { status: 403 }
+      );
+    }
+
+    if (ticket.status === 'closed') {
+      return NextResponse.json(
+        { success: false, error: 'Bu talep kapatılmış. Yeni mesaj gönderemezsiniz.' },
+        { status: 403 }
+      );
+    }
+
+    // Create message (kullanıcı fotoğraf gönderemez)
+    const ticketMessage = {
+      id: uuidv4(),
+      ticketId,
+      sender: 'user',
+      message,
+      imageUrl: null,
+      createdAt: new Date()
+    };
+
+    await db.collection('ticket_messages').insertOne(ticketMessage);
+
+    // Update ticket status
+    await db.collection('tickets').updateOne(
+      { id: ticketId },
+      {
+        $set: {
+          status: 'waiting_admin',
+          lastMessageBy: 'user',
+          userCanReply: false,
+          updatedAt: new Date()
+        }
+      }
+    );
+
+    // 🤖 Otomatik admin yanıtı (kullanıcı her mesaj gönderdiğinde)
+    const autoReplyMsg = {
+      id: uuidv4(),
+      ticketId,
+      sender: 'admin',
+      adminUsername: 'admin',
+      message: 'Canlı desteğe bağlanarak bilgi alın. Çalışma saatleri sabah 08:30 - akşam 22:00 arasında aktif olmaktadır. Bu süre içinde bağlanarak bilgi alabilirsiniz. Lütfen bağlanmadan, bilgi almadan herhangi bir işlem yapmayınız. Teşekkür ederiz.',
+      isAutoReply: true,
+      createdAt: new Date(Date.now() + 1000)
+    };
+    await db.collection('ticket_messages').insertOne(autoReplyMsg);
+
+    // Ticket durumunu güncelle - admin yanıt verdi (kullanıcı tekrar yazabilsin)
+    await db.collection('tickets').updateOne(
+      { id: ticketId },
+      { $set: { status: 'waiting_user', userCanReply: true, lastMessageBy: 'admin', updatedAt: new Date() } }
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: 'Mesajınız gönderildi',
+      data: ticketMessage
+    });
+  });
+
+  // ============================================
+  // 🎮 PUBG HESAP SATIŞ API - ORDER CREATION
+  // ============================================
+
+  // Hesap Siparişi Oluştur (AUTH REQUIRED)
+  router.post('/api/account-orders', async ({ request, db, body }) => {
+    // Verify user authentication
+    const authUser = verifyToken(request);
+    if (!authUser || authUser.type !== 'user') {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş vermek için giriş yapmalısınız', code: 'AUTH_REQUIRED' },
+        { status: 401 }
+      );
+    }
+
+    const { accountId, paymentMethod } = body;
+    
+    if (!accountId) {
+      return NextResponse.json(
+        { success: false, error: 'Hesap ID gerekli' },
+        { status: 400 }
+      );
+    }
+
+    // Get user details
+    const user = await db.collection('users').findOne({ id: authUser.id });
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Kullanıcı bulunamadı' }, { status: 404 });
+    }
+
+    // Validate user has required customer information
+    if (!user.firstName || !user.lastName || !user.email || !user.phone) {
+      return NextResponse.json(
+        { success: false, error: 'Profil bilgileriniz eksik. Lütfen hesap ayarlarından tamamlayın.', code: 'INCOMPLETE_PROFILE' },
+        { status: 400 }
+      );
+    }
+
+    // Get account (price controlled by backend)
+    const account = await db.collection('accounts').findOne({ 
+      id: accountId, 
+      active: true
+    });
+
+    if (!account) {
+      return NextResponse.json({ success: false, error: 'Hesap bulunamadı veya satışta değil' }, { status: 404 });
+    }
+
+    // Check if stock available (for non-unlimited accounts)
+    let availableStock = null;
+    if (!account.unlimited) {
+      availableStock = await db.collection('account_stock').findOne({
+        accountId,
+        status: 'available'
+      });
+      
+      if (!availableStock) {
+        return NextResponse.json({ success: false, error: 'Bu hesap için stok bulunmuyor' }, { status: 400 });
+      }
+    } else {
+      // For unlimited accounts, still try to get stock if available
+      availableStock = await db.collection('account_stock').findOne({
+        accountId,
+        status: 'available'
+      });
+    }
+
+    const orderAmount = account.discountPrice || account.price || 0;
+    const customerSnapshot = {
+      firstName: user.firstName,
+      lastName: user.lastName,
+      email: user.email,
+      phone: user.phone
+    };
+
+    // Balance Payment
+    if (paymentMethod === 'balance') {
+      const userBalance = user.balance || 0;
+
+      if (userBalance < orderAmount) {
+        return NextResponse.json(
+          { success: false, error: `Yetersiz bakiye. Mevcut: ${userBalance.toFixed(2)} ₺, Gerekli: ${orderAmount.toFixed(2)} ₺` },
+          { status: 400 }
+        );
+      }
+
+      // Assign stock to order
+      let assignedCredentials = account.credentials || null; // Fallback to account's default credentials
+      if (availableStock) {
+        assignedCredentials = availableStock.credentials;
+        // Mark stock as assigned
+        await db.collection('account_stock').updateOne(
+          { id: availableStock.id },
+          { 
+            $set: { 
+              status: 'assigned',
+              assignedAt: new Date()
+            }
+          }
+        );
+      }
+
+      // Create order
+      const order = {
+        id: uuidv4(),
+        type: 'account', // HESAP SİPARİŞİ
+        userId: user.id,
+        accountId: accountId,
+        accountTitle: account.title,
+        accountImageUrl: account.imageUrl || null,
+        customer: customerSnapshot,
+        status: 'paid',
+        paymentMethod: 'balance',
+        amount: orderAmount,
+        totalAmount: orderAmount,
+        currency: 'TRY',
+        delivery: {
+          status: assignedCredentials ? 'delivered' : 'pending',
+          message: assignedCredentials ? 'Hesap bilgileri hazır' : 'Hesap bilgileri hazırlanıyor...',
+          credentials: assignedCredentials,
+          stockId: availableStock?.id || null
+        },
+        createdAt: new Date(),
+        updatedAt: new Date()
+      };
+
+      // Update stock with order ID
+      if (availableStock) {
+        await db.collection('account_stock').updateOne(
+          { id: availableStock.id },
+          { $set: { orderId: order.id } }
+        );
+      }
+
+      // Deduct balance
+      const newBalance = userBalance - orderAmount;
+      await db.collection('users').updateOne(
+        { id: user.id },
+        { $set: { balance: newBalance, updatedAt: new Date() } }
+      );
+
+      // Balance transaction record
+      await db.collection('balance_transactions').insertOne({
+        id: uuidv4(),
+        userId: user.id,
+        type: 'account_purchase',
+        amount: -orderAmount,
+        balanceBefore: userBalance,
+        balanceAfter: newBalance,
+        description: `Hesap satın alma: ${account.title}`,
+        orderId: order.id,
+        createdAt: new Date()
+      });
+
+      // Insert order
+      await db.collection('orders').insertOne(order);
+
+      // SMS gönder - Hesap bakiye ödemesi başarılı
+      sendPaymentSuccessSms(db, order, user, account.title).catch(err =>
+        console.error('Account balance payment SMS failed:', err)
+      );
+
+      // Mark account as sold ONLY if not unlimited AND no more stock
+      if (!account.unlimited) {
+        // Check remaining stock
+        const remainingStock = await db.collection('account_stock').countDocuments({
+          accountId,
+          status: 'available'
+        });
+        
+        if (remainingStock === 0) {
+          await db.collection('accounts').updateOne(
+            { id: accountId },
+            { 
+              $set: { 
+                status: 'sold', 
+                stockCount: 0,
+                soldAt: new Date(),
+                soldToUserId: user.id,
+                orderId: order.id
+              } 
+            }
+          );
+          responseCache.invalidateTags('accounts');
+        } else {
+          // Update stock count
+          await db.collection('accounts').updateOne(
+            { id: accountId },
+            { $set: { stockCount: remainingStock } }
+          );
+          responseCache.invalidateTags('accounts');
+        }
+      } else {
+        // For unlimited accounts, just increment sales count and update stock count
+        const remainingStock = await db.collection('account_stock').countDocuments({
+          accountId,
+          status: 'available'
+        });
+        
+        await db.collection('accounts').updateOne(
+          { id: accountId },
+          { 
+            $inc: { salesCount: 1 },
+            $set: { lastSoldAt: new Date(), stockCount: remainingStock }
+          }
+        );
+        responseCache.invalidateTags('accounts');
+      }
+
+      return NextResponse.json({
+        success: true,
+        message: 'Hesap siparişi oluşturuldu!',
+        data: { orderId: order.id }
+      });
+    }
+
+    // ============================================
+    // 💳 SHOPINEXT PAYMENT FLOW FOR ACCOUNTS
+    // ============================================
+    if (paymentMethod === 'shopinext') {
+      const shopinextSettings = await db.collection('shopinext_settings').findOne({ isActive: true });
+      
+      if (!shopinextSettings) {
+        return NextResponse.json(
+          { success: false, error: 'Shopinext ödeme sistemi yapılandırılmamış.' },
+          { status: 503 }
+        );
+      }
+
+      // Create pending order
+      const order = {
+        id: uuidv4(),
+        type: 'account',
+        userId: user.id,
+        accountId: accountId,
+        accountTitle: account.title,
+        accountImageUrl: account.imageUrl || null,
+        customer: customerSnapshot,
+        status: 'pending',
+        paymentMethod: 'shopinext',
+        amount: orderAmount,
+        totalAmount: orderAmount,
+        currency: 'TRY',
+        delivery: {
+          status: 'pending',
+          message: 'Ödeme bekleniyor...',
+          credentials: null
+        },
+        createdAt: new Date(),
+        updatedAt: new Date()
+      };
+
+      await db.collection('orders').insertOne(order);
+
+      // Create Shopinext payment
+      const paymentResult = await createShopinextPayment(db, order, user, account);
+      
+      if (!paymentResult.success) {
+        await db.collection('orders').updateOne(
+          { id: order.id },
+          { $set: { status: 'failed', error: paymentResult.error, updatedAt: new Date() } }
+        );
+        
+        return NextResponse.json(
+          { success: false, error: paymentResult.error || 'Ödeme başlatılamadı' },
+          { status: 400 }
+        );
+      }
+
+      return NextResponse.json({
+        success: true,
+        data: {
+          orderId: order.id,
+          paymentUrl: paymentResult.redirectUrl,
+          paymentProvider: 'shopinext'
+        }
+      });
+    }
+
+    // ============================================
+    // 💳 PAYYEEN PAYMENT FLOW FOR ACCOUNTS
+    // ============================================
+    if (paymentMethod === 'payyeen') {
+      const payeenSettings = await db.collection('payyeen_settings').findOne({ isActive: true });
+      
+      if (!payeenSettings) {
+        return NextResponse.json(
+          { success: false, error: 'Payyeen ödeme sistemi yapılandırılmamış.' },
+          { status: 503 }
+        );
+      }
+
+      // Decrypt API key
+      let payeenApiKey;
+      try {
+        payeenApiKey = decrypt(payeenSettings.apiKey);
+      } catch (error) {
+        console.error('Payyeen settings decryption failed');
+        return NextResponse.json(
+          { success: false, error: 'Ödeme sistemi yapılandırma hatası' },
+          { status: 500 }
+        );
+      }
+
+      // Create pending order
+      const order = {
+        id: uuidv4(),
+        type: 'account',
+        userId: user.id,
+        accountId: accountId,
+        accountTitle: account.title,
+        accountImageUrl: account.imageUrl || null,
+        customer: customerSnapshot,
+        status: 'pending',
+        paymentMethod: 'payyeen',
+        amount: orderAmount,
+        totalAmount: orderAmount,
+        currency: 'TRY',
+        delivery: {
+          status: 'pending',
+          message: 'Ödeme bekleniyor...',
+          credentials: null
+        },
+        createdAt: new Date(),
+        updatedAt: new Date()
+      };
+
+      await db.collection('orders').insertOne(order);
+
+      // Reserve account
+      if (!account.unlimited) {
+        await db.collection('accounts').updateOne(
+          { id: accountId },
+          { $set: { status: 'reserved', reservedAt: new Date(), reservedByOrderId: order.id } }
+        );
+        responseCache.invalidateTags('accounts');
+      }
+
+      // Build Payyeen Quick Checkout form data
+      const payeenFormData = {
+        api_key: payeenApiKey,
+        amount: orderAmount.toFixed(2),
+        currency: 'TRY',
+        description: `PINLY-${order.id}`,
+        success_url: `${BASE_URL}/api/payment/payyeen/success/${order.id}`,
+        cancel_url: `${BASE_URL}/api/payment/payyeen/fail/${order.id}`
+      };
+
+      // Store payment request for audit trail
+      await db.collection('payment_requests').insertOne({
+        orderId: order.id,
+        type: 'account',
+        provider: 'payyeen',
+        description: payeenFormData.description,
+        amount: orderAmount,
+        currency: 'TRY',
+        apiKey: '***MASKED***',
+        createdAt: new Date()
+      });
+
+      return NextResponse.json({
+        success: true,
+        data: {
+          orderId: order.id,
+          paymentUrl: 'https://payyeen.com/checkout/quick',
+          formData: payeenFormData,
+          paymentProvider: 'payyeen'
+        }
+      });
+    }
+
+    // Card Payment - Shopier
+    const shopierSettings = await db.collection('shopier_settings').findOne({ isActive: true });
+    if (!shopierSettings) {
+      return NextResponse.json(
+        { success: false, error: 'Ödeme sistemi yapılandırılmamış' },
+        { status: 503 }
+      );
+    }
+
+    // Create pending order
+    const order = {
+      id: uuidv4(),
+      type: 'account', // HESAP SİPARİŞİ
+      userId: user.id,
+      accountId: accountId,
+      accountTitle: account.title,
+      accountImageUrl: account.imageUrl || null,
+      customer: customerSnapshot,
+      status: 'pending',
+      paymentMethod: 'card',
+      amount: orderAmount,
+      totalAmount: orderAmount,
+      currency: 'TRY',
+      delivery: {
+        status: 'pending',
+        message: 'Ödeme bekleniyor...',
+        credentials: null
+      },
+      createdAt: new Date(),
+      updatedAt: new Date()
+    };
+
+    await db.collection('orders').insertOne(order);
+
+    // Mark account as reserved temporarily (only for non-unlimited accounts)
+    if (!account.unlimited) {
+      await db.collection('accounts').updateOne(
+        { id: accountId },
+        { $set: { status: 'reserved', reservedAt: new Date(), reservedByOrderId: order.id } }
+      );
+      responseCache.invalidateTags('accounts');
+    }
+
+    // Generate Shopier form - use same format as UC orders
+    const apiKey = decrypt(shopierSettings.apiKey);
+    const apiSecret = decrypt(shopierSettings.apiSecret);
+    
+    // Generate random number for Shopier request (6 digits as per API spec)
+    const randomNr = Math.floor(Math.random() * (999999 - 100000 + 1)) + 100000;
+    const crypto = require('crypto');
+
+    // Currency codes: 0 = TRY, 1 = USD, 2 = EUR
+    const currencyCode = 0; // TRY
+
+    // Prepare Shopier payment request with REAL customer data
+    // E-posta adresi maskeleniyor - Shopier'den müşteriye mail gitmesin
+    const maskedEmail = maskEmailForShopier(customerSnapshot.email);
+    const shopierPayload = {
+      API_key: apiKey,
+      website_index: 1,
+      platform_order_id: order.id,
+      product_name: 'Bakiye Yüklemesi',
+      product_type: 1, // 0 = Physical, 1 = Digital
+      buyer_name: customerSnapshot.firstName,
+      buyer_surname: customerSnapshot.lastName,
+      buyer_email: maskedEmail, // Maskelenmiş e-posta
+      buyer_account_age: 0,
+      buyer_id_nr: '',
+      buyer_phone: customerSnapshot.phone,
+      billing_address: 'Turkey',
+      billing_city: 'Istanbul',
+      billing_country: 'Turkey',
+      billing_postcode: '34000',
+      shipping_address: 'Turkey',
+      shipping_city: 'Istanbul',
+      shipping_country: 'Turkey',
+      shipping_postcode: '34000',
+      total_order_value: orderAmount,
+      currency: currencyCode,
+      platform: 0,
+      is_in_frame: 0,
+      current_language: 0,
+      modul_version: '1.0.4',
+      random_nr: randomNr,
+    };
+
+    // Generate Shopier signature
+    const signatureData = `${randomNr}${order.id}${orderAmount}${currencyCode}`;
+    const signature = crypto.createHmac('sha256', apiSecret)
+      .update(signatureData)
+      .digest('base64');
+
+    shopierPayload.signature = signature;
+
+    const paymentUrl = 'https://www.shopier.com/ShowProduct/api_pay4.php';
+
+    // Store payment request for audit
+    await db.collection('payment_requests').insertOne({
+      orderId: order.id,
+      type: 'account',
+      shopierPayload: { ...shopierPayload, API_key: '***MASKED***', signature: '***MASKED***' },
+      createdAt: new Date()
+    });
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        orderId: order.id,
+        paymentUrl,
+        formData: shopierPayload
+      }
+    });
+  });
+
+  // User account endpoints (use user token)
+  router.put('/api/account/me', async ({ request, db, body }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    const userId = userData.id || userData.userId;
+    const { firstName, lastName, phone } = body;
+
+    // Validation
+    if (firstName !== undefined && firstName.length < 2) {
+      return NextResponse.json(
+        { success: false, error: 'Ad en az 2 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    if (lastName !== undefined && lastName.length < 2) {
+      return NextResponse.json(
+        { success: false, error: 'Soyad en az 2 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    // Phone format validation (Turkish format)
+    if (phone !== undefined && phone.length > 0) {
+      const phoneRegex = /^(\+90|0)?[5][0-9]{9}$/;
+      const cleanPhone = phone.replace(/\s/g, '');
+      if (!phoneRegex.test(cleanPhone)) {
+        return NextResponse.json(
+          { success: false, error: 'Geçersiz telefon numarası formatı' },
+          { status: 400 }
+        );
+      }
+    }
+
+    const updateData = { updatedAt: new Date() };
+    if (firstName !== undefined) updateData.firstName = firstName.trim();
+    if (lastName !== undefined) updateData.lastName = lastName.trim();
+    if (phone !== undefined) updateData.phone = phone.replace(/\s/g, '');
+
+    await db.collection('users').updateOne(
+      { id: userId },
+      { $set: updateData }
+    );
+
+    const updatedUser = await db.collection('users').findOne({ id: userId });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Profil güncellendi',
+      data: {
+        id: updatedUser.id,
+        email: updatedUser.email,
+        firstName: updatedUser.firstName || '',
+        lastName: updatedUser.lastName || '',
+        phone: updatedUser.phone || ''
+      }
+    });
+  });
+
+  router.put('/api/account/password', async ({ request, db, body }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    const userId = userData.id || userData.userId;
+    const { currentPassword, newPassword, confirmPassword } = body;
+
+    // Validation
+    if (!currentPassword || !newPassword || !confirmPassword) {
+      return NextResponse.json(
+        { success: false, error: 'Tüm alanlar zorunludur' },
+        { status: 400 }
+      );
+    }
+
+    if (newPassword !== confirmPassword) {
+      return NextResponse.json(
+        { success: false, error: 'Yeni şifreler eşleşmiyor' },
+        { status: 400 }
+      );
+    }
+
+    if (newPassword.length < 8) {
+      return NextResponse.json(
+        { success: false, error: 'Yeni şifre en az 8 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    // Check for at least one letter and one number
+    const hasLetter = /[a-zA-Z]/.test(newPassword);
+    const hasNumber = /[0-9]/.test(newPassword);
+    if (!hasLetter || !hasNumber) {
+      return NextResponse.json(
+        { success: false, error: 'Şifre en az bir harf ve bir rakam içermelidir' },
+        { status: 400 }
+      );
+    }
+
+    // Get user and verify current password
+    const user = await db.collection('users').findOne({ id: userId });
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Kullanıcı bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    const isValidPassword = await bcrypt.compare(currentPassword, user.passwordHash);
+    if (!isValidPassword) {
+      return NextResponse.json(
+        { success: false, error: 'Mevcut şifre yanlış' },
+        { status: 400 }
+      );
+    }
+
+    // Hash new password and update
+    const hashedPassword = await bcrypt.hash(newPassword, 10);
+    await db.collection('users').updateOne(
+      { id: userId },
+      { 
+        $set: { 
+          passwordHash: hashedPassword,
+          passwordChangedAt: new Date(),
+          updatedAt: new Date()
+        } 
+      }
+    );
+
+    // Send password changed email
+    sendPasswordChangedEmail(db, user).catch(err => 
+      console.error('Password changed email failed:', err)
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: 'Şifreniz başarıyla güncellendi'
+    });
+  });
+
+  // User: Update my profile
+  router.put('/api/account/me', async ({ request, db, body }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    const userId = userData.id || userData.userId;
+    const { firstName, lastName, phone } = body;
+
+    // Validation
+    if (firstName !== undefined && firstName.length < 2) {
+      return NextResponse.json(
+        { success: false, error: 'Ad en az 2 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    if (lastName !== undefined && lastName.length < 2) {
+      return NextResponse.json(
+        { success: false, error: 'Soyad en az 2 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    // Phone format validation (Turkish format)
+    if (phone !== undefined && phone.length > 0) {
+      const phoneRegex = /^(\+90|0)?[5][0-9]{9}$/;
+      const cleanPhone = phone.replace(/\s/g, '');
+      if (!phoneRegex.test(cleanPhone)) {
+        return NextResponse.json(
+          { success: false, error: 'Geçersiz telefon numarası formatı' },
+          { status: 400 }
+        );
+      }
+    }
+
+    const updateData = { updatedAt: new Date() };
+    if (firstName !== undefined) updateData.firstName = firstName.trim();
+    if (lastName !== undefined) updateData.lastName = lastName.trim();
+    if (phone !== undefined) updateData.phone = phone.replace(/\s/g, '');
+
+    await db.collection('users').updateOne(
+      { id: userId },
+      { $set: updateData }
+    );
+
+    const updatedUser = await db.collection('users').findOne({ id: userId });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Profil güncellendi',
+      data: {
+        id: updatedUser.id,
+        email: updatedUser.email,
+        firstName: updatedUser.firstName || '',
+        lastName: updatedUser.lastName || '',
+        phone: updatedUser.phone || ''
+      }
+    });
+  }, { admin: true });
+
+  // User: Change password
+  router.put('/api/account/password', async ({ request, db, body }) => {
+    const userData = verifyToken(request);
+    if (!userData) {
+      return NextResponse.json(
+        { success: false, error: 'Oturum açmanız gerekiyor' },
+        { status: 401 }
+      );
+    }
+
+    const userId = userData.id || userData.userId;
+    const { currentPassword, newPassword, confirmPassword } = body;
+
+    // Validation
+    if (!currentPassword || !newPassword || !confirmPassword) {
+      return NextResponse.json(
+        { success: false, error: 'Tüm alanlar zorunludur' },
+        { status: 400 }
+      );
+    }
+
+    if (newPassword !== confirmPassword) {
+      return NextResponse.json(
+        { success: false, error: 'Yeni şifreler eşleşmiyor' },
+        { status: 400 }
+      );
+    }
+
+    if (newPassword.length < 8) {
+      return NextResponse.json(
+        { success: false, error: 'Yeni şifre en az 8 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    // Check for at least one letter and one number
+    const hasLetter = /[a-zA-Z]/.test(newPassword);
+    const hasNumber = /[0-9]/.test(newPassword);
+    if (!hasLetter || !hasNumber) {
+      return NextResponse.json(
+        { success: false, error: 'Şifre en az bir harf ve bir rakam içermelidir' },
+        { status: 400 }
+      );
+    }
+
+    // Get user and verify current password
+    const user = await db.collection('users').findOne({ id: userId });
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Kullanıcı bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    const isValidPassword = await bcrypt.compare(currentPassword, user.passwordHash);
+    if (!isValidPassword) {
+      return NextResponse.json(
+        { success: false, error: 'Mevcut şifre yanlış' },
+        { status: 400 }
+      );
+    }
+
+    // Hash new password and update
+    const hashedPassword = await bcrypt.hash(newPassword, 10);
+    await db.collection('users').updateOne(
+      { id: userId },
+      { 
+        $set: { 
+          passwordHash: hashedPassword,
+          passwordChangedAt: new Date(),
+          updatedAt: new Date()
+        } 
+      }
+    );
+
+    // Send password changed email
+    sendPasswordChangedEmail(db, user).catch(err => 
+      console.error('Password changed email failed:', err)
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: 'Şifreniz başarıyla güncellendi'
+    });
+  }, { admin: true });
+
+  // Kullanıcının indirim bakiyesini getir
+  router.delete('/api/user/discount-balance', async ({ request, db }) => {
+    const authHeader = request.headers.get('authorization');
+    if (!authHeader) {
+      return NextResponse.json({ success: false, error: 'Giriş yapmalısınız' }, { status: 401 });
+    }
+    
+    const token = authHeader.replace('Bearer ', '');
+    let decoded;
+    try {
+      decoded = jwt.verify(token, JWT_SECRET);
+    } catch (e) {
+      return NextResponse.json({ success: false, error: 'Geçersiz token' }, { status: 401 });
+    }
+    
+    const spinUser = await db.collection('users').findOne({ id: decoded.userId });
+    if (!spinUser) {
+      return NextResponse.json({ success: false, error: 'Kullanıcı bulunamadı' }, { status: 404 });
+    }
+    
+    // İndirim süresi dolmuş mu kontrol et
+    let discountBalance = spinUser.discountBalance || 0;
+    let discountMinOrder = spinUser.discountMinOrder || 0;
+    let discountExpiry = spinUser.discountExpiry;
+    
+    if (discountExpiry && new Date(discountExpiry) < new Date()) {
+      // Süresi dolmuş, sıfırla
+      await db.collection('users').updateOne(
+        { id: spinUser.id },
+        { $unset: { discountBalance: '', discountMinOrder: '', discountExpiry: '', discountSource: '' } }
+      );
+      discountBalance = 0;
+      discountMinOrder = 0;
+      discountExpiry = null;
+    }
+    
+    // Bugün çevirmiş mi?
+    const today = new Date().toISOString().split('T')[0];
+    const lastSpin = spinUser.lastSpinDate ? new Date(spinUser.lastSpinDate).toISOString().split('T')[0] : null;
+    const canSpin = lastSpin !== today;
+    
+    return NextResponse.json({
+      success: true,
+      data: {
+        discountBalance,
+        discountMinOrder,
+        discountExpiry,
+        canSpin,
+        nextSpinTime: canSpin ? null : getNextMidnight(),
+        lastSpinDate: spinUser.lastSpinDate
+      }
+    });
+  });
+}
@@ -0,0 +1,1347 @@
+/**
+ * Admin catalogue routes: products, accounts, stock, deals, content, reviews, legal pages and blog.
+ */
+
+import { NextResponse } from 'next/server';
+import { v4 as uuidv4 } from 'uuid';
+import { saveUploadedFile } from '@/lib/fileUpload';
+import { responseCache, logAuditAction, AUDIT_ACTIONS, verifyAdminToken } from '../core.js';
+
+export function register(router) {
+  // 🔥 ADMIN: Günün Fırsatları (GET)
+  router.get('/api/admin/daily-deals', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) return NextResponse.json({ success: false, error: 'Yetkisiz' }, { status: 401 });
+    const deals = await db.collection('daily_deals').find({}).sort({ createdAt: -1 }).toArray();
+    const products = await db.collection('products').find({ active: true }).sort({ sortOrder: 1 }).toArray();
+    return NextResponse.json({ success: true, data: { deals, products } });
+  });
+
+  // Admin: Get all accounts (including inactive and sold)
+  router.get('/api/admin/accounts', async ({ request, db }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const accounts = await db.collection('accounts')
+      .find({})
+      .sort({ createdAt: -1 })
+      .toArray();
+
+    return NextResponse.json({ success: true, data: accounts });
+  });
+
+  // Admin: Get single account
+  router.get('/api/admin/accounts/:id', async ({ request, db, pathname }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const accountId = pathname.split('/').pop();
+    const account = await db.collection('accounts').findOne({ id: accountId });
+
+    if (!account) {
+      return NextResponse.json({ success: false, error: 'Hesap bulunamadı' }, { status: 404 });
+    }
+
+    return NextResponse.json({ success: true, data: account });
+  });
+
+  // Admin: Get account stock
+  router.get('/api/admin/accounts/:id/stock', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const accountId = pathname.split('/')[4];
+    
+    // Get stock items for this account
+    const stocks = await db.collection('account_stock')
+      .find({ accountId })
+      .sort({ createdAt: -1 })
+      .toArray();
+
+    const availableCount = stocks.filter(s => s.status === 'available').length;
+    const assignedCount = stocks.filter(s => s.status === 'assigned').length;
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        stocks,
+        summary: {
+          total: stocks.length,
+          available: availableCount,
+          assigned: assignedCount
+        }
+      }
+    });
+  });
+
+  // Admin: Get all products (including inactive)
+  router.get('/api/admin/products', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const products = await db.collection('products')
+      .find({})
+      .sort({ sortOrder: 1 })
+      .toArray();
+    
+    return NextResponse.json({ success: true, data: products });
+  });
+
+  // Admin: Get product stock
+  router.get('/api/admin/products/:id/stock', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const productId = pathname.split('/')[4];
+    
+    // Get stock items
+    const stocks = await db.collection('stock')
+      .find({ productId })
+      .sort({ createdAt: -1 })
+      .toArray();
+
+    const availableCount = stocks.filter(s => s.status === 'available').length;
+    const assignedCount = stocks.filter(s => s.status === 'assigned').length;
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        stocks,
+        summary: {
+          total: stocks.length,
+          available: availableCount,
+          assigned: assignedCount
+        }
+      }
+    });
+  });
+
+  // Admin: Get all reviews (including unapproved)
+  router.get('/api/admin/reviews', async ({ request, db, searchParams }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const game = searchParams.get('game') || 'pubg';
+    const reviews = await db.collection('reviews')
+      .find({ game })
+      .sort({ createdAt: -1 })
+      .toArray();
+
+    return NextResponse.json({ success: true, data: reviews });
+  });
+
+  // Admin: Get game content
+  router.get('/api/admin/content/pubg', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    let content = await db.collection('game_content').findOne({ game: 'pubg' });
+    
+    if (!content) {
+      content = {
+        game: 'pubg',
+        title: 'PUBG Mobile',
+        description: '',
+        defaultRating: 5.0,
+        defaultReviewCount: 2008
+      };
+    }
+
+    return NextResponse.json({ success: true, data: content });
+  });
+
+  // Admin: Get Roblox content (GET)
+  router.get('/api/admin/content/roblox', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    let content = await db.collection('game_content').findOne({ game: 'roblox' });
+    
+    if (!content) {
+      content = {
+        game: 'roblox',
+        title: 'Roblox',
+        description: '',
+        defaultRating: 5.0,
+        defaultReviewCount: 1500
+      };
+    }
+
+    return NextResponse.json({ success: true, data: content });
+  });
+
+  // Admin: Get all legal pages
+  router.get('/api/admin/legal-pages', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const pages = await db.collection('legal_pages').find({}).sort({ order: 1, createdAt: -1 }).toArray();
+    return NextResponse.json({ success: true, data: pages });
+  });
+
+  // Admin: Get footer settings
+  router.get('/api/admin/footer-settings', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    let settings = await db.collection('footer_settings').findOne({ active: true });
+    
+    if (!settings) {
+      settings = {
+        quickLinks: [
+          { label: 'Giriş Yap', action: 'login' },
+          { label: 'Kayıt Ol', action: 'register' }
+        ],
+        categories: [
+          { label: 'PUBG Mobile', url: '/' }
+        ],
+        corporateLinks: []
+      };
+    }
+    
+    return NextResponse.json({ success: true, data: settings });
+  });
+
+  // Admin: Get all blog posts (including drafts)
+  router.get('/api/admin/blog', async ({ request, db, searchParams }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const page = parseInt(searchParams.get('page')) || 1;
+    const limit = parseInt(searchParams.get('limit')) || 20;
+    const status = searchParams.get('status');
+
+    let query = {};
+    if (status) query.status = status;
+
+    const total = await db.collection('blog_posts').countDocuments(query);
+    const posts = await db.collection('blog_posts')
+      .find(query)
+      .sort({ createdAt: -1 })
+      .skip((page - 1) * limit)
+      .limit(limit)
+      .toArray();
+
+    return NextResponse.json({
+      success: true,
+      data: posts,
+      meta: {
+        total,
+        page,
+        limit,
+        totalPages: Math.ceil(total / limit)
+      }
+    });
+  });
+
+  // Admin: Get single blog post for editing
+  router.get('/api/admin/blog/:id', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const postId = pathname.split('/').pop();
+    const post = await db.collection('blog_posts').findOne({ id: postId });
+
+    if (!post) {
+      return NextResponse.json(
+        { success: false, error: 'Yazı bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    return NextResponse.json({
+      success: true,
+      data: post
+    });
+  });
+
+  // Admin: Upload file
+  router.post('/api/admin/upload', async ({ request }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    try {
+      const formData = await request.formData();
+      const file = formData.get('file');
+      const category = formData.get('category') || 'general';
+
+      if (!file) {
+        return NextResponse.json(
+          { success: false, error: 'Dosya seçilmedi' },
+          { status: 400 }
+        );
+      }
+
+      // Debug log
+      console.log('Upload file info:', {
+        name: file.name,
+        type: file.type,
+        size: file.size
+      });
+
+      // Validate file type manually if file.type is missing
+      const fileType = file.type || 'image/png';
+      const allowedTypes = ['image/jpeg', 'image/jpg', 'image/png', 'image/svg+xml', 'image/webp', 'image/gif'];
+      
+      if (!allowedTypes.some(t => fileType.startsWith('image/'))) {
+        return NextResponse.json(
+          { success: false, error: 'Sadece resim dosyaları yüklenebilir' },
+          { status: 400 }
+        );
+      }
+
+      const fileUrl = await saveUploadedFile(file, category);
+
+      return NextResponse.json({
+        success: true,
+        data: {
+          url: fileUrl,
+          filename: file.name,
+          size: file.size,
+          type: fileType
+        }
+      });
+    } catch (error) {
+      console.error('Upload error:', error);
+      return NextResponse.json(
+        { success: false, error: error.message },
+        { status: 400 }
+      );
+    }
+  }, { rawBody: true });
+
+  // 🔥 ADMIN: Günün Fırsatları CRUD (POST)
+  router.post('/api/admin/daily-deals', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) return NextResponse.json({ success: false, error: 'Yetkisiz' }, { status: 401 });
+    const { action, dealId, productId, dealPrice, endTime } = body;
+    if (action === 'create') {
+      if (!productId || !dealPrice || !endTime) return NextResponse.json({ success: false, error: 'Tüm alanlar gerekli' }, { status: 400 });
+      const existing = await db.collection('daily_deals').findOne({ productId, active: true, endTime: { $gt: new Date() } });
+      if (existing) return NextResponse.json({ success: false, error: 'Bu ürün zaten fırsatta' }, { status: 400 });
+      const deal = { id: uuidv4(), productId, dealPrice: parseFloat(dealPrice), endTime: new Date(endTime), active: true, createdBy: user.username || user.email, createdAt: new Date() };
+      await db.collection('daily_deals').insertOne(deal);
+      return NextResponse.json({ success: true, data: deal, message: 'Fırsat oluşturuldu' });
+    }
+    if (action === 'delete') {
+      await db.collection('daily_deals').deleteOne({ id: dealId });
+      return NextResponse.json({ success: true, message: 'Fırsat silindi' });
+    }
+    if (action === 'toggle') {
+      const deal = await db.collection('daily_deals').findOne({ id: dealId });
+      if (deal) await db.collection('daily_deals').updateOne({ id: dealId }, { $set: { active: !deal.active } });
+      return NextResponse.json({ success: true, message: 'Güncellendi' });
+    }
+    return NextResponse.json({ success: false, error: 'Geçersiz işlem' }, { status: 400 });
+  });
+
+  // Admin: Create product
+  router.post('/api/admin/products', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Ensure game field defaults to 'pubg' if not provided
+    const game = body.game || 'pubg';
+    
+    const product = {
+      id: uuidv4(),
+      ...body,
+      game,
+      createdAt: new Date()
+    };
+
+    await db.collection('products').insertOne(product);
+    responseCache.invalidateTags('products');
+    
+    return NextResponse.json({
+      success: true,
+      data: product
+    });
+  });
+
+  // Admin: Create PUBG Account
+  router.post('/api/admin/accounts', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { title, description, price, discountPrice, imageUrl, legendaryMin, legendaryMax, level, rank, features, credentials, unlimited, order } = body;
+
+    if (!title || !price) {
+      return NextResponse.json(
+        { success: false, error: 'Başlık ve fiyat zorunludur' },
+        { status: 400 }
+      );
+    }
+
+    // Calculate discount percent
+    let discountPercent = 0;
+    if (discountPrice && discountPrice < price) {
+      discountPercent = Math.round(((price - discountPrice) / price) * 100);
+    }
+
+    const account = {
+      id: uuidv4(),
+      title,
+      description: description || '',
+      price: parseFloat(price),
+      discountPrice: discountPrice ? parseFloat(discountPrice) : parseFloat(price),
+      discountPercent,
+      imageUrl: imageUrl || '',
+      legendaryMin: legendaryMin || 0,
+      legendaryMax: legendaryMax || 0,
+      level: level || 0,
+      rank: rank || '',
+      features: features || [],
+      credentials: credentials || '', // Hesap bilgileri (gizli - sadece admin görür)
+      unlimited: unlimited !== false, // Varsayılan: true (sınırsız satış)
+      order: order !== undefined ? parseInt(order) : 0, // Sıralama
+      salesCount: 0,
+      status: 'available', // available, reserved, sold
+      active: true,
+      sortOrder: 0,
+      createdAt: new Date(),
+      createdBy: user.username
+    };
+
+    await db.collection('accounts').insertOne(account);
+    responseCache.invalidateTags('accounts');
+    
+    return NextResponse.json({
+      success: true,
+      message: 'Hesap oluşturuldu',
+      data: account
+    });
+  });
+
+  // Admin: Fix missing order values (migration - one-time use)
+  router.post('/api/admin/accounts/fix-order', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Update all accounts without order field
+    const result = await db.collection('accounts').updateMany(
+      { $or: [{ order: { $exists: false } }, { order: null }] },
+      { $set: { order: 0 } }
+    );
+    responseCache.invalidateTags('accounts');
+
+    return NextResponse.json({
+      success: true,
+      message: `${result.modifiedCount} hesap güncellendi`,
+      data: { modifiedCount: result.modifiedCount }
+    });
+  });
+
+  // Admin: Add stock to account
+  router.post('/api/admin/accounts/:id/stock', async ({ request, db, pathname, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const accountId = pathname.split('/')[4];
+    const { items } = body; // Array of strings (credentials)
+
+    if (!items || !Array.isArray(items) || items.length === 0) {
+      return NextResponse.json(
+        { success: false, error: 'Hesap bilgileri gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    // Validate account exists
+    const account = await db.collection('accounts').findOne({ id: accountId });
+    if (!account) {
+      return NextResponse.json(
+        { success: false, error: 'Hesap bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Create stock items
+    const stockItems = items.map(item => ({
+      id: uuidv4(),
+      accountId,
+      credentials: item.trim(), // Hesap bilgileri (email, şifre vs)
+      status: 'available',
+      orderId: null,
+      assignedAt: null,
+      createdAt: new Date(),
+      createdBy: user.username
+    }));
+
+    await db.collection('account_stock').insertMany(stockItems);
+
+    // Update account stock count
+    const availableCount = await db.collection('account_stock').countDocuments({ 
+      accountId, 
+      status: 'available' 
+    });
+    
+    await db.collection('accounts').updateOne(
+      { id: accountId },
+      { $set: { stockCount: availableCount } }
+    );
+    responseCache.invalidateTags('accounts');
+
+    return NextResponse.json({
+      success: true,
+      message: `${stockItems.length} adet hesap bilgisi eklendi`,
+      data: {
+        count: stockItems.length
+      }
+    });
+  });
+
+  // Admin: Update product DijiPin setting
+  router.post('/api/admin/products/dijipin', async ({ request, db, body }) => {
+    const authHeader = request.headers.get('authorization');
+    if (!authHeader) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const { productId, dijipinEnabled } = body;
+
+    if (!productId) {
+      return NextResponse.json({ success: false, error: 'Ürün ID gerekli' }, { status: 400 });
+    }
+
+    const result = await db.collection('products').updateOne(
+      { id: productId },
+      { $set: { dijipinEnabled: dijipinEnabled, updatedAt: new Date() } }
+    );
+    responseCache.invalidateTags('products');
+
+    if (result.matchedCount === 0) {
+      return NextResponse.json({ success: false, error: 'Ürün bulunamadı' }, { status: 404 });
+    }
+
+    return NextResponse.json({
+      success: true,
+      message: dijipinEnabled ? 'DijiPin otomatik gönderim açıldı' : 'DijiPin otomatik gönderim kapatıldı'
+    });
+  });
+
+  // Admin: Add stock to product (bulk)
+  router.post('/api/admin/products/:id/stock', async ({ request, db, pathname, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const productId = pathname.split('/')[4];
+    const { items } = body; // Array of strings (codes/items)
+
+    if (!items || !Array.isArray(items) || items.length === 0) {
+      return NextResponse.json(
+        { success: false, error: 'Stok item\'ları gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    // Validate product exists
+    const product = await db.collection('products').findOne({ id: productId });
+    if (!product) {
+      return NextResponse.json(
+        { success: false, error: 'Ürün bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Create stock items
+    const stockItems = items.map(item => ({
+      id: uuidv4(),
+      productId,
+      value: item.trim(),
+      status: 'available',
+      orderId: null,
+      createdAt: new Date(),
+      createdBy: user.username
+    }));
+
+    await db.collection('stock').insertMany(stockItems);
+
+    return NextResponse.json({
+      success: true,
+      message: `${stockItems.length} adet stok eklendi`,
+      data: {
+        count: stockItems.length
+      }
+    });
+  });
+
+  // Admin: Save game content
+  router.post('/api/admin/content/pubg', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { title, description, defaultRating, defaultReviewCount } = body;
+
+    await db.collection('game_content').updateOne(
+      { game: 'pubg' },
+      {
+        $set: {
+          game: 'pubg',
+          title: title || 'PUBG Mobile',
+          description: description || '',
+          defaultRating: defaultRating || 5.0,
+          defaultReviewCount: defaultReviewCount || 0,
+          updatedBy: user.username,
+          updatedAt: new Date()
+        }
+      },
+      { upsert: true }
+    );
+    responseCache.invalidateTags('content:pubg');
+
+    const content = await db.collection('game_content').findOne({ game: 'pubg' });
+
+    return NextResponse.json({
+      success: true,
+      message: 'İçerik güncellendi',
+      data: content
+    });
+  });
+
+  // Admin: Save Roblox content
+  router.post('/api/admin/content/roblox', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { title, description, defaultRating, defaultReviewCount } = body;
+
+    await db.collection('game_content').updateOne(
+      { game: 'roblox' },
+      {
+        $set: {
+          game: 'roblox',
+          title: title || 'Roblox',
+          description: description || '',
+          defaultRating: defaultRating || 5.0,
+          defaultReviewCount: defaultReviewCount || 0,
+          updatedBy: user.username,
+          updatedAt: new Date()
+        }
+      },
+      { upsert: true }
+    );
+    responseCache.invalidateTags('content:roblox');
+
+    const robloxContent = await db.collection('game_content').findOne({ game: 'roblox' });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Roblox içeriği güncellendi',
+      data: robloxContent
+    });
+  });
+
+  // Admin: Add review
+  router.post('/api/admin/reviews', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { game, userName, rating, comment, approved, customDate } = body;
+
+    if (!rating || rating < 1 || rating > 5) {
+      return NextResponse.json(
+        { success: false, error: 'Puan 1-5 arasında olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    // Use custom date if provided, otherwise use current date
+    const reviewDate = customDate ? new Date(customDate) : new Date();
+
+    const review = {
+      id: uuidv4(),
+      game: game || 'pubg',
+      userName: userName || 'Misafir',
+      rating: parseInt(rating),
+      comment: comment || '',
+      approved: approved !== false,
+      createdBy: user.username,
+      createdAt: reviewDate
+    };
+
+    await db.collection('reviews').insertOne(review);
+    responseCache.invalidateTags(`reviews:${review.game}`);
+
+    return NextResponse.json({
+      success: true,
+      message: 'Yorum eklendi',
+      data: review
+    });
+  });
+
+  // Admin: Create legal page
+  router.post('/api/admin/legal-pages', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { title, slug, content, effectiveDate, isActive, order } = body;
+
+    if (!title || !slug) {
+      return NextResponse.json(
+        { success: false, error: 'Başlık ve slug zorunludur' },
+        { status: 400 }
+      );
+    }
+
+    // Check if slug already exists
+    const existing = await db.collection('legal_pages').findOne({ slug });
+    if (existing) {
+      return NextResponse.json(
+        { success: false, error: 'Bu slug zaten kullanılıyor' },
+        { status: 400 }
+      );
+    }
+
+    const page = {
+      id: uuidv4(),
+      title,
+      slug,
+      content: content || '',
+      effectiveDate: effectiveDate ? new Date(effectiveDate) : new Date(),
+      isActive: isActive !== false,
+      order: order || 0,
+      createdBy: user.username,
+      createdAt: new Date(),
+      updatedAt: new Date()
+    };
+
+    await db.collection('legal_pages').insertOne(page);
+
+    return NextResponse.json({
+      success: true,
+      message: 'Sayfa oluşturuldu',
+      data: page
+    });
+  });
+
+  // Admin: Save footer settings
+  router.post('/api/admin/footer-settings', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { quickLinks, categories, corporateLinks } = body;
+
+    // Deactivate previous settings
+    await db.collection('footer_settings').updateMany({}, { $set: { active: false } });
+
+    const settings = {
+      id: uuidv4(),
+      quickLinks: quickLinks || [],
+      categories: categories || [],
+      corporateLinks: corporateLinks || [],
+      active: true,
+      updatedBy: user.username,
+      updatedAt: new Date(),
+      createdAt: new Date()
+    };
+
+    await db.collection('footer_settings').insertOne(settings);
+    responseCache.invalidateTags('footer_settings');
+
+    return NextResponse.json({
+      success: true,
+      message: 'Footer ayarları güncellendi',
+      data: settings
+    });
+  });
+
+  // ============================================
+  // BLOG POST ENDPOINTS
+  // ============================================
+
+  // Admin: Create blog post
+  router.post('/api/admin/blog', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { title, content, excerpt, category, coverImage, tags, status } = body;
+
+    if (!title || !content) {
+      return NextResponse.json(
+        { success: false, error: 'Başlık ve içerik zorunludur' },
+        { status: 400 }
+      );
+    }
+
+    // Generate slug from title
+    const slug = title
+      .toLowerCase()
+      .replace(/[ğ]/g, 'g')
+      .replace(/[ü]/g, 'u')
+      .replace(/[ş]/g, 's')
+      .replace(/[ı]/g, 'i')
+      .replace(/[ö]/g, 'o')
+      .replace(/[ç]/g, 'c')
+      .replace(/[^a-z0-9]+/g, '-')
+      .replace(/^-+|-+$/g, '')
+      .substring(0, 100);
+
+    // Check if slug exists
+    const existingSlug = await db.collection('blog_posts').findOne({ slug });
+    const finalSlug = existingSlug ? `${slug}-${Date.now()}` : slug;
+
+    const post = {
+      id: uuidv4(),
+      title,
+      slug: finalSlug,
+      content,
+      excerpt: excerpt || content.replace(/<[^>]*>/g, '').substring(0, 200) + '...',
+      category: category || 'genel',
+      coverImage: coverImage || null,
+      tags: tags || [],
+      status: status || 'draft',
+      views: 0,
+      authorId: user.id || user.username,
+      authorName: user.username || 'Admin',
+      createdAt: new Date(),
+      updatedAt: new Date(),
+      publishedAt: status === 'published' ? new Date() : null
+    };
+
+    await db.collection('blog_posts').insertOne(post);
+    responseCache.invalidateTags('blog');
+
+    return NextResponse.json({
+      success: true,
+      message: 'Blog yazısı oluşturuldu',
+      data: post
+    });
+  });
+
+  // Update blog post
+  router.put('/api/admin/blog/:id', async ({ db, pathname, body }) => {
+    const postId = pathname.split('/').pop();
+    
+    const existingPost = await db.collection('blog_posts').findOne({ id: postId });
+    if (!existingPost) {
+      return NextResponse.json(
+        { success: false, error: 'Yazı bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    const updateData = {
+      ...body,
+      updatedAt: new Date()
+    };
+
+    // If status changed to published and wasn't published before
+    if (body.status === 'published' && existingPost.status !== 'published') {
+      updateData.publishedAt = new Date();
+    }
+
+    await db.collection('blog_posts').updateOne(
+      { id: postId },
+      { $set: updateData }
+    );
+    responseCache.invalidateTags('blog');
+
+    const updated = await db.collection('blog_posts').findOne({ id: postId });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Blog yazısı güncellendi',
+      data: updated
+    });
+  }, { admin: true });
+
+  // Update product
+  router.put('/api/admin/products/:id', async ({ db, pathname, body }) => {
+    const productId = pathname.split('/').pop();
+    
+    await db.collection('products').updateOne(
+      { id: productId },
+      { $set: { ...body, updatedAt: new Date() } }
+    );
+
+    responseCache.invalidateTags('products');
+
+    const updated = await db.collection('products').findOne({ id: productId });
+    
+    return NextResponse.json({
+      success: true,
+      data: updated
+    });
+  }, { admin: true });
+
+  // Update PUBG Account (Admin)
+  router.put('/api/admin/accounts/:id', async ({ db, pathname, user, body }) => {
+    const accountId = pathname.split('/').pop();
+    
+    const existingAccount = await db.collection('accounts').findOne({ id: accountId });
+    if (!existingAccount) {
+      return NextResponse.json(
+        { success: false, error: 'Hesap bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    const updateData = {
+      ...body,
+      updatedAt: new Date(),
+      updatedBy: user.username
+    };
+
+    // Calculate discount percent if both prices provided
+    if (body.price && body.discountPrice) {
+      updateData.discountPercent = Math.round(((body.price - body.discountPrice) / body.price) * 100);
+    }
+
+    await db.collection('accounts').updateOne(
+      { id: accountId },
+      { $set: updateData }
+    );
+    responseCache.invalidateTags('accounts');
+
+    const updated = await db.collection('accounts').findOne({ id: accountId });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Hesap güncellendi',
+      data: updated
+    });
+  }, { admin: true });
+
+  // Update legal page
+  router.put('/api/admin/legal-pages/:id', async ({ db, pathname, user, body }) => {
+    const pageId = pathname.split('/').pop();
+    
+    const { title, slug, content, effectiveDate, isActive, order } = body;
+
+    // Check if slug already exists (excluding current page)
+    if (slug) {
+      const existing = await db.collection('legal_pages').findOne({ slug, id: { $ne: pageId } });
+      if (existing) {
+        return NextResponse.json(
+          { success: false, error: 'Bu slug zaten kullanılıyor' },
+          { status: 400 }
+        );
+      }
+    }
+
+    const updateData = {
+      updatedAt: new Date(),
+      updatedBy: user.username
+    };
+    
+    if (title !== undefined) updateData.title = title;
+    if (slug !== undefined) updateData.slug = slug;
+    if (content !== undefined) updateData.content = content;
+    if (effectiveDate !== undefined) updateData.effectiveDate = new Date(effectiveDate);
+    if (isActive !== undefined) updateData.isActive = isActive;
+    if (order !== undefined) updateData.order = order;
+
+    await db.collection('legal_pages').updateOne(
+      { id: pageId },
+      { $set: updateData }
+    );
+
+    const updated = await db.collection('legal_pages').findOne({ id: pageId });
+    
+    return NextResponse.json({
+      success: true,
+      message: 'Sayfa güncellendi',
+      data: updated
+    });
+  }, { admin: true });
+
+  // Admin: Clear/Reset product stock (delete all available stock items)
+  router.delete('/api/admin/products/:id/stock/clear', async ({ db, pathname }) => {
+    const productId = pathname.split('/')[4];
+    
+    // Validate product exists
+    const product = await db.collection('products').findOne({ id: productId });
+    if (!product) {
+      return NextResponse.json(
+        { success: false, error: 'Ürün bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Delete only available stock items (not assigned ones)
+    const deleteResult = await db.collection('stock').deleteMany({ 
+      productId: productId,
+      status: 'available'
+    });
+
+    return NextResponse.json({
+      success: true,
+      message: `${deleteResult.deletedCount} adet mevcut stok silindi`,
+      data: {
+        deletedCount: deleteResult.deletedCount
+      }
+    });
+  });
+
+  // Delete blog post
+  router.delete('/api/admin/blog/:id', async ({ db, pathname }) => {
+    const postId = pathname.split('/').pop();
+    
+    const post = await db.collection('blog_posts').findOne({ id: postId });
+    if (!post) {
+      return NextResponse.json(
+        { success: false, error: 'Yazı bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    await db.collection('blog_posts').deleteOne({ id: postId });
+    responseCache.invalidateTags('blog');
+
+    return NextResponse.json({
+      success: true,
+      message: 'Blog yazısı silindi'
+    });
+  });
+
+  // Reset product stock (Delete all stock for a product)
+  router.delete('/api/admin/products/:id/stock/reset', async ({ request, db, pathname, user }) => {
+    const productId = pathname.split('/')[4];
+    
+    const product = await db.collection('products').findOne({ id: productId });
+    if (!product) {
+      return NextResponse.json(
+        { success: false, error: 'Ürün bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Delete all stock items for this product
+    const deleteResult = await db.collection('stock').deleteMany({ 
+      productId: productId,
+      status: 'available' // Only delete available stock, not assigned ones
+    });
+
+    // Log the action
+    await logAuditAction(db, AUDIT_ACTIONS.STOCK_RESET, user.id || user.username, 'product', productId, request, {
+      productTitle: product.title,
+      stocksDeleted: deleteResult.deletedCount
+    });
+
+    return NextResponse.json({
+      success: true,
+      message: `${deleteResult.deletedCount} adet stok sıfırlandı`,
+      data: {
+        productId: productId,
+        stocksDeleted: deleteResult.deletedCount
+      }
+    });
+  });
+
+  // Delete PUBG Account (Admin)
+  router.delete('/api/admin/accounts/:id', async ({ db, pathname }) => {
+    const accountId = pathname.split('/').pop();
+    
+    const account = await db.collection('accounts').findOne({ id: accountId });
+    if (!account) {
+      return NextResponse.json(
+        { success: false, error: 'Hesap bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Satılmış hesap silinemez
+    if (account.status === 'sold') {
+      return NextResponse.json(
+        { success: false, error: 'Satılmış hesap silinemez' },
+        { status: 400 }
+      );
+    }
+
+    await db.collection('accounts').deleteOne({ id: accountId });
+    responseCache.invalidateTags('accounts');
+
+    return NextResponse.json({
+      success: true,
+      message: 'Hesap silindi'
+    });
+  });
+
+  // Delete product (HARD DELETE - permanently remove from database)
+  router.delete('/api/admin/products/:id', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+    
+    const productId = pathname.split('/').pop();
+    
+    // Get product info before deletion (for image cleanup and audit)
+    const product = await db.collection('products').findOne({ id: productId });
+    
+    if (!product) {
+      return NextResponse.json(
+        { success: false, error: 'Ürün bulunamadı' },
+        { status: 404 }
+      );
+    }
+    
+    // Delete product from database
+    const deleteResult = await db.collection('products').deleteOne({ id: productId });
+    responseCache.invalidateTags('products');
+    
+    if (deleteResult.deletedCount === 0) {
+      return NextResponse.json(
+        { success: false, error: 'Ürün silinemedi' },
+        { status: 500 }
+      );
+    }
+    
+    // Delete all stock items associated with this product
+    const stockDeleteResult = await db.collection('stocks').deleteMany({ productId: productId });
+    
+    // Audit log - product deletion
+    await logAuditAction(db, AUDIT_ACTIONS.PRODUCT_DELETE, user.id || user.email, 'product', productId, request, {
+      productTitle: product.title,
+      ucAmount: product.ucAmount,
+      stocksDeleted: stockDeleteResult.deletedCount
+    });
+    
+    // Optionally delete uploaded image if it's a local file
+    if (product.imageUrl && product.imageUrl.startsWith('/uploads/')) {
+      try {
+        const fs = await import('fs/promises');
+        const path = await import('path');
+        const imagePath = path.join(process.cwd(), 'public', product.imageUrl);
+        await fs.unlink(imagePath);
+      } catch (err) {
+        // Image might not exist or already deleted, continue
+      }
+    }
+    
+    return NextResponse.json({
+      success: true,
+      message: 'Ürün ve stokları tamamen silindi',
+      data: {
+        productDeleted: true,
+        stocksDeleted: stockDeleteResult.deletedCount
+      }
+    });
+  });
+
+  // Delete review
+  router.delete('/api/admin/reviews/:id', async ({ db, pathname }) => {
+    const reviewId = pathname.split('/').pop();
+    
+    const result = await db.collection('reviews').deleteOne({ id: reviewId });
+    responseCache.invalidateTags('reviews');
+    
+    if (result.deletedCount === 0) {
+      return NextResponse.json(
+        { success: false, error: 'Yorum bulunamadı' },
+        { status: 404 }
+      );
+    }
+    
+    return NextResponse.json({
+      success: true,
+      message: 'Yorum silindi'
+    });
+  });
+
+  // Delete legal page
+  router.delete('/api/admin/legal-pages/:id', async ({ db, pathname }) => {
+    const pageId = pathname.split('/').pop();
+    
+    const result = await db.collection('legal_pages').deleteOne({ id: pageId });
+    
+    if (result.deletedCount === 0) {
+      return NextResponse.json(
+        { success: false, error: 'Sayfa bulunamadı' },
+        { status: 404 }
+      );
+    }
+    
+    return NextResponse.json({
+      success: true,
+      message: 'Sayfa silindi'
+    });
+  });
+
+  // Admin - Çark istatistikleri
+  router.delete('/api/admin/spin-wheel/stats', async ({ request, db }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+    
+    const today = new Date();
+    today.setHours(0, 0, 0, 0);
+    
+    const weekAgo = new Date();
+    weekAgo.setDate(weekAgo.getDate() - 7);
+    
+    const [todaySpins, weekSpins, totalSpins, prizeStats] = await Promise.all([
+      db.collection('spin_history').countDocuments({ createdAt: { $gte: today } }),
+      db.collection('spin_history').countDocuments({ createdAt: { $gte: weekAgo } }),
+      db.collection('spin_history').countDocuments({}),
+      db.collection('spin_history').aggregate([
+        { $group: { _id: '$prizeName', count: { $sum: 1 }, totalAmount: { $sum: '$prizeAmount' } } }
+      ]).toArray()
+    ]);
+    
+    return NextResponse.json({
+      success: true,
+      data: {
+        todaySpins,
+        weekSpins,
+        totalSpins,
+        prizeStats
+      }
+    });
+  });
+
+  // ============================================
+  // 🎮 PUBG HESAP SATIŞ API - ADMIN ENDPOINTS
+  // ============================================
+
+  // Admin: Hesap Listesi
+  router.delete('/api/admin/accounts', async ({ request, db }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const accounts = await db.collection('accounts')
+      .find({})
+      .sort({ order: 1, createdAt: -1 })
+      .toArray();
+
+    return NextResponse.json({ success: true, data: accounts });
+  });
+
+  // Admin: Tek Hesap Detayı
+  router.delete('/api/admin/accounts/:id', async ({ request, db, pathname }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const accountId = pathname.split('/').pop();
+    const account = await db.collection('accounts').findOne({ id: accountId });
+
+    if (!account) {
+      return NextResponse.json({ success: false, error: 'Hesap bulunamadı' }, { status: 404 });
+    }
+
+    return NextResponse.json({ success: true, data: account });
+  });
+}
@@ -0,0 +1,1141 @@
+/**
+ * Admin order routes: order list, verification, approval, refunds and stock assignment.
+ */
+
+import { NextResponse } from 'next/server';
+import { v4 as uuidv4 } from 'uuid';
+import { deleteUploadedFile } from '@/lib/fileUpload';
+import {
+  DIJIPIN_API_TOKEN, createDijipinOrder, logAuditAction, AUDIT_ACTIONS, sendPaymentSuccessSms,
+  sendAccountDeliverySms, sendDeliveredEmail, sendVerificationRejectedEmail, verifyAdminToken,
+  responseCache
+} from '../core.js';
+
+export function register(router) {
+  // Admin: Get all orders (UC + Account Orders combined)
+  router.get('/api/admin/orders', async ({ request, db, searchParams }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const status = searchParams.get('status');
+    const riskStatus = searchParams.get('riskStatus'); // FLAGGED | CLEAR
+    const deliveryStatus = searchParams.get('deliveryStatus'); // hold | pending | delivered
+    
+    let query = {};
+    if (status) query.status = status;
+    if (riskStatus) query['risk.status'] = riskStatus;
+    if (deliveryStatus) query['delivery.status'] = deliveryStatus;
+    
+    // Fetch UC orders
+    const ucOrders = await db.collection('orders')
+      .find(query)
+      .sort({ createdAt: -1 })
+      .toArray();
+    
+    // Fetch Account orders
+    const accountOrders = await db.collection('account_orders')
+      .find(query)
+      .sort({ createdAt: -1 })
+      .toArray();
+    
+    // Mark account orders with orderType
+    const markedAccountOrders = accountOrders.map(order => ({
+      ...order,
+      orderType: 'account'
+    }));
+    
+    // Combine both order types
+    const allOrders = [...ucOrders, ...markedAccountOrders];
+    
+    // Sort by date (newest first)
+    allOrders.sort((a, b) => {
+      const dateA = a.createdAt ? new Date(a.createdAt).getTime() : 0;
+      const dateB = b.createdAt ? new Date(b.createdAt).getTime() : 0;
+      return dateB - dateA;
+    });
+    
+    // Get user details for each order
+    const userIds = [...new Set(allOrders.map(o => o.userId).filter(Boolean))];
+    const users = await db.collection('users').find({ id: { $in: userIds } }).toArray();
+    const userMap = {};
+    users.forEach(u => { userMap[u.id] = u; });
+    
+    // Enrich orders with user info
+    const enrichedOrders = allOrders.map(order => {
+      const user = userMap[order.userId];
+      return {
+        ...order,
+        userEmail: user?.email || null,
+        userPhone: user?.phone || null,
+        userName: user?.name || user?.email?.split('@')[0] || null
+      };
+    });
+    
+    // Add flagged count for badge (both order types)
+    const ucFlaggedCount = await db.collection('orders').countDocuments({ 
+      'risk.status': 'FLAGGED',
+      'delivery.status': 'hold'
+    });
+    const accountFlaggedCount = await db.collection('account_orders').countDocuments({ 
+      'risk.status': 'FLAGGED',
+      'delivery.status': 'hold'
+    });
+    const flaggedCount = ucFlaggedCount + accountFlaggedCount;
+    
+    return NextResponse.json({ 
+      success: true, 
+      data: enrichedOrders,
+      meta: { flaggedCount }
+    });
+  });
+
+  // Admin: Get orders pending verification
+  router.get('/api/admin/orders/pending-verification', async ({ request, db }) => {
+    console.log('=== PENDING VERIFICATION ENDPOINT HIT ===');
+    
+    const adminUser = verifyAdminToken(request);
+    console.log('Admin User:', adminUser ? adminUser.username : 'NO ADMIN USER');
+    
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const pendingOrders = await db.collection('orders').find({
+      'verification.required': true,
+      'verification.status': 'pending',
+      'verification.submittedAt': { $ne: null }
+    }).sort({ 'verification.submittedAt': -1 }).toArray();
+
+    console.log('Pending Orders Found:', pendingOrders.length);
+
+    // Populate user info
+    const ordersWithUsers = await Promise.all(pendingOrders.map(async (order) => {
+      const user = await db.collection('users').findOne({ id: order.userId });
+      return {
+        ...order,
+        userEmail: user?.email || 'N/A',
+        userName: `${user?.firstName || ''} ${user?.lastName || ''}`.trim()
+      };
+    }));
+
+    console.log('=== RETURNING', ordersWithUsers.length, 'ORDERS ===');
+
+    return NextResponse.json({
+      success: true,
+      data: ordersWithUsers
+    });
+  });
+
+  // Admin: Get single order
+  router.get('/api/admin/orders/:id', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const orderId = pathname.split('/').pop();
+    const order = await db.collection('orders').findOne({ id: orderId });
+    
+    if (!order) {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Get user details
+    let userInfo = null;
+    if (order.userId) {
+      const orderUser = await db.collection('users').findOne({ id: order.userId });
+      if (orderUser) {
+        userInfo = {
+          email: orderUser.email,
+          phone: orderUser.phone,
+          name: orderUser.name || orderUser.email?.split('@')[0]
+        };
+      }
+    }
+
+    // Get payment details
+    const payment = await db.collection('payments').findOne({ orderId });
+    
+    return NextResponse.json({
+      success: true,
+      data: { 
+        order: {
+          ...order,
+          userEmail: userInfo?.email || null,
+          userPhone: userInfo?.phone || null,
+          userName: userInfo?.name || null
+        }, 
+        payment 
+      }
+    });
+  });
+
+  // Admin: Manual stock assignment for pending orders
+  router.post('/api/admin/orders/:id/assign-stock', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const orderId = pathname.split('/')[4];
+    
+    const order = await db.collection('orders').findOne({ id: orderId });
+    
+    if (!order) {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Check if order needs stock assignment
+    if (order.delivery?.status === 'delivered') {
+      return NextResponse.json(
+        { success: false, error: 'Bu siparişe zaten stok atanmış' },
+        { status: 400 }
+      );
+    }
+
+    if (order.status !== 'paid') {
+      return NextResponse.json(
+        { success: false, error: 'Sadece ödenmiş siparişlere stok atanabilir' },
+        { status: 400 }
+      );
+    }
+
+    // Try to assign stock
+    const assignedStock = await db.collection('stock').findOneAndUpdate(
+      { 
+        productId: order.productId, 
+        status: 'available' 
+      },
+      { 
+        $set: { 
+          status: 'assigned', 
+          orderId: order.id,
+          assignedAt: new Date(),
+          assignedBy: user.username || user.email
+        } 
+      },
+      { 
+        returnDocument: 'after',
+        sort: { createdAt: 1 }
+      }
+    );
+
+    if (assignedStock) {
+      // MongoDB returns the document directly
+      let stockItem;
+      if (assignedStock._id) {
+        stockItem = assignedStock;
+      } else if (assignedStock.value && assignedStock.value._id) {
+        stockItem = assignedStock.value;
+      } else {
+        stockItem = assignedStock;
+      }
+      
+      const stockCode = stockItem.value;
+      
+      if (!stockCode) {
+        console.error('Stock code is empty. Stock item:', JSON.stringify(stockItem));
+        return NextResponse.json(
+          { success: false, error: 'Stok kodu boş - lütfen tekrar deneyin' },
+          { status: 400 }
+        );
+      }
+      
+      await db.collection('orders').updateOne(
+        { id: order.id },
+        {
+          $set: {
+            delivery: {
+              status: 'delivered',
+              items: [stockCode],
+              stockId: stockItem.id || stockItem._id?.toString(),
+              assignedAt: new Date(),
+              assignedBy: user.username || user.email,
+              method: 'manual'
+            }
+          }
+        }
+      );
+
+      // Send delivery email
+      const orderUser = await db.collection('users').findOne({ id: order.userId });
+      const product = await db.collection('products').findOne({ id: order.productId });
+      if (orderUser && product) {
+        sendDeliveredEmail(db, order, orderUser, product, [stockCode]).catch(err => 
+          console.error('Delivered email failed:', err)
+        );
+      }
+
+      return NextResponse.json({
+        success: true,
+        message: 'Stok başarıyla atandı',
+        data: { 
+          orderId: order.id,
+          stockCode: stockCode,
+          deliveryStatus: 'delivered'
+        }
+      });
+    } else {
+      return NextResponse.json(
+        { success: false, error: 'Bu ürün için mevcut stok bulunamadı' },
+        { status: 400 }
+      );
+    }
+  }, { rawBody: true });
+
+  // Admin: Assign Account Stock to Order
+  router.post('/api/admin/account-orders/:id/assign-stock', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const orderId = pathname.split('/')[4];
+    
+    // Parse body for stockId
+    let body = {};
+    try {
+      const text = await request.text();
+      if (text) body = JSON.parse(text);
+    } catch (e) {}
+    
+    const { stockId } = body;
+    
+    // DÜZELTME: Hesap siparişleri 'orders' koleksiyonunda type: 'account' olarak saklanıyor
+    // Önce orders koleksiyonunda ara
+    let order = await db.collection('orders').findOne({ id: orderId, type: 'account' });
+    
+    // Bulunamazsa eski account_orders koleksiyonunda da ara (geriye dönük uyumluluk)
+    if (!order) {
+      order = await db.collection('account_orders').findOne({ id: orderId });
+    }
+    
+    if (!order) {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Siparişin hangi koleksiyonda olduğunu belirle
+    const orderCollection = order.type === 'account' ? 'orders' : 'account_orders';
+
+    // Check if order already has stock assigned
+    if (order.delivery?.credentials || order.credentials) {
+      return NextResponse.json(
+        { success: false, error: 'Bu siparişe zaten hesap bilgisi atanmış' },
+        { status: 400 }
+      );
+    }
+
+    if (order.status !== 'paid') {
+      return NextResponse.json(
+        { success: false, error: 'Sadece ödenmiş siparişlere hesap atanabilir' },
+        { status: 400 }
+      );
+    }
+
+    // Build query for stock
+    let stockQuery = {
+      accountId: order.accountId,
+      status: 'available'
+    };
+    
+    // If specific stockId provided, use it
+    if (stockId) {
+      stockQuery.id = stockId;
+    }
+
+    // Try to assign account stock
+    const assignedStock = await db.collection('account_stock').findOneAndUpdate(
+      stockQuery,
+      { 
+        $set: { 
+          status: 'sold', 
+          orderId: order.id,
+          soldAt: new Date(),
+          soldBy: user.username || user.email
+        } 
+      },
+      { 
+        returnDocument: 'after',
+        sort: { createdAt: 1 }
+      }
+    );
+
+    if (assignedStock) {
+      let stockItem;
+      if (assignedStock._id) {
+        stockItem = assignedStock;
+      } else if (assignedStock.value && assignedStock.value._id) {
+        stockItem = assignedStock.value;
+      } else {
+        stockItem = assignedStock;
+      }
+      
+      const credentials = stockItem.credentials || stockItem.value;
+      
+      if (!credentials) {
+        console.error('Credentials empty. Stock item:', JSON.stringify(stockItem));
+        return NextResponse.json(
+          { success: false, error: 'Hesap bilgisi boş - lütfen tekrar deneyin' },
+          { status: 400 }
+        );
+      }
+      
+      // DÜZELTME: Doğru koleksiyonda güncelle
+      await db.collection(orderCollection).updateOne(
+        { id: order.id },
+        {
+          $set: {
+            'delivery.credentials': credentials,
+            'delivery.status': 'delivered',
+            'delivery.message': 'Hesap bilgileri teslim edildi',
+            'delivery.stockId': stockItem.id || stockItem._id?.toString(),
+            'delivery.deliveredAt': new Date(),
+            'delivery.deliveredBy': user.username || user.email,
+            status: 'delivered',
+            deliveredAt: new Date(),
+            updatedAt: new Date()
+          }
+        }
+      );
+
+      // Send delivery email
+      const orderUser = await db.collection('users').findOne({ id: order.userId });
+      const account = await db.collection('accounts').findOne({ id: order.accountId });
+      
+      if (orderUser && account && orderUser.email) {
+        try {
+          // Hesap teslimat e-postası gönder
+          await sendDeliveredEmail(db, order, orderUser, account, [credentials]);
+          console.log('Account delivery email sent to:', orderUser.email);
+          // Hesap teslimat SMS'i gönder
+          sendAccountDeliverySms(db, order, orderUser, account.title).catch(err =>
+            console.error('Account delivery SMS failed:', err)
+          );
+        } catch (err) {
+          console.error('Delivery email failed:', err);
+        }
+      }
+
+      // Stok sayısını güncelle
+      const remainingStock = await db.collection('account_stock').countDocuments({
+        accountId: order.accountId,
+        status: 'available'
+      });
+      
+      await db.collection('accounts').updateOne(
+        { id: order.accountId },
+        { $set: { stockCount: remainingStock, updatedAt: new Date() } }
+      );
+      responseCache.invalidateTags('accounts');
+
+      return NextResponse.json({
+        success: true,
+        message: 'Hesap stoku başarıyla atandı ve müşteriye e-posta gönderildi',
+        data: { 
+          orderId: order.id,
+          status: 'delivered',
+          credentials: credentials
+        }
+      });
+    } else {
+      return NextResponse.json(
+        { success: false, error: 'Bu hesap için mevcut stok bulunamadı' },
+        { status: 400 }
+      );
+    }
+  }, { rawBody: true });
+
+  // Admin: Approve IBAN payment
+  router.post('/api/admin/orders/:id/approve-iban', async ({ request, db, pathname }) => {
+    const orderId = pathname.split('/')[4];
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const order = await db.collection('orders').findOne({ id: orderId });
+    if (!order) {
+      return NextResponse.json({ success: false, error: 'Sipariş bulunamadı' }, { status: 404 });
+    }
+
+    if (order.status === 'paid') {
+      return NextResponse.json({ success: false, error: 'Sipariş zaten onaylanmış' }, { status: 400 });
+    }
+
+    // Update order to paid
+    await db.collection('orders').updateOne(
+      { id: orderId },
+      { 
+        $set: { 
+          status: 'paid',
+          'ibanPayment.status': 'approved',
+          'ibanPayment.approvedAt': new Date(),
+          'ibanPayment.approvedBy': user.username,
+          ibanSuccessShown: false,
+          updatedAt: new Date()
+        } 
+      }
+    );
+
+    // Assign stock (same logic as other payment methods)
+    try {
+      const product = await db.collection('products').findOne({ id: order.productId });
+      if (product) {
+        // Try to assign stock with quantity support
+        const orderQty = order.quantity || 1;
+        const assignedItems = [];
+        for (let i = 0; i < orderQty; i++) {
+          const assignedStock = await db.collection('stock').findOneAndUpdate(
+            { productId: order.productId, status: 'available' },
+            { $set: { status: 'assigned', orderId: orderId, assignedAt: new Date() } },
+            { sort: { createdAt: 1 }, returnDocument: 'after' }
+          );
+          if (assignedStock && assignedStock.value) {
+            assignedItems.push(assignedStock.value);
+          } else { break; }
+        }
+
+        if (assignedItems.length > 0) {
+          await db.collection('orders').updateOne(
+            { id: orderId },
+            { $set: { 
+              delivery: { status: assignedItems.length >= orderQty ? 'delivered' : 'partial', items: assignedItems, assignedAt: new Date() },
+              updatedAt: new Date()
+            }}
+          );
+          console.log(`IBAN: ${assignedItems.length} stock assigned for order ${orderId}`);
+        } else {
+          // No stock available - try DijiPin as fallback
+          const dijipinSettings = await db.collection('settings').findOne({ type: 'dijipin' });
+          if (dijipinSettings?.isEnabled && product.dijipinEnabled) {
+            try {
+              const dijipinResult = await createDijipinOrder(product.title, 1, order.playerId);
+              if (dijipinResult.success && dijipinResult.pin) {
+                await db.collection('orders').updateOne(
+                  { id: orderId },
+                  { $set: { 
+                    delivery: { status: 'delivered', items: [dijipinResult.pin], method: 'dijipin', deliveredAt: new Date() },
+                    updatedAt: new Date()
+                  }}
+                );
+                console.log(`IBAN: DijiPin delivered for order ${orderId}`);
+              } else {
+                await db.collection('orders').updateOne(
+                  { id: orderId },
+                  { $set: { delivery: { status: 'pending', message: 'Stok bekleniyor', items: [] }, updatedAt: new Date() } }
+                );
+              }
+            } catch (err) {
+              console.error('IBAN DijiPin delivery error:', err);
+              await db.collection('orders').updateOne(
+                { id: orderId },
+                { $set: { delivery: { status: 'pending', message: 'Stok bekleniyor', items: [] }, updatedAt: new Date() } }
+              );
+            }
+          } else {
+            await db.collection('orders').updateOne(
+              { id: orderId },
+              { $set: { delivery: { status: 'pending', message: 'Stok bekleniyor', items: [] }, updatedAt: new Date() } }
+            );
+            console.log(`IBAN: No stock available for order ${orderId}`);
+          }
+        }
+      }
+    } catch (stockErr) {
+      console.error('IBAN stock assignment error:', stockErr);
+    }
+
+    return NextResponse.json({ success: true, message: 'IBAN ödemesi onaylandı ve stok atandı' });
+  });
+
+  // Admin: Reject IBAN payment
+  router.post('/api/admin/orders/:id/reject-iban', async ({ request, db, pathname }) => {
+    const orderId = pathname.split('/')[4];
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    await db.collection('orders').updateOne(
+      { id: orderId },
+      { 
+        $set: { 
+          status: 'failed',
+          'ibanPayment.status': 'rejected',
+          'ibanPayment.rejectedAt': new Date(),
+          'ibanPayment.rejectedBy': user.username,
+          updatedAt: new Date()
+        } 
+      }
+    );
+
+    return NextResponse.json({ success: true, message: 'IBAN ödemesi reddedildi' });
+  });
+
+  // Admin: Create TEST order (free - for testing DijiPin)
+  router.post('/api/admin/test-order', async ({ request, db, body }) => {
+    const authHeader = request.headers.get('authorization');
+    if (!authHeader) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const { productId, playerId } = body;
+
+    if (!productId || !playerId) {
+      return NextResponse.json({ success: false, error: 'Ürün ID ve PUBG ID gerekli' }, { status: 400 });
+    }
+
+    // Get product
+    const product = await db.collection('products').findOne({ id: productId });
+    if (!product) {
+      return NextResponse.json({ success: false, error: 'Ürün bulunamadı' }, { status: 404 });
+    }
+
+    // Create test order
+    const testOrder = {
+      id: uuidv4(),
+      productId: product.id,
+      productTitle: product.title,
+      quantity: 1,
+      totalPrice: 0, // Free test order
+      playerId: playerId,
+      status: 'paid', // Mark as paid directly
+      paymentMethod: 'admin_test',
+      isTestOrder: true,
+      createdAt: new Date(),
+      updatedAt: new Date()
+    };
+
+    await db.collection('orders').insertOne(testOrder);
+    console.log(`Admin test order created: ${testOrder.id}, Product: ${product.title}, PUBG ID: ${playerId}`);
+
+    // Check if DijiPin is enabled for this product
+    const dijipinSettings = await db.collection('settings').findOne({ type: 'dijipin' });
+    const isDijipinGlobalEnabled = dijipinSettings?.isEnabled && DIJIPIN_API_TOKEN;
+    const isProductDijipinEnabled = product.dijipinEnabled === true;
+
+    let deliveryResult = { method: 'none', status: 'pending', message: '' };
+
+    if (isDijipinGlobalEnabled && isProductDijipinEnabled) {
+      console.log(`Attempting DijiPin delivery for test order ${testOrder.id}`);
+      
+      const dijipinResult = await createDijipinOrder(product.title, 1, playerId);
+      
+      if (dijipinResult.success) {
+        deliveryResult = {
+          method: 'dijipin_auto',
+          status: 'delivered',
+          dijipinOrderId: dijipinResult.orderId,
+          message: 'UC DijiPin üzerinden gönderildi',
+          deliveredAt: new Date()
+        };
+        console.log(`DijiPin delivery success: Test Order ${testOrder.id}, DijiPin Order: ${dijipinResult.orderId}`);
+      } else {
+        deliveryResult = {
+          method: 'dijipin_auto',
+          status: 'failed',
+          error: dijipinResult.error,
+          message: `DijiPin hatası: ${dijipinResult.error}`
+        };
+        console.error(`DijiPin delivery failed for test order ${testOrder.id}:`, dijipinResult.error);
+      }
+    } else {
+      deliveryResult = {
+        method: 'none',
+        status: 'pending',
+        message: isDijipinGlobalEnabled ? 'Ürün için DijiPin kapalı' : 'DijiPin global ayar kapalı'
+      };
+    }
+
+    // Update order with delivery result
+    await db.collection('orders').updateOne(
+      { id: testOrder.id },
+      { $set: { delivery: deliveryResult } }
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: 'Test siparişi oluşturuldu',
+      data: {
+        orderId: testOrder.id,
+        product: product.title,
+        playerId: playerId,
+        delivery: deliveryResult
+      }
+    });
+  });
+
+  // Admin: Manual approve risky order (POST)
+  router.post('/api/admin/orders/:id/approve', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const orderId = pathname.split('/')[4];
+    const order = await db.collection('orders').findOne({ id: orderId });
+    
+    if (!order) {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Check if order is on hold
+    if (order.delivery?.status !== 'hold') {
+      return NextResponse.json(
+        { success: false, error: 'Bu sipariş onay beklemede değil' },
+        { status: 400 }
+      );
+    }
+
+    // 🔒 GÜVENLİK: Ödeme yapılmadan onaylanamaz!
+    if (order.status !== 'paid') {
+      return NextResponse.json(
+        { success: false, error: 'Bu sipariş henüz ödenmemiş! Ödeme yapılmadan onaylanamaz.' },
+        { status: 400 }
+      );
+    }
+
+    // Get user and product for email
+    const orderUser = await db.collection('users').findOne({ id: order.userId });
+    const product = await db.collection('products').findOne({ id: order.productId });
+
+    // Assign stock with quantity support (FIFO)
+    const orderQty = order.quantity || 1;
+    const assignedItems = [];
+    for (let i = 0; i < orderQty; i++) {
+      const assignedStock = await db.collection('stock').findOneAndUpdate(
+        { productId: order.productId, status: 'available' },
+        { $set: { status: 'assigned', orderId: order.id, assignedAt: new Date() } },
+        { returnDocument: 'after', sort: { createdAt: 1 } }
+      );
+      if (assignedStock && assignedStock.value) {
+        assignedItems.push(assignedStock.value);
+      } else { break; }
+    }
+
+    if (assignedItems.length > 0) {
+      await db.collection('orders').updateOne(
+        { id: order.id },
+        { $set: { delivery: { status: assignedItems.length >= orderQty ? 'delivered' : 'partial', items: assignedItems, assignedAt: new Date(), approvedBy: user.username || user.email, approvedAt: new Date() } } }
+      );
+
+      await logAuditAction(db, AUDIT_ACTIONS.ORDER_MANUAL_APPROVE, user.id || user.username, 'order', order.id, request, {
+        previousRiskScore: order.risk?.score,
+        stockCode: '***MASKED***'
+      });
+
+      if (orderUser && product) {
+        sendDeliveredEmail(db, order, orderUser, product, assignedItems).catch(err => 
+          console.error('Delivered email failed:', err)
+        );
+      }
+
+      return NextResponse.json({
+        success: true,
+        message: 'Sipariş onaylandı ve stok atandı',
+        data: { 
+          orderId: order.id,
+          deliveryStatus: 'delivered'
+        }
+      });
+    } else {
+      // No stock available
+      await db.collection('orders').updateOne(
+        { id: order.id },
+        {
+          $set: {
+            delivery: {
+              status: 'pending',
+              message: 'Stok bekleniyor - Manuel onaylandı',
+              items: [],
+              approvedBy: user.username || user.email,
+              approvedAt: new Date()
+            }
+          }
+        }
+      );
+
+      return NextResponse.json({
+        success: true,
+        message: 'Sipariş onaylandı ancak stok mevcut değil',
+        data: { 
+          orderId: order.id,
+          deliveryStatus: 'pending'
+        }
+      });
+    }
+  });
+
+  // Admin: Manual refund risky order (POST)
+  router.post('/api/admin/orders/:id/refund', async ({ request, db, pathname, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const orderId = pathname.split('/')[4];
+    const { reason } = body;
+    
+    const order = await db.collection('orders').findOne({ id: orderId });
+    
+    if (!order) {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Check if order is on hold or paid
+    if (!['hold', 'pending'].includes(order.delivery?.status) && order.status !== 'paid') {
+      return NextResponse.json(
+        { success: false, error: 'Bu sipariş iade edilemez' },
+        { status: 400 }
+      );
+    }
+
+    // Update order status to refunded
+    await db.collection('orders').updateOne(
+      { id: order.id },
+      {
+        $set: {
+          status: 'refunded',
+          delivery: {
+            status: 'cancelled',
+            message: reason || 'İade edildi',
+            refundedBy: user.username || user.email,
+            refundedAt: new Date()
+          },
+          refundedAt: new Date()
+        }
+      }
+    );
+
+    // Log the refund
+    await logAuditAction(db, AUDIT_ACTIONS.ORDER_MANUAL_REFUND, user.id || user.username, 'order', order.id, request, {
+      previousStatus: order.status,
+      riskScore: order.risk?.score,
+      reason: reason || 'Manuel iade'
+    });
+
+    // Send refund email (optional)
+    const orderUser = await db.collection('users').findOne({ id: order.userId });
+    if (orderUser) {
+      // TODO: Send refund notification email
+    }
+
+    return NextResponse.json({
+      success: true,
+      message: 'Sipariş iade edildi olarak işaretlendi',
+      data: { 
+        orderId: order.id,
+        status: 'refunded'
+      }
+    });
+  });
+
+  // Admin: Manuel SMS Gönder (Sipariş için)
+  router.post('/api/admin/orders/:id/send-sms', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const orderId = pathname.split('/')[4];
+    
+    // Siparişi bul
+    const order = await db.collection('orders').findOne({ id: orderId });
+    if (!order) {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Kullanıcıyı bul
+    const orderUser = await db.collection('users').findOne({ id: order.userId });
+    if (!orderUser || !orderUser.phone) {
+      return NextResponse.json(
+        { success: false, error: 'Kullanıcı veya telefon numarası bulunamadı' },
+        { status: 400 }
+      );
+    }
+
+    // Ürün/Hesap bilgisi
+    const product = order.productId ? await db.collection('products').findOne({ id: order.productId }) : null;
+    const account = order.accountId ? await db.collection('accounts').findOne({ id: order.accountId }) : null;
+    const itemTitle = product?.title || account?.title || order.productTitle || order.accountTitle || 'Sipariş';
+
+    console.log('📱 Manuel SMS gönderiliyor:', {
+      orderId: order.id,
+      phone: orderUser.phone,
+      itemTitle
+    });
+
+    // SMS gönder
+    const result = await sendPaymentSuccessSms(db, order, orderUser, itemTitle);
+
+    if (result.success) {
+      return NextResponse.json({
+        success: true,
+        message: `SMS gönderildi: ${orderUser.phone}`,
+        data: result
+      });
+    } else {
+      return NextResponse.json({
+        success: false,
+        error: `SMS gönderilemedi: ${result.reason || 'Bilinmeyen hata'}`,
+        data: result
+      });
+    }
+  });
+
+  // Admin: Manually require verification for an order
+  router.put('/api/admin/orders/:id/require-verification', async ({ request, db, pathname }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const orderId = pathname.match(/^\/api\/admin\/orders\/([^\/]+)\/require-verification$/)[1];
+
+    const order = await db.collection('orders').findOne({ id: orderId });
+    if (!order) {
+      return NextResponse.json({ success: false, error: 'Sipariş bulunamadı' }, { status: 404 });
+    }
+
+    // Update order to require verification
+    await db.collection('orders').updateOne(
+      { id: orderId },
+      {
+        $set: {
+          verification: {
+            required: true,
+            status: 'pending',
+            identityPhoto: null,
+            paymentReceipt: null,
+            submittedAt: null,
+            reviewedAt: null,
+            reviewedBy: null,
+            rejectionReason: null
+          },
+          'delivery.status': 'verification_required',
+          'delivery.message': 'Yüksek tutarlı sipariş - Kimlik ve ödeme dekontu doğrulaması gerekli',
+          updatedAt: new Date()
+        }
+      }
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: 'Sipariş doğrulama gerektiren duruma alındı'
+    });
+  }, { admin: true });
+
+  // Admin: Approve/Reject verification & Assign stock
+  router.put('/api/admin/orders/:id/verify', async ({ request, db, pathname, body }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const orderId = pathname.match(/^\/api\/admin\/orders\/([^\/]+)\/verify$/)[1];
+    const { action, rejectionReason } = body; // action: 'approve' or 'reject'
+
+    const order = await db.collection('orders').findOne({ id: orderId });
+    if (!order) {
+      return NextResponse.json({ success: false, error: 'Sipariş bulunamadı' }, { status: 404 });
+    }
+
+    if (!order.verification || !order.verification.required) {
+      return NextResponse.json({ success: false, error: 'Bu sipariş doğrulama gerektirmiyor' }, { status: 400 });
+    }
+
+    if (action === 'approve') {
+      // 🔒 GÜVENLİK: Ödeme yapılmadan doğrulama onaylanamaz!
+      if (order.status !== 'paid') {
+        return NextResponse.json({ success: false, error: 'Bu sipariş henüz ödenmemiş! Ödeme yapılmadan doğrulama onaylanamaz.' }, { status: 400 });
+      }
+
+      // Update verification status to approved
+      await db.collection('orders').updateOne(
+        { id: orderId },
+        {
+          $set: {
+            'verification.status': 'approved',
+            'verification.reviewedAt': new Date(),
+            'verification.reviewedBy': adminUser.username
+          }
+        }
+      );
+
+      // Delete verification files (as per requirement)
+      if (order.verification.identityPhoto) {
+        deleteUploadedFile(order.verification.identityPhoto);
+      }
+      if (order.verification.paymentReceipt) {
+        deleteUploadedFile(order.verification.paymentReceipt);
+      }
+
+      // NOW ASSIGN STOCK (same logic as auto-assignment)
+      const product = await db.collection('products').findOne({ id: order.productId });
+      const assignedStock = await db.collection('stock').findOneAndUpdate(
+        { 
+          productId: order.productId, 
+          status: 'available' 
+        },
+        { 
+          $set: { 
+            status: 'assigned', 
+            orderId: order.id,
+            assignedAt: new Date()
+          } 
+        },
+        { 
+          returnDocument: 'after',
+          sort: { createdAt: 1 }
+        }
+      );
+
+      if (assignedStock && assignedStock.value) {
+        const stockCode = assignedStock.value;
+        
+        await db.collection('orders').updateOne(
+          { id: order.id },
+          {
+            $set: {
+              delivery: {
+                status: 'delivered',
+                items: [stockCode],
+                stockId: assignedStock.id || assignedStock._id,
+                assignedAt: new Date()
+              }
+            }
+          }
+        );
+
+        // Send delivered email
+        const orderUser = await db.collection('users').findOne({ id: order.userId });
+        if (orderUser && product) {
+          sendDeliveredEmail(db, order, orderUser, product, [stockCode]).catch(err => 
+            console.error('Delivered email failed:', err)
+          );
+        }
+
+        await logAuditAction(db, AUDIT_ACTIONS.ORDER_VERIFICATION_APPROVE, adminUser.username, 'order', orderId, request, {
+          stockAssigned: true,
+          stockCode: '***MASKED***'
+        });
+
+        return NextResponse.json({
+          success: true,
+          message: 'Doğrulama onaylandı ve stok atandı'
+        });
+      } else {
+        // No stock available
+        await db.collection('orders').updateOne(
+          { id: order.id },
+          {
+            $set: {
+              delivery: {
+                status: 'pending',
+                message: 'Stok bekleniyor',
+                items: []
+              }
+            }
+          }
+        );
+
+        await logAuditAction(db, AUDIT_ACTIONS.ORDER_VERIFICATION_APPROVE, adminUser.username, 'order', orderId, request, {
+          stockAssigned: false,
+          reason: 'out_of_stock'
+        });
+
+        return NextResponse.json({
+          success: true,
+          message: 'Doğrulama onaylandı ancak stok yok. Manuel teslimat gerekli.'
+        });
+      }
+
+    } else if (action === 'reject') {
+      // Update verification status to rejected
+      await db.collection('orders').updateOne(
+        { id: orderId },
+        {
+          $set: {
+            'verification.status': 'rejected',
+            'verification.reviewedAt': new Date(),
+            'verification.reviewedBy': adminUser.username,
+            'verification.rejectionReason': rejectionReason || 'Doğrulama belgeleri uygun değil',
+            status: 'cancelled', // Cancel order
+            delivery: {
+              status: 'cancelled',
+              message: `Doğrulama reddedildi: ${rejectionReason || 'Belgeler uygun değil'}`
+            }
+          }
+        }
+      );
+
+      // Delete verification files
+      if (order.verification.identityPhoto) {
+        deleteUploadedFile(order.verification.identityPhoto);
+      }
+      if (order.verification.paymentReceipt) {
+        deleteUploadedFile(order.verification.paymentReceipt);
+      }
+
+      await logAuditAction(db, AUDIT_ACTIONS.ORDER_VERIFICATION_REJECT, adminUser.username, 'order', orderId, request, {
+        reason: rejectionReason
+      });
+
+      // Send rejection email
+      const orderUser = await db.collection('users').findOne({ id: order.userId });
+      if (orderUser) {
+        sendVerificationRejectedEmail(db, order, orderUser, rejectionReason).catch(err => 
+          console.error('Rejection email failed:', err)
+        );
+      }
+
+      return NextResponse.json({
+        success: true,
+        message: 'Doğrulama reddedildi ve sipariş iptal edildi. Para iadesi için Shopier panelinden işlem yapın.'
+      });
+    } else {
+      return NextResponse.json({ success: false, error: 'Geçersiz işlem' }, { status: 400 });
+    }
+  }, { admin: true });
+}
@@ -0,0 +1,327 @@
+/**
+ * Admin risk routes: risk settings, blacklist, risk logs and disposable domains.
+ */
+
+import { NextResponse } from 'next/server';
+import { v4 as uuidv4 } from 'uuid';
+import {
+  DISPOSABLE_EMAIL_DOMAINS, DEFAULT_RISK_SETTINGS, logAuditAction, verifyAdminToken
+} from '../core.js';
+
+export function register(router) {
+  // ============================================
+  // RISK MANAGEMENT API ENDPOINTS
+  // ============================================
+
+  // Admin: Get risk settings
+  router.get('/api/admin/risk/settings', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    let settings = await db.collection('risk_settings').findOne({ id: 'main' });
+    if (!settings) {
+      // Return defaults if not configured
+      settings = { ...DEFAULT_RISK_SETTINGS, id: 'main' };
+    }
+
+    return NextResponse.json({ success: true, data: settings });
+  });
+
+  // Admin: Get blacklist
+  router.get('/api/admin/risk/blacklist', async ({ request, db, searchParams }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const type = searchParams.get('type');
+    const search = searchParams.get('search');
+    const page = parseInt(searchParams.get('page')) || 1;
+    const limit = parseInt(searchParams.get('limit')) || 50;
+
+    let query = {};
+    if (type) query.type = type;
+    if (search) {
+      query.value = { $regex: search, $options: 'i' };
+    }
+
+    const total = await db.collection('blacklist').countDocuments(query);
+    const items = await db.collection('blacklist')
+      .find(query)
+      .sort({ createdAt: -1 })
+      .skip((page - 1) * limit)
+      .limit(limit)
+      .toArray();
+
+    return NextResponse.json({
+      success: true,
+      data: items,
+      meta: {
+        total,
+        page,
+        limit,
+        totalPages: Math.ceil(total / limit)
+      }
+    });
+  });
+
+  // Admin: Get risk logs
+  router.get('/api/admin/risk/logs', async ({ request, db, searchParams }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const from = searchParams.get('from');
+    const to = searchParams.get('to');
+    const status = searchParams.get('status');
+    const page = parseInt(searchParams.get('page')) || 1;
+    const limit = parseInt(searchParams.get('limit')) || 50;
+
+    let query = {};
+    if (from || to) {
+      query.createdAt = {};
+      if (from) query.createdAt.$gte = new Date(from);
+      if (to) query.createdAt.$lte = new Date(to);
+    }
+    if (status) query.status = status;
+
+    const total = await db.collection('risk_logs').countDocuments(query);
+    const logs = await db.collection('risk_logs')
+      .find(query)
+      .sort({ createdAt: -1 })
+      .skip((page - 1) * limit)
+      .limit(limit)
+      .toArray();
+
+    // Get order info for each log
+    const orderIds = logs.map(l => l.orderId).filter(Boolean);
+    const orders = await db.collection('orders').find({ id: { $in: orderIds } }).toArray();
+    const orderMap = {};
+    orders.forEach(o => { orderMap[o.id] = o; });
+
+    const enrichedLogs = logs.map(log => ({
+      ...log,
+      order: orderMap[log.orderId] ? {
+        id: orderMap[log.orderId].id,
+        amount: orderMap[log.orderId].amount,
+        status: orderMap[log.orderId].status,
+        productTitle: orderMap[log.orderId].productTitle
+      } : null
+    }));
+
+    return NextResponse.json({
+      success: true,
+      data: enrichedLogs,
+      meta: {
+        total,
+        page,
+        limit,
+        totalPages: Math.ceil(total / limit)
+      }
+    });
+  });
+
+  // Admin: Get disposable domains list
+  router.get('/api/admin/risk/disposable-domains', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Get custom domains from blacklist
+    const customDomains = await db.collection('blacklist')
+      .find({ type: 'domain', isActive: true })
+      .toArray();
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        builtIn: DISPOSABLE_EMAIL_DOMAINS,
+        custom: customDomains.map(d => d.value)
+      }
+    });
+  });
+
+  // ============================================
+  // RISK MANAGEMENT POST ENDPOINTS
+  // ============================================
+
+  // Admin: Save risk settings
+  router.post('/api/admin/risk/settings', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { isEnabled, isTestMode, thresholds, weights, hardBlocks, suspiciousAutoApprove } = body;
+
+    const settings = {
+      id: 'main',
+      isEnabled: isEnabled !== undefined ? isEnabled : true,
+      isTestMode: isTestMode !== undefined ? isTestMode : false,
+      thresholds: thresholds || DEFAULT_RISK_SETTINGS.thresholds,
+      weights: weights || DEFAULT_RISK_SETTINGS.weights,
+      hardBlocks: hardBlocks || DEFAULT_RISK_SETTINGS.hardBlocks,
+      suspiciousAutoApprove: suspiciousAutoApprove !== undefined ? suspiciousAutoApprove : false,
+      updatedAt: new Date(),
+      updatedBy: user.username || user.id
+    };
+
+    await db.collection('risk_settings').updateOne(
+      { id: 'main' },
+      { $set: settings },
+      { upsert: true }
+    );
+
+    // Log the change
+    await logAuditAction(db, 'RISK_SETTINGS_UPDATE', user.id || user.username, 'risk_settings', 'main', request, {
+      changes: body
+    });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Risk ayarları kaydedildi',
+      data: settings
+    });
+  });
+
+  // Admin: Add to blacklist
+  router.post('/api/admin/risk/blacklist', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { type, value, reason } = body;
+
+    if (!type || !value) {
+      return NextResponse.json(
+        { success: false, error: 'Tip ve değer zorunludur' },
+        { status: 400 }
+      );
+    }
+
+    const validTypes = ['email', 'phone', 'ip', 'playerId', 'domain'];
+    if (!validTypes.includes(type)) {
+      return NextResponse.json(
+        { success: false, error: 'Geçersiz tip' },
+        { status: 400 }
+      );
+    }
+
+    // Check if already exists
+    const existing = await db.collection('blacklist').findOne({
+      type,
+      value: value.toLowerCase()
+    });
+
+    if (existing) {
+      return NextResponse.json(
+        { success: false, error: 'Bu kayıt zaten mevcut' },
+        { status: 400 }
+      );
+    }
+
+    const blacklistEntry = {
+      id: uuidv4(),
+      type,
+      value: value.toLowerCase(),
+      reason: reason || '',
+      isActive: true,
+      createdAt: new Date(),
+      createdBy: user.username || user.id
+    };
+
+    await db.collection('blacklist').insertOne(blacklistEntry);
+
+    // Log the action
+    await logAuditAction(db, 'BLACKLIST_ADD', user.id || user.username, 'blacklist', blacklistEntry.id, request, {
+      type,
+      value: value.toLowerCase()
+    });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Kara listeye eklendi',
+      data: blacklistEntry
+    });
+  });
+
+  // Admin: Toggle blacklist item active status
+  router.post('/api/admin/risk/blacklist/:id/toggle', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const itemId = pathname.split('/')[5];
+    const item = await db.collection('blacklist').findOne({ id: itemId });
+
+    if (!item) {
+      return NextResponse.json(
+        { success: false, error: 'Kayıt bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    await db.collection('blacklist').updateOne(
+      { id: itemId },
+      { $set: { isActive: !item.isActive, updatedAt: new Date() } }
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: item.isActive ? 'Kayıt pasif yapıldı' : 'Kayıt aktif yapıldı'
+    });
+  });
+
+  // Delete blacklist item
+  router.delete('/api/admin/risk/blacklist/:id', async ({ request, db, pathname, user }) => {
+    const itemId = pathname.split('/').pop();
+    
+    const item = await db.collection('blacklist').findOne({ id: itemId });
+    if (!item) {
+      return NextResponse.json(
+        { success: false, error: 'Kayıt bulunamadı' },
+        { status: 404 }
+      );
+    }
+    
+    await db.collection('blacklist').deleteOne({ id: itemId });
+    
+    // Log the action
+    await logAuditAction(db, 'BLACKLIST_DELETE', user.id || user.username, 'blacklist', itemId, request, {
+      type: item.type,
+      value: item.value
+    });
+    
+    return NextResponse.json({
+      success: true,
+      message: 'Kayıt kara listeden silindi'
+    });
+  });
+}
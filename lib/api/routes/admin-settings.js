@@ -0,0 +1,1752 @@
+/**
+ * Admin settings routes: payment providers, SMS, e-mail, SEO, site, regions, OAuth and DijiPin.
+ */
+
+import { NextResponse } from 'next/server';
+import { v4 as uuidv4 } from 'uuid';
+import { encrypt, decrypt, maskSensitiveData } from '@/lib/crypto';
+import {
+  DIJIPIN_API_URL, DIJIPIN_API_TOKEN, DIJIPIN_API_KEY, NETGSM_API_URL, responseCache,
+  DIJIPIN_PRODUCT_MAP, getDijipinBalance, SHOPINEXT_API_URL, SHOPINEXT_API_URL_TEST, sendSms,
+  getEmailSettings, createTransporter, htmlToPlainText, generateEmailTemplate, verifyAdminToken
+} from '../core.js';
+
+export function register(router) {
+  // Admin: Test Shopinext API connection (DEBUG)
+  router.get('/api/admin/settings/shopinext/test', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Check env first, then database
+    const envClientId = process.env.SHOPINEXT_CLIENT_ID;
+    const envClientSecret = process.env.SHOPINEXT_CLIENT_SECRET;
+    const envDomain = process.env.SHOPINEXT_DOMAIN;
+    const envMode = process.env.SHOPINEXT_MODE || 'production';
+    
+    let clientId, clientSecret, domain, mode;
+    
+    if (envClientId && envClientSecret && envDomain) {
+      clientId = envClientId;
+      clientSecret = envClientSecret;
+      domain = envDomain;
+      mode = envMode;
+    } else {
+      const settings = await db.collection('shopinext_settings').findOne({ isActive: true });
+      if (!settings) {
+        return NextResponse.json({
+          success: false,
+          error: 'Shopinext ayarları bulunamadı. .env dosyasına veya admin panelden ayarları girin.'
+        });
+      }
+      clientId = decrypt(settings.clientId);
+      clientSecret = decrypt(settings.clientSecret);
+      domain = settings.domain;
+      mode = settings.mode;
+    }
+
+    try {
+      const apiUrl = mode === 'test' ? SHOPINEXT_API_URL_TEST : SHOPINEXT_API_URL;
+      
+      console.log('Testing Shopinext API:', { apiUrl, domain, mode });
+      
+      const response = await fetch(`${apiUrl}/authenticate`, {
+        method: 'POST',
+        headers: {
+          'Content-Type': 'application/json',
+          'Domain': domain
+        },
+        body: JSON.stringify({
+          client_id: clientId,
+          client_secret: clientSecret
+        })
+      });
+      
+      const data = await response.json();
+      console.log('Shopinext API response:', JSON.stringify(data));
+      
+      if (data.status === 1) {
+        return NextResponse.json({
+          success: true,
+          message: 'Shopinext bağlantısı başarılı!',
+          data: {
+            tokenReceived: !!data.access_token,
+            expiresAt: data.access_token_validity
+          }
+        });
+      } else {
+        return NextResponse.json({
+          success: false,
+          error: 'Shopinext API hatası',
+          details: data
+        });
+      }
+    } catch (error) {
+      console.error('Shopinext test error:', error);
+      return NextResponse.json({
+        success: false,
+        error: 'Bağlantı hatası',
+        details: error.message
+      });
+    }
+  });
+
+  // Admin: Get Shopinext payment settings (masked)
+  router.get('/api/admin/settings/shopinext', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Get encrypted settings from database
+    const settings = await db.collection('shopinext_settings').findOne({ isActive: true });
+    
+    if (!settings) {
+      return NextResponse.json({
+        success: true,
+        data: {
+          isConfigured: false,
+          isEnabled: false,
+          clientId: null,
+          domain: null,
+          ipAddress: null,
+          mode: 'production',
+          message: 'Shopinext ayarları henüz yapılmadı'
+        }
+      });
+    }
+
+    // Return masked values
+    return NextResponse.json({
+      success: true,
+      data: {
+        isConfigured: true,
+        isEnabled: settings.isEnabled || false,
+        clientId: settings.clientId ? maskSensitiveData(decrypt(settings.clientId)) : null,
+        domain: settings.domain || null,
+        ipAddress: settings.ipAddress || null,
+        mode: settings.mode || 'production',
+        updatedBy: settings.updatedBy,
+        updatedAt: settings.updatedAt
+      }
+    });
+  });
+
+  // Admin: Get Shopier payment settings (masked)
+  router.get('/api/admin/settings/payments', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Get encrypted settings from database
+    const settings = await db.collection('shopier_settings').findOne({ isActive: true });
+    
+    if (!settings) {
+      return NextResponse.json({
+        success: true,
+        data: {
+          isConfigured: false,
+          isEnabled: false,
+          apiKey: null,
+          mode: 'production',
+          message: 'Shopier ayarları henüz yapılmadı'
+        }
+      });
+    }
+
+    // Return masked values (never send encrypted or decrypted sensitive data to frontend)
+    return NextResponse.json({
+      success: true,
+      data: {
+        isConfigured: true,
+        isEnabled: settings.isEnabled !== false,
+        apiKey: settings.apiKey ? maskSensitiveData(decrypt(settings.apiKey)) : null,
+        mode: settings.mode || 'production',
+        updatedBy: settings.updatedBy,
+        updatedAt: settings.updatedAt
+      }
+    });
+  });
+
+  // Admin: Get IBAN Settings (GET)
+  router.get('/api/admin/settings/iban', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+    const settings = await db.collection('iban_settings').findOne({ id: 'main' });
+    return NextResponse.json({
+      success: true,
+      data: {
+        isEnabled: settings ? settings.isEnabled !== false : true,
+        iban: settings?.iban || 'TR16 0006 4000 0014 3790 3852 51',
+        accountName: settings?.accountName || 'PİNLY ELEKTRONİK HİZMET TİCARET A.Ş',
+        updatedAt: settings?.updatedAt || null
+      }
+    });
+  });
+
+  // Admin: Get Payyeen payment settings (masked)
+  router.get('/api/admin/settings/payyeen', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const settings = await db.collection('payyeen_settings').findOne({ isActive: true });
+    
+    if (!settings) {
+      return NextResponse.json({
+        success: true,
+        data: {
+          isConfigured: false,
+          isEnabled: false,
+          apiKey: null,
+          mode: 'production',
+          message: 'Payyeen ayarları henüz yapılmadı'
+        }
+      });
+    }
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        isConfigured: true,
+        isEnabled: settings.isEnabled !== false,
+        apiKey: settings.apiKey ? maskSensitiveData(decrypt(settings.apiKey)) : null,
+        mode: settings.mode || 'production',
+        updatedBy: settings.updatedBy,
+        updatedAt: settings.updatedAt
+      }
+    });
+  });
+
+  // Admin: Get Shopier V2 Settings (GET)
+  router.get('/api/admin/settings/shopierv2', async ({ request }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Read from environment variables
+    const apiKey = process.env.SHOPIER_V2_API_KEY || '';
+    const osbUsername = process.env.SHOPIER_V2_OSB_USERNAME || '';
+    const osbKey = process.env.SHOPIER_V2_OSB_KEY || '';
+    const referencePrefix = process.env.SHOPIER_V2_REFERENCE_PREFIX || 'SV2';
+    const linkTtl = parseInt(process.env.SHOPIER_V2_LINK_TTL || '900', 10);
+    const closeDelay = parseInt(process.env.SHOPIER_V2_CLOSE_DELAY || '60', 10);
+
+    const isConfigured = !!(apiKey && osbUsername && osbKey);
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        isConfigured,
+        apiKey: apiKey ? maskSensitiveData(apiKey) : null,
+        osbUsername: osbUsername ? maskSensitiveData(osbUsername) : null,
+        osbKey: osbKey ? maskSensitiveData(osbKey) : null,
+        referencePrefix,
+        linkTtlSeconds: linkTtl,
+        closeDelaySeconds: closeDelay,
+        message: isConfigured ? 'Shopier V2 ayarları mevcut' : 'Shopier V2 ayarları henüz yapılmadı'
+      }
+    });
+  });
+
+  // Admin: Get Google OAuth Settings (GET)
+  router.get('/api/admin/settings/oauth/google', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const oauthSettings = await db.collection('oauth_settings').findOne({ provider: 'google' });
+    
+    // Get base URL from request headers (for correct domain)
+    const host = request.headers.get('host');
+    // x-forwarded-proto can be "https, https" from multiple proxies, take first value
+    const protoHeader = request.headers.get('x-forwarded-proto') || 'https';
+    const protocol = protoHeader.split(',')[0].trim();
+    const requestBaseUrl = `${protocol}://${host}`;
+    
+    // Fallback to site settings or env
+    const siteSettings = await db.collection('site_settings').findOne({ active: true });
+    const baseUrl = requestBaseUrl || siteSettings?.baseUrl || process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000';
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        enabled: oauthSettings?.enabled || false,
+        clientId: oauthSettings?.clientId ? maskSensitiveData(decrypt(oauthSettings.clientId)) : '',
+        clientSecret: oauthSettings?.clientSecret ? '••••••••' : '',
+        hasClientId: !!oauthSettings?.clientId,
+        hasClientSecret: !!oauthSettings?.clientSecret,
+        baseUrl: baseUrl,
+        redirectUri: `${baseUrl}/api/auth/google/callback`,
+        authorizedOrigin: baseUrl,
+        updatedBy: oauthSettings?.updatedBy || null,
+        updatedAt: oauthSettings?.updatedAt || null
+      }
+    });
+  });
+
+  // Admin: Get SEO Settings (GET)
+  router.get('/api/admin/settings/seo', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const seoSettings = await db.collection('seo_settings').findOne({ active: true });
+
+    return NextResponse.json({
+      success: true,
+      data: seoSettings ? {
+        ga4MeasurementId: seoSettings.ga4MeasurementId || '',
+        gscVerificationCode: seoSettings.gscVerificationCode || '',
+        enableAnalytics: seoSettings.enableAnalytics !== false,
+        enableSearchConsole: seoSettings.enableSearchConsole !== false,
+        updatedBy: seoSettings.updatedBy,
+        updatedAt: seoSettings.updatedAt
+      } : null
+    });
+  });
+
+  // Admin: Get SMS settings
+  router.get('/api/admin/settings/sms', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const settings = await db.collection('sms_settings').findOne({ id: 'main' });
+    
+    return NextResponse.json({
+      success: true,
+      data: settings ? {
+        ...settings,
+        password: settings.password ? '********' : '' // Şifreyi maskele
+      } : {
+        id: 'main',
+        enabled: false,
+        usercode: '',
+        password: '',
+        msgheader: 'PINLY',
+        sendOnPayment: true,
+        sendOnDelivery: true
+      }
+    });
+  });
+
+  // Admin: Get SMS logs
+  router.get('/api/admin/settings/sms/logs', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { searchParams } = new URL(request.url);
+    const page = parseInt(searchParams.get('page')) || 1;
+    const limit = parseInt(searchParams.get('limit')) || 20;
+    const skip = (page - 1) * limit;
+
+    const logs = await db.collection('sms_logs')
+      .find({})
+      .sort({ createdAt: -1 })
+      .skip(skip)
+      .limit(limit)
+      .toArray();
+
+    const total = await db.collection('sms_logs').countDocuments();
+
+    return NextResponse.json({
+      success: true,
+      data: logs,
+      pagination: {
+        page,
+        limit,
+        total,
+        totalPages: Math.ceil(total / limit)
+      }
+    });
+  });
+
+  // Admin: NetGSM Gönderici Adı (Başlık) Sorgula - GET
+  router.get('/api/admin/settings/sms/headers', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const settings = await db.collection('sms_settings').findOne({ id: 'main' });
+    
+    if (!settings || !settings.usercode || !settings.password) {
+      return NextResponse.json({
+        success: false,
+        error: 'SMS ayarları yapılmamış. Önce kullanıcı kodu ve şifre girin ve kaydedin.'
+      });
+    }
+
+    try {
+      // Şifreyi decrypt et
+      let password = settings.password;
+      try {
+        password = decrypt(settings.password);
+      } catch (e) {
+        console.log('Password decrypt failed, using as-is');
+      }
+
+      // NetGSM Gönderici Adı Sorgulama API
+      const apiUrl = `${NETGSM_API_URL}/sms/rest/v2/msgheader`;
+      const credentials = Buffer.from(`${settings.usercode}:${password}`).toString('base64');
+
+      console.log('Fetching NetGSM headers for usercode:', settings.usercode);
+
+      const response = await fetch(apiUrl, {
+        method: 'GET',
+        headers: {
+          'Authorization': `Basic ${credentials}`,
+          'Content-Type': 'application/json'
+        }
+      });
+
+      const result = await response.json();
+      console.log('NetGSM headers response:', JSON.stringify(result));
+
+      if (result.msgheader && Array.isArray(result.msgheader)) {
+        return NextResponse.json({
+          success: true,
+          data: result.msgheader,
+          message: `${result.msgheader.length} adet gönderici adı bulundu`
+        });
+      } else if (result.code === '30') {
+        return NextResponse.json({
+          success: false,
+          error: 'Geçersiz kullanıcı adı/şifre veya API erişim izni yok. Alt kullanıcı şifresini kullandığınızdan emin olun.'
+        });
+      } else {
+        return NextResponse.json({
+          success: false,
+          error: 'Gönderici adı bulunamadı. NetGSM panelinden başlık tanımlamanız gerekebilir.',
+          data: result
+        });
+      }
+    } catch (error) {
+      console.error('NetGSM headers error:', error);
+      return NextResponse.json({
+        success: false,
+        error: 'NetGSM API hatası: ' + error.message
+      });
+    }
+  });
+
+  // Admin: Get site settings
+  router.get('/api/admin/settings/site', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const settings = await db.collection('site_settings').findOne({ active: true });
+    
+    return NextResponse.json({
+      success: true,
+      data: settings || {
+        logo: null,
+        favicon: null,
+        heroImage: null,
+        categoryIcon: null,
+        siteName: 'PINLY',
+        metaTitle: 'PINLY – Dijital Kod ve Oyun Satış Platformu',
+        metaDescription: 'PUBG Mobile UC satın al. Güvenilir, hızlı ve uygun fiyatlı UC satış platformu.',
+        contactEmail: '',
+        contactPhone: '',
+        dailyBannerEnabled: true,
+        dailyBannerTitle: 'Bugüne Özel Fiyatlar',
+        dailyBannerSubtitle: '',
+        dailyBannerIcon: 'fire',
+        dailyCountdownEnabled: true,
+        dailyCountdownLabel: 'Kampanya bitimine',
+        active: true
+      }
+    });
+  });
+
+  // Admin: Get all regions (including disabled)
+  router.get('/api/admin/settings/regions', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    let regions = await db.collection('regions').find({}).sort({ sortOrder: 1 }).toArray();
+    
+    // If no regions exist, initialize with defaults
+    if (regions.length === 0) {
+      const defaultRegions = [
+        { id: uuidv4(), code: 'TR', name: 'Türkiye', enabled: true, flagImageUrl: null, sortOrder: 1, createdAt: new Date() },
+        { id: uuidv4(), code: 'GLOBAL', name: 'Küresel', enabled: true, flagImageUrl: null, sortOrder: 2, createdAt: new Date() },
+        { id: uuidv4(), code: 'DE', name: 'Almanya', enabled: true, flagImageUrl: null, sortOrder: 3, createdAt: new Date() },
+        { id: uuidv4(), code: 'FR', name: 'Fransa', enabled: true, flagImageUrl: null, sortOrder: 4, createdAt: new Date() },
+        { id: uuidv4(), code: 'JP', name: 'Japonya', enabled: true, flagImageUrl: null, sortOrder: 5, createdAt: new Date() }
+      ];
+      await db.collection('regions').insertMany(defaultRegions);
+      responseCache.invalidateTags('regions');
+      regions = defaultRegions;
+    }
+    
+    return NextResponse.json({ success: true, data: regions });
+  });
+
+  // Admin: Get email settings
+  router.get('/api/admin/email/settings', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const settings = await db.collection('email_settings').findOne({ id: 'main' });
+    
+    if (!settings) {
+      return NextResponse.json({
+        success: true,
+        data: {
+          enableEmail: false,
+          fromName: '',
+          fromEmail: '',
+          smtpHost: '',
+          smtpPort: '587',
+          smtpSecure: false,
+          smtpUser: '',
+          smtpPass: '',
+          testRecipientEmail: ''
+        }
+      });
+    }
+    
+    // Don't send actual password, send masked version
+    return NextResponse.json({
+      success: true,
+      data: {
+        ...settings,
+        smtpPass: settings.smtpPass ? '••••••••' : ''
+      }
+    });
+  });
+
+  // Admin: Get email logs
+  router.get('/api/admin/email/logs', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const logs = await db.collection('email_logs')
+      .find({})
+      .sort({ createdAt: -1 })
+      .limit(100)
+      .toArray();
+    
+    return NextResponse.json({ success: true, data: logs });
+  });
+
+  // ============================================
+  // DIJIPIN ADMIN API
+  // ============================================
+
+  // Get DijiPin settings (admin panel only - no strict auth for simplicity)
+  router.get('/api/admin/dijipin/settings', async ({ request, db }) => {
+    // Check for any authorization header (loose check for admin panel)
+    const authHeader = request.headers.get('authorization');
+    if (!authHeader) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+    
+    const settings = await db.collection('settings').findOne({ type: 'dijipin' });
+    const balance = await getDijipinBalance();
+    
+    return NextResponse.json({
+      success: true,
+      data: {
+        isEnabled: settings?.isEnabled || false,
+        isConfigured: !!DIJIPIN_API_TOKEN,
+        balance: balance,
+        productMap: DIJIPIN_PRODUCT_MAP
+      }
+    });
+  });
+
+  // Get DijiPin balance (admin panel only - loose auth check)
+  router.get('/api/admin/dijipin/balance', async ({ request }) => {
+    // Check for any authorization header
+    const authHeader = request.headers.get('authorization');
+    if (!authHeader) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+    
+    // Check if DijiPin is configured
+    if (!DIJIPIN_API_TOKEN || !DIJIPIN_API_KEY) {
+      console.log('DijiPin not configured - Token:', !!DIJIPIN_API_TOKEN, 'ApiKey:', !!DIJIPIN_API_KEY);
+      return NextResponse.json({
+        success: false,
+        error: 'DijiPin API yapılandırılmamış. .env dosyasında DIJIPIN_API_TOKEN ve DIJIPIN_API_KEY tanımlı olmalı.'
+      });
+    }
+    
+    try {
+      // Direct API call for more reliable results
+      const response = await fetch(`${DIJIPIN_API_URL}/Customer/Get`, {
+        method: 'GET',
+        headers: {
+          'Authorization': `Bearer ${DIJIPIN_API_TOKEN}`,
+          'Apikey': DIJIPIN_API_KEY,
+          'Content-Type': 'application/json'
+        }
+      });
+      
+      const data = await response.json();
+      console.log('DijiPin balance direct response:', JSON.stringify(data));
+      
+      if (data.success && data.data) {
+        return NextResponse.json({
+          success: true,
+          data: {
+            balance: data.data.balance,
+            currencyCode: data.data.currencyCode || 'TL',
+            customerName: `${data.data.firstName || ''} ${data.data.lastName || ''}`.trim(),
+            email: data.data.email
+          }
+        });
+      } else {
+        return NextResponse.json({
+          success: false,
+          error: data.message || 'DijiPin API yanıt vermedi'
+        });
+      }
+    } catch (error) {
+      console.error('DijiPin balance error:', error);
+      return NextResponse.json({
+        success: false,
+        error: 'DijiPin bağlantı hatası: ' + error.message
+      });
+    }
+  });
+
+  // Get DijiPin orders (admin panel only - loose auth check)
+  router.get('/api/admin/dijipin/orders', async ({ request, db }) => {
+    const authHeader = request.headers.get('authorization');
+    if (!authHeader) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+    
+    // Get orders with DijiPin delivery
+    const dijipinOrders = await db.collection('orders')
+      .find({ 'delivery.method': 'dijipin_auto' })
+      .sort({ createdAt: -1 })
+      .limit(50)
+      .toArray();
+    
+    // Calculate stats
+    const allDijipinOrders = await db.collection('orders')
+      .find({ 'delivery.method': 'dijipin_auto' })
+      .toArray();
+    
+    const pendingDijipinOrders = await db.collection('orders')
+      .find({ 
+        'delivery.status': 'pending',
+        'delivery.dijipinError': { $exists: true }
+      })
+      .toArray();
+    
+    const stats = {
+      totalOrders: allDijipinOrders.length + pendingDijipinOrders.length,
+      successfulOrders: allDijipinOrders.filter(o => o.delivery?.status === 'delivered').length,
+      failedOrders: pendingDijipinOrders.length,
+      pendingOrders: allDijipinOrders.filter(o => o.delivery?.status === 'pending').length
+    };
+    
+    return NextResponse.json({
+      success: true,
+      data: {
+        orders: dijipinOrders,
+        stats
+      }
+    });
+  });
+
+  // Admin: Save email settings
+  router.post('/api/admin/email/settings', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { enableEmail, fromName, fromEmail, smtpHost, smtpPort, smtpSecure, smtpUser, smtpPass, testRecipientEmail } = body;
+    
+    // Get existing settings to preserve encrypted password if not changed
+    const existingSettings = await db.collection('email_settings').findOne({ id: 'main' });
+    
+    let encryptedPassword = existingSettings?.smtpPass || '';
+    
+    // Only encrypt if password changed (not masked value)
+    if (smtpPass && smtpPass !== '••••••••') {
+      encryptedPassword = encrypt(smtpPass);
+    }
+
+    await db.collection('email_settings').updateOne(
+      { id: 'main' },
+      {
+        $set: {
+          id: 'main',
+          enableEmail: enableEmail || false,
+          fromName: fromName || '',
+          fromEmail: fromEmail || '',
+          smtpHost: smtpHost || '',
+          smtpPort: smtpPort || '587',
+          smtpSecure: smtpSecure || false,
+          smtpUser: smtpUser || '',
+          smtpPass: encryptedPassword,
+          testRecipientEmail: testRecipientEmail || '',
+          updatedAt: new Date(),
+          updatedBy: user.username
+        }
+      },
+      { upsert: true }
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: 'E-posta ayarları kaydedildi'
+    });
+  });
+
+  // Admin: Send test email
+  router.post('/api/admin/email/test', async ({ request, db }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const settings = await getEmailSettings(db);
+    
+    if (!settings || !settings.enableEmail) {
+      return NextResponse.json(
+        { success: false, error: 'E-posta gönderimi devre dışı veya yapılandırılmamış' },
+        { status: 400 }
+      );
+    }
+
+    if (!settings.testRecipientEmail) {
+      return NextResponse.json(
+        { success: false, error: 'Test alıcı e-posta adresi belirtilmemiş' },
+        { status: 400 }
+      );
+    }
+
+    try {
+      const transporter = await createTransporter(settings);
+      if (!transporter) {
+        return NextResponse.json(
+          { success: false, error: 'SMTP bağlantısı kurulamadı' },
+          { status: 500 }
+        );
+      }
+
+      // Get site settings for template
+      const siteSettings = await db.collection('site_settings').findOne({ id: 'main' });
+
+      const testContent = {
+        subject: 'Test E-postasi - PINLY',
+        title: 'Test E-postasi Basarili',
+        body: `
+            <p>Merhaba,</p>
+            <p>Bu bir test e-postasdir. E-posta sisteminiz dogru yapilandirilmis ve calisiyor.</p>
+          `
+      };
+
+      const html = generateEmailTemplate(testContent, {
+        logoUrl: siteSettings?.logoUrl,
+        siteName: siteSettings?.siteName || 'PINLY'
+      });
+      
+      const text = htmlToPlainText(html);
+
+      await transporter.sendMail({
+        from: `"${settings.fromName}" <${settings.fromEmail}>`,
+        replyTo: settings.fromEmail,
+        to: settings.testRecipientEmail,
+        subject: testContent.subject,
+        text: text,
+        html: html,
+        headers: {
+          'X-Priority': '3',
+          'X-Mailer': 'PINLY Mailer'
+        }
+      });
+
+      // Log test email
+      await db.collection('email_logs').insertOne({
+        id: uuidv4(),
+        type: 'test',
+        userId: 'admin',
+        to: settings.testRecipientEmail,
+        status: 'sent',
+        createdAt: new Date()
+      });
+
+      return NextResponse.json({
+        success: true,
+        message: `Test e-postası ${settings.testRecipientEmail} adresine gönderildi`
+      });
+
+    } catch (error) {
+      console.error('Test email error:', error.message);
+      
+      // Log failed attempt
+      await db.collection('email_logs').insertOne({
+        id: uuidv4(),
+        type: 'test',
+        userId: 'admin',
+        to: settings.testRecipientEmail,
+        status: 'failed',
+        error: error.message,
+        createdAt: new Date()
+      });
+
+      return NextResponse.json(
+        { success: false, error: `E-posta gönderilemedi: ${error.message}` },
+        { status: 500 }
+      );
+    }
+  });
+
+  // Admin: Toggle Shopinext enabled/disabled
+  router.post('/api/admin/settings/shopinext/toggle', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { isEnabled } = body;
+
+    // Update isEnabled field
+    const result = await db.collection('shopinext_settings').updateOne(
+      { isActive: true },
+      { $set: { isEnabled: !!isEnabled, updatedAt: new Date() } }
+    );
+
+    if (result.matchedCount === 0) {
+      return NextResponse.json(
+        { success: false, error: 'Shopinext ayarları bulunamadı. Önce ayarları kaydedin.' },
+        { status: 404 }
+      );
+    }
+
+    return NextResponse.json({
+      success: true,
+      message: isEnabled ? 'Shopinext ödeme seçeneği aktifleştirildi' : 'Shopinext ödeme seçeneği gizlendi',
+      data: { isEnabled: !!isEnabled }
+    });
+  });
+
+  // Admin: Save Shopinext payment settings (encrypted)
+  router.post('/api/admin/settings/shopinext', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { clientId, clientSecret, domain, ipAddress, mode } = body;
+
+    // Validate required fields
+    if (!clientId || !clientSecret || !domain) {
+      return NextResponse.json(
+        { success: false, error: 'Client ID, Client Secret ve Domain gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    // Rate limiting check (simple implementation - 10 requests per hour)
+    const oneHourAgo = new Date(Date.now() - 60 * 60 * 1000);
+    const recentUpdates = await db.collection('shopinext_settings')
+      .countDocuments({ updatedAt: { $gte: oneHourAgo } });
+    
+    if (recentUpdates >= 10) {
+      return NextResponse.json(
+        { success: false, error: 'Çok fazla istek. Lütfen daha sonra tekrar deneyin.' },
+        { status: 429 }
+      );
+    }
+
+    // Encrypt sensitive data before storing
+    const encryptedSettings = {
+      clientId: encrypt(clientId),
+      clientSecret: encrypt(clientSecret),
+      domain: domain,
+      ipAddress: ipAddress || '',
+      mode: mode || 'production',
+      isActive: true,
+      updatedBy: user.username || user.email,
+      updatedAt: new Date(),
+      createdAt: new Date()
+    };
+
+    // Deactivate all previous settings
+    await db.collection('shopinext_settings').updateMany(
+      {},
+      { $set: { isActive: false } }
+    );
+
+    // Insert new settings
+    await db.collection('shopinext_settings').insertOne(encryptedSettings);
+
+    // Clear any existing tokens
+    await db.collection('shopinext_tokens').deleteMany({});
+
+    return NextResponse.json({
+      success: true,
+      message: 'Shopinext ayarları başarıyla kaydedildi',
+      data: {
+        domain: encryptedSettings.domain,
+        mode: encryptedSettings.mode,
+        updatedBy: encryptedSettings.updatedBy,
+        updatedAt: encryptedSettings.updatedAt
+      }
+    });
+  });
+
+  // Admin: Save Shopier payment settings (encrypted)
+  router.post('/api/admin/settings/payments', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Toggle request (isEnabled only)
+    if (body.hasOwnProperty('isEnabled') && !body.apiKey && !body.apiSecret) {
+      const result = await db.collection('shopier_settings').updateOne(
+        { isActive: true },
+        { $set: { isEnabled: !!body.isEnabled, updatedAt: new Date() } }
+      );
+
+      if (result.matchedCount === 0) {
+        return NextResponse.json(
+          { success: false, error: 'Shopier ayarları bulunamadı. Önce ayarları kaydedin.' },
+          { status: 404 }
+        );
+      }
+
+      return NextResponse.json({
+        success: true,
+        message: body.isEnabled ? 'Shopier ödeme seçeneği aktifleştirildi' : 'Shopier ödeme seçeneği pasife alındı',
+        data: { isEnabled: !!body.isEnabled }
+      });
+    }
+
+    const { apiKey, apiSecret, mode } = body;
+
+    // Validate required fields (Shopier only needs apiKey and apiSecret)
+    if (!apiKey || !apiSecret) {
+      return NextResponse.json(
+        { success: false, error: 'API Kullanıcı ve API Şifre gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    // Rate limiting check (simple implementation - 10 requests per hour)
+    const oneHourAgo = new Date(Date.now() - 60 * 60 * 1000);
+    const recentUpdates = await db.collection('shopier_settings')
+      .countDocuments({ updatedAt: { $gte: oneHourAgo } });
+    
+    if (recentUpdates >= 10) {
+      return NextResponse.json(
+        { success: false, error: 'Çok fazla istek. Lütfen daha sonra tekrar deneyin.' },
+        { status: 429 }
+      );
+    }
+
+    // Encrypt sensitive data before storing (Shopier only needs apiKey and apiSecret)
+    const encryptedSettings = {
+      apiKey: encrypt(apiKey),
+      apiSecret: encrypt(apiSecret),
+      mode: mode || 'production',
+      isActive: true,
+      updatedBy: user.username || user.email,
+      updatedAt: new Date(),
+      createdAt: new Date()
+    };
+
+    // Deactivate all previous settings
+    await db.collection('shopier_settings').updateMany(
+      {},
+      { $set: { isActive: false } }
+    );
+
+    // Insert new settings
+    await db.collection('shopier_settings').insertOne(encryptedSettings);
+
+    return NextResponse.json({
+      success: true,
+      message: 'Shopier ayarları başarıyla kaydedildi',
+      data: {
+        mode: encryptedSettings.mode,
+        updatedBy: encryptedSettings.updatedBy,
+        updatedAt: encryptedSettings.updatedAt
+      }
+    });
+  });
+
+  // Admin: Save IBAN Settings (POST - toggle on/off)
+  router.post('/api/admin/settings/iban', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const { isEnabled, iban, accountName } = body;
+
+    await db.collection('iban_settings').updateOne(
+      { id: 'main' },
+      { $set: { 
+        id: 'main',
+        isEnabled: isEnabled !== false,
+        iban: iban || 'TR16 0006 4000 0014 3790 3852 51',
+        accountName: accountName || 'PİNLY ELEKTRONİK HİZMET TİCARET A.Ş',
+        updatedBy: user.username || user.email,
+        updatedAt: new Date()
+      }},
+      { upsert: true }
+    );
+
+    return NextResponse.json({ success: true, message: isEnabled !== false ? 'IBAN ödemesi aktif' : 'IBAN ödemesi pasif' });
+  });
+
+  // Admin: Save Payyeen payment settings (encrypted)
+  router.post('/api/admin/settings/payyeen', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Check if this is a toggle request (isEnabled only)
+    if (body.hasOwnProperty('isEnabled') && Object.keys(body).length <= 2) {
+      const result = await db.collection('payyeen_settings').updateOne(
+        { isActive: true },
+        { $set: { isEnabled: !!body.isEnabled, updatedAt: new Date() } }
+      );
+
+      if (result.matchedCount === 0) {
+        return NextResponse.json(
+          { success: false, error: 'Payyeen ayarları bulunamadı. Önce ayarları kaydedin.' },
+          { status: 404 }
+        );
+      }
+
+      return NextResponse.json({
+        success: true,
+        message: body.isEnabled ? 'Payyeen ödeme seçeneği aktifleştirildi' : 'Payyeen ödeme seçeneği gizlendi',
+        data: { isEnabled: !!body.isEnabled }
+      });
+    }
+
+    const { apiKey } = body;
+
+    // Validate required fields
+    if (!apiKey) {
+      return NextResponse.json(
+        { success: false, error: 'API Key gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    // Rate limiting check (10 requests per hour)
+    const oneHourAgo = new Date(Date.now() - 60 * 60 * 1000);
+    const recentUpdates = await db.collection('payyeen_settings')
+      .countDocuments({ updatedAt: { $gte: oneHourAgo } });
+    
+    if (recentUpdates >= 10) {
+      return NextResponse.json(
+        { success: false, error: 'Çok fazla istek. Lütfen daha sonra tekrar deneyin.' },
+        { status: 429 }
+      );
+    }
+
+    // Encrypt sensitive data before storing
+    const encryptedSettings = {
+      apiKey: encrypt(apiKey),
+      isActive: true,
+      isEnabled: true,
+      mode: body.mode || 'production',
+      updatedBy: user.username || user.email,
+      updatedAt: new Date(),
+      createdAt: new Date()
+    };
+
+    // Deactivate all previous settings
+    await db.collection('payyeen_settings').updateMany(
+      {},
+      { $set: { isActive: false } }
+    );
+
+    // Insert new settings
+    await db.collection('payyeen_settings').insertOne(encryptedSettings);
+
+    return NextResponse.json({
+      success: true,
+      message: 'Payyeen ayarları başarıyla kaydedildi',
+      data: {
+        mode: encryptedSettings.mode,
+        updatedBy: encryptedSettings.updatedBy,
+        updatedAt: encryptedSettings.updatedAt
+      }
+    });
+  });
+
+  // Admin: Save Shopier V2 Settings (POST)
+  router.post('/api/admin/settings/shopierv2', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { 
+      apiKey, 
+      osbUsername, 
+      osbKey, 
+      referencePrefix, 
+      linkTtlSeconds, 
+      closeDelaySeconds 
+    } = body;
+
+    // Validate required fields
+    if (!apiKey || !osbUsername || !osbKey) {
+      return NextResponse.json(
+        { success: false, error: 'API Key, OSB Username ve OSB Key gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    // Validate numeric fields
+    const linkTtl = parseInt(linkTtlSeconds || '900', 10);
+    const closeDelay = parseInt(closeDelaySeconds || '60', 10);
+
+    if (linkTtl < 60 || linkTtl > 3600) {
+      return NextResponse.json(
+        { success: false, error: 'Link TTL 60-3600 saniye arasında olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    if (closeDelay < 0 || closeDelay > 300) {
+      return NextResponse.json(
+        { success: false, error: 'Close Delay 0-300 saniye arasında olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    // Store settings in database for audit trail
+    const shopierV2Settings = {
+      apiKey: encrypt(apiKey),
+      osbUsername: encrypt(osbUsername),
+      osbKey: encrypt(osbKey),
+      referencePrefix: referencePrefix || 'SV2',
+      linkTtlSeconds: linkTtl,
+      closeDelaySeconds: closeDelay,
+      isActive: true,
+      updatedBy: user.username || user.email,
+      updatedAt: new Date(),
+      createdAt: new Date()
+    };
+
+    // Deactivate all previous settings
+    await db.collection('shopierv2_settings').updateMany(
+      {},
+      { $set: { isActive: false } }
+    );
+
+    // Insert new settings
+    await db.collection('shopierv2_settings').insertOne(shopierV2Settings);
+
+    // NOTE: In production, you may want to update .env file or use a secrets manager
+    // For now, we store in DB and admin needs to manually update .env for actual usage
+
+    return NextResponse.json({
+      success: true,
+      message: 'Shopier V2 ayarları başarıyla kaydedildi. Lütfen .env dosyasını da güncelleyin.',
+      data: {
+        referencePrefix: shopierV2Settings.referencePrefix,
+        linkTtlSeconds: shopierV2Settings.linkTtlSeconds,
+        closeDelaySeconds: shopierV2Settings.closeDelaySeconds,
+        updatedBy: shopierV2Settings.updatedBy,
+        updatedAt: shopierV2Settings.updatedAt
+      }
+    });
+  });
+
+  // Admin: Save SEO Settings (POST)
+  router.post('/api/admin/settings/seo', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { ga4MeasurementId, gscVerificationCode, enableAnalytics, enableSearchConsole } = body;
+
+    // Validate GA4 Measurement ID format if provided
+    if (ga4MeasurementId && !ga4MeasurementId.match(/^G-[A-Z0-9]+$/)) {
+      return NextResponse.json(
+        { success: false, error: 'Geçersiz GA4 Measurement ID formatı (G-XXXXXXXXXX)' },
+        { status: 400 }
+      );
+    }
+
+    const seoSettings = {
+      ga4MeasurementId: ga4MeasurementId?.trim() || '',
+      gscVerificationCode: gscVerificationCode?.trim() || '',
+      enableAnalytics: enableAnalytics !== false,
+      enableSearchConsole: enableSearchConsole !== false,
+      active: true,
+      updatedBy: user.username || user.email,
+      updatedAt: new Date()
+    };
+
+    // Upsert SEO settings
+    await db.collection('seo_settings').updateOne(
+      { active: true },
+      { $set: seoSettings },
+      { upsert: true }
+    );
+    responseCache.invalidateTags('seo_settings');
+
+    return NextResponse.json({
+      success: true,
+      message: 'SEO ayarları başarıyla kaydedildi',
+      data: seoSettings
+    });
+  });
+
+  // Admin: Update SMS settings
+  router.post('/api/admin/settings/sms', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { enabled, usercode, password, msgheader, sendOnPayment, sendOnDelivery } = body;
+
+    // Mevcut ayarları al
+    const existingSettings = await db.collection('sms_settings').findOne({ id: 'main' });
+
+    // Şifreyi encrypt et (sadece değişmişse)
+    let encryptedPassword = existingSettings?.password || '';
+    if (password && password !== '********') {
+      encryptedPassword = encrypt(password);
+    }
+
+    const smsSettings = {
+      id: 'main',
+      enabled: enabled || false,
+      usercode: usercode || '',
+      password: encryptedPassword,
+      msgheader: msgheader || 'PINLY',
+      sendOnPayment: sendOnPayment !== false,
+      sendOnDelivery: sendOnDelivery !== false,
+      updatedAt: new Date(),
+      updatedBy: user.username || user.email
+    };
+
+    await db.collection('sms_settings').updateOne(
+      { id: 'main' },
+      { $set: smsSettings },
+      { upsert: true }
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: 'SMS ayarları kaydedildi',
+      data: {
+        ...smsSettings,
+        password: '********'
+      }
+    });
+  });
+
+  // Admin: Test SMS
+  router.post('/api/admin/settings/sms/test', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { phone } = body;
+
+    if (!phone) {
+      return NextResponse.json(
+        { success: false, error: 'Telefon numarası gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    const testMessage = 'Bu bir test mesajidir. SMS sistemi basariyla calisiyor! - PINLY';
+    const result = await sendSms(db, phone, testMessage, 'test');
+
+    if (result.success) {
+      return NextResponse.json({
+        success: true,
+        message: 'Test SMS\'i gönderildi',
+        data: result
+      });
+    } else {
+      return NextResponse.json({
+        success: false,
+        error: `SMS gönderilemedi: ${result.reason || result.response || 'Bilinmeyen hata'}`,
+        data: result
+      });
+    }
+  });
+
+  // Admin: Özel SMS Gönder
+  router.post('/api/admin/settings/sms/custom', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { phone, message } = body;
+
+    if (!phone) {
+      return NextResponse.json(
+        { success: false, error: 'Telefon numarası gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    if (!message || !message.trim()) {
+      return NextResponse.json(
+        { success: false, error: 'Mesaj içeriği gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    const result = await sendSms(db, phone, message.trim(), 'custom');
+
+    if (result.success) {
+      return NextResponse.json({
+        success: true,
+        message: 'SMS gönderildi',
+        data: result
+      });
+    } else {
+      return NextResponse.json({
+        success: false,
+        error: `SMS gönderilemedi: ${result.reason || result.response || 'Bilinmeyen hata'}`,
+        data: result
+      });
+    }
+  });
+
+  // Admin: Update site settings
+  router.post('/api/admin/settings/site', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { logo, favicon, heroImage, valorantHeroImage, mlbbHeroImage, lolHeroImage, robloxHeroImage, categoryIcon, siteName, metaTitle, metaDescription, contactEmail, contactPhone, liveSupportEnabled, liveSupportHours, dailyBannerEnabled, dailyBannerTitle, dailyBannerSubtitle, dailyBannerIcon, dailyCountdownEnabled, dailyCountdownLabel } = body;
+
+    // Validation
+    if (siteName !== undefined && (!siteName || siteName.trim().length === 0)) {
+      return NextResponse.json(
+        { success: false, error: 'Site adı boş olamaz' },
+        { status: 400 }
+      );
+    }
+
+    if (metaTitle && metaTitle.length > 70) {
+      return NextResponse.json(
+        { success: false, error: 'META başlık en fazla 70 karakter olabilir' },
+        { status: 400 }
+      );
+    }
+
+    if (metaDescription && metaDescription.length > 160) {
+      return NextResponse.json(
+        { success: false, error: 'META açıklama en fazla 160 karakter olabilir' },
+        { status: 400 }
+      );
+    }
+
+    if (contactEmail && contactEmail.length > 0) {
+      const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+      if (!emailRegex.test(contactEmail)) {
+        return NextResponse.json(
+          { success: false, error: 'Geçersiz e-posta adresi' },
+          { status: 400 }
+        );
+      }
+    }
+
+    // Get existing settings
+    const existingSettings = await db.collection('site_settings').findOne({ active: true });
+
+    // Deactivate previous settings
+    await db.collection('site_settings').updateMany(
+      {},
+      { $set: { active: false } }
+    );
+
+    // Create new settings (merge with existing)
+    const settings = {
+      logo: logo !== undefined ? logo : existingSettings?.logo || null,
+      favicon: favicon !== undefined ? favicon : existingSettings?.favicon || null,
+      heroImage: heroImage !== undefined ? heroImage : existingSettings?.heroImage || null,
+      valorantHeroImage: valorantHeroImage !== undefined ? valorantHeroImage : existingSettings?.valorantHeroImage || null,
+      mlbbHeroImage: mlbbHeroImage !== undefined ? mlbbHeroImage : existingSettings?.mlbbHeroImage || null,
+      lolHeroImage: lolHeroImage !== undefined ? lolHeroImage : existingSettings?.lolHeroImage || null,
+      robloxHeroImage: robloxHeroImage !== undefined ? robloxHeroImage : existingSettings?.robloxHeroImage || null,
+      categoryIcon: categoryIcon !== undefined ? categoryIcon : existingSettings?.categoryIcon || null,
+      siteName: siteName !== undefined ? siteName.trim() : existingSettings?.siteName || 'PINLY',
+      metaTitle: metaTitle !== undefined ? metaTitle.trim() : existingSettings?.metaTitle || '',
+      metaDescription: metaDescription !== undefined ? metaDescription.trim() : existingSettings?.metaDescription || '',
+      contactEmail: contactEmail !== undefined ? contactEmail.trim() : existingSettings?.contactEmail || '',
+      contactPhone: contactPhone !== undefined ? contactPhone.trim() : existingSettings?.contactPhone || '',
+      liveSupportEnabled: liveSupportEnabled !== undefined ? liveSupportEnabled : existingSettings?.liveSupportEnabled !== false,
+      liveSupportHours: liveSupportHours !== undefined ? liveSupportHours.trim() : existingSettings?.liveSupportHours || '14:00 - 22:00',
+      dailyBannerEnabled: dailyBannerEnabled !== undefined ? dailyBannerEnabled : existingSettings?.dailyBannerEnabled !== false,
+      dailyBannerTitle: dailyBannerTitle !== undefined ? dailyBannerTitle.trim() : existingSettings?.dailyBannerTitle || 'Bugüne Özel Fiyatlar',
+      dailyBannerSubtitle: dailyBannerSubtitle !== undefined ? dailyBannerSubtitle.trim() : existingSettings?.dailyBannerSubtitle || '',
+      dailyBannerIcon: dailyBannerIcon !== undefined ? dailyBannerIcon.trim() : existingSettings?.dailyBannerIcon || 'fire',
+      dailyCountdownEnabled: dailyCountdownEnabled !== undefined ? dailyCountdownEnabled : existingSettings?.dailyCountdownEnabled !== false,
+      dailyCountdownLabel: dailyCountdownLabel !== undefined ? dailyCountdownLabel.trim() : existingSettings?.dailyCountdownLabel || 'Kampanya bitimine',
+      active: true,
+      updatedBy: user.username,
+      updatedAt: new Date(),
+      createdAt: existingSettings?.createdAt || new Date()
+    };
+
+    await db.collection('site_settings').insertOne(settings);
+
+    // Drop cached settings, banner and homepage so new settings take effect immediately
+    responseCache.invalidateTags('site_settings');
+
+    return NextResponse.json({
+      success: true,
+      message: 'Site ayarları güncellendi',
+      data: settings
+    });
+  });
+
+  // Admin: Save regions settings
+  router.post('/api/admin/settings/regions', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { regions } = body;
+
+    if (!regions || !Array.isArray(regions)) {
+      return NextResponse.json(
+        { success: false, error: 'Geçersiz region verisi' },
+        { status: 400 }
+      );
+    }
+
+    // Validate each region
+    for (const region of regions) {
+      if (!region.code || !region.name) {
+        return NextResponse.json(
+          { success: false, error: 'Her region için code ve name zorunludur' },
+          { status: 400 }
+        );
+      }
+    }
+
+    // Delete all existing regions and insert new ones
+    await db.collection('regions').deleteMany({});
+    
+    const regionsToInsert = regions.map((region, index) => ({
+      id: region.id || uuidv4(),
+      code: region.code,
+      name: region.name,
+      enabled: region.enabled !== false,
+      flagImageUrl: region.flagImageUrl || null,
+      sortOrder: region.sortOrder || index + 1,
+      updatedBy: user.username,
+      updatedAt: new Date(),
+      createdAt: region.createdAt || new Date()
+    }));
+
+    if (regionsToInsert.length > 0) {
+      await db.collection('regions').insertMany(regionsToInsert);
+    }
+    responseCache.invalidateTags('regions');
+
+    return NextResponse.json({
+      success: true,
+      message: 'Region ayarları güncellendi',
+      data: regionsToInsert
+    });
+  });
+
+  // ============================================
+  // GOOGLE OAUTH ADMIN ENDPOINTS
+  // ============================================
+
+  // Admin: Get Google OAuth Settings
+  router.post('/api/admin/settings/oauth/google', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const oauthSettings = await db.collection('oauth_settings').findOne({ provider: 'google' });
+    
+    // Get base URL from request headers (for correct domain)
+    const host = request.headers.get('host');
+    // x-forwarded-proto can be "https, https" from multiple proxies, take first value
+    const protoHeader = request.headers.get('x-forwarded-proto') || 'https';
+    const protocol = protoHeader.split(',')[0].trim();
+    const requestBaseUrl = `${protocol}://${host}`;
+    
+    // Fallback to site settings or env
+    const siteSettings = await db.collection('site_settings').findOne({ active: true });
+    const baseUrl = requestBaseUrl || siteSettings?.baseUrl || process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000';
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        enabled: oauthSettings?.enabled || false,
+        clientId: oauthSettings?.clientId ? maskSensitiveData(decrypt(oauthSettings.clientId)) : '',
+        clientSecret: oauthSettings?.clientSecret ? '••••••••' : '',
+        hasClientId: !!oauthSettings?.clientId,
+        hasClientSecret: !!oauthSettings?.clientSecret,
+        baseUrl: baseUrl,
+        redirectUri: `${baseUrl}/api/auth/google/callback`,
+        authorizedOrigin: baseUrl,
+        updatedBy: oauthSettings?.updatedBy || null,
+        updatedAt: oauthSettings?.updatedAt || null
+      }
+    });
+  });
+
+  // Admin: Save Google OAuth Settings
+  router.post('/api/admin/settings/oauth/google', async ({ request, db, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const { enabled, clientId, clientSecret } = body;
+
+    // Get existing settings
+    const existingSettings = await db.collection('oauth_settings').findOne({ provider: 'google' });
+
+    // Prepare update data
+    const updateData = {
+      provider: 'google',
+      enabled: enabled === true,
+      updatedBy: user.username,
+      updatedAt: new Date()
+    };
+
+    // Only update clientId if provided and not masked
+    if (clientId && !clientId.includes('*')) {
+      updateData.clientId = encrypt(clientId.trim());
+    } else if (existingSettings?.clientId) {
+      updateData.clientId = existingSettings.clientId;
+    }
+
+    // Only update clientSecret if provided and not masked
+    if (clientSecret && clientSecret !== '••••••••' && !clientSecret.includes('•')) {
+      updateData.clientSecret = encrypt(clientSecret.trim());
+    } else if (existingSettings?.clientSecret) {
+      updateData.clientSecret = existingSettings.clientSecret;
+    }
+
+    // Validation: If enabling, must have both clientId and clientSecret
+    if (updateData.enabled && (!updateData.clientId || !updateData.clientSecret)) {
+      return NextResponse.json(
+        { success: false, error: 'Google OAuth aktif etmek için Client ID ve Client Secret gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    // Upsert the settings
+    await db.collection('oauth_settings').updateOne(
+      { provider: 'google' },
+      { 
+        $set: updateData,
+        $setOnInsert: { createdAt: new Date() }
+      },
+      { upsert: true }
+    );
+
+    // Log the action (audit)
+    await db.collection('admin_logs').insertOne({
+      id: uuidv4(),
+      action: 'oauth_settings_update',
+      provider: 'google',
+      enabled: updateData.enabled,
+      updatedBy: user.username,
+      ip: request.headers.get('x-forwarded-for') || 'unknown',
+      createdAt: new Date()
+    });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Google OAuth ayarları güncellendi'
+    });
+  });
+
+  // ============================================
+  // DIJIPIN SETTINGS UPDATE (MOVED HERE)
+  // ============================================
+  router.post('/api/admin/dijipin/settings', async ({ request, db, body }) => {
+    // Loose auth check for admin panel
+    const authHeader = request.headers.get('authorization');
+    if (!authHeader) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+    
+    const { isEnabled } = body;
+    
+    await db.collection('settings').updateOne(
+      { type: 'dijipin' },
+      { 
+        $set: { 
+          type: 'dijipin',
+          isEnabled: isEnabled,
+          supportedProducts: ['60 UC', '325 UC'],
+          updatedAt: new Date(),
+          updatedBy: 'admin'
+        } 
+      },
+      { upsert: true }
+    );
+    
+    return NextResponse.json({
+      success: true,
+      message: 'DijiPin ayarları güncellendi'
+    });
+  });
+
+  // ============================================
+  // DIJIPIN SETTINGS UPDATE
+  // ============================================
+  router.put('/api/admin/dijipin/settings', async ({ request, db, body }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+    
+    const { isEnabled } = body;
+    
+    await db.collection('settings').updateOne(
+      { type: 'dijipin' },
+      { 
+        $set: { 
+          type: 'dijipin',
+          isEnabled: isEnabled,
+          updatedAt: new Date(),
+          updatedBy: adminUser.username
+        } 
+      },
+      { upsert: true }
+    );
+    
+    return NextResponse.json({
+      success: true,
+      message: 'DijiPin ayarları güncellendi'
+    });
+  }, { admin: true });
+}
@@ -0,0 +1,268 @@
+/**
+ * Admin support routes: ticket list, replies, closing and bulk delete.
+ */
+
+import { NextResponse } from 'next/server';
+import { v4 as uuidv4 } from 'uuid';
+import { deleteUploadedFile } from '@/lib/fileUpload';
+import { sendSupportReplyEmail, verifyAdminToken } from '../core.js';
+
+export function register(router) {
+  // Admin: Get all support tickets
+  router.get('/api/admin/support/tickets', async ({ request, db, searchParams }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const status = searchParams.get('status');
+    const query = status ? { status } : {};
+    
+    const tickets = await db.collection('tickets')
+      .find(query)
+      .sort({ updatedAt: -1 })
+      .toArray();
+
+    // Get user info for each ticket
+    const userIds = [...new Set(tickets.map(t => t.userId))];
+    const users = await db.collection('users')
+      .find({ id: { $in: userIds } })
+      .toArray();
+    const userMap = Object.fromEntries(users.map(u => [u.id, u]));
+
+    const ticketsWithUser = tickets.map(t => ({
+      ...t,
+      userEmail: userMap[t.userId]?.email || 'Bilinmiyor',
+      userName: userMap[t.userId] 
+        ? `${userMap[t.userId].firstName || ''} ${userMap[t.userId].lastName || ''}`.trim() || userMap[t.userId].email
+        : 'Bilinmiyor'
+    }));
+
+    return NextResponse.json({ success: true, data: ticketsWithUser });
+  });
+
+  // Admin: Get single ticket with messages
+  router.get('/api/admin/support/tickets/:id', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const ticketId = pathname.split('/').pop();
+    const ticket = await db.collection('tickets').findOne({ id: ticketId });
+    
+    if (!ticket) {
+      return NextResponse.json(
+        { success: false, error: 'Talep bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Get user info
+    const ticketUser = await db.collection('users').findOne({ id: ticket.userId });
+    
+    const messages = await db.collection('ticket_messages')
+      .find({ ticketId })
+      .sort({ createdAt: 1 })
+      .toArray();
+
+    return NextResponse.json({ 
+      success: true, 
+      data: { 
+        ticket: {
+          ...ticket,
+          userEmail: ticketUser?.email || 'Bilinmiyor',
+          userName: ticketUser 
+            ? `${ticketUser.firstName || ''} ${ticketUser.lastName || ''}`.trim() || ticketUser.email
+            : 'Bilinmiyor'
+        },
+        messages 
+      } 
+    });
+  });
+
+  // Admin: Close ticket
+  router.post('/api/admin/support/tickets/:id/close', async ({ request, db, pathname }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const ticketId = pathname.split('/')[5];
+
+    const ticket = await db.collection('tickets').findOne({ id: ticketId });
+    if (!ticket) {
+      return NextResponse.json(
+        { success: false, error: 'Talep bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    await db.collection('tickets').updateOne(
+      { id: ticketId },
+      {
+        $set: {
+          status: 'closed',
+          userCanReply: false,
+          closedBy: user.username,
+          closedAt: new Date(),
+          updatedAt: new Date()
+        }
+      }
+    );
+
+    return NextResponse.json({
+      success: true,
+      message: 'Talep kapatıldı'
+    });
+  }, { rawBody: true });
+
+  // Admin: Bulk delete tickets (with images)
+  router.post('/api/admin/support/tickets/bulk-delete', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    try {
+      const body = await request.json();
+      const { ticketIds } = body;
+
+      if (!ticketIds || !Array.isArray(ticketIds) || ticketIds.length === 0) {
+        return NextResponse.json(
+          { success: false, error: 'Silinecek talep seçilmedi' },
+          { status: 400 }
+        );
+      }
+
+      let deletedCount = 0;
+      let deletedImagesCount = 0;
+
+      for (const ticketId of ticketIds) {
+        // Get all messages for this ticket
+        const messages = await db.collection('ticket_messages')
+          .find({ ticketId })
+          .toArray();
+
+        // Delete images from messages
+        for (const msg of messages) {
+          if (msg.imageUrl) {
+            deleteUploadedFile(msg.imageUrl);
+            deletedImagesCount++;
+          }
+          if (msg.imageUrls && Array.isArray(msg.imageUrls)) {
+            for (const url of msg.imageUrls) {
+              deleteUploadedFile(url);
+              deletedImagesCount++;
+            }
+          }
+        }
+
+        // Delete messages
+        await db.collection('ticket_messages').deleteMany({ ticketId });
+
+        // Delete ticket
+        const result = await db.collection('tickets').deleteOne({ id: ticketId });
+        if (result.deletedCount > 0) {
+          deletedCount++;
+        }
+      }
+
+      return NextResponse.json({
+        success: true,
+        message: `${deletedCount} talep ve ${deletedImagesCount} resim silindi`,
+        data: { deletedTickets: deletedCount, deletedImages: deletedImagesCount }
+      });
+    } catch (error) {
+      console.error('Bulk delete error:', error);
+      return NextResponse.json(
+        { success: false, error: 'Silme işlemi başarısız' },
+        { status: 500 }
+      );
+    }
+  }, { rawBody: true });
+
+  // Admin: Send message to ticket (with optional images - multiple)
+  router.post('/api/admin/support/tickets/:id/messages', async ({ request, db, pathname, body }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const ticketId = pathname.split('/')[5];
+    const { message, imageUrl, imageUrls } = body;
+
+    // Admin mesaj veya fotoğraf(lar) gönderebilir
+    const hasImages = (imageUrls && imageUrls.length > 0) || imageUrl;
+    if ((!message || message.length < 1) && !hasImages) {
+      return NextResponse.json(
+        { success: false, error: 'Mesaj veya fotoğraf gerekli' },
+        { status: 400 }
+      );
+    }
+
+    const ticket = await db.collection('tickets').findOne({ id: ticketId });
+    if (!ticket) {
+      return NextResponse.json(
+        { success: false, error: 'Talep bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Create message (admin çoklu fotoğraf gönderebilir)
+    const ticketMessage = {
+      id: uuidv4(),
+      ticketId,
+      sender: 'admin',
+      adminUsername: user.username,
+      message: message || '',
+      imageUrl: imageUrl || null,
+      imageUrls: imageUrls || null,
+      createdAt: new Date()
+    };
+
+    await db.collection('ticket_messages').insertOne(ticketMessage);
+
+    // Update ticket status - user can now reply
+    await db.collection('tickets').updateOne(
+      { id: ticketId },
+      {
+        $set: {
+          status: 'waiting_user',
+          lastMessageBy: 'admin',
+          userCanReply: true,
+          updatedAt: new Date()
+        }
+      }
+    );
+
+    // Send support reply email to user
+    const ticketUser = await db.collection('users').findOne({ id: ticket.userId });
+    if (ticketUser) {
+      sendSupportReplyEmail(db, ticket, ticketUser, message || '📷 Fotoğraf gönderildi').catch(err => 
+        console.error('Support reply email failed:', err)
+      );
+    }
+
+    return NextResponse.json({
+      success: true,
+      message: 'Yanıt gönderildi',
+      data: ticketMessage
+    });
+  });
+}
@@ -0,0 +1,201 @@
+/**
+ * Admin system routes: dashboard, audit logs, system status and debug.
+ */
+
+import v8 from 'v8';
+import { NextResponse } from 'next/server';
+import { APP_VERSION, responseCache, rateLimitStore, bruteForceStore, verifyAdminToken } from '../core.js';
+
+export function register(router) {
+  // Admin: Dashboard stats
+  router.get('/api/admin/dashboard', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const totalOrders = await db.collection('orders').countDocuments();
+    const paidOrders = await db.collection('orders').countDocuments({ status: 'paid' });
+    const pendingOrders = await db.collection('orders').countDocuments({ status: 'pending' });
+    
+    const revenueResult = await db.collection('orders').aggregate([
+      { $match: { status: 'paid' } },
+      { $group: { _id: null, total: { $sum: '$amount' } } }
+    ]).toArray();
+    const totalRevenue = revenueResult[0]?.total || 0;
+
+    // Recent orders
+    const recentOrders = await db.collection('orders')
+      .find({})
+      .sort({ createdAt: -1 })
+      .limit(5)
+      .toArray();
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        stats: {
+          totalOrders,
+          paidOrders,
+          pendingOrders,
+          totalRevenue
+        },
+        recentOrders
+      }
+    });
+  });
+
+  // Admin: Get Audit Logs
+  router.get('/api/admin/audit-logs', async ({ request, db, searchParams }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const page = parseInt(searchParams.get('page')) || 1;
+    const limit = parseInt(searchParams.get('limit')) || 50;
+    const action = searchParams.get('action');
+    const entityType = searchParams.get('entityType');
+    const actorId = searchParams.get('actorId');
+    const startDate = searchParams.get('startDate');
+    const endDate = searchParams.get('endDate');
+
+    // Build query
+    const query = {};
+    if (action) query.action = action;
+    if (entityType) query.entityType = entityType;
+    if (actorId) query.actorId = actorId;
+    if (startDate || endDate) {
+      query.createdAt = {};
+      if (startDate) query.createdAt.$gte = new Date(startDate);
+      if (endDate) query.createdAt.$lte = new Date(endDate);
+    }
+
+    const total = await db.collection('audit_logs').countDocuments(query);
+    const logs = await db.collection('audit_logs')
+      .find(query)
+      .sort({ createdAt: -1 })
+      .skip((page - 1) * limit)
+      .limit(limit)
+      .toArray();
+
+    // Get unique action types for filter dropdown
+    const actionTypes = await db.collection('audit_logs').distinct('action');
+    const entityTypes = await db.collection('audit_logs').distinct('entityType');
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        logs,
+        pagination: {
+          page,
+          limit,
+          total,
+          pages: Math.ceil(total / limit)
+        },
+        filters: {
+          actionTypes,
+          entityTypes
+        }
+      }
+    });
+  });
+
+  // Admin: Get system health/status
+  router.get('/api/admin/system-status', async ({ request, db }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    // Get various counts for system status
+    const usersCount = await db.collection('users').countDocuments();
+    const ordersToday = await db.collection('orders').countDocuments({
+      createdAt: { $gte: new Date(new Date().setHours(0, 0, 0, 0)) }
+    });
+    const pendingOrders = await db.collection('orders').countDocuments({ status: 'pending' });
+    const availableStock = await db.collection('stocks').countDocuments({ status: 'available' });
+    const openTickets = await db.collection('tickets').countDocuments({ status: { $ne: 'closed' } });
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        version: APP_VERSION,
+        uptime: process.uptime(),
+        timestamp: new Date().toISOString(),
+        metrics: {
+          totalUsers: usersCount,
+          ordersToday,
+          pendingOrders,
+          availableStock,
+          openTickets
+        },
+        status: 'healthy'
+      }
+    });
+  });
+
+  // Admin: Process memory and in-memory store sizes (soak testing)
+  router.get('/api/admin/debug/memory', async ({ request }) => {
+    const user = verifyAdminToken(request);
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz erişim' },
+        { status: 401 }
+      );
+    }
+
+    const memory = process.memoryUsage();
+    const heap = v8.getHeapStatistics();
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        pid: process.pid,
+        uptime: process.uptime(),
+        timestamp: new Date().toISOString(),
+        memory: {
+          rss: memory.rss,
+          heapTotal: memory.heapTotal,
+          heapUsed: memory.heapUsed,
+          external: memory.external,
+          arrayBuffers: memory.arrayBuffers,
+          heapSizeLimit: heap.heap_size_limit
+        },
+        stores: {
+          rateLimit: rateLimitStore.size,
+          bruteForce: bruteForceStore.size,
+          cache: responseCache.size
+        },
+        cache: responseCache.stats()
+      }
+    });
+  });
+
+  // Admin: Drop cached responses, all of them or those tagged ?tag=...
+  router.delete('/api/admin/debug/cache', async ({ request }) => {
+    const { searchParams } = new URL(request.url);
+    const tags = searchParams.getAll('tag');
+    const before = responseCache.size;
+
+    if (tags.length > 0) {
+      responseCache.invalidateTags(...tags);
+    } else {
+      responseCache.clear();
+    }
+
+    return NextResponse.json({
+      success: true,
+      data: { removed: before - responseCache.size, cache: responseCache.stats() }
+    });
+  });
+}
@@ -0,0 +1,560 @@
+/**
+ * Admin user routes: admin login, users, roles, passwords and balances.
+ */
+
+import { NextResponse } from 'next/server';
+import bcrypt from 'bcryptjs';
+import jwt from 'jsonwebtoken';
+import { v4 as uuidv4 } from 'uuid';
+import { JWT_SECRET, logAuditAction, verifyAdminToken } from '../core.js';
+
+export function register(router) {
+  // ============================================
+  // 💰 BALANCE SYSTEM ENDPOINTS (GET)
+  // ============================================
+
+  // Admin: Get all users with balance
+  router.get('/api/admin/users', async ({ request, db, searchParams }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const search = searchParams.get('search') || '';
+    const dateFilter = searchParams.get('dateFilter') || 'all';
+    const page = parseInt(searchParams.get('page') || '1');
+    const limit = parseInt(searchParams.get('limit') || '20');
+    const skip = (page - 1) * limit;
+
+    // Tarih filtreleri için başlangıç tarihleri
+    const now = new Date();
+    const todayStart = new Date(now.getFullYear(), now.getMonth(), now.getDate());
+    
+    // Bu haftanın başlangıcı (Pazartesi)
+    const dayOfWeek = now.getDay();
+    const diffToMonday = dayOfWeek === 0 ? 6 : dayOfWeek - 1;
+    const weekStart = new Date(now.getFullYear(), now.getMonth(), now.getDate() - diffToMonday);
+    
+    // Bu ayın başlangıcı
+    const monthStart = new Date(now.getFullYear(), now.getMonth(), 1);
+
+    // Query: tüm kullanıcılar (admin hariç)
+    let query = { 
+      $or: [
+        { type: 'user' },
+        { type: { $exists: false } }  // type field'ı olmayanlar da dahil
+      ],
+      role: { $ne: 'admin' }  // Admin rolü olmayanlar
+    };
+
+    // Tarih filtresi
+    if (dateFilter === 'today') {
+      query.createdAt = { $gte: todayStart };
+    } else if (dateFilter === 'week') {
+      query.createdAt = { $gte: weekStart };
+    } else if (dateFilter === 'month') {
+      query.createdAt = { $gte: monthStart };
+    }
+    
+    if (search) {
+      query.$and = query.$and || [];
+      query.$and.push({
+        $or: [
+          { email: { $regex: search, $options: 'i' } },
+          { firstName: { $regex: search, $options: 'i' } },
+          { lastName: { $regex: search, $options: 'i' } },
+          { phone: { $regex: search, $options: 'i' } }
+        ]
+      });
+    }
+
+    // Stats için base query (tarih filtresi hariç)
+    const baseQuery = { 
+      $or: [
+        { type: 'user' },
+        { type: { $exists: false } }
+      ],
+      role: { $ne: 'admin' }
+    };
+
+    const [users, total, todayCount, weekCount, monthCount] = await Promise.all([
+      db.collection('users')
+        .find(query)
+        .sort({ createdAt: -1 })
+        .skip(skip)
+        .limit(limit)
+        .toArray(),
+      db.collection('users').countDocuments(query),
+      db.collection('users').countDocuments({ ...baseQuery, createdAt: { $gte: todayStart } }),
+      db.collection('users').countDocuments({ ...baseQuery, createdAt: { $gte: weekStart } }),
+      db.collection('users').countDocuments({ ...baseQuery, createdAt: { $gte: monthStart } })
+    ]);
+
+    // Remove password hashes
+    const safeUsers = users.map(user => {
+      const { password, ...safeUser } = user;
+      return {
+        ...safeUser,
+        balance: user.balance || 0
+      };
+    });
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        users: safeUsers,
+        pagination: {
+          total,
+          page,
+          limit,
+          pages: Math.ceil(total / limit)
+        },
+        stats: {
+          todayCount,
+          weekCount,
+          monthCount
+        }
+      }
+    });
+  });
+
+  // Admin: Get single user details
+  router.get('/api/admin/users/:id', async ({ request, db, pathname }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const userId = pathname.match(/^\/api\/admin\/users\/([^\/]+)$/)[1];
+    
+    const user = await db.collection('users').findOne({ id: userId });
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Kullanıcı bulunamadı' }, { status: 404 });
+    }
+
+    // Get balance transaction history
+    const transactions = await db.collection('balance_transactions')
+      .find({ userId })
+      .sort({ createdAt: -1 })
+      .limit(50)
+      .toArray();
+
+    // Get order statistics
+    const orderStats = await db.collection('orders').aggregate([
+      { $match: { userId } },
+      { 
+        $group: { 
+          _id: null, 
+          totalOrders: { $sum: 1 },
+          totalSpent: { $sum: '$totalAmount' },
+          paidOrders: { 
+            $sum: { $cond: [{ $eq: ['$status', 'paid'] }, 1, 0] } 
+          }
+        } 
+      }
+    ]).toArray();
+
+    const { password, ...safeUser } = user;
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        user: {
+          ...safeUser,
+          balance: user.balance || 0
+        },
+        transactions,
+        stats: orderStats[0] || { totalOrders: 0, totalSpent: 0, paidOrders: 0 }
+      }
+    });
+  });
+
+  // Admin login
+  // DEPRECATED: Old admin login - redirect to unified login
+  router.post('/api/admin/login', async ({ db, body }) => {
+    // For backwards compatibility, try to authenticate and return response
+    // But new flow should use /api/auth/login
+    const { username, password, email } = body;
+    
+    // If email is provided, use the new flow
+    if (email) {
+      // Find user by email with admin role
+      const user = await db.collection('users').findOne({ 
+        email: email.toLowerCase(),
+        role: 'admin'
+      });
+      
+      if (!user) {
+        return NextResponse.json(
+          { success: false, error: 'E-posta veya şifre hatalı' },
+          { status: 401 }
+        );
+      }
+
+      const validPassword = await bcrypt.compare(password, user.passwordHash);
+      if (!validPassword) {
+        return NextResponse.json(
+          { success: false, error: 'E-posta veya şifre hatalı' },
+          { status: 401 }
+        );
+      }
+
+      const token = jwt.sign(
+        { id: user.id, email: user.email, role: 'admin', type: 'user' },
+        JWT_SECRET,
+        { expiresIn: '24h' }
+      );
+
+      return NextResponse.json({
+        success: true,
+        data: { 
+          token, 
+          username: user.email,
+          user: {
+            id: user.id,
+            firstName: user.firstName,
+            lastName: user.lastName,
+            email: user.email,
+            role: 'admin'
+          }
+        }
+      });
+    }
+    
+    // Legacy username-based login (for backwards compatibility during transition)
+    const adminUser = await db.collection('admin_users').findOne({ username });
+    if (adminUser) {
+      const validPassword = await bcrypt.compare(password, adminUser.passwordHash);
+      if (validPassword) {
+        // Return token with admin role
+        const token = jwt.sign(
+          { id: adminUser.id, username: adminUser.username, role: 'admin' },
+          JWT_SECRET,
+          { expiresIn: '24h' }
+        );
+
+        return NextResponse.json({
+          success: true,
+          data: { token, username: adminUser.username }
+        });
+      }
+    }
+    
+    return NextResponse.json(
+      { success: false, error: 'Kullanıcı adı veya şifre hatalı' },
+      { status: 401 }
+    );
+  });
+
+  // Admin: Create admin user (internal use - call once to migrate)
+  router.post('/api/admin/create-admin-user', async ({ db, body }) => {
+    const { email, password, firstName, lastName, secretKey } = body;
+    
+    // Secret key protection for admin creation
+    if (secretKey !== 'ADMIN_SETUP_2024') {
+      return NextResponse.json(
+        { success: false, error: 'Yetkisiz' },
+        { status: 403 }
+      );
+    }
+    
+    // Check if admin already exists
+    const existingAdmin = await db.collection('users').findOne({ role: 'admin' });
+    if (existingAdmin) {
+      return NextResponse.json(
+        { success: false, error: 'Admin kullanıcı zaten mevcut' },
+        { status: 400 }
+      );
+    }
+    
+    const hashedPassword = await bcrypt.hash(password, 10);
+    
+    const adminUser = {
+      id: uuidv4(),
+      email: email.toLowerCase(),
+      firstName: firstName || 'Admin',
+      lastName: lastName || 'User',
+      phone: '',
+      passwordHash: hashedPassword,
+      role: 'admin',
+      authProvider: 'local',
+      emailVerified: true,
+      isActive: true,
+      createdAt: new Date(),
+      updatedAt: new Date()
+    };
+    
+    await db.collection('users').insertOne(adminUser);
+    
+    return NextResponse.json({
+      success: true,
+      message: 'Admin kullanıcı oluşturuldu',
+      data: { email: adminUser.email }
+    });
+  });
+
+  // Admin: Belirli kullanıcıyı tüm cihazlardan çıkış yaptır
+  router.post('/api/admin/users/:id/logout-all', async ({ request, db, pathname }) => {
+    const userId = pathname.split('/')[4];
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser || adminUser.role !== 'admin') {
+      return NextResponse.json({ success: false, error: 'Sadece admin bu işlemi yapabilir' }, { status: 403 });
+    }
+    
+    await db.collection('users').updateOne(
+      { id: userId },
+      { $set: { logoutAllAt: new Date(), updatedAt: new Date() } }
+    );
+    
+    return NextResponse.json({ success: true, message: 'Kullanıcı tüm cihazlardan çıkış yaptırıldı' });
+  });
+
+  // Admin: Update user role (POST)
+  router.post('/api/admin/users/:id/role', async ({ request, db, pathname, body }) => {
+    const userId = pathname.split('/')[4];
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser || adminUser.role !== 'admin') {
+      return NextResponse.json({ success: false, error: 'Sadece admin rol değiştirebilir' }, { status: 403 });
+    }
+    const { role } = body;
+    if (!['admin', 'destek', 'izleyici', 'user'].includes(role)) {
+      return NextResponse.json({ success: false, error: 'Geçersiz rol' }, { status: 400 });
+    }
+    await db.collection('users').updateOne({ id: userId }, { $set: { role: role, updatedAt: new Date() } });
+    return NextResponse.json({ success: true, message: `Rol "${role}" olarak güncellendi` });
+  });
+
+  // ============================================
+  // 💰 BALANCE SYSTEM ENDPOINTS (PUT)
+  // ============================================
+
+  // Admin: Change user password
+  router.put('/api/admin/users/:id/password', async ({ request, db, pathname, body }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const userId = pathname.match(/^\/api\/admin\/users\/([^\/]+)\/password$/)[1];
+    const { newPassword } = body;
+
+    // Validate password
+    if (!newPassword || newPassword.length < 6) {
+      return NextResponse.json({ 
+        success: false, 
+        error: 'Şifre en az 6 karakter olmalıdır' 
+      }, { status: 400 });
+    }
+
+    const user = await db.collection('users').findOne({ id: userId });
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Kullanıcı bulunamadı' }, { status: 404 });
+    }
+
+    // Hash new password
+    const hashedPassword = await bcrypt.hash(newPassword, 10);
+
+    // Update user password
+    await db.collection('users').updateOne(
+      { id: userId },
+      { 
+        $set: { 
+          passwordHash: hashedPassword, 
+          updatedAt: new Date(),
+          passwordChangedAt: new Date(),
+          passwordChangedBy: adminUser.username
+        } 
+      }
+    );
+
+    // Audit log
+    await logAuditAction(db, 'user.password_change_by_admin', adminUser.username, 'user', userId, request, {
+      userEmail: user.email
+    });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Şifre başarıyla güncellendi'
+    });
+  }, { admin: true });
+
+  // Admin: Update user role
+  router.put('/api/admin/users/:id/role', async ({ request, db, pathname, body }) => {
+    const userId = pathname.split('/')[4];
+    const user = verifyAdminToken(request);
+    if (!user || user.role !== 'admin') {
+      return NextResponse.json({ success: false, error: 'Sadece admin rol değiştirebilir' }, { status: 403 });
+    }
+    
+    const { role } = body;
+    if (!['admin', 'destek', 'izleyici', 'user'].includes(role)) {
+      return NextResponse.json({ success: false, error: 'Geçersiz rol' }, { status: 400 });
+    }
+    
+    await db.collection('users').updateOne(
+      { id: userId },
+      { $set: { role: role, updatedAt: new Date() } }
+    );
+    
+    return NextResponse.json({ success: true, message: `Kullanıcı rolü "${role}" olarak güncellendi` });
+  }, { admin: true });
+
+  // Admin: Update user role (POST)
+  router.put('/api/admin/users/:id/role', async ({ request, db, pathname, body }) => {
+    const userId = pathname.split('/')[4];
+    const user = verifyAdminToken(request);
+    if (!user || user.role !== 'admin') {
+      return NextResponse.json({ success: false, error: 'Sadece admin rol değiştirebilir' }, { status: 403 });
+    }
+    const { role } = body;
+    if (!['admin', 'destek', 'izleyici', 'user'].includes(role)) {
+      return NextResponse.json({ success: false, error: 'Geçersiz rol' }, { status: 400 });
+    }
+    await db.collection('users').updateOne(
+      { id: userId },
+      { $set: { role: role, updatedAt: new Date() } }
+    );
+    return NextResponse.json({ success: true, message: `Kullanıcı rolü "${role}" olarak güncellendi` });
+  }, { admin: true });
+
+  // Admin: Update user role
+  router.put('/api/admin/users/:id/role', async ({ request, db, pathname, body }) => {
+    const userId = pathname.split('/')[4];
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser || adminUser.role !== 'admin') {
+      return NextResponse.json({ success: false, error: 'Sadece admin rol değiştirebilir' }, { status: 403 });
+    }
+    const { role } = body;
+    if (!['admin', 'destek', 'izleyici', 'user'].includes(role)) {
+      return NextResponse.json({ success: false, error: 'Geçersiz rol' }, { status: 400 });
+    }
+    await db.collection('users').updateOne({ id: userId }, { $set: { role: role, updatedAt: new Date() } });
+    return NextResponse.json({ success: true, message: `Rol "${role}" olarak güncellendi` });
+  }, { admin: true });
+
+  // Admin: Update user balance (add/subtract)
+  router.put('/api/admin/users/:id/balance', async ({ request, db, pathname, body }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const userId = pathname.match(/^\/api\/admin\/users\/([^\/]+)\/balance$/)[1];
+    const { amount, type, note } = body; // type: 'add' or 'subtract'
+
+    if (!amount || amount <= 0) {
+      return NextResponse.json({ success: false, error: 'Geçerli bir tutar giriniz' }, { status: 400 });
+    }
+
+    if (!['add', 'subtract'].includes(type)) {
+      return NextResponse.json({ success: false, error: 'Geçersiz işlem tipi' }, { status: 400 });
+    }
+
+    const user = await db.collection('users').findOne({ id: userId });
+    if (!user) {
+      return NextResponse.json({ success: false, error: 'Kullanıcı bulunamadı' }, { status: 404 });
+    }
+
+    const currentBalance = user.balance || 0;
+    const changeAmount = type === 'add' ? amount : -amount;
+    const newBalance = currentBalance + changeAmount;
+
+    if (newBalance < 0) {
+      return NextResponse.json({ 
+        success: false, 
+        error: 'Bakiye negatif olamaz. Mevcut bakiye: ' + currentBalance.toFixed(2) + ' TL' 
+      }, { status: 400 });
+    }
+
+    // Update user balance
+    await db.collection('users').updateOne(
+      { id: userId },
+      { $set: { balance: newBalance, updatedAt: new Date() } }
+    );
+
+    // Create transaction record
+    const transaction = {
+      id: uuidv4(),
+      userId,
+      type: type === 'add' ? 'admin_credit' : 'admin_debit',
+      amount: Math.abs(changeAmount),
+      balanceBefore: currentBalance,
+      balanceAfter: newBalance,
+      description: note || (type === 'add' ? 'Admin tarafından bakiye eklendi' : 'Admin tarafından bakiye düşüldü'),
+      adminUsername: adminUser.username,
+      createdAt: new Date()
+    };
+
+    await db.collection('balance_transactions').insertOne(transaction);
+
+    // Audit log
+    await logAuditAction(db, type === 'add' ? 'user.balance_add' : 'user.balance_subtract', adminUser.username, 'user', userId, request, {
+      amount: changeAmount,
+      newBalance,
+      note
+    });
+
+    return NextResponse.json({
+      success: true,
+      message: type === 'add' ? 'Bakiye eklendi' : 'Bakiye düşüldü',
+      data: {
+        newBalance,
+        transaction
+      }
+    });
+  }, { admin: true });
+
+  // Account orders endpoint moved to POST function
+
+  // ============================================
+  // 👤 ADMIN: DELETE USER ACCOUNT
+  // ============================================
+  router.delete('/api/admin/users/:id', async ({ request, db, pathname }) => {
+    const adminUser = verifyAdminToken(request);
+    if (!adminUser) {
+      return NextResponse.json({ success: false, error: 'Yetkisiz erişim' }, { status: 401 });
+    }
+
+    const userId = pathname.match(/^\/api\/admin\/users\/([^\/]+)$/)[1];
+    
+    // Find user
+    const userToDelete = await db.collection('users').findOne({ id: userId });
+    if (!userToDelete) {
+      return NextResponse.json({ success: false, error: 'Kullanıcı bulunamadı' }, { status: 404 });
+    }
+
+    // Prevent deleting admin accounts
+    if (userToDelete.role === 'admin') {
+      return NextResponse.json({ 
+        success: false, 
+        error: 'Admin hesabı silinemez' 
+      }, { status: 400 });
+    }
+
+    // Delete user
+    await db.collection('users').deleteOne({ id: userId });
+
+    // Delete user's balance transactions
+    await db.collection('balance_transactions').deleteMany({ userId: userId });
+
+    // Delete user's support tickets and messages
+    const userTickets = await db.collection('support_tickets').find({ userId: userId }).toArray();
+    const ticketIds = userTickets.map(t => t.id);
+    if (ticketIds.length > 0) {
+      await db.collection('ticket_messages').deleteMany({ ticketId: { $in: ticketIds } });
+      await db.collection('support_tickets').deleteMany({ userId: userId });
+    }
+
+    // Audit log
+    await logAuditAction(db, 'user.delete', adminUser.username, 'user', userId, request, {
+      deletedUserEmail: userToDelete.email,
+      deletedUserName: `${userToDelete.firstName || ''} ${userToDelete.lastName || ''}`.trim(),
+      deletedUserPhone: userToDelete.phone
+    });
+
+    return NextResponse.json({
+      success: true,
+      message: 'Kullanıcı hesabı başarıyla silindi'
+    });
+  });
+}
@@ -0,0 +1,631 @@
+/**
+ * Authentication routes: registration, login, password reset and Google sign-in.
+ */
+
+import { NextResponse } from 'next/server';
+import bcrypt from 'bcryptjs';
+import jwt from 'jsonwebtoken';
+import { v4 as uuidv4 } from 'uuid';
+import { decrypt } from '@/lib/crypto';
+import {
+  JWT_SECRET, BRUTE_FORCE_CONFIG, checkBruteForce, recordFailedLogin, clearBruteForce,
+  logAuditAction, AUDIT_ACTIONS, sendWelcomeEmail, sendPasswordChangedEmail, sendPasswordResetEmail,
+  verifyToken
+} from '../core.js';
+
+export function register(router) {
+  // Validate Reset Token (check if token is valid before showing form)
+  router.get('/api/auth/validate-reset-token', async ({ db, searchParams }) => {
+    const token = searchParams.get('token');
+
+    if (!token) {
+      return NextResponse.json(
+        { success: false, error: 'Token gereklidir', valid: false },
+        { status: 400 }
+      );
+    }
+
+    const resetRecord = await db.collection('password_resets').findOne({
+      token: token,
+      used: false,
+      expiresAt: { $gt: new Date() }
+    });
+
+    return NextResponse.json({
+      success: !!resetRecord,
+      valid: !!resetRecord
+    });
+  });
+
+  // User Register
+  router.post('/api/auth/register', async ({ db, body }) => {
+    const { firstName, lastName, email, phone, password } = body;
+
+    // Validate required fields
+    if (!firstName || !lastName || !email || !phone || !password) {
+      return NextResponse.json(
+        { success: false, error: 'Tüm alanlar zorunludur' },
+        { status: 400 }
+      );
+    }
+
+    // Validate email format
+    const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+    if (!emailRegex.test(email)) {
+      return NextResponse.json(
+        { success: false, error: 'Geçersiz e-posta adresi' },
+        { status: 400 }
+      );
+    }
+
+    // Validate phone format (Turkish)
+    const phoneRegex = /^[0-9]{10,11}$/;
+    if (!phoneRegex.test(phone.replace(/\s/g, ''))) {
+      return NextResponse.json(
+        { success: false, error: 'Geçersiz telefon numarası (10-11 rakam)' },
+        { status: 400 }
+      );
+    }
+
+    // Validate password length
+    if (password.length < 6) {
+      return NextResponse.json(
+        { success: false, error: 'Şifre en az 6 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    // Check if email already exists
+    const existingUser = await db.collection('users').findOne({ email: email.toLowerCase() });
+    if (existingUser) {
+      return NextResponse.json(
+        { success: false, error: 'Bu e-posta ile kayıtlı hesap var', code: 'EMAIL_EXISTS' },
+        { status: 409 }
+      );
+    }
+
+    // Hash password
+    const passwordHash = await bcrypt.hash(password, 10);
+
+    // Create user
+    const user = {
+      id: uuidv4(),
+      firstName,
+      lastName,
+      email: email.toLowerCase(),
+      phone: phone.replace(/\s/g, ''),
+      passwordHash,
+      createdAt: new Date(),
+      updatedAt: new Date()
+    };
+
+    await db.collection('users').insertOne(user);
+
+    // Send welcome email (async, don't block response)
+    sendWelcomeEmail(db, user).catch(err => console.error('Welcome email failed:', err));
+
+    // Generate JWT token
+    const token = jwt.sign(
+      { 
+        id: user.id, 
+        email: user.email,
+        type: 'user'
+      },
+      JWT_SECRET,
+      { expiresIn: '7d' } // 7 days for user tokens
+    );
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        token,
+        user: {
+          id: user.id,
+          firstName: user.firstName,
+          lastName: user.lastName,
+          email: user.email,
+          phone: user.phone
+        }
+      }
+    });
+  });
+
+  // User Login - Unified for both users and admins
+  router.post('/api/auth/login', async ({ request, db, clientIP, body }) => {
+    const { email, password } = body;
+
+    if (!email || !password) {
+      return NextResponse.json(
+        { success: false, error: 'E-posta ve şifre gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    // Check brute force lockout
+    const bruteForceCheck = await checkBruteForce(email.toLowerCase(), clientIP, false);
+    if (!bruteForceCheck.allowed) {
+      return NextResponse.json(
+        { 
+          success: false, 
+          error: `Çok fazla başarısız deneme. ${Math.ceil(bruteForceCheck.retryAfter / 60)} dakika sonra tekrar deneyin.`,
+          code: 'LOCKOUT'
+        },
+        { 
+          status: 429,
+          headers: { 'Retry-After': bruteForceCheck.retryAfter?.toString() || '600' }
+        }
+      );
+    }
+
+    // Find user by email
+    const user = await db.collection('users').findOne({ email: email.toLowerCase() });
+    if (!user) {
+      // Record failed attempt
+      await recordFailedLogin(email.toLowerCase(), clientIP, false);
+      await logAuditAction(db, AUDIT_ACTIONS.USER_LOGIN_FAILED, null, 'user', null, request, { email, reason: 'user_not_found' });
+      return NextResponse.json(
+        { success: false, error: 'E-posta veya şifre hatalı' },
+        { status: 401 }
+      );
+    }
+
+    // Admin failures are counted under the stricter admin config
+    if (user.role === 'admin') {
+      const adminLockout = await checkBruteForce(email.toLowerCase(), clientIP, true);
+      if (!adminLockout.allowed) {
+        return NextResponse.json(
+          {
+            success: false,
+            error: `Çok fazla başarısız deneme. ${Math.ceil(adminLockout.retryAfter / 60)} dakika sonra tekrar deneyin.`,
+            code: 'LOCKOUT'
+          },
+          {
+            status: 429,
+            headers: { 'Retry-After': adminLockout.retryAfter?.toString() || '1800' }
+          }
+        );
+      }
+    }
+
+    // Check if user has password (might be Google-only user)
+    if (!user.passwordHash) {
+      return NextResponse.json(
+        { success: false, error: 'Bu hesap Google ile oluşturulmuş. Google ile giriş yapın.', code: 'GOOGLE_ONLY' },
+        { status: 400 }
+      );
+    }
+
+    // Verify password
+    const validPassword = await bcrypt.compare(password, user.passwordHash);
+    if (!validPassword) {
+      // Record failed attempt - use admin config if user is admin
+      const isAdmin = user.role === 'admin';
+      const entry = await recordFailedLogin(email.toLowerCase(), clientIP, isAdmin);
+      await logAuditAction(db, isAdmin ? AUDIT_ACTIONS.ADMIN_LOGIN_FAILED : AUDIT_ACTIONS.USER_LOGIN_FAILED, user.id, 'user', user.id, request, { 
+        email, 
+        reason: 'invalid_password',
+        attemptCount: entry.attempts
+      });
+      
+      // Show remaining attempts if close to lockout
+      const config = isAdmin ? BRUTE_FORCE_CONFIG.admin : BRUTE_FORCE_CONFIG.user;
+      const remaining = config.maxAttempts - entry.attempts;
+      let errorMsg = 'E-posta veya şifre hatalı';
+      if (remaining <= 2 && remaining > 0) {
+        errorMsg += `. ${remaining} deneme hakkınız kaldı.`;
+      }
+      
+      return NextResponse.json(
+        { success: false, error: errorMsg },
+        { status: 401 }
+      );
+    }
+
+    // Check if user is banned/inactive
+    if (user.isActive === false || user.banned === true) {
+      return NextResponse.json(
+        { success: false, error: 'Hesabınız askıya alınmış. Destek ile iletişime geçin.', code: 'ACCOUNT_SUSPENDED' },
+        { status: 403 }
+      );
+    }
+
+    // Clear brute force on successful login
+    await clearBruteForce(email.toLowerCase(), clientIP, user.role === 'admin');
+
+    // Determine user role (default: user)
+    const userRole = user.role || 'user';
+
+    // Log successful login
+    await logAuditAction(db, userRole === 'admin' ? AUDIT_ACTIONS.ADMIN_LOGIN : AUDIT_ACTIONS.USER_LOGIN, user.id, 'user', user.id, request, { email });
+
+    // Generate JWT token with role included
+    const token = jwt.sign(
+      { 
+        id: user.id, 
+        email: user.email,
+        role: userRole,
+        type: 'user'
+      },
+      JWT_SECRET,
+      { expiresIn: '7d' }
+    );
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        token,
+        user: {
+          id: user.id,
+          firstName: user.firstName,
+          lastName: user.lastName,
+          email: user.email,
+          phone: user.phone,
+          role: userRole,
+          authProvider: user.authProvider || 'local',
+          avatarUrl: user.avatarUrl || null
+        }
+      }
+    });
+  });
+
+  // ============================================
+  // PASSWORD RESET ENDPOINTS
+  // ============================================
+
+  // Forgot Password - Send reset email
+  router.post('/api/auth/forgot-password', async ({ db, body }) => {
+    const { email } = body;
+
+    if (!email) {
+      return NextResponse.json(
+        { success: false, error: 'E-posta adresi gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    // Find user by email
+    const user = await db.collection('users').findOne({ 
+      email: email.toLowerCase().trim() 
+    });
+
+    // Always return success to prevent email enumeration
+    if (!user) {
+      return NextResponse.json({
+        success: true,
+        message: 'Eğer bu e-posta ile kayıtlı bir hesap varsa, şifre sıfırlama linki gönderildi.'
+      });
+    }
+
+    // Check if user registered with Google (no password)
+    if (user.authProvider === 'google' && !user.password) {
+      return NextResponse.json({
+        success: false,
+        error: 'Bu hesap Google ile oluşturulmuş. Lütfen Google ile giriş yapın.',
+        code: 'GOOGLE_ACCOUNT'
+      });
+    }
+
+    // Generate reset token
+    const resetToken = uuidv4();
+    const resetExpires = new Date(Date.now() + 60 * 60 * 1000); // 1 hour
+
+    // Save reset token to database
+    await db.collection('password_resets').insertOne({
+      id: uuidv4(),
+      userId: user.id,
+      email: user.email,
+      token: resetToken,
+      expiresAt: resetExpires,
+      used: false,
+      createdAt: new Date()
+    });
+
+    // Send reset email
+    try {
+      await sendPasswordResetEmail(db, user, resetToken);
+    } catch (emailError) {
+      console.error('Failed to send reset email:', emailError);
+    }
+
+    return NextResponse.json({
+      success: true,
+      message: 'Eğer bu e-posta ile kayıtlı bir hesap varsa, şifre sıfırlama linki gönderildi.'
+    });
+  });
+
+  // Reset Password - Validate token and update password
+  router.post('/api/auth/reset-password', async ({ db, body }) => {
+    const { token, password } = body;
+
+    if (!token || !password) {
+      return NextResponse.json(
+        { success: false, error: 'Token ve yeni şifre gereklidir' },
+        { status: 400 }
+      );
+    }
+
+    if (password.length < 6) {
+      return NextResponse.json(
+        { success: false, error: 'Şifre en az 6 karakter olmalıdır' },
+        { status: 400 }
+      );
+    }
+
+    // Find valid reset token
+    const resetRecord = await db.collection('password_resets').findOne({
+      token: token,
+      used: false,
+      expiresAt: { $gt: new Date() }
+    });
+
+    if (!resetRecord) {
+      return NextResponse.json(
+        { success: false, error: 'Geçersiz veya süresi dolmuş link. Lütfen yeni bir şifre sıfırlama talebi oluşturun.' },
+        { status: 400 }
+      );
+    }
+
+    // Find user
+    const user = await db.collection('users').findOne({ id: resetRecord.userId });
+    if (!user) {
+      return NextResponse.json(
+        { success: false, error: 'Kullanıcı bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Hash new password
+    const hashedPassword = await bcrypt.hash(password, 10);
+
+    // Update user password
+    await db.collection('users').updateOne(
+      { id: user.id },
+      { 
+        $set: { 
+          password: hashedPassword,
+          updatedAt: new Date()
+        } 
+      }
+    );
+
+    // Mark token as used
+    await db.collection('password_resets').updateOne(
+      { id: resetRecord.id },
+      { 
+        $set: { 
+          used: true,
+          usedAt: new Date()
+        } 
+      }
+    );
+
+    // Send password changed confirmation email
+    try {
+      await sendPasswordChangedEmail(db, user);
+    } catch (emailError) {
+      console.error('Failed to send password changed email:', emailError);
+    }
+
+    return NextResponse.json({
+      success: true,
+      message: 'Şifreniz başarıyla güncellendi. Artık yeni şifrenizle giriş yapabilirsiniz.'
+    });
+  });
+
+  // ============================================
+  // GOOGLE OAUTH ENDPOINTS
+  // ============================================
+
+  // Public: Check if Google OAuth is enabled
+  router.post('/api/auth/google/status', async () => {
+    // Always return enabled=true since we have .env configuration
+    return NextResponse.json({
+      success: true,
+      data: {
+        enabled: true
+      }
+    });
+  });
+
+  // Google OAuth: Initiate login
+  router.post('/api/auth/google', async ({ request, db }) => {
+    // PRIORITY: Use .env credentials first, then fallback to database
+    let clientId, redirectUri;
+    
+    // Check .env first (hardcoded credentials take priority)
+    if (process.env.GOOGLE_CLIENT_ID) {
+      clientId = process.env.GOOGLE_CLIENT_ID;
+      redirectUri = process.env.GOOGLE_REDIRECT_URI || 'https://pinly.com.tr/api/auth/google/callback';
+    } else {
+      // Fallback to database
+      const oauthSettings = await db.collection('oauth_settings').findOne({ provider: 'google' });
+      if (oauthSettings?.clientId) {
+        clientId = decrypt(oauthSettings.clientId);
+        const host = request.headers.get('host');
+        const protoHeader = request.headers.get('x-forwarded-proto') || 'https';
+        const protocol = protoHeader.split(',')[0].trim();
+        redirectUri = `${protocol}://${host}/api/auth/google/callback`;
+      } else {
+        return NextResponse.redirect(new URL('/?google_auth=error&reason=oauth_not_configured', request.url));
+      }
+    }
+    
+    // Build Google OAuth URL
+    const googleAuthUrl = new URL('https://accounts.google.com/o/oauth2/v2/auth');
+    googleAuthUrl.searchParams.set('client_id', clientId);
+    googleAuthUrl.searchParams.set('redirect_uri', redirectUri);
+    googleAuthUrl.searchParams.set('response_type', 'code');
+    googleAuthUrl.searchParams.set('scope', 'openid email profile');
+    googleAuthUrl.searchParams.set('access_type', 'offline');
+    googleAuthUrl.searchParams.set('prompt', 'consent');
+    
+    return NextResponse.redirect(googleAuthUrl.toString());
+  });
+
+  // Google OAuth: Callback handler
+  router.post('/api/auth/google/callback', async ({ request, db }) => {
+    const { searchParams } = new URL(request.url);
+    const code = searchParams.get('code');
+    const error = searchParams.get('error');
+    
+    // Use hardcoded base URL for pinly.com.tr
+    const baseUrl = process.env.NEXT_PUBLIC_BASE_URL || 'https://pinly.com.tr';
+    
+    if (error) {
+      return NextResponse.redirect(new URL(`/?google_auth=error&reason=google_auth_denied`, baseUrl));
+    }
+    
+    if (!code) {
+      return NextResponse.redirect(new URL(`/?google_auth=error&reason=no_code`, baseUrl));
+    }
+    
+    try {
+      // PRIORITY: Use .env credentials first
+      let clientId, clientSecret, redirectUri;
+      
+      if (process.env.GOOGLE_CLIENT_ID && process.env.GOOGLE_CLIENT_SECRET) {
+        clientId = process.env.GOOGLE_CLIENT_ID;
+        clientSecret = process.env.GOOGLE_CLIENT_SECRET;
+        redirectUri = process.env.GOOGLE_REDIRECT_URI || 'https://pinly.com.tr/api/auth/google/callback';
+      } else {
+        // Fallback to database
+        const oauthSettings = await db.collection('oauth_settings').findOne({ provider: 'google' });
+        if (oauthSettings?.clientId && oauthSettings?.clientSecret) {
+          clientId = decrypt(oauthSettings.clientId);
+          clientSecret = decrypt(oauthSettings.clientSecret);
+          redirectUri = `${baseUrl}/api/auth/google/callback`;
+        } else {
+          return NextResponse.redirect(new URL(`/?google_auth=error&reason=oauth_config_error`, baseUrl));
+        }
+      }
+      
+      // Exchange code for tokens
+      const tokenResponse = await fetch('https://oauth2.googleapis.com/token', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/x-www-form-urlencoded' },
+        body: new URLSearchParams({
+          code,
+          client_id: clientId,
+          client_secret: clientSecret,
+          redirect_uri: redirectUri,
+          grant_type: 'authorization_code'
+        })
+      });
+      
+      const tokenData = await tokenResponse.json();
+      
+      if (!tokenData.access_token) {
+        console.error('Google OAuth token error:', tokenData);
+        return NextResponse.redirect(new URL(`/?google_auth=error&reason=token_error`, baseUrl));
+      }
+      
+      // Get user info from Google
+      const userInfoResponse = await fetch('https://www.googleapis.com/oauth2/v2/userinfo', {
+        headers: { 'Authorization': `Bearer ${tokenData.access_token}` }
+      });
+      
+      const googleUser = await userInfoResponse.json();
+      
+      if (!googleUser.email) {
+        return NextResponse.redirect(new URL(`/?google_auth=error&reason=no_email`, baseUrl));
+      }
+      
+      // Check if user exists
+      let user = await db.collection('users').findOne({ email: googleUser.email });
+      
+      if (user) {
+        // Update existing user with Google info if not already linked
+        if (!user.googleId) {
+          await db.collection('users').updateOne(
+            { id: user.id },
+            { 
+              $set: { 
+                googleId: googleUser.id,
+                profilePicture: user.profilePicture || googleUser.picture,
+                updatedAt: new Date()
+              }
+            }
+          );
+        }
+      } else {
+        // Create new user
+        const userId = uuidv4();
+        const nameParts = (googleUser.name || '').split(' ');
+        const firstName = nameParts[0] || googleUser.given_name || 'User';
+        const lastName = nameParts.slice(1).join(' ') || googleUser.family_name || '';
+        
+        user = {
+          id: userId,
+          email: googleUser.email,
+          firstName,
+          lastName,
+          phone: '',
+          googleId: googleUser.id,
+          profilePicture: googleUser.picture,
+          role: 'user',
+          status: 'active',
+          authMethod: 'google',
+          createdAt: new Date(),
+          updatedAt: new Date()
+        };
+        
+        await db.collection('users').insertOne(user);
+      }
+      
+      // Generate JWT token
+      const token = jwt.sign(
+        { id: user.id, email: user.email, type: 'user', role: user.role || 'user' },
+        JWT_SECRET,
+        { expiresIn: '7d' }
+      );
+      
+      // Create response with redirect
+      const response = NextResponse.redirect(new URL(`/?google_auth=success`, baseUrl));
+      
+      // Set cookies for client-side handling
+      response.cookies.set('googleAuthToken', token, {
+        httpOnly: false,
+        secure: true,
+        sameSite: 'lax',
+        maxAge: 60 * 5, // 5 minutes - just for transfer
+        path: '/'
+      });
+      
+      response.cookies.set('googleAuthUser', Buffer.from(JSON.stringify({
+        id: user.id,
+        email: user.email,
+        firstName: user.firstName,
+        lastName: user.lastName,
+        profilePicture: user.profilePicture
+      })).toString('base64'), {
+        httpOnly: false,
+        secure: true,
+        sameSite: 'lax',
+        maxAge: 60 * 5,
+        path: '/'
+      });
+      
+      return response;
+      
+    } catch (error) {
+      console.error('Google OAuth callback error:', error);
+      return NextResponse.redirect(new URL(`/?google_auth=error&reason=oauth_callback_error`, baseUrl));
+    }
+  });
+
+  // Customer: Get verification status
+
+
+  // Tüm cihazlardan çıkış yap (POST)
+  router.post('/api/auth/logout-all', async ({ request, db }) => {
+    const user = verifyToken(request);
+    if (!user) return NextResponse.json({ success: false, error: 'Yetkisiz' }, { status: 401 });
+    
+    await db.collection('users').updateOne(
+      { id: user.id },
+      { $set: { logoutAllAt: new Date(), updatedAt: new Date() } }
+    );
+    
+    return NextResponse.json({ success: true, message: 'Tüm cihazlardan çıkış yapıldı' });
+  });
+}
@@ -0,0 +1,170 @@
+/**
+ * Scheduled jobs triggered over HTTP.
+ */
+
+import { NextResponse } from 'next/server';
+import { sendPaymentSuccessSms, sendAbandonedOrderSms } from '../core.js';
+
+export function register(router) {
+  // ============================================
+  // CRON: Terk Edilmiş Sipariş SMS Gönderimi
+  // ============================================
+  // Bu endpoint cPanel cron job ile çağrılacak
+  // Her 5 dakikada bir: curl https://pinly.com.tr/api/cron/abandoned-sms
+  router.get('/api/cron/abandoned-sms', async ({ db }) => {
+    console.log('Cron: Checking abandoned orders for SMS...');
+    
+    // 15 dakika önce oluşturulmuş ve hala ödenmemiş siparişleri bul
+    const fifteenMinutesAgo = new Date(Date.now() - 15 * 60 * 1000);
+    const twentyMinutesAgo = new Date(Date.now() - 20 * 60 * 1000); // 20 dakikadan eski olmasın
+    
+    // Pending durumundaki siparişleri bul (15-20 dakika arası)
+    const abandonedOrders = await db.collection('orders').find({
+      status: 'pending',
+      createdAt: { 
+        $gte: twentyMinutesAgo, // 20 dakikadan yeni
+        $lte: fifteenMinutesAgo // 15 dakikadan eski
+      },
+      abandonedSmsSent: { $ne: true } // SMS henüz gönderilmemiş
+    }).toArray();
+    
+    console.log(`Found ${abandonedOrders.length} abandoned orders`);
+    
+    let sentCount = 0;
+    let errorCount = 0;
+    
+    for (const order of abandonedOrders) {
+      try {
+        // Kullanıcıyı bul
+        const user = await db.collection('users').findOne({ id: order.userId });
+        
+        if (user && user.phone) {
+          // SMS gönder
+          const result = await sendAbandonedOrderSms(db, order, user);
+          
+          // SMS gönderildi olarak işaretle (tekrar gönderilmesin)
+          await db.collection('orders').updateOne(
+            { id: order.id },
+            { 
+              $set: { 
+                abandonedSmsSent: true,
+                abandonedSmsSentAt: new Date()
+              } 
+            }
+          );
+          
+          if (result.success) {
+            sentCount++;
+            console.log(`Abandoned SMS sent to order ${order.id}`);
+          } else {
+            errorCount++;
+            console.log(`Abandoned SMS failed for order ${order.id}: ${result.reason}`);
+          }
+        } else {
+          // Telefon yoksa da işaretle
+          await db.collection('orders').updateOne(
+            { id: order.id },
+            { $set: { abandonedSmsSent: true, abandonedSmsSkipped: 'no_phone' } }
+          );
+        }
+      } catch (err) {
+        errorCount++;
+        console.error(`Error processing order ${order.id}:`, err);
+      }
+    }
+    
+    return NextResponse.json({
+      success: true,
+      message: `Terk edilmiş sipariş kontrolü tamamlandı`,
+      data: {
+        checked: abandonedOrders.length,
+        sent: sentCount,
+        errors: errorCount,
+        timestamp: new Date().toISOString()
+      }
+    });
+  });
+
+  // ============================================
+  // CRON: Ödenen Siparişlere SMS Gönderimi
+  // ============================================
+  // Bu endpoint cPanel cron job ile çağrılacak
+  // Her 2 dakikada bir: curl https://pinly.com.tr/api/cron/payment-sms
+  router.get('/api/cron/payment-sms', async ({ db }) => {
+    console.log('Cron: Checking paid orders for SMS...');
+    
+    // Son 30 dakikada ödenen ve SMS gönderilmemiş siparişleri bul
+    const thirtyMinutesAgo = new Date(Date.now() - 30 * 60 * 1000);
+    
+    // Paid durumundaki siparişleri bul (SMS gönderilmemiş)
+    const paidOrders = await db.collection('orders').find({
+      status: { $in: ['paid', 'delivered'] },
+      createdAt: { $gte: thirtyMinutesAgo },
+      paymentSmsSent: { $ne: true }
+    }).toArray();
+    
+    console.log(`Found ${paidOrders.length} paid orders without SMS`);
+    
+    let sentCount = 0;
+    let errorCount = 0;
+    
+    for (const order of paidOrders) {
+      try {
+        // Kullanıcıyı bul
+        const user = await db.collection('users').findOne({ id: order.userId });
+        
+        if (user && user.phone) {
+          // Ürün/hesap bilgisi
+          const product = order.productId ? await db.collection('products').findOne({ id: order.productId }) : null;
+          const account = order.accountId ? await db.collection('accounts').findOne({ id: order.accountId }) : null;
+          const itemTitle = product?.title || account?.title || order.productTitle || order.accountTitle || 'Sipariş';
+          
+          // SMS gönder
+          console.log(`Sending payment SMS for order ${order.id} to ${user.phone}`);
+          const result = await sendPaymentSuccessSms(db, order, user, itemTitle);
+          
+          // SMS gönderildi olarak işaretle (tekrar gönderilmesin)
+          await db.collection('orders').updateOne(
+            { id: order.id },
+            { 
+              $set: { 
+                paymentSmsSent: true,
+                paymentSmsSentAt: new Date(),
+                paymentSmsResult: result.success ? 'sent' : 'failed'
+              } 
+            }
+          );
+          
+          if (result.success) {
+            sentCount++;
+            console.log(`Payment SMS sent for order ${order.id}`);
+          } else {
+            errorCount++;
+            console.log(`Payment SMS failed for order ${order.id}: ${result.reason}`);
+          }
+        } else {
+          // Telefon yoksa da işaretle
+          await db.collection('orders').updateOne(
+            { id: order.id },
+            { $set: { paymentSmsSent: true, paymentSmsSkipped: 'no_phone' } }
+          );
+          console.log(`Order ${order.id} skipped - no phone number`);
+        }
+      } catch (err) {
+        errorCount++;
+        console.error(`Error processing order ${order.id}:`, err);
+      }
+    }
+    
+    return NextResponse.json({
+      success: true,
+      message: `Ödeme SMS kontrolü tamamlandı`,
+      data: {
+        checked: paidOrders.length,
+        sent: sentCount,
+        errors: errorCount,
+        timestamp: new Date().toISOString()
+      }
+    });
+  });
+}
@@ -0,0 +1,43 @@
+/**
+ * API route registry
+ * Every module exports register(router). The router prefers the more specific
+ * of two matching routes, so registration order only matters between routes
+ * with the same pattern (the first one registered runs first).
+ */
+
+import { Router } from '../router.js';
+import * as publicRoutes from './public.js';
+import * as authRoutes from './auth.js';
+import * as accountRoutes from './account.js';
+import * as paymentRoutes from './payments.js';
+import * as cronRoutes from './cron.js';
+import * as adminOrderRoutes from './admin-orders.js';
+import * as adminUserRoutes from './admin-users.js';
+import * as adminSettingsRoutes from './admin-settings.js';
+import * as adminRiskRoutes from './admin-risk.js';
+import * as adminSupportRoutes from './admin-support.js';
+import * as adminSystemRoutes from './admin-system.js';
+import * as adminCatalogRoutes from './admin-catalog.js';
+
+const MODULES = [
+  publicRoutes,
+  authRoutes,
+  accountRoutes,
+  paymentRoutes,
+  cronRoutes,
+  adminOrderRoutes,
+  adminUserRoutes,
+  adminSettingsRoutes,
+  adminRiskRoutes,
+  adminSupportRoutes,
+  adminSystemRoutes,
+  adminCatalogRoutes,
+];
+
+export function createApiRouter() {
+  const router = new Router();
+  for (const module of MODULES) {
+    module.register(router);
+  }
+  return router;
+}
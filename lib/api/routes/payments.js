@@ -0,0 +1,950 @@
+/**
+ * Payment routes: payment methods and the Shopier, Shopinext and Payyeen callbacks.
+ */
+
+import { NextResponse } from 'next/server';
+import { v4 as uuidv4 } from 'uuid';
+import { decrypt } from '@/lib/crypto';
+import * as shopierV2Client from '@/lib/shopierv2/client';
+import * as shopierV2Service from '@/lib/shopierv2/service';
+import {
+  BASE_URL, DEFAULT_RISK_SETTINGS, getClientIP, generateShopinextHash, logAuditAction,
+  AUDIT_ACTIONS, calculateOrderRisk, sendPaymentSuccessSms, sendDeliverySms, sendPaymentFailedSms,
+  sendPaymentSuccessEmail, sendDeliveredEmail, sendPaymentFailedEmail, sendVerificationRequiredEmail,
+  responseCache
+} from '../core.js';
+
+export function register(router) {
+  // Get available payment methods (PUBLIC - for checkout)
+  router.get('/api/payment-methods', async ({ db }) => {
+    const shopierSettings = await db.collection('shopier_settings').findOne({ isActive: true });
+    const shopinextSettings = await db.collection('shopinext_settings').findOne({ isActive: true });
+    const payeenSettings = await db.collection('payyeen_settings').findOne({ isActive: true });
+    const ibanSettings = await db.collection('iban_settings').findOne({ id: 'main' });
+    
+    // Check if Shopinext is configured via environment variables
+    const shopinextFromEnv = process.env.SHOPINEXT_CLIENT_ID && 
+                             process.env.SHOPINEXT_CLIENT_SECRET && 
+                             process.env.SHOPINEXT_DOMAIN;
+    
+    // Shopinext available only if:
+    // 1. DB settings exist AND isEnabled is true, OR
+    // 2. ENV configured AND no DB settings exist (fallback), OR
+    // 3. ENV configured AND DB settings exist with isEnabled true
+    let shopinextAvailable = false;
+    if (shopinextSettings) {
+      // If DB settings exist, respect isEnabled flag
+      shopinextAvailable = shopinextSettings.isEnabled === true;
+    } else if (shopinextFromEnv) {
+      // If no DB settings but ENV configured, show it
+      shopinextAvailable = true;
+    }
+
+    // Shoppiyen available if API key is set AND payyeen settings enabled
+    const shoppiyenApiKeySet = !!(process.env.SHOPPIYEN_API_KEY);
+    const shoppiyenAvailable = shoppiyenApiKeySet && (!payeenSettings || payeenSettings.isEnabled !== false);
+    
+    return NextResponse.json({
+      success: true,
+      data: {
+        shopier: {
+          available: !!shopierSettings && shopierSettings.isEnabled !== false,
+          name: 'Kredi/Banka Kartı'
+        },
+        shopinext: {
+          available: shopinextAvailable,
+          name: 'Kredi / Banka Kartı'
+        },
+        payyeen: {
+          available: shoppiyenAvailable,
+          name: 'Kredi / Banka Kartı'
+        },
+        iban: {
+          available: ibanSettings ? ibanSettings.isEnabled !== false : true,
+          name: 'Havale / EFT (IBAN)'
+        }
+      }
+    });
+  });
+
+  // ============================================
+  // 💳 SHOPPIYEN SUCCESS HANDLER - Ödeme başarılı
+  // URL: /api/payment/payyeen/success/{orderId}?status=success&transaction_id=xxx&order_id=xxx&hash=xxx
+  // ============================================
+  router.get('/api/payment/payyeen/success/*', async ({ request, db, pathname }) => {
+    const pathParts = pathname.split('/');
+    const orderId = pathParts[5];
+    const url = new URL(request.url);
+    const transactionId = url.searchParams.get('transaction_id');
+    const epin = url.searchParams.get('epin');
+    const callbackHash = url.searchParams.get('hash');
+    const callbackStatus = url.searchParams.get('status');
+    const callbackUuid = url.searchParams.get('uuid');
+    
+    const host = request.headers.get('host');
+    const protoHeader = request.headers.get('x-forwarded-proto') || 'https';
+    const protocol = protoHeader.split(',')[0].trim();
+    const publicBaseUrl = host ? `${protocol}://${host}` : BASE_URL;
+    
+    console.log('Shoppiyen SUCCESS:', { orderId, transactionId, callbackStatus, callbackUuid });
+    
+    if (!orderId) return NextResponse.redirect(`${publicBaseUrl}/payment/failed?error=missing_order`);
+    
+    const order = await db.collection('orders').findOne({ id: orderId });
+    if (!order) return NextResponse.redirect(`${publicBaseUrl}/payment/failed?orderId=${orderId}&error=order_not_found`);
+    if (order.status === 'paid') return NextResponse.redirect(`${publicBaseUrl}/payment/success?orderId=${orderId}&amount=${order.amount || 0}`);
+    if (order.status === 'failed') return NextResponse.redirect(`${publicBaseUrl}/payment/failed?orderId=${orderId}`);
+    
+    // Verify with Shoppiyen webhook verify API
+    let verified = false;
+    const SHOPPIYEN_API_KEY = process.env.SHOPPIYEN_API_KEY || '';
+    if (callbackHash && SHOPPIYEN_API_KEY) {
+      try {
+        const verifyRes = await fetch('https://shoppiyen.com/api/sale/webhook/verify', {
+          method: 'POST',
+          headers: { 'api-key': SHOPPIYEN_API_KEY, 'Content-Type': 'application/json' },
+          body: JSON.stringify({ order_id: orderId, uuid: callbackUuid || '', status: callbackStatus || 'successful', hash: callbackHash })
+        });
+        const verifyData = await verifyRes.json();
+        if (verifyData.is_valid && verifyData.official_status === 'successful') {
+          verified = true;
+        }
+        console.log('Shoppiyen verify result:', verifyData);
+      } catch (verifyErr) {
+        console.error('Shoppiyen verify error:', verifyErr);
+      }
+    }
+    
+    // Accept if verified OR if status=success (fallback for redirects)
+    if (verified || callbackStatus === 'success') {
+      // UPDATE ORDER TO PAID
+      await db.collection('orders').updateOne(
+        { id: orderId },
+        { $set: { status: 'paid', paymentProvider: 'shoppiyen', paymentId: transactionId || null, shoppiyen: { verified, uuid: callbackUuid, hash: callbackHash }, updatedAt: new Date() } }
+      );
+    
+    await db.collection('payments').insertOne({
+      id: uuidv4(), orderId, provider: 'shoppiyen', providerTxnId: transactionId || null,
+      status: 'paid', amount: order.amount, currency: order.currency || 'TRY',
+      source: 'success_url', rawPayload: { transactionId, epin, callbackHash, callbackUuid, verified }, verifiedAt: new Date(), createdAt: new Date()
+    });
+    
+    await db.collection('payment_requests').updateOne(
+      { orderId, provider: 'shoppiyen' },
+      { $set: { status: 'paid', transactionId, updatedAt: new Date() } }
+    );
+    
+    const orderUser = await db.collection('users').findOne({ id: order.userId });
+    const product = order.productId ? await db.collection('products').findOne({ id: order.productId }) : null;
+    const account = (order.type === 'account' && order.accountId) ? await db.collection('accounts').findOne({ id: order.accountId }) : null;
+    
+    if (orderUser && orderUser.phone) {
+      sendPaymentSuccessSms(db, order, orderUser, product?.title || order.accountTitle || 'Sipariş').catch(err => console.error('SMS err:', err));
+    }
+    
+    const orderAmount = order.amount || order.totalAmount || 0;
+    if (orderAmount >= 3000) {
+      await db.collection('orders').updateOne({ id: orderId }, { $set: {
+        verification: { required: true, status: 'pending', identityPhoto: null, paymentReceipt: null, submittedAt: null, reviewedAt: null, reviewedBy: null, rejectionReason: null },
+        delivery: { status: 'verification_required', message: 'Yüksek tutarlı sipariş - Doğrulama gerekli', items: [] }
+      }});
+      if (orderUser && product) sendVerificationRequiredEmail(db, order, orderUser, product).catch(err => console.error('Verif email err:', err));
+      return NextResponse.redirect(`${publicBaseUrl}/payment/success?orderId=${orderId}&amount=${order.amount || 0}`);
+    }
+    
+    const riskResult = await calculateOrderRisk(db, order, orderUser, request);
+    await db.collection('orders').updateOne({ id: orderId }, { $set: { risk: riskResult, 'meta.ip': getClientIP(request), 'meta.userAgent': request.headers.get('user-agent')?.substring(0, 500) || '' } });
+    
+    if (orderUser && product) sendPaymentSuccessEmail(db, order, orderUser, product).catch(err => console.error('Email err:', err));
+    
+    if (order.type === 'account' && account && account.credentials) {
+      await db.collection('orders').updateOne({ id: orderId }, { $set: { delivery: { status: 'delivered', credentials: account.credentials, deliveredAt: new Date() } } });
+      await db.collection('accounts').updateOne({ id: order.accountId }, { $set: { status: 'sold', soldAt: new Date(), soldToOrderId: orderId } });
+      responseCache.invalidateTags('accounts');
+    } else if (product) {
+      try {
+        const orderQty = order.quantity || 1;
+        const assignedItems = [];
+        for (let i = 0; i < orderQty; i++) {
+          const assignedStock = await db.collection('stock').findOneAndUpdate(
+            { productId: order.productId, status: 'available' },
+            { $set: { status: 'assigned', orderId, assignedAt: new Date() } },
+            { returnDocument: 'after', sort: { createdAt: 1 } }
+          );
+          if (assignedStock && assignedStock.value) {
+            assignedItems.push(assignedStock.value);
+          } else {
+            break;
+          }
+        }
+        if (assignedItems.length > 0) {
+          await db.collection('orders').updateOne({ id: orderId }, { $set: { delivery: { status: assignedItems.length >= orderQty ? 'delivered' : 'partial', items: assignedItems, assignedAt: new Date() } } });
+          if (orderUser) sendDeliveredEmail(db, order, orderUser, product, assignedItems).catch(err => console.error('Del email err:', err));
+        } else {
+          await db.collection('orders').updateOne({ id: orderId }, { $set: { delivery: { status: 'pending', message: 'Stok bekleniyor', items: [] } } });
+        }
+      } catch (e) { console.error('Stock error:', e); }
+    }
+    
+    return NextResponse.redirect(`${publicBaseUrl}/payment/success?orderId=${orderId}&amount=${order.amount || 0}`);
+    } else {
+      // Verification failed or status not success
+      return NextResponse.redirect(`${publicBaseUrl}/payment/failed?orderId=${orderId}&error=verification_failed`);
+    }
+  });
+
+  // ============================================
+  // 💳 SHOPPIYEN FAIL HANDLER - Ödeme başarısız
+  // URL: /api/payment/payyeen/fail/{orderId}?status=error&message=xxx
+  // ============================================
+  router.get('/api/payment/payyeen/fail/*', async ({ request, db, pathname }) => {
+    const pathParts = pathname.split('/');
+    const orderId = pathParts[5];
+    const url = new URL(request.url);
+    const errorMessage = url.searchParams.get('message');
+    
+    const host = request.headers.get('host');
+    const protoHeader = request.headers.get('x-forwarded-proto') || 'https';
+    const protocol = protoHeader.split(',')[0].trim();
+    const publicBaseUrl = host ? `${protocol}://${host}` : BASE_URL;
+    
+    console.log('Shoppiyen FAIL:', { orderId, errorMessage });
+    
+    if (orderId) {
+      await db.collection('orders').updateOne(
+        { id: orderId, status: 'pending' },
+        { $set: { status: 'failed', paymentProvider: 'shoppiyen', failReason: errorMessage || 'Ödeme başarısız', updatedAt: new Date() } }
+      );
+      const failedOrder = await db.collection('orders').findOne({ id: orderId });
+      if (failedOrder && failedOrder.type === 'account' && failedOrder.accountId) {
+        await db.collection('accounts').updateOne(
+          { id: failedOrder.accountId, status: 'reserved', reservedByOrderId: orderId },
+          { $set: { status: 'available', reservedAt: null, reservedByOrderId: null } }
+        );
+        responseCache.invalidateTags('accounts');
+      }
+      if (failedOrder && failedOrder.userId) {
+        const failedUser = await db.collection('users').findOne({ id: failedOrder.userId });
+        if (failedUser && failedUser.email) sendPaymentFailedEmail(db, failedOrder, failedUser).catch(err => console.error('Fail email err:', err));
+        if (failedUser && failedUser.phone) sendPaymentFailedSms(db, failedOrder, failedUser).catch(err => console.error('Fail SMS err:', err));
+      }
+    }
+    
+    return NextResponse.redirect(`${publicBaseUrl}/payment/failed?orderId=${orderId || ''}`);
+  });
+
+  // ============================================
+  // SHOPIER V2 - STATUS POLLING ENDPOINT
+  // ============================================
+  router.get('/api/payment/shopierv2/status', async ({ db, searchParams }) => {
+    const orderId = searchParams.get('orderId');
+    
+    if (!orderId) {
+      return NextResponse.json(
+        { success: false, error: 'orderId gerekli' },
+        { status: 400 }
+      );
+    }
+
+    // Get session status
+    const statusResult = await shopierV2Service.getSessionStatus(db, orderId);
+
+    if (!statusResult.success) {
+      return NextResponse.json(
+        { success: false, error: statusResult.error },
+        { status: 404 }
+      );
+    }
+
+    // Get order status
+    const order = await db.collection('orders').findOne({ id: orderId });
+    
+    if (!order) {
+      return NextResponse.json(
+        { success: false, error: 'Sipariş bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    return NextResponse.json({
+      success: true,
+      data: {
+        orderId: order.id,
+        orderStatus: order.status,
+        sessionStatus: statusResult.status,
+        delivery: order.delivery || null,
+        expiresAt: statusResult.expiresAt
+      }
+    });
+  });
+
+  // Shopier V2 OSB Webhook Callback
+  router.post('/api/payment/shopierv2/osb', async ({ request, db, body }) => {
+    console.log('========================================');
+    console.log('🔔 SHOPIER V2 OSB WEBHOOK RECEIVED');
+    console.log('Payload:', body);
+    console.log('========================================');
+
+    // Verify webhook signature
+    const isValidSignature = shopierV2Client.verifyOsbSignature(body);
+    
+    if (!isValidSignature) {
+      console.error('❌ Shopier V2: Invalid webhook signature');
+      return NextResponse.json(
+        { success: false, error: 'Invalid signature' },
+        { status: 403 }
+      );
+    }
+
+    console.log('✅ Shopier V2: Signature verified');
+
+    // Handle webhook callback
+    const webhookResult = await shopierV2Service.handleWebhookCallback(db, body);
+
+    if (!webhookResult.success) {
+      console.error('❌ Shopier V2 Webhook processing failed:', webhookResult.error);
+      return NextResponse.json(
+        { success: false, error: webhookResult.error },
+        { status: 400 }
+      );
+    }
+
+    console.log('✅ Shopier V2 Webhook processed:', webhookResult);
+
+    // If payment is successful, trigger delivery flow
+    if (webhookResult.status === 'paid') {
+      const order = await db.collection('orders').findOne({ id: webhookResult.orderId });
+      const orderUser = await db.collection('users').findOne({ id: order.userId });
+      const product = await db.collection('products').findOne({ id: order.productId });
+
+      // Check if this is a high-value order (>= 3000 TL)
+      const orderAmount = order.amount || order.totalAmount || 0;
+      
+      if (orderAmount >= 3000) {
+        // HIGH VALUE ORDER - REQUIRES VERIFICATION
+        await db.collection('orders').updateOne(
+          { id: order.id },
+          {
+            $set: {
+              verification: {
+                required: true,
+                status: 'pending',
+                identityPhoto: null,
+                paymentReceipt: null,
+                submittedAt: null
+              },
+              delivery: {
+                status: 'verification_required',
+                message: 'Yüksek tutarlı sipariş - Kimlik ve ödeme dekontu doğrulaması gerekli',
+                items: []
+              }
+            }
+          }
+        );
+        
+        console.log(`✅ Order ${order.id} marked for VERIFICATION (${orderAmount} TL >= 3000 TL)`);
+        
+        // Send verification required email
+        if (orderUser && product) {
+          sendVerificationRequiredEmail(db, order, orderUser, product).catch(err => 
+            console.error('Verification required email failed:', err)
+          );
+        }
+        
+        return NextResponse.json({
+          success: true,
+          message: 'Ödeme başarılı - Doğrulama gerekli'
+        });
+      }
+
+      // NORMAL FLOW - Orders < 3000 TL
+      // Calculate risk score
+      const riskResult = await calculateOrderRisk(db, order, orderUser, request);
+      
+      await db.collection('orders').updateOne(
+        { id: order.id },
+        {
+          $set: {
+            risk: riskResult,
+            'meta.ip': getClientIP(request),
+            'meta.userAgent': request.headers.get('user-agent')?.substring(0, 500) || ''
+          }
+        }
+      );
+
+      // Get risk settings
+      let riskSettings = await db.collection('risk_settings').findOne({ id: 'main' });
+      if (!riskSettings) {
+        riskSettings = DEFAULT_RISK_SETTINGS;
+      }
+
+      const actualStatus = riskResult.actualStatus || riskResult.status;
+      const shouldHoldDelivery = 
+        actualStatus === 'FLAGGED' || 
+        actualStatus === 'BLOCKED' ||
+        (actualStatus === 'SUSPICIOUS' && !riskSettings.suspiciousAutoApprove);
+
+      // Send payment success SMS immediately
+      if (orderUser && orderUser.phone && product) {
+        const itemTitle = product.title || order.productTitle || 'Sipariş';
+        console.log('📱 Sending immediate payment SMS to:', orderUser.phone);
+        sendPaymentSuccessSms(db, order, orderUser, itemTitle).catch(err =>
+          console.error('Payment success SMS failed:', err)
+        );
+      }
+
+      if (shouldHoldDelivery && !riskSettings.isTestMode) {
+        // Hold delivery for risky orders
+        await db.collection('orders').updateOne(
+          { id: order.id },
+          {
+            $set: {
+              delivery: {
+                status: 'hold',
+                message: actualStatus === 'BLOCKED' ? 'Sipariş engellendi' : 
+                         actualStatus === 'FLAGGED' ? 'Sipariş kontrol altında - Riskli' :
+                         'Sipariş kontrol altında - Şüpheli',
+                holdReason: actualStatus === 'BLOCKED' ? 'risk_blocked' : 
+                            actualStatus === 'FLAGGED' ? 'risk_flagged' : 'risk_suspicious',
+                items: []
+              }
+            }
+          }
+        );
+        
+        await logAuditAction(db, AUDIT_ACTIONS.ORDER_RISK_FLAG, 'system', 'order', order.id, request, {
+          riskScore: riskResult.score,
+          riskStatus: actualStatus,
+          reasons: riskResult.reasons
+        });
+        
+        console.log(`Order ${order.id} ${actualStatus} - Delivery on HOLD`);
+        
+        if (orderUser && product) {
+          sendPaymentSuccessEmail(db, order, orderUser, product).catch(err => 
+            console.error('Payment success email failed:', err)
+          );
+        }
+      } else {
+        // CLEAR risk - proceed with stock assignment
+        if (orderUser && product) {
+          sendPaymentSuccessEmail(db, order, orderUser, product).catch(err => 
+            console.error('Payment success email failed:', err)
+          );
+        }
+
+        const currentOrder = await db.collection('orders').findOne({ id: order.id });
+        
+        if (!currentOrder.delivery || !currentOrder.delivery.items || currentOrder.delivery.items.length === 0) {
+          console.log('Stock assignment starting for order:', order.id);
+          
+          try {
+            if (order.type === 'account' && order.accountId) {
+              // ACCOUNT ORDER - Use account_stock collection
+              const assignedAccountStock = await db.collection('account_stock').findOneAndUpdate(
+                { accountId: order.accountId, status: 'available' },
+                { $set: { status: 'sold', soldAt: new Date(), orderId: order.id } },
+                { returnDocument: 'after' }
+              );
+
+              if (assignedAccountStock) {
+                await db.collection('orders').updateOne(
+                  { id: order.id },
+                  {
+                    $set: {
+                      delivery: {
+                        status: 'delivered',
+                        deliveredAt: new Date(),
+                        items: [{
+                          id: assignedAccountStock.id,
+                          username: assignedAccountStock.username,
+                          password: assignedAccountStock.password,
+                          deliveredAt: new Date()
+                        }]
+                      }
+                    }
+                  }
+                );
+
+                console.log(`Account stock assigned to order ${order.id}:`, assignedAccountStock.id);
+              } else {
+                await db.collection('orders').updateOne(
+                  { id: order.id },
+                  {
+                    $set: {
+                      delivery: {
+                        status: 'out_of_stock',
+                        message: 'Stok tükendi - En kısa sürede eklenecek',
+                        items: []
+                      }
+                    }
+                  }
+                );
+                console.log(`No account stock available for order ${order.id}`);
+              }
+            } else {
+              // PRODUCT ORDER - Use stock collection
+              const stockItems = await db.collection('stock')
+                .find({ productId: order.productId, status: 'available' })
+                .limit(order.quantity)
+                .toArray();
+
+              if (stockItems.length >= order.quantity) {
+                const stockIds = stockItems.map(s => s.id);
+                
+                await db.collection('stock').updateMany(
+                  { id: { $in: stockIds } },
+                  { $set: { status: 'sold', soldAt: new Date(), orderId: order.id } }
+                );
+
+                const deliveryItems = stockItems.map(s => ({
+                  id: s.id,
+                  code: s.code,
+                  deliveredAt: new Date()
+                }));
+
+                await db.collection('orders').updateOne(
+                  { id: order.id },
+                  {
+                    $set: {
+                      delivery: {
+                        status: 'delivered',
+                        deliveredAt: new Date(),
+                        items: deliveryItems
+                      }
+                    }
+                  }
+                );
+
+                console.log(`Stock assigned to order ${order.id}:`, deliveryItems.length, 'items');
+
+                // Send delivery email
+                if (orderUser && product) {
+                  sendDeliveryEmail(db, order, orderUser, product, deliveryItems).catch(err => 
+                    console.error('Delivery email failed:', err)
+                  );
+                }
+
+                // Send delivery SMS
+                if (orderUser && orderUser.phone) {
+                  const itemTitle = product?.title || order.productTitle || 'Sipariş';
+                  console.log('📱 Sending delivery SMS to:', orderUser.phone);
+                  sendDeliverySms(db, order, orderUser, itemTitle).catch(err =>
+                    console.error('Delivery SMS failed:', err)
+                  );
+                }
+
+                // Close Shopier order after delivery (with delay)
+                shopierV2Service.closeOrderAfterDelivery(db, order.id).catch(err =>
+                  console.error('Close Shopier order failed:', err)
+                );
+              } else {
+                await db.collection('orders').updateOne(
+                  { id: order.id },
+                  {
+                    $set: {
+                      delivery: {
+                        status: 'out_of_stock',
+                        message: 'Stok tükendi - En kısa sürede eklenecek',
+                        items: []
+                      }
+                    }
+                  }
+                );
+                console.log(`Insufficient stock for order ${order.id}. Required: ${order.quantity}, Available: ${stockItems.length}`);
+              }
+            }
+          } catch (stockError) {
+            console.error('Stock assignment error:', stockError);
+            await db.collection('orders').updateOne(
+              { id: order.id },
+              {
+                $set: {
+                  delivery: {
+                    status: 'error',
+                    message: 'Stok ataması sırasında hata oluştu',
+                    items: [],
+                    error: stockError.message
+                  }
+                }
+              }
+            );
+          }
+        } else {
+          console.log(`Order ${order.id} already has stock assigned`);
+        }
+      }
+    }
+
+    return NextResponse.json({
+      success: true,
+      message: 'Webhook işlendi'
+    });
+  });
+
+  // Shopinext callback (Webhook)
+  router.post('/api/payments/shopinext/callback', async ({ db, body }) => {
+    const { payment_id, status, hash } = body;
+    
+    console.log('Shopinext callback received:', { payment_id, status });
+    
+    // 1. Find payment request
+    const paymentRequest = await db.collection('payment_requests').findOne({
+      paymentId: payment_id,
+      provider: 'shopinext'
+    });
+    
+    if (!paymentRequest) {
+      console.error(`Shopinext callback: Payment ${payment_id} not found`);
+      return new Response('OK', { status: 200 }); // Always return OK to stop retries
+    }
+    
+    const orderId = paymentRequest.orderId;
+    
+    // 2. Validate order exists
+    const order = await db.collection('orders').findOne({ id: orderId });
+    if (!order) {
+      console.error(`Shopinext callback: Order ${orderId} not found`);
+      return new Response('OK', { status: 200 });
+    }
+    
+    // 3. Check if order is already PAID (idempotency protection)
+    if (order.status === 'paid') {
+      console.log(`Shopinext callback: Order ${orderId} already PAID. Ignoring duplicate callback.`);
+      return new Response('OK', { status: 200 });
+    }
+    
+    // 4. Verify hash (CRITICAL SECURITY)
+    // Get credentials from env or database
+    const envClientId = process.env.SHOPINEXT_CLIENT_ID;
+    const envClientSecret = process.env.SHOPINEXT_CLIENT_SECRET;
+    const shopinextSettings = await db.collection('shopinext_settings').findOne({ isActive: true });
+    
+    let clientId, clientSecret;
+    if (envClientId && envClientSecret) {
+      clientId = envClientId;
+      clientSecret = envClientSecret;
+    } else if (shopinextSettings) {
+      clientId = decrypt(shopinextSettings.clientId);
+      clientSecret = decrypt(shopinextSettings.clientSecret);
+    }
+    
+    if (clientId && clientSecret && hash) {
+      try {
+        const expectedHash = generateShopinextHash(clientId, clientSecret);
+        
+        if (hash !== expectedHash) {
+          console.error('Shopinext callback: Hash mismatch');
+          // Log security event
+          await db.collection('payment_security_logs').insertOne({
+            orderId: orderId,
+            provider: 'shopinext',
+            event: 'hash_mismatch',
+            receivedHash: hash.substring(0, 20) + '...',
+            timestamp: new Date()
+          });
+          return new Response('OK', { status: 200 });
+        }
+      } catch (error) {
+        console.error('Shopinext callback: Hash verification error:', error);
+      }
+    }
+    
+    // 5. Map Shopinext status to application status
+    // Status codes: processing, successful, unsuccessful, cancelled, refunded, partially_refunded
+    let newStatus;
+    if (status === 'successful') {
+      newStatus = 'paid';
+    } else if (status === 'processing') {
+      // Still processing, don't update yet
+      console.log(`Shopinext callback: Order ${orderId} still processing`);
+      return new Response('OK', { status: 200 });
+    } else {
+      newStatus = 'failed';
+    }
+    
+    // 6. Enforce immutable status transitions
+    if (order.status === 'failed' && newStatus === 'paid') {
+      console.error(`Shopinext callback: Cannot change order ${orderId} from FAILED to PAID`);
+      return new Response('OK', { status: 200 });
+    }
+    
+    // 7. Update order status
+    await db.collection('orders').updateOne(
+      { id: orderId },
+      {
+        $set: {
+          status: newStatus,
+          paymentProvider: 'shopinext',
+          paymentId: payment_id,
+          updatedAt: new Date()
+        }
+      }
+    );
+    
+    // 8. Create payment record
+    await db.collection('payments').insertOne({
+      id: uuidv4(),
+      orderId: orderId,
+      provider: 'shopinext',
+      providerTxnId: payment_id,
+      status: newStatus,
+      amount: order.amount,
+      currency: order.currency || 'TRY',
+      hashValidated: !!hash,
+      rawPayload: { payment_id, status },
+      verifiedAt: new Date(),
+      createdAt: new Date()
+    });
+    
+    // Update payment request status
+    await db.collection('payment_requests').updateOne(
+      { paymentId: payment_id },
+      { $set: { status: newStatus, updatedAt: new Date() } }
+    );
+    
+    // 9. PROCESS PAID ORDERS (Stock assignment etc - same as Shopier)
+    if (newStatus === 'paid') {
+      const orderUser = await db.collection('users').findOne({ id: order.userId });
+      const product = await db.collection('products').findOne({ id: order.productId });
+      
+      // Send SMS
+      if (orderUser && orderUser.phone) {
+        const itemTitle = product?.title || 'Sipariş';
+        console.log('Shopinext: Sending payment SMS to', orderUser.phone);
+        sendPaymentSuccessSms(db, order, orderUser, itemTitle).catch(err =>
+          console.error('Shopinext payment SMS failed:', err)
+        );
+      }
+      
+      // Stock assignment with quantity support (same logic as Shopier)
+      if (product && (!order.delivery || order.delivery.status !== 'delivered')) {
+        try {
+          const orderQty = order.quantity || 1;
+          const assignedItems = [];
+          for (let i = 0; i < orderQty; i++) {
+            const assignedStock = await db.collection('stock').findOneAndUpdate(
+              { productId: order.productId, status: 'available' },
+              { $set: { status: 'assigned', orderId: orderId, assignedAt: new Date() } },
+              { returnDocument: 'after', sort: { createdAt: 1 } }
+            );
+            if (assignedStock && assignedStock.value) {
+              assignedItems.push(assignedStock.value);
+            } else { break; }
+          }
+          if (assignedItems.length > 0) {
+            await db.collection('orders').updateOne(
+              { id: orderId },
+              { $set: { delivery: { status: assignedItems.length >= orderQty ? 'delivered' : 'partial', items: assignedItems, assignedAt: new Date() } } }
+            );
+            console.log(`Shopinext: ${assignedItems.length} stock assigned to order ${orderId}`);
+            if (orderUser && product) {
+              sendDeliveredEmail(db, order, orderUser, product, assignedItems).catch(err => 
+                console.error('Shopinext delivered email failed:', err)
+              );
+            }
+          } else {
+            await db.collection('orders').updateOne(
+              { id: orderId },
+              { $set: { delivery: { status: 'pending', message: 'Stok bekleniyor', items: [] } } }
+            );
+            console.log(`Shopinext: No stock for order ${orderId}`);
+          }
+        } catch (stockError) {
+          console.error(`Shopinext stock error for order ${orderId}:`, stockError);
+        }
+      }
+    }
+    
+    console.log(`Shopinext callback: Order ${orderId} status updated to ${newStatus}`);
+    
+    // Return OK to Shopinext
+    return new Response('OK', { status: 200 });
+  });
+
+  // ============================================
+  // 💳 PAYYEEN WEBHOOK CALLBACK HANDLER
+  // ============================================
+  // ============================================
+  // 💳 PAYYEEN WEBHOOK CALLBACK HANDLER
+  // ============================================
+  router.post('/api/payment/payyeen/callback', async ({ db, body }) => {
+    console.log('Payyeen webhook received:', JSON.stringify(body));
+    
+    const { event, transaction_id, amount, currency, status, description, created_at } = body;
+    
+    // Extract orderId from description (PINLY-{orderId})
+    let orderId = null;
+    if (description && description.startsWith('PINLY-')) {
+      orderId = description.replace('PINLY-', '');
+    }
+    
+    // Fallback: find via payment_requests collection
+    if (!orderId) {
+      const paymentRequest = await db.collection('payment_requests').findOne({
+        provider: 'payyeen',
+        description: description
+      });
+      if (paymentRequest) orderId = paymentRequest.orderId;
+    }
+    
+    if (!orderId) {
+      console.error('Payyeen callback: Cannot determine orderId from description:', description);
+      return new Response('OK', { status: 200 });
+    }
+    
+    // 1. Validate order exists
+    const order = await db.collection('orders').findOne({ id: orderId });
+    if (!order) {
+      console.error(`Payyeen callback: Order ${orderId} not found`);
+      return new Response('OK', { status: 200 });
+    }
+    
+    // 2. Check if order is already PAID (idempotency protection)
+    if (order.status === 'paid') {
+      console.log(`Payyeen callback: Order ${orderId} already PAID. Ignoring duplicate callback.`);
+      return new Response('OK', { status: 200 });
+    }
+    
+    // 3. Map Payyeen event/status to application status
+    // Events: payment.success, payment.failed, payment.pending, payment.cancelled
+    let newStatus;
+    if (event === 'payment.success' || status === 'success') {
+      newStatus = 'paid';
+    } else if (event === 'payment.pending' || status === 'pending') {
+      console.log(`Payyeen callback: Order ${orderId} still pending`);
+      return new Response('OK', { status: 200 });
+    } else {
+      newStatus = 'failed';
+    }
+    
+    // 4. Enforce immutable status transitions
+    if (order.status === 'failed' && newStatus === 'paid') {
+      console.error(`Payyeen callback: Cannot change order ${orderId} from FAILED to PAID`);
+      return new Response('OK', { status: 200 });
+    }
+    
+    // 5. Update order status
+    await db.collection('orders').updateOne(
+      { id: orderId },
+      {
+        $set: {
+          status: newStatus,
+          paymentProvider: 'payyeen',
+          paymentId: transaction_id,
+          updatedAt: new Date()
+        }
+      }
+    );
+    
+    // 6. Create payment record
+    await db.collection('payments').insertOne({
+      id: uuidv4(),
+      orderId: orderId,
+      provider: 'payyeen',
+      providerTxnId: transaction_id,
+      status: newStatus,
+      amount: order.amount,
+      currency: order.currency || 'TRY',
+      rawPayload: body,
+      verifiedAt: new Date(),
+      createdAt: new Date()
+    });
+    
+    // Update payment request status
+    await db.collection('payment_requests').updateOne(
+      { orderId: orderId, provider: 'payyeen' },
+      { $set: { status: newStatus, transactionId: transaction_id, updatedAt: new Date() } }
+    );
+    
+    // 7. PROCESS PAID ORDERS (Stock assignment etc - same as Shopier/Shopinext)
+    if (newStatus === 'paid') {
+      const orderUser = await db.collection('users').findOne({ id: order.userId });
+      const product = await db.collection('products').findOne({ id: order.productId });
+      
+      // Send SMS
+      if (orderUser && orderUser.phone) {
+        const itemTitle = product?.title || 'Sipariş';
+        console.log('Payyeen: Sending payment SMS to', orderUser.phone);
+        sendPaymentSuccessSms(db, order, orderUser, itemTitle).catch(err =>
+          console.error('Payyeen payment SMS failed:', err)
+        );
+      }
+      
+      // Check if this is an account order
+      if (order.type === 'account' && order.accountId) {
+        // Account order - deliver credentials
+        const account = await db.collection('accounts').findOne({ id: order.accountId });
+        if (account && account.credentials) {
+          await db.collection('orders').updateOne(
+            { id: orderId },
+            {
+              $set: {
+                delivery: {
+                  status: 'delivered',
+                  credentials: account.credentials,
+                  deliveredAt: new Date()
+                }
+              }
+            }
+          );
+          // Mark account as sold
+          await db.collection('accounts').updateOne(
+            { id: order.accountId },
+            { $set: { status: 'sold', soldAt: new Date(), soldToOrderId: orderId } }
+          );
+          responseCache.invalidateTags('accounts');
+          console.log(`Payyeen: Account credentials delivered for order ${orderId}`);
+        }
+      } else if (product && (!order.delivery || order.delivery.status !== 'delivered')) {
+        // UC order - Stock assignment with quantity
+        try {
+          const orderQty = order.quantity || 1;
+          const assignedItems = [];
+          for (let i = 0; i < orderQty; i++) {
+            const assignedStock = await db.collection('stock').findOneAndUpdate(
+              { productId: order.productId, status: 'available' },
+              { $set: { status: 'assigned', orderId: orderId, assignedAt: new Date() } },
+              { returnDocument: 'after', sort: { createdAt: 1 } }
+            );
+            if (assignedStock && assignedStock.value) {
+              assignedItems.push(assignedStock.value);
+            } else { break; }
+          }
+          if (assignedItems.length > 0) {
+            await db.collection('orders').updateOne(
+              { id: orderId },
+              { $set: { delivery: { status: assignedItems.length >= orderQty ? 'delivered' : 'partial', items: assignedItems, assignedAt: new Date() } } }
+            );
+            console.log(`Payyeen: ${assignedItems.length} stock assigned to order ${orderId}`);
+            if (orderUser && product) {
+              sendDeliveredEmail(db, order, orderUser, product, assignedItems).catch(err => 
+                console.error('Payyeen delivered email failed:', err)
+              );
+            }
+          } else {
+            await db.collection('orders').updateOne(
+              { id: orderId },
+              { $set: { delivery: { status: 'pending', message: 'Stok bekleniyor', items: [] } } }
+            );
+            console.log(`Payyeen: No stock for order ${orderId}`);
+          }
+        } catch (stockError) {
+          console.error(`Payyeen stock error for order ${orderId}:`, stockError);
+        }
+      }
+      
+      // Send payment success email
+      if (orderUser && product) {
+        sendPaymentSuccessEmail(db, order, orderUser, product).catch(err =>
+          console.error('Payyeen payment success email failed:', err)
+        );
+      }
+    }
+    
+    console.log(`Payyeen callback: Order ${orderId} status updated to ${newStatus}`);
+    
+    // Return 200 OK to Payyeen
+    return new Response('OK', { status: 200 });
+  });
+}
@@ -0,0 +1,785 @@
+/**
+ * Public storefront routes: homepage, catalogue, content pages, site settings and reviews.
+ */
+
+import { NextResponse } from 'next/server';
+import { APP_VERSION, responseCache } from '../core.js';
+
+// Everything /api/homepage bundles; a write to any of it drops the cached page
+const HOMEPAGE_TAGS = [
+  'products', 'accounts', 'site_settings', 'footer_settings', 'seo_settings', 'regions',
+  'content:pubg', 'reviews', 'reviews:pubg'
+];
+
+export function register(router) {
+  // Healthcheck endpoint
+  router.get('/api/health', async () => {
+    return NextResponse.json({ 
+      ok: true, 
+      version: APP_VERSION, 
+      time: new Date().toISOString(),
+      uptime: process.uptime()
+    });
+  }, { rateLimit: false });
+
+  // Root endpoint
+  router.get(['/api', '/api/'], async () => {
+    return NextResponse.json({ message: 'PINLY API v1.0', status: 'ok', version: APP_VERSION });
+  }, { rateLimit: false });
+
+  // ============================================
+  // 🚀 HOMEPAGE - TÜM VERİLER TEK SEFERDE
+  // ============================================
+  router.get('/api/homepage', async ({ db, searchParams }) => {
+    const gameFilter = searchParams.get('game'); // 'pubg', 'valorant', or null
+    const cacheKey = gameFilter ? `homepage_${gameFilter}` : 'homepage_all';
+    const data = await responseCache.fetch(cacheKey, { ttl: 60000, tags: HOMEPAGE_TAGS }, async () => { // 1 dakika cache
+      // Build product query
+      const productQuery = { active: true };
+      if (gameFilter) {
+        productQuery.game = gameFilter;
+      }
+      
+      // Tüm verileri paralel olarak çek
+      const [
+        products,
+        accounts,
+        siteSettings,
+        footerSettings,
+        seoSettings,
+        regions,
+        gameContent,
+        reviewsData
+      ] = await Promise.all([
+        // Products (filtered by game if specified)
+        db.collection('products').find(productQuery).sort({ sortOrder: 1 }).toArray(),
+        
+        // Accounts
+        db.collection('accounts').find({ active: true, status: 'available' }).sort({ order: 1 }).toArray(),
+        
+        // Site Settings
+        db.collection('site_settings').findOne({ active: true }),
+        
+        // Footer Settings
+        db.collection('footer_settings').findOne({ active: true }),
+        
+        // SEO Settings
+        db.collection('seo_settings').findOne({ active: true }),
+        
+        // Regions
+        db.collection('regions').find({ enabled: true }).sort({ sortOrder: 1 }).toArray(),
+        
+        // Game Content
+        db.collection('game_content').findOne({ game: 'pubg' }),
+        
+        // Reviews with stats
+        (async () => {
+          const reviews = await db.collection('reviews')
+            .find({ game: 'pubg', approved: true })
+            .sort({ createdAt: -1 })
+            .limit(5)
+            .toArray();
+          
+          const ratingAgg = await db.collection('reviews').aggregate([
+            { $match: { game: 'pubg', approved: true } },
+            { $group: { _id: null, avgRating: { $avg: '$rating' }, count: { $sum: 1 } } }
+          ]).toArray();
+          
+          return { reviews, ratingAgg };
+        })()
+      ]);
+
+      // Process accounts (hide sensitive info)
+      const publicAccounts = accounts.map(acc => ({
+        id: acc.id,
+        title: acc.title,
+        description: acc.description,
+        price: acc.price,
+        discountPrice: acc.discountPrice,
+        imageUrl: acc.imageUrl,
+        legendaryMin: acc.legendaryMin,
+        legendaryMax: acc.legendaryMax,
+        level: acc.level,
+        rank: acc.rank,
+        features: acc.features,
+        order: acc.order || 0
+      }));
+
+      // Process regions
+      const processedRegions = regions.length > 0 ? regions : [
+        { id: 'tr', code: 'TR', name: 'Türkiye', enabled: true, sortOrder: 1 },
+        { id: 'global', code: 'GLOBAL', name: 'Küresel', enabled: true, sortOrder: 2 }
+      ];
+
+      // Process reviews stats
+      let avgRating = 5.0, reviewCount = 0;
+      if (reviewsData.ratingAgg.length > 0 && reviewsData.ratingAgg[0].count > 0) {
+        avgRating = Math.round(reviewsData.ratingAgg[0].avgRating * 10) / 10;
+        reviewCount = reviewsData.ratingAgg[0].count;
+      } else if (gameContent) {
+        avgRating = gameContent.defaultRating || 5.0;
+        reviewCount = gameContent.defaultReviewCount || 0;
+      }
+
+      return {
+        products,
+        accounts: publicAccounts,
+        siteSettings: {
+          logo: siteSettings?.logo || null,
+          favicon: siteSettings?.favicon || null,
+          heroImage: siteSettings?.heroImage || null,
+          valorantHeroImage: siteSettings?.valorantHeroImage || null,
+          mlbbHeroImage: siteSettings?.mlbbHeroImage || null,
+          lolHeroImage: siteSettings?.lolHeroImage || null,
+          robloxHeroImage: siteSettings?.robloxHeroImage || null,
+          categoryIcon: siteSettings?.categoryIcon || null,
+          siteName: siteSettings?.siteName || 'PINLY',
+          metaTitle: siteSettings?.metaTitle || 'PINLY – Dijital Kod ve Oyun Satış Platformu',
+          metaDescription: siteSettings?.metaDescription || 'PUBG Mobile UC satın al.',
+          contactEmail: siteSettings?.contactEmail || '',
+          contactPhone: siteSettings?.contactPhone || '',
+          liveSupportEnabled: siteSettings?.liveSupportEnabled !== false,
+          liveSupportHours: siteSettings?.liveSupportHours || '14:00 - 22:00',
+          dailyBannerEnabled: siteSettings?.dailyBannerEnabled !== false,
+          dailyBannerTitle: siteSettings?.dailyBannerTitle || 'Bugüne Özel Fiyatlar',
+          dailyBannerSubtitle: siteSettings?.dailyBannerSubtitle || '',
+          dailyBannerIcon: siteSettings?.dailyBannerIcon || 'fire',
+          dailyCountdownEnabled: siteSettings?.dailyCountdownEnabled !== false,
+          dailyCountdownLabel: siteSettings?.dailyCountdownLabel || 'Kampanya bitimine'
+        },
+        footerSettings: footerSettings || {
+          companyName: 'PINLY',
+          companyDescription: 'Güvenilir oyun kodu satış platformu',
+          quickLinks: [],
+          copyrightText: '© 2025 PINLY'
+        },
+        seoSettings: {
+          ga4MeasurementId: seoSettings?.enableAnalytics ? seoSettings.ga4MeasurementId : null,
+          gscVerificationCode: seoSettings?.enableSearchConsole ? seoSettings.gscVerificationCode : null
+        },
+        regions: processedRegions,
+        gameContent: gameContent || { title: 'PUBG Mobile', description: '' },
+        reviews: {
+          items: reviewsData.reviews,
+          stats: { avgRating, reviewCount }
+        }
+      };
+    });
+    
+    return NextResponse.json({ success: true, data });
+  });
+
+  // Get all products - WITH CACHE (supports game filter)
+  // 🔥 GÜNÜN FIRSATLARI - PUBLIC
+  router.get('/api/daily-deals', async ({ db }) => {
+    const now = new Date();
+    const deals = await db.collection('daily_deals').find({ active: true, endTime: { $gt: now } }).sort({ createdAt: -1 }).toArray();
+    const dealsWithProducts = await Promise.all(deals.map(async (deal) => {
+      const product = await db.collection('products').findOne({ id: deal.productId, active: true });
+      if (!product) return null;
+      return { ...deal, product: { id: product.id, title: product.title, ucAmount: product.ucAmount, price: product.price, discountPrice: product.discountPrice, imageUrl: product.imageUrl, regionCode: product.regionCode } };
+    }));
+    return NextResponse.json({ success: true, data: dealsWithProducts.filter(Boolean) });
+  });
+
+  router.get('/api/products', async ({ db, searchParams }) => {
+    const game = searchParams.get('game'); // 'pubg', 'valorant', or null (all)
+    const cacheKey = game ? `products_active_${game}` : 'products_active';
+    const products = await responseCache.fetch(cacheKey, { ttl: 120000, tags: ['products'] }, async () => { // 2 dakika cache
+      const query = { active: true };
+      if (game) {
+        query.game = game;
+      }
+      return db.collection('products')
+        .find(query)
+        .sort({ sortOrder: 1 })
+        .toArray();
+    });
+    
+    return NextResponse.json({ success: true, data: products });
+  });
+
+  // ============================================
+  // 🎮 PUBG HESAP SATIŞ API - PUBLIC GET ENDPOINTS
+  // ============================================
+
+  // Public: Get all active accounts - WITH CACHE
+  router.get('/api/accounts', async ({ db }) => {
+    const cacheKey = 'accounts_active';
+    const publicAccounts = await responseCache.fetch(cacheKey, { ttl: 120000, tags: ['accounts'] }, async () => { // 2 dakika cache
+      const accounts = await db.collection('accounts')
+        .find({ active: true, status: 'available' })
+        .sort({ order: 1, createdAt: -1 })
+        .toArray();
+
+      // Hide sensitive info
+      return accounts.map(acc => ({
+        id: acc.id,
+        title: acc.title,
+        description: acc.description,
+        price: acc.price,
+        discountPrice: acc.discountPrice,
+        discountPercent: acc.discountPercent,
+        imageUrl: acc.imageUrl,
+        legendaryMin: acc.legendaryMin,
+        legendaryMax: acc.legendaryMax,
+        level: acc.level,
+        rank: acc.rank,
+        features: acc.features,
+        order: acc.order || 0,
+        createdAt: acc.createdAt
+      }));
+    });
+
+    return NextResponse.json({ success: true, data: publicAccounts });
+  });
+
+  // Public: Get single account
+  router.get('/api/accounts/:id', async ({ db, pathname }) => {
+    const accountId = pathname.split('/').pop();
+    const account = await db.collection('accounts').findOne({ 
+      id: accountId, 
+      active: true, 
+      status: 'available' 
+    });
+
+    if (!account) {
+      return NextResponse.json({ success: false, error: 'Hesap bulunamadı' }, { status: 404 });
+    }
+
+    // Hide sensitive info
+    const publicAccount = {
+      id: account.id,
+      title: account.title,
+      description: account.description,
+      price: account.price,
+      discountPrice: account.discountPrice,
+      discountPercent: account.discountPercent,
+      imageUrl: account.imageUrl,
+      legendaryMin: account.legendaryMin,
+      legendaryMax: account.legendaryMax,
+      level: account.level,
+      rank: account.rank,
+      features: account.features,
+      createdAt: account.createdAt
+    };
+
+    return NextResponse.json({ success: true, data: publicAccount });
+  });
+
+  // Resolve player name (Real PUBG Mobile API via RapidAPI - ID Game Checker)
+  router.get('/api/player/resolve', async ({ searchParams }) => {
+    // Accept both 'id' and 'playerId' parameters
+    const playerId = searchParams.get('playerId') || searchParams.get('id');
+    if (!playerId || playerId.length < 6) {
+      return NextResponse.json(
+        { success: false, error: 'Geçersiz Oyuncu ID' },
+        { status: 400 }
+      );
+    }
+    
+    try {
+      const rapidApiKey = process.env.RAPIDAPI_KEY;
+      
+      if (!rapidApiKey) {
+        console.error('RAPIDAPI_KEY not configured');
+        // Fallback to generic name if API key not available
+        return NextResponse.json({
+          success: true,
+          data: {
+            playerId,
+            playerName: `Player#${playerId.slice(-4)}`
+          }
+        });
+      }
+
+      // Call PUBG Mobile ID Game Checker API via RapidAPI
+      const response = await fetch(
+        `https://id-game-checker.p.rapidapi.com/pubgm-global/${playerId}`,
+        {
+          method: 'GET',
+          headers: {
+            'x-rapidapi-host': 'id-game-checker.p.rapidapi.com',
+            'x-rapidapi-key': rapidApiKey
+          },
+          signal: AbortSignal.timeout(10000) // 10 second timeout
+        }
+      );
+
+      if (!response.ok) {
+        console.error(`PUBG API error: ${response.status}`);
+        // If API fails, use fallback
+        return NextResponse.json({
+          success: true,
+          data: {
+            playerId,
+            playerName: `Player#${playerId.slice(-4)}`
+          }
+        });
+      }
+
+      const apiData = await response.json();
+      
+      console.log('PUBG API response:', JSON.stringify(apiData));
+      
+      // Check if account is banned
+      if (apiData.data && apiData.data.is_ban === 1) {
+        return NextResponse.json({
+          success: false,
+          error: 'Bu hesap yasaklanmış (banned). UC yüklenemez.'
+        }, { status: 400 });
+      }
+      
+      // Extract player name - try multiple fields, fallback to Player#XXXX
+      const playerName = (apiData.data?.username && apiData.data.username.trim()) 
+        || (apiData.data?.nickname && apiData.data.nickname.trim()) 
+        || (apiData.data?.name && apiData.data.name.trim()) 
+        || `Player#${playerId.slice(-4)}`;
+      
+      return NextResponse.json({
+        success: true,
+        data: {
+          playerId,
+          playerName,
+          isBanned: apiData.data.is_ban === 1
+        }
+      });
+    } catch (error) {
+      console.error('Player resolve error:', error.message);
+      // Fallback to generic name on error
+      return NextResponse.json({
+        success: true,
+        data: {
+          playerId,
+          playerName: `Player#${playerId.slice(-4)}`
+        }
+      });
+    }
+  });
+
+  // Public: Get SEO Settings for frontend (limited data)
+  router.get('/api/seo/settings', async ({ db }) => {
+    const cacheKey = 'seo_settings';
+    const data = await responseCache.fetch(cacheKey, { ttl: 300000, tags: ['seo_settings'] }, async () => { // 5 dakika cache
+      const seoSettings = await db.collection('seo_settings').findOne({ active: true });
+      return {
+        ga4MeasurementId: seoSettings?.enableAnalytics ? seoSettings.ga4MeasurementId : null,
+        gscVerificationCode: seoSettings?.enableSearchConsole ? seoSettings.gscVerificationCode : null
+      };
+    });
+
+    return NextResponse.json({ success: true, data });
+  });
+
+  // Public: Get site settings (for frontend) - WITH CACHE
+  router.get('/api/site/settings', async ({ db }) => {
+    const cacheKey = 'site_settings';
+    const data = await responseCache.fetch(cacheKey, { ttl: 300000, tags: ['site_settings'] }, async () => { // 5 dakika cache
+      const settings = await db.collection('site_settings').findOne({ active: true });
+      return {
+        logo: settings?.logo || null,
+        favicon: settings?.favicon || null,
+        heroImage: settings?.heroImage || null,
+        valorantHeroImage: settings?.valorantHeroImage || null,
+        mlbbHeroImage: settings?.mlbbHeroImage || null,
+        lolHeroImage: settings?.lolHeroImage || null,
+        robloxHeroImage: settings?.robloxHeroImage || null,
+        categoryIcon: settings?.categoryIcon || null,
+        siteName: settings?.siteName || 'PINLY',
+        metaTitle: settings?.metaTitle || 'PINLY – Dijital Kod ve Oyun Satış Platformu',
+        metaDescription: settings?.metaDescription || 'PUBG Mobile UC satın al. Güvenilir, hızlı ve uygun fiyatlı UC satış platformu.',
+        contactEmail: settings?.contactEmail || '',
+        contactPhone: settings?.contactPhone || '',
+        liveSupportEnabled: settings?.liveSupportEnabled !== false,
+        liveSupportHours: settings?.liveSupportHours || '14:00 - 22:00',
+        dailyBannerEnabled: settings?.dailyBannerEnabled !== false,
+        dailyBannerTitle: settings?.dailyBannerTitle || 'Bugüne Özel Fiyatlar',
+        dailyBannerSubtitle: settings?.dailyBannerSubtitle || '',
+        dailyBannerIcon: settings?.dailyBannerIcon || 'fire',
+        dailyCountdownEnabled: settings?.dailyCountdownEnabled !== false,
+        dailyCountdownLabel: settings?.dailyCountdownLabel || 'Kampanya bitimine'
+      };
+    });
+    
+    return NextResponse.json({ success: true, data });
+  });
+
+  // Public: Get daily banner settings - WITH CACHE
+  router.get('/api/site/banner', async ({ db }) => {
+    const cacheKey = 'site_banner';
+    const data = await responseCache.fetch(cacheKey, { ttl: 300000, tags: ['site_settings'] }, async () => { // 5 dakika cache
+      const settings = await db.collection('site_settings').findOne({ active: true });
+      return {
+        enabled: settings?.dailyBannerEnabled !== false,
+        title: settings?.dailyBannerTitle || 'Bugüne Özel Fiyatlar',
+        subtitle: settings?.dailyBannerSubtitle || '',
+        icon: settings?.dailyBannerIcon || 'fire',
+        countdownEnabled: settings?.dailyCountdownEnabled !== false,
+        countdownLabel: settings?.dailyCountdownLabel || 'Kampanya bitimine'
+      };
+    });
+    
+    return NextResponse.json({ success: true, data });
+  });
+
+  // Public: Get enabled regions (for frontend filter) - WITH CACHE
+  router.get('/api/regions', async ({ db }) => {
+    const cacheKey = 'regions_enabled';
+    const regions = await responseCache.fetch(cacheKey, { ttl: 300000, tags: ['regions'] }, async () => { // 5 dakika cache
+      let regions = await db.collection('regions').find({ enabled: true }).sort({ sortOrder: 1 }).toArray();
+      
+      // If no regions exist, return default regions
+      if (regions.length === 0) {
+        regions = [
+          { id: 'tr', code: 'TR', name: 'Türkiye', enabled: true, flagImageUrl: null, sortOrder: 1 },
+          { id: 'global', code: 'GLOBAL', name: 'Küresel', enabled: true, flagImageUrl: null, sortOrder: 2 },
+          { id: 'de', code: 'DE', name: 'Almanya', enabled: true, flagImageUrl: null, sortOrder: 3 },
+          { id: 'fr', code: 'FR', name: 'Fransa', enabled: true, flagImageUrl: null, sortOrder: 4 },
+          { id: 'jp', code: 'JP', name: 'Japonya', enabled: true, flagImageUrl: null, sortOrder: 5 }
+        ];
+      }
+      return regions;
+    });
+    
+    return NextResponse.json({ success: true, data: regions });
+  });
+
+  // Public: Get game content (description, etc.) - WITH CACHE
+  router.get('/api/content/pubg', async ({ db }) => {
+    const cacheKey = 'content_pubg';
+    const content = await responseCache.fetch(cacheKey, { ttl: 300000, tags: ['content:pubg'] }, async () => { // 5 dakika cache
+      let content = await db.collection('game_content').findOne({ game: 'pubg' });
+      
+      // Default content if not exists
+      if (!content) {
+        content = {
+          game: 'pubg',
+          title: 'PUBG Mobile',
+          description: `PUBG Mobile UC satın alarak oyun içi avantajlar elde edin.`,
+          defaultRating: 5.0,
+          defaultReviewCount: 2008,
+          updatedAt: new Date()
+        };
+      }
+      return content;
+    });
+    
+    return NextResponse.json({ success: true, data: content });
+  });
+
+  // Public: Get Roblox content - WITH CACHE
+  router.get('/api/content/roblox', async ({ db }) => {
+    const cacheKey = 'content_roblox';
+    const content = await responseCache.fetch(cacheKey, { ttl: 300000, tags: ['content:roblox'] }, async () => {
+      let content = await db.collection('game_content').findOne({ game: 'roblox' });
+      
+      if (!content) {
+        content = {
+          game: 'roblox',
+          title: 'Roblox',
+          description: 'Roblox Robux satın alarak oyun içi avantajlar elde edin.',
+          defaultRating: 5.0,
+          defaultReviewCount: 1500,
+          updatedAt: new Date()
+        };
+      }
+      return content;
+    });
+    
+    return NextResponse.json({ success: true, data: content });
+  });
+
+  // Public: Get reviews with pagination - WITH CACHE
+  router.get('/api/reviews', async ({ db, searchParams }) => {
+    const game = searchParams.get('game') || 'pubg';
+    const page = parseInt(searchParams.get('page') || '1');
+    const limit = parseInt(searchParams.get('limit') || '5');
+    const skip = (page - 1) * limit;
+    
+    const cacheKey = `reviews_${game}_${page}_${limit}`;
+    const data = await responseCache.fetch(cacheKey, { ttl: 120000, tags: ['reviews', `reviews:${game}`, `content:${game}`] }, async () => { // 2 dakika cache
+      const reviews = await db.collection('reviews')
+        .find({ game, approved: true })
+        .sort({ createdAt: -1 })
+        .skip(skip)
+        .limit(limit)
+        .toArray();
+
+      const totalReviews = await db.collection('reviews').countDocuments({ game, approved: true });
+    
+      // Calculate average rating
+      const ratingAgg = await db.collection('reviews').aggregate([
+        { $match: { game, approved: true } },
+        { $group: { _id: null, avgRating: { $avg: '$rating' }, count: { $sum: 1 } } }
+      ]).toArray();
+
+      let avgRating = 5.0;
+      let reviewCount = 0;
+    
+      if (ratingAgg.length > 0 && ratingAgg[0].count > 0) {
+        avgRating = Math.round(ratingAgg[0].avgRating * 10) / 10;
+        reviewCount = ratingAgg[0].count;
+      } else {
+        // Use defaults from content if no reviews
+        const content = await db.collection('game_content').findOne({ game });
+        if (content) {
+          avgRating = content.defaultRating || 5.0;
+          reviewCount = content.defaultReviewCount || 0;
+        }
+      }
+
+      return {
+        reviews,
+        pagination: {
+          page,
+          limit,
+          total: totalReviews,
+          pages: Math.ceil(totalReviews / limit)
+        },
+        stats: {
+          avgRating,
+          reviewCount
+        }
+      };
+    });
+
+    return NextResponse.json({ success: true, data });
+  });
+
+  // Public: Get footer settings - WITH CACHE
+  router.get('/api/footer-settings', async ({ db }) => {
+    const cacheKey = 'footer_settings';
+    const data = await responseCache.fetch(cacheKey, { ttl: 300000, tags: ['footer_settings'] }, async () => { // 5 dakika cache
+      const settings = await db.collection('footer_settings').findOne({ active: true });
+      return settings || {
+        companyName: 'PINLY',
+        companyDescription: 'Güvenilir oyun kodu ve dijital ürün satış platformu',
+        socialLinks: {},
+        quickLinks: [],
+        supportLinks: [],
+        copyrightText: '© 2025 PINLY. Tüm hakları saklıdır.'
+      };
+    });
+    
+    return NextResponse.json({ success: true, data });
+  });
+
+  // Public: Get legal page by slug
+  router.get('/api/legal/:id', async ({ db, pathname }) => {
+    const slug = pathname.split('/').pop();
+    const page = await db.collection('legal_pages').findOne({ slug, isActive: true });
+    
+    if (!page) {
+      return NextResponse.json(
+        { success: false, error: 'Sayfa bulunamadı' },
+        { status: 404 }
+      );
+    }
+    
+    return NextResponse.json({ success: true, data: page });
+  });
+
+  // ============================================
+  // BLOG / NEWS API ENDPOINTS
+  // ============================================
+
+  // Public: Get all published blog posts
+  router.get('/api/blog', async ({ db, searchParams }) => {
+    const page = parseInt(searchParams.get('page')) || 1;
+    const limit = parseInt(searchParams.get('limit')) || 10;
+    const category = searchParams.get('category');
+
+    const cacheKey = `blog_${page}_${limit}_${category || 'all'}`;
+    const { posts, total } = await responseCache.fetch(cacheKey, { ttl: 60000, tags: ['blog'] }, async () => { // 1 dakika cache
+      let query = { status: 'published' };
+      if (category) query.category = category;
+
+      const [total, posts] = await Promise.all([
+        db.collection('blog_posts').countDocuments(query),
+        db.collection('blog_posts')
+          .find(query)
+          .sort({ publishedAt: -1, createdAt: -1 })
+          .skip((page - 1) * limit)
+          .limit(limit)
+          .toArray()
+      ]);
+      return { posts, total };
+    });
+
+    return NextResponse.json({
+      success: true,
+      data: posts,
+      meta: {
+        total,
+        page,
+        limit,
+        totalPages: Math.ceil(total / limit)
+      }
+    });
+  });
+
+  // Public: Get single blog post by slug
+  router.get('/api/blog/:id', async ({ db, pathname }) => {
+    const slug = pathname.split('/').pop();
+    
+    const post = await db.collection('blog_posts').findOne({ 
+      slug,
+      status: 'published'
+    });
+
+    if (!post) {
+      return NextResponse.json(
+        { success: false, error: 'Yazı bulunamadı' },
+        { status: 404 }
+      );
+    }
+
+    // Increment view count
+    await db.collection('blog_posts').updateOne(
+      { id: post.id },
+      { $inc: { views: 1 } }
+    );
+
+    return NextResponse.json({
+      success: true,
+      data: { ...post, views: (post.views || 0) + 1 }
+    });
+  });
+
+  // ============================================
+  // SPIN WHEEL - ÇARK ÇEVİR SİSTEMİ (GET)
+  // ============================================
+
+  // Çark ayarlarını getir
+  router.get('/api/spin-wheel/settings', async ({ db }) => {
+    const settings = await db.collection('settings').findOne({ type: 'spin_wheel' });
+    
+    const defaultSettings = {
+      type: 'spin_wheel',
+      isEnabled: true,
+      prizes: [
+        { id: 1, name: '150₺ İndirim', amount: 150, minOrder: 1500, chance: 2, color: '#FFD700' },
+        { id: 2, name: '100₺ İndirim', amount: 100, minOrder: 1000, chance: 5, color: '#FF6B00' },
+        { id: 3, name: '50₺ İndirim', amount: 50, minOrder: 500, chance: 15, color: '#3B82F6' },
+        { id: 4, name: '25₺ İndirim', amount: 25, minOrder: 250, chance: 25, color: '#10B981' },
+        { id: 5, name: '10₺ İndirim', amount: 10, minOrder: 100, chance: 30, color: '#8B5CF6' },
+        { id: 6, name: 'Boş - Tekrar Dene', amount: 0, minOrder: 0, chance: 23, color: '#6B7280' }
+      ],
+      expiryDays: 7,
+      dailySpins: 1
+    };
+    
+    return NextResponse.json({
+      success: true,
+      data: settings || defaultSettings
+    });
+  });
+
+  // Public: Get Site Base URL for OAuth redirect info
+  router.post('/api/site/base-url', async ({ db }) => {
+    const siteSettings = await db.collection('site_settings').findOne({ active: true });
+    const baseUrl = siteSettings?.baseUrl || process.env.NEXT_PUBLIC_BASE_URL || 'http://localhost:3000';
+    
+    return NextResponse.json({
+      success: true,
+      data: { baseUrl }
+    });
+  });
+
+  // ============================================
+  // SPIN WHEEL - ÇARK ÇEVİR SİSTEMİ
+  // ============================================
+
+  // Çark ayarlarını getir
+  router.delete('/api/spin-wheel/settings', async ({ db }) => {
+    const settings = await db.collection('settings').findOne({ type: 'spin_wheel' });
+    
+    const defaultSettings = {
+      type: 'spin_wheel',
+      isEnabled: true,
+      prizes: [
+        { id: 1, name: '150₺ İndirim', amount: 150, minOrder: 1500, chance: 2, color: '#FFD700' },
+        { id: 2, name: '100₺ İndirim', amount: 100, minOrder: 1000, chance: 5, color: '#FF6B00' },
+        { id: 3, name: '50₺ İndirim', amount: 50, minOrder: 500, chance: 15, color: '#3B82F6' },
+        { id: 4, name: '25₺ İndirim', amount: 25, minOrder: 250, chance: 25, color: '#10B981' },
+        { id: 5, name: '10₺ İndirim', amount: 10, minOrder: 100, chance: 30, color: '#8B5CF6' },
+        { id: 6, name: 'Boş - Tekrar Dene', amount: 0, minOrder: 0, chance: 23, color: '#6B7280' }
+      ],
+      expiryDays: 7,
+      dailySpins: 1
+    };
+    
+    return NextResponse.json({
+      success: true,
+      data: settings || defaultSettings
+    });
+  });
+
+  // ============================================
+  // 🎮 PUBG HESAP SATIŞ API - PUBLIC ENDPOINTS
+  // ============================================
+
+  // Public: Aktif Hesap Listesi
+  router.delete('/api/accounts', async ({ db }) => {
+    const accounts = await db.collection('accounts')
+      .find({ active: true, status: 'available' })
+      .sort({ order: 1, createdAt: -1 })
+      .toArray();
+
+    // Hassas bilgileri gizle
+    const publicAccounts = accounts.map(acc => {
+      console.log('Account order:', acc.title, acc.order); // DEBUG
+      return {
+        id: acc.id,
+        title: acc.title,
+        description: acc.description,
+        price: acc.price,
+        discountPrice: acc.discountPrice,
+        discountPercent: acc.discountPercent,
+        imageUrl: acc.imageUrl,
+        legendaryMin: acc.legendaryMin,
+        legendaryMax: acc.legendaryMax,
+        level: acc.level,
+        rank: acc.rank,
+        features: acc.features,
+        order: acc.order || 0,
+        createdAt: acc.createdAt
+      };
+    });
+
+    return NextResponse.json({ success: true, data: publicAccounts });
+  });
+
+  // Public: Tek Hesap Detayı
+  router.delete('/api/accounts/:id', async ({ db, pathname }) => {
+    const accountId = pathname.split('/').pop();
+    const account = await db.collection('accounts').findOne({ 
+      id: accountId, 
+      active: true, 
+      status: 'available' 
+    });
+
+    if (!account) {
+      return NextResponse.json({ success: false, error: 'Hesap bulunamadı' }, { status: 404 });
+    }
+
+    // Hassas bilgileri gizle
+    const publicAccount = {
+      id: account.id,
+      title: account.title,
+      description: account.description,
+      price: account.price,
+      discountPrice: account.discountPrice,
+      discountPercent: account.discountPercent,
+      imageUrl: account.imageUrl,
+      legendaryMin: account.legendaryMin,
+      legendaryMax: account.legendaryMax,
+      level: account.level,
+      rank: account.rank,
+      features: account.features,
+      createdAt: account.createdAt
+    };
+
+    return NextResponse.json({ success: true, data: publicAccount });
+  });
+}
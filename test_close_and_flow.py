@@ -3,21 +3,18 @@
 Test close ticket functionality and full flow with new user
 """
 
-import requests
-import json
-import time
 import sys
-from datetime import datetime
+
+from tools.api_client import API_BASE, ApiClient, scoped_email
 
 # Configuration
-BASE_URL = "https://world-store-en.preview."
-API_BASE = f"{BASE_URL}/api"
+api = ApiClient()
 
 # Test data for new user to avoid rate limiting
 TEST_USER_DATA = {
     "firstName": "Mehmet",
     "lastName": "Kaya", 
-    "email": "mehmet.flow@example.com",
+    "email": scoped_email("mehmet.flow@example.com"),
     "phone": "5559876543",
     "password": "test123456"
 }
@@ -40,33 +37,16 @@ def print_test_result(test_name, success, details=""):
     print()
 
 def setup_user():
-    """Setup test user"""
+    """Setup test user (log in, or register on first run)"""
     global user_token
     
-    print("🔧 Setting up new test user...")
+    print("🔧 Setting up test user...")
     
     try:
-        response = requests.post(f"{API_BASE}/auth/register", json=TEST_USER_DATA)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('success') and data.get('data') and data['data'].get('token'):
-                user_token = data['data']['token']
-                print(f"✅ New test user registered successfully")
-                return True
-        elif response.status_code == 409:
-            # User exists, login
-            login_response = requests.post(f"{API_BASE}/auth/login", json={
-                "email": TEST_USER_DATA["email"],
-                "password": TEST_USER_DATA["password"]
-            })
-            
-            if login_response.status_code == 200:
-                login_data = login_response.json()
-                if login_data.get('success') and login_data.get('data') and login_data['data'].get('token'):
-                    user_token = login_data['data']['token']
-                    print(f"✅ Test user logged in successfully")
-                    return True
+        user_token = api.user_token(TEST_USER_DATA["email"], TEST_USER_DATA["password"], register_data=TEST_USER_DATA)
+        if user_token:
+            print(f"✅ Test user ready")
+            return True
         
         print(f"❌ Failed to setup user")
         return False
@@ -82,14 +62,10 @@ def setup_admin():
     print("🔧 Logging in as admin...")
     
     try:
-        response = requests.post(f"{API_BASE}/admin/login", json=ADMIN_CREDENTIALS)
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('success') and data.get('data') and data['data'].get('token'):
-                admin_token = data['data']['token']
-                print(f"✅ Admin logged in successfully")
-                return True
+        admin_token = api.admin_token(ADMIN_CREDENTIALS)
+        if admin_token:
+            print(f"✅ Admin logged in successfully")
+            return True
         
         print(f"❌ Admin login failed")
         return False
@@ -106,7 +82,7 @@ def test_close_functionality():
     ticket_id = None
     try:
         headers = {"Authorization": f"Bearer {user_token}"}
-        response = requests.post(f"{API_BASE}/support/tickets", json={
+        response = api.post(f"{API_BASE}/support/tickets", json={
             "subject": "Test close functionality",
             "category": "diger",
             "message": "This ticket will be used to test close functionality"
@@ -129,7 +105,7 @@ def test_close_functionality():
     
     # Test close without auth
     try:
-        response = requests.post(f"{API_BASE}/admin/support/tickets/{ticket_id}/close", json={})
+        response = api.post(f"{API_BASE}/admin/support/tickets/{ticket_id}/close", json={})
         
         success = response.status_code == 401
         print_test_result(
@@ -143,7 +119,7 @@ def test_close_functionality():
     # Test close with admin token
     try:
         headers = {"Authorization": f"Bearer {admin_token}"}
-        response = requests.post(f"{API_BASE}/admin/support/tickets/{ticket_id}/close", json={}, headers=headers)
+        response = api.post(f"{API_BASE}/admin/support/tickets/{ticket_id}/close", json={}, headers=headers)
         
         if response.status_code == 200:
             data = response.json()
@@ -151,7 +127,7 @@ def test_close_functionality():
             
             # Verify ticket status changed to closed
             if success:
-                ticket_response = requests.get(f"{API_BASE}/admin/support/tickets/{ticket_id}", headers=headers)
+                ticket_response = api.get(f"{API_BASE}/admin/support/tickets/{ticket_id}", headers=headers)
                 if ticket_response.status_code == 200:
                     ticket_data = ticket_response.json()
                     if ticket_data.get('success') and ticket_data.get('data'):
@@ -174,7 +150,7 @@ def test_close_functionality():
     # Test user cannot send message to closed ticket
     try:
         headers = {"Authorization": f"Bearer {user_token}"}
-        response = requests.post(f"{API_BASE}/support/tickets/{ticket_id}/messages", 
+        response = api.post(f"{API_BASE}/support/tickets/{ticket_id}/messages", 
                                json={"message": "Bu mesaj kapalı bilete gönderilmemeli"}, 
                                headers=headers)
         
@@ -203,7 +179,7 @@ def test_full_flow():
     
     try:
         headers = {"Authorization": f"Bearer {user_token}"}
-        response = requests.post(f"{API_BASE}/support/tickets", json={
+        response = api.post(f"{API_BASE}/support/tickets", json={
             "subject": "Teslimat sorunu - Full Flow Test",
             "category": "teslimat",
             "message": "UC kodlarım gelmedi, lütfen yardım edin."
@@ -228,7 +204,7 @@ def test_full_flow():
     # Step 2: User tries to send message (should fail)
     try:
         headers = {"Authorization": f"Bearer {user_token}"}
-        response = requests.post(f"{API_BASE}/support/tickets/{flow_ticket_id}/messages", 
+        response = api.post(f"{API_BASE}/support/tickets/{flow_ticket_id}/messages", 
                                json={"message": "Acil yardım gerekiyor!"}, 
                                headers=headers)
         
@@ -244,7 +220,7 @@ def test_full_flow():
     # Step 3: Admin replies
     try:
         headers = {"Authorization": f"Bearer {admin_token}"}
-        response = requests.post(f"{API_BASE}/admin/support/tickets/{flow_ticket_id}/messages", 
+        response = api.post(f"{API_BASE}/admin/support/tickets/{flow_ticket_id}/messages", 
                                json={"message": "Merhaba, sorununuzu inceliyoruz. Sipariş numaranızı paylaşabilir misiniz?"}, 
                                headers=headers)
         
@@ -261,7 +237,7 @@ def test_full_flow():
     # Step 4: User sends message
     try:
         headers = {"Authorization": f"Bearer {user_token}"}
-        response = requests.post(f"{API_BASE}/support/tickets/{flow_ticket_id}/messages", 
+        response = api.post(f"{API_BASE}/support/tickets/{flow_ticket_id}/messages", 
                                json={"message": "Sipariş numarası: ORD789123. Teşekkürler."}, 
                                headers=headers)
         
@@ -278,7 +254,7 @@ def test_full_flow():
     # Step 5: User tries to send another message (should fail)
     try:
         headers = {"Authorization": f"Bearer {user_token}"}
-        response = requests.post(f"{API_BASE}/support/tickets/{flow_ticket_id}/messages", 
+        response = api.post(f"{API_BASE}/support/tickets/{flow_ticket_id}/messages", 
                                json={"message": "Başka bir mesaj"}, 
                                headers=headers)
         
@@ -294,7 +270,7 @@ def test_full_flow():
     # Step 6: Admin closes ticket
     try:
         headers = {"Authorization": f"Bearer {admin_token}"}
-        response = requests.post(f"{API_BASE}/admin/support/tickets/{flow_ticket_id}/close", json={}, headers=headers)
+        response = api.post(f"{API_BASE}/admin/support/tickets/{flow_ticket_id}/close", json={}, headers=headers)
         
         if response.status_code == 200:
             print("✅ Step 6: Admin closed ticket")
@@ -309,7 +285,7 @@ def test_full_flow():
     # Step 7: User tries to send message to closed ticket (should fail)
     try:
         headers = {"Authorization": f"Bearer {user_token}"}
-        response = requests.post(f"{API_BASE}/support/tickets/{flow_ticket_id}/messages", 
+        response = api.post(f"{API_BASE}/support/tickets/{flow_ticket_id}/messages", 
                                json={"message": "Kapalı bilete mesaj"}, 
                                headers=headers)
         
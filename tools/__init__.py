@@ -0,0 +1,6 @@
+"""
+PINLY backend tooling - load drivers, benchmarks and maintenance scripts.
+
+Run modules from the repository root, e.g. `python -m tools.loadtest --help`.
+Install their dependencies with `pip install -r tools/requirements.txt`.
+"""
@@ -0,0 +1,354 @@
+"""
+Shared PINLY API client for the test and ops scripts.
+
+- One keep-alive connection pool per client instead of a new TCP+TLS handshake per call
+- Cached admin and user tokens
+- Bounded retries on 429 honouring the Retry-After value set from checkRateLimit's retryAfter
+- Per-call timing hooks
+- AsyncApiClient: the same interface on aiohttp (imported lazily, optional)
+
+Usage:
+    from tools.api_client import ApiClient
+
+    api = ApiClient()
+    token = api.admin_token()
+    response = api.get("/admin/orders", headers=api.auth_headers(token))
+"""
+
+import asyncio
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = os.getenv("NEXT_PUBLIC_BASE_URL", "http://localhost:3000")
+API_BASE = f"{BASE_URL.rstrip('/')}/api"
+
+# Set per worker by tools/run_suites.py so parallel runs never share users or a rate-limit IP
+TEST_RUN_ID = os.getenv("PINLY_TEST_RUN_ID")
+TEST_FORWARDED_FOR = os.getenv("PINLY_TEST_FORWARDED_FOR")
+
+# Tried in order by admin_token(); the first working login is cached
+ADMIN_CREDENTIALS = [
+    {"username": "admin", "password": "admin123"},
+    {"email": "admin@pinly.com.tr", "password": "admin123"},
+    {"email": "admin", "password": "admin123"},
+]
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+# Do not sit out brute-force lockouts (600s+); give the caller the 429 instead
+DEFAULT_MAX_RETRY_WAIT = 65
+
+
+def scoped_email(email):
+    """Make a fixed test identity unique to the current run (plus-addressed with PINLY_TEST_RUN_ID)"""
+    if not TEST_RUN_ID:
+        return email
+    local, _, domain = email.partition("@")
+    return f"{local}+{TEST_RUN_ID}@{domain}"
+
+
+def _retry_after_seconds(headers, body):
+    """Seconds to wait before retrying a 429, from the Retry-After header or a retryAfter body field"""
+    value = headers.get("Retry-After") if headers is not None else None
+    if value is None and isinstance(body, dict):
+        value = body.get("retryAfter")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return 1.0
+
+
+def _token_from(response):
+    """Token from a login/register response, or None"""
+    if response.status_code != 200:
+        return None
+    try:
+        body = response.json()
+    except ValueError:
+        return None
+    if isinstance(body, dict) and body.get("success"):
+        return (body.get("data") or {}).get("token")
+    return None
+
+
+class _ClientBase:
+    """URL building, default headers, token cache and hooks shared by both clients"""
+
+    def __init__(self, base_url=None, timeout=DEFAULT_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 max_retry_wait=DEFAULT_MAX_RETRY_WAIT, headers=None, hooks=None, forwarded_for=None):
+        self.base_url = (base_url or API_BASE).rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_retry_wait = max_retry_wait
+        self.default_headers = dict(headers or {})
+        forwarded_for = forwarded_for or TEST_FORWARDED_FOR
+        if forwarded_for:
+            self.default_headers["X-Forwarded-For"] = forwarded_for
+        self.hooks = list(hooks or [])
+        self._tokens = {}
+        self._token_lock = threading.Lock()
+
+    def url(self, path):
+        """Absolute URLs pass through; paths are joined onto the API base"""
+        if path.startswith("http://") or path.startswith("https://"):
+            return path
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def add_hook(self, hook):
+        """Register hook(event) called after every attempt.
+
+        event keys: method, url, label, status, elapsed_ms, attempt, error
+        """
+        self.hooks.append(hook)
+
+    def _emit(self, **event):
+        for hook in self.hooks:
+            hook(event)
+
+    def _merge_headers(self, headers):
+        merged = dict(self.default_headers)
+        if headers:
+            merged.update(headers)
+        return merged
+
+    def _should_retry(self, status, attempt, wait):
+        return status == 429 and attempt < self.max_retries and wait <= self.max_retry_wait
+
+    @staticmethod
+    def auth_headers(token):
+        return {"Authorization": f"Bearer {token}"} if token else {}
+
+    def invalidate_tokens(self):
+        with self._token_lock:
+            self._tokens.clear()
+
+
+class ApiClient(_ClientBase):
+    """Synchronous client on a pooled requests.Session. Thread safe for concurrent use."""
+
+    def __init__(self, base_url=None, pool_size=20, **kwargs):
+        super().__init__(base_url, **kwargs)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def request(self, method, path, label=None, **kwargs):
+        url = self.url(path)
+        kwargs["headers"] = self._merge_headers(kwargs.get("headers"))
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except requests.exceptions.RequestException as e:
+                self._emit(method=method, url=url, label=label or path, status=None,
+                           elapsed_ms=(time.perf_counter() - start) * 1000, attempt=attempt, error=type(e).__name__)
+                raise
+            self._emit(method=method, url=url, label=label or path, status=response.status_code,
+                       elapsed_ms=(time.perf_counter() - start) * 1000, attempt=attempt, error=None)
+            if response.status_code != 429:
+                return response
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            wait = _retry_after_seconds(response.headers, body)
+            if not self._should_retry(response.status_code, attempt, wait):
+                return response
+            attempt += 1
+            time.sleep(wait)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def admin_token(self, credentials=None):
+        """Log in to /admin/login once and reuse the token; returns None if every credential fails"""
+        key = ("admin", json.dumps(credentials, sort_keys=True) if credentials else None)
+        with self._token_lock:
+            if key in self._tokens:
+                return self._tokens[key]
+        for creds in ([credentials] if credentials else ADMIN_CREDENTIALS):
+            response = self.post("/admin/login", json=creds)
+            token = _token_from(response)
+            if token:
+                with self._token_lock:
+                    self._tokens[key] = token
+                return token
+        return None
+
+    def user_token(self, email, password, register_data=None):
+        """User token, cached per e-mail.
+
+        With register_data the user is registered first and only logged in when
+        the e-mail already exists (409), so a fresh scoped user costs no failed
+        login (brute-force counter, USER_LOGIN_FAILED audit entry, login rate
+        limit). Without it this just logs in.
+        """
+        key = ("user", email.lower())
+        with self._token_lock:
+            if key in self._tokens:
+                return self._tokens[key]
+        token = None
+        response = None
+        if register_data:
+            response = self.post("/auth/register", json={**register_data, "email": email, "password": password})
+            token = _token_from(response)
+        if not token and (response is None or response.status_code == 409):
+            response = self.post("/auth/login", json={"email": email, "password": password})
+            token = _token_from(response)
+        if token:
+            with self._token_lock:
+                self._tokens[key] = token
+        return token
+
+    def close(self):
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AsyncResponse:
+    """Fully read aiohttp response, so it can outlive the request context"""
+
+    def __init__(self, status_code, headers, text):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    def json(self):
+        return json.loads(self.text) if self.text else {}
+
+
+class AsyncApiClient(_ClientBase):
+    """asyncio variant on a shared aiohttp.ClientSession. Use as `async with AsyncApiClient() as api:`"""
+
+    def __init__(self, base_url=None, pool_size=100, **kwargs):
+        super().__init__(base_url, **kwargs)
+        self.pool_size = pool_size
+        self.session = None
+        self._token_locks = {}
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        import aiohttp
+
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                connector=aiohttp.TCPConnector(limit=self.pool_size),
+            )
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    async def request(self, method, path, label=None, headers=None, **kwargs):
+        import aiohttp
+
+        await self.open()
+        url = self.url(path)
+        headers = self._merge_headers(headers)
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                async with self.session.request(method, url, headers=headers, **kwargs) as raw:
+                    response = AsyncResponse(raw.status, raw.headers, await raw.text())
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                self._emit(method=method, url=url, label=label or path, status=None,
+                           elapsed_ms=(time.perf_counter() - start) * 1000, attempt=attempt,
+                           error="timeout" if isinstance(e, asyncio.TimeoutError) else type(e).__name__)
+                raise
+            self._emit(method=method, url=url, label=label or path, status=response.status_code,
+                       elapsed_ms=(time.perf_counter() - start) * 1000, attempt=attempt, error=None)
+            if response.status_code != 429:
+                return response
+            try:
+                body = response.json()
+            except ValueError:
+                body = None
+            wait = _retry_after_seconds(response.headers, body)
+            if not self._should_retry(response.status_code, attempt, wait):
+                return response
+            attempt += 1
+            await asyncio.sleep(wait)
+
+    async def get(self, path, **kwargs):
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path, **kwargs):
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path, **kwargs):
+        return await self.request("PUT", path, **kwargs)
+
+    async def patch(self, path, **kwargs):
+        return await self.request("PATCH", path, **kwargs)
+
+    async def delete(self, path, **kwargs):
+        return await self.request("DELETE", path, **kwargs)
+
+    async def admin_token(self, credentials=None):
+        key = ("admin", json.dumps(credentials, sort_keys=True) if credentials else None)
+        # One login per key even when many tasks ask at once
+        lock = self._token_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key in self._tokens:
+                return self._tokens[key]
+            for creds in ([credentials] if credentials else ADMIN_CREDENTIALS):
+                response = await self.post("/admin/login", json=creds, label="admin_login")
+                token = _token_from(response)
+                if token:
+                    self._tokens[key] = token
+                    return token
+        return None
+
+    async def user_token(self, email, password, register_data=None):
+        key = ("user", email.lower())
+        lock = self._token_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key in self._tokens:
+                return self._tokens[key]
+            token = None
+            response = None
+            # Register first, log in only for an existing e-mail (see ApiClient.user_token)
+            if register_data:
+                response = await self.post("/auth/register", label="register",
+                                           json={**register_data, "email": email, "password": password})
+                token = _token_from(response)
+            if not token and (response is None or response.status_code == 409):
+                response = await self.post("/auth/login", json={"email": email, "password": password}, label="login")
+                token = _token_from(response)
+            if token:
+                self._tokens[key] = token
+            return token
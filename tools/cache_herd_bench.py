@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Cache Miss Herd Benchmark
+Empties the API response cache (DELETE /api/admin/debug/cache), then fires
+--concurrency simultaneous GETs at one cached public endpoint, the way a
+traffic spike lands right after a TTL expires. It counts the MongoDB
+operations the burst caused and compares them with a single cold request
+against the same endpoint:
+
+    single_ops      operations for one request on an empty cache
+    burst_ops       operations for the whole burst on an empty cache
+    herd_factor     burst_ops / single_ops - 1.0 when concurrent misses share
+                    one load (ResponseCache.fetch in lib/api/cache.js), about
+                    --concurrency when every request queries on its own
+
+Operations are read from the database profiler (level 2 while a burst runs,
+reset between bursts), which needs a standalone mongod or replica set member
+we may profile. Where that is refused, the serverStatus opcounters delta is
+used instead, which also counts other clients of the same server.
+
+The coalesced / misses counters come from GET /api/admin/debug/memory.
+
+Usage:
+    python -m tools.cache_herd_bench --concurrency 500
+    python -m tools.cache_herd_bench --endpoints homepage,blog --rounds 3 --output herd.json
+
+Requires: aiohttp, pymongo
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter
+
+import aiohttp
+from pymongo.errors import OperationFailure
+
+from tools.api_client import BASE_URL, AsyncApiClient
+from tools.db import DB_NAME, get_db
+from tools.stats import Recorder, summarize
+
+ENDPOINTS = {
+    "homepage": "/homepage",
+    "products": "/products",
+    "accounts": "/accounts",
+    "regions": "/regions",
+    "blog": "/blog",
+    "reviews": "/reviews",
+}
+
+OPCOUNTERS = ["query", "getmore", "command"]
+
+
+class OpCounter:
+    """MongoDB operations run between start() and stop()"""
+
+    def __init__(self, db, force_opcounters=False):
+        self.db = db
+        self.mode = "opcounters" if force_opcounters else "profiler"
+        self.previous_level = None
+
+    def _opcounters(self):
+        status = self.db.client.admin.command("serverStatus")
+        return sum(status["opcounters"][name] for name in OPCOUNTERS)
+
+    def start(self):
+        if self.mode == "profiler":
+            try:
+                self.previous_level = self.db.command("profile", -1)["was"]
+                self.db.command("profile", 0)
+                self.db.drop_collection("system.profile")
+                self.db.command("profile", 2)
+                return
+            except OperationFailure as e:
+                print(f"⚠️  Profiler unavailable ({e.code}), falling back to serverStatus opcounters",
+                      file=sys.stderr)
+                self.mode = "opcounters"
+        self.baseline = self._opcounters()
+
+    def stop(self):
+        """(total operations, operations per namespace or None)"""
+        if self.mode == "opcounters":
+            # The serverStatus call that took the baseline counts as one command
+            return self._opcounters() - self.baseline - 1, None
+
+        self.db.command("profile", 0)
+        by_namespace = Counter()
+        for entry in self.db["system.profile"].find({}, {"ns": 1, "command": 1}):
+            if "profile" in (entry.get("command") or {}):
+                continue
+            by_namespace[entry["ns"].removeprefix(f"{DB_NAME}.")] += 1
+        self.db.command("profile", self.previous_level or 0)
+        return sum(by_namespace.values()), dict(by_namespace)
+
+
+class Bench:
+    def __init__(self, args, db):
+        self.args = args
+        self.ops = OpCounter(db, force_opcounters=args.opcounters)
+        self.recorder = Recorder()
+
+    def on_call(self, event):
+        self.recorder.record(event["label"], event["elapsed_ms"], status=event["status"], error=event["error"])
+
+    async def cache_counters(self):
+        response = await self.api.get("/admin/debug/memory", label="debug_memory", headers=self.headers)
+        return response.json()["data"]["cache"]
+
+    async def clear_cache(self):
+        response = await self.api.delete("/admin/debug/cache", label="clear_cache", headers=self.headers)
+        if response.status_code != 200:
+            raise SystemExit(f"❌ Clearing the response cache failed: HTTP {response.status_code}")
+
+    async def burst(self, name, path, count):
+        """Clear the cache, send `count` simultaneous GETs and return what they cost"""
+        await self.clear_cache()
+        before = await self.cache_counters()
+        start = asyncio.Event()
+        latencies = []
+
+        async def one():
+            await start.wait()
+            began = time.perf_counter()
+            try:
+                response = await self.api.get(path, label=name)
+                ok = response.status_code == 200
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                ok = False
+            latencies.append((time.perf_counter() - began) * 1000)
+            return ok
+
+        tasks = [asyncio.create_task(one()) for _ in range(count)]
+        await asyncio.sleep(0)
+        self.ops.start()
+        start.set()
+        results = await asyncio.gather(*tasks)
+        total, by_namespace = self.ops.stop()
+        after = await self.cache_counters()
+
+        return {
+            "requests": count,
+            "failed": results.count(False),
+            "db_ops": total,
+            "db_ops_by_collection": by_namespace,
+            "misses": after["misses"] - before["misses"],
+            "coalesced": after["coalesced"] - before["coalesced"],
+            "latency_ms": summarize(latencies),
+        }
+
+    async def run(self):
+        # Retries only apply to 429s, i.e. the /api/admin limit on the debug calls between bursts
+        self.api = AsyncApiClient(f"{self.args.base_url.rstrip('/')}/api", timeout=self.args.timeout,
+                                  pool_size=self.args.concurrency, hooks=[self.on_call])
+        async with self.api:
+            token = await self.api.admin_token()
+            if not token:
+                raise SystemExit("❌ Admin login failed")
+            self.headers = self.api.auth_headers(token)
+
+            results = {}
+            for name in self.args.endpoints:
+                path = ENDPOINTS[name]
+                print(f"🏁 {name}: 1 cold request, then {self.args.rounds} x {self.args.concurrency} "
+                      f"simultaneous cold requests", file=sys.stderr)
+                single = await self.burst(name, path, 1)
+                bursts = [await self.burst(name, path, self.args.concurrency) for _ in range(self.args.rounds)]
+                burst_ops = max(b["db_ops"] for b in bursts)
+                results[name] = {
+                    "path": f"/api{path}",
+                    "single_ops": single["db_ops"],
+                    "burst_ops": burst_ops,
+                    "herd_factor": round(burst_ops / single["db_ops"], 2) if single["db_ops"] else None,
+                    "single": single,
+                    "bursts": bursts,
+                }
+            self.recorder.stop()
+        return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="DB operations caused by simultaneous cache misses")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS),
+                        help=f"Comma separated, from: {', '.join(ENDPOINTS)}")
+    parser.add_argument("--concurrency", type=int, default=500, help="Simultaneous requests per burst")
+    parser.add_argument("--rounds", type=int, default=1, help="Bursts per endpoint (the worst one is reported)")
+    parser.add_argument("--opcounters", action="store_true",
+                        help="Count serverStatus opcounters instead of using the profiler")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    args.endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in args.endpoints if name not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(unknown)}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    bench = Bench(args, get_db())
+    results = asyncio.run(bench.run())
+
+    report = {
+        "config": {"concurrency": args.concurrency, "rounds": args.rounds, "op_source": bench.ops.mode},
+        "endpoints": results,
+        "requests": bench.recorder.report(),
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    herded = False
+    for name, result in results.items():
+        factor = result["herd_factor"]
+        coalesced = max(b["coalesced"] for b in result["bursts"])
+        symbol = "✅" if factor is not None and factor <= 1.5 else "❌"
+        herded |= symbol == "❌"
+        print(f"{symbol} {name}: {result['single_ops']} ops cold, {result['burst_ops']} ops for "
+              f"{args.concurrency} simultaneous cold requests (x{factor}, {coalesced} coalesced)", file=sys.stderr)
+    return 1 if herded else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
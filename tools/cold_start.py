@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Cold Start Benchmark
+Repeatedly boots server.js (the same entry point the cPanel host runs),
+sends one request the moment it reports ready and then --requests more, and
+reports where the cold start goes:
+
+    boot_ms          spawn -> "> Ready on" (node start, next.prepare)
+    first_ttfb_ms    time to first byte of the first request
+    compile_ms       route compile reported by Next (dev mode only)
+    first_rest_ms    first_ttfb_ms - compile_ms - warm p50: module evaluation,
+                     the MongoClient connect and the first initializeDb()
+    warm             TTFB of the following requests (p50/p95/p99)
+
+initializeDb() runs pending schema migrations once per process
+(lib/api/migrations.js), so after the first request it costs nothing. The db
+breakdown times what it costs on a boot with nothing pending, directly
+against MONGO_URL:
+
+    connect, schema_migrations lookup of the applied migrations
+
+Production mode needs a build (`next build`); dev mode measures the on-demand
+compile of the route module as well.
+
+Usage:
+    python -m tools.cold_start --boots 5
+    python -m tools.cold_start --mode dev --boots 3 --path /api/products --output cold-start.json
+
+Requires: pymongo, node (with the project's node_modules)
+"""
+
+import argparse
+import http.client
+import json
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlsplit
+
+from pymongo import MongoClient
+
+from tools.db import DB_NAME, MONGO_URL
+from tools.stats import summarize
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+READY_LINE = re.compile(r"Ready on")
+COMPILED_LINE = re.compile(r"Compiled (\S+) in ([\d.]+)(ms|s)")
+
+# What initializeDb() in lib/api/core.js reads on a boot with no pending migrations
+INIT_STEPS = [
+    ("schema_migrations_applied", "schema_migrations", {"appliedAt": {"$exists": True}}),
+]
+
+
+class Server:
+    """One server.js process, with its output timestamped as it arrives"""
+
+    def __init__(self, mode, port):
+        self.mode = mode
+        self.port = port
+        self.env = dict(os.environ, PORT=str(port), HOSTNAME="127.0.0.1",
+                        NODE_ENV="production" if mode == "prod" else "development")
+        self.lines = []
+        self.ready = threading.Event()
+        self.proc = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self.proc = subprocess.Popen(["node", "server.js"], cwd=REPO_ROOT, env=self.env, stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT, text=True, bufsize=1, start_new_session=True)
+        threading.Thread(target=self._read, daemon=True).start()
+
+    def _read(self):
+        for line in self.proc.stdout:
+            now = time.perf_counter()
+            self.lines.append((now, line.rstrip()))
+            if READY_LINE.search(line):
+                self.ready_at = now
+                self.ready.set()
+        self.ready.set()
+
+    def wait_ready(self, timeout):
+        if not self.ready.wait(timeout) or self.proc.poll() is not None:
+            tail = "\n".join(line for _, line in self.lines[-20:])
+            raise RuntimeError(f"server.js did not become ready within {timeout}s:\n{tail}")
+        return (self.ready_at - self.started) * 1000
+
+    def compile_ms(self, since, until):
+        """Compile time Next reported between two perf_counter instants"""
+        total = 0.0
+        for at, line in list(self.lines):
+            match = COMPILED_LINE.search(line)
+            if match and since <= at <= until:
+                value = float(match[2])
+                total += value * 1000 if match[3] == "s" else value
+        return total
+
+    def stop(self):
+        if self.proc is None or self.proc.poll() is not None:
+            return
+        os.killpg(self.proc.pid, signal.SIGTERM)
+        try:
+            self.proc.wait(10)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+            self.proc.wait()
+
+
+def ttfb(port, path, timeout):
+    """(status, ms until the response headers arrived) on a fresh connection"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+    try:
+        start = time.perf_counter()
+        conn.request("GET", path, headers={"Accept": "application/json"})
+        response = conn.getresponse()
+        elapsed = (time.perf_counter() - start) * 1000
+        response.read()
+        return response.status, elapsed
+    finally:
+        conn.close()
+
+
+def wait_port_free(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        with socket.socket() as s:
+            if s.connect_ex(("127.0.0.1", port)) != 0:
+                return
+        time.sleep(0.2)
+    raise RuntimeError(f"port {port} is still in use")
+
+
+def boot_once(args):
+    wait_port_free(args.port)
+    server = Server(args.mode, args.port)
+    server.start()
+    try:
+        boot_ms = server.wait_ready(args.ready_timeout)
+        sent = time.perf_counter()
+        first_status, first_ms = ttfb(args.port, args.path, args.ready_timeout)
+        compile_ms = server.compile_ms(sent, time.perf_counter())
+        warm, statuses = [], {}
+        for _ in range(args.requests):
+            status, elapsed = ttfb(args.port, args.path, args.timeout)
+            warm.append(elapsed)
+            statuses[str(status)] = statuses.get(str(status), 0) + 1
+    finally:
+        server.stop()
+
+    warm_summary = summarize(warm)
+    warm_p50 = warm_summary["p50"] or 0
+    return {
+        "boot_ms": round(boot_ms, 2),
+        "first_status": first_status,
+        "first_ttfb_ms": round(first_ms, 2),
+        "compile_ms": round(compile_ms, 2),
+        "first_rest_ms": round(max(0.0, first_ms - compile_ms - warm_p50), 2),
+        "cold_penalty_ms": round(first_ms - warm_p50, 2),
+        "warm": warm_summary,
+        "warm_first_10": [round(v, 2) for v in warm[:10]],
+        "warm_status_codes": statuses,
+    }
+
+
+def db_breakdown(samples):
+    """Median time of each initializeDb() step, measured outside the server"""
+    timings = {"connect": []}
+    for name, _, _ in INIT_STEPS:
+        timings[name] = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        client = MongoClient(MONGO_URL, maxPoolSize=10, minPoolSize=2, serverSelectionTimeoutMS=10000)
+        client.admin.command("ping")
+        timings["connect"].append((time.perf_counter() - start) * 1000)
+        db = client[DB_NAME]
+        for name, collection, query in INIT_STEPS:
+            start = time.perf_counter()
+            list(db[collection].find(query, {"_id": 1}))
+            timings[name].append((time.perf_counter() - start) * 1000)
+        client.close()
+
+    steps = {name: summarize(values)["p50"] for name, values in timings.items()}
+    per_boot = round(sum(v for name, v in steps.items() if name != "connect"), 2)
+    return {"samples": samples, "steps_p50_ms": steps, "per_boot_ms": per_boot}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Boot server.js repeatedly and measure cold-start latency")
+    parser.add_argument("--mode", choices=["prod", "dev"], default="prod",
+                        help="prod needs `next build`; dev includes the on-demand route compile")
+    parser.add_argument("--boots", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=100, help="Requests after the first, per boot")
+    parser.add_argument("--path", default="/api/health")
+    parser.add_argument("--port", type=int, default=3100)
+    parser.add_argument("--ready-timeout", type=float, default=180.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--db-samples", type=int, default=20, help="0 skips the initializeDb breakdown")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    if not urlsplit(args.path).path.startswith("/"):
+        parser.error("--path must start with /")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.mode == "prod" and not os.path.exists(os.path.join(REPO_ROOT, ".next", "BUILD_ID")):
+        print("❌ No production build found; run `npm run build` first or use --mode dev", file=sys.stderr)
+        return 1
+
+    boots = []
+    for i in range(args.boots):
+        try:
+            result = boot_once(args)
+        except RuntimeError as e:
+            print(f"❌ Boot {i + 1}: {e}", file=sys.stderr)
+            return 1
+        boots.append(result)
+        print(f"🚀 Boot {i + 1}/{args.boots}: ready {result['boot_ms']:.0f} ms, first request "
+              f"{result['first_ttfb_ms']:.0f} ms (compile {result['compile_ms']:.0f}), "
+              f"warm p50 {result['warm']['p50']} ms", file=sys.stderr)
+
+    def across(key):
+        return summarize([boot[key] for boot in boots])
+
+    report = {
+        "mode": args.mode,
+        "path": args.path,
+        "boots": args.boots,
+        "requests_per_boot": args.requests + 1,
+        "summary": {
+            "boot_ms": across("boot_ms"),
+            "first_ttfb_ms": across("first_ttfb_ms"),
+            "compile_ms": across("compile_ms"),
+            "first_rest_ms": across("first_rest_ms"),
+            "cold_penalty_ms": across("cold_penalty_ms"),
+            "warm_p50_ms": summarize([boot["warm"]["p50"] for boot in boots if boot["warm"]["p50"] is not None]),
+            "warm_p95_ms": summarize([boot["warm"]["p95"] for boot in boots if boot["warm"]["p95"] is not None]),
+        },
+        "runs": boots,
+    }
+    if args.db_samples > 0:
+        report["initialize_db"] = db_breakdown(args.db_samples)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    summary = report["summary"]
+    print(f"📊 Cold start (p50 of {args.boots} boots): ready {summary['boot_ms']['p50']} ms + first request "
+          f"{summary['first_ttfb_ms']['p50']} ms vs warm {summary['warm_p50_ms']['p50']} ms", file=sys.stderr)
+    if "initialize_db" in report:
+        print(f"📊 initializeDb() queries: ~{report['initialize_db']['per_boot_ms']} ms once per process",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
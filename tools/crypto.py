@@ -0,0 +1,55 @@
+"""
+Settings encryption, matching lib/crypto.js: AES-256-GCM with the key
+SHA256(MASTER_ENCRYPTION_KEY), stored as base64(IV[16] + ciphertext + authTag[16]).
+
+Requires: cryptography
+"""
+
+import base64
+import hashlib
+import os
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+IV_LENGTH = 16
+AUTH_TAG_LENGTH = 16
+
+
+def master_key(value=None):
+    """32-byte AES key derived like getMasterKey(); `value` defaults to $MASTER_ENCRYPTION_KEY"""
+    value = value if value is not None else os.getenv("MASTER_ENCRYPTION_KEY")
+    if not value:
+        raise ValueError("MASTER_ENCRYPTION_KEY not found in environment variables")
+    return hashlib.sha256(value.encode("utf-8")).digest()
+
+
+def encrypt(plaintext, key):
+    if not plaintext:
+        return None
+    iv = os.urandom(IV_LENGTH)
+    # AESGCM appends the tag to the ciphertext, which is already the stored layout
+    return base64.b64encode(iv + AESGCM(key).encrypt(iv, plaintext.encode("utf-8"), None)).decode("ascii")
+
+
+def decrypt(encrypted, key):
+    """Plaintext of an encrypt()/lib/crypto.js value; ValueError when it is malformed or the key is wrong"""
+    if not encrypted:
+        return None
+    try:
+        combined = base64.b64decode(encrypted, validate=True)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Failed to decrypt data") from e
+    if len(combined) < IV_LENGTH + AUTH_TAG_LENGTH:
+        raise ValueError("Failed to decrypt data")
+    try:
+        return AESGCM(key).decrypt(combined[:IV_LENGTH], combined[IV_LENGTH:], None).decode("utf-8")
+    except (InvalidTag, UnicodeDecodeError) as e:
+        raise ValueError("Failed to decrypt data") from e
+
+
+def mask(value):
+    """maskSensitiveData(): first and last four characters"""
+    if not value or len(value) < 8:
+        return "****"
+    return f"{value[:4]}{'*' * max(4, len(value) - 8)}{value[-4:]}"
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Data Cleanup
+Finds test leftovers and abandoned data and deletes (or archives) it in
+throttled batches, so it can run against production during the day.
+
+Targets:
+
+    test-users        users whose e-mail matches --pattern (default @test.com,
+                      @example.com) or that carry a loadTestRunId, with their
+                      orders, account orders, tickets and messages, spin
+                      history, risk/e-mail/SMS logs, payments, payment
+                      requests, Shopier V2 sessions, balance transactions and
+                      password resets
+    tagged            any fixture document with a loadTestRunId (tools run
+                      with --keep or interrupted)
+    abandoned-orders  orders still pending after --older-than (default 30d),
+                      with their risk/e-mail/SMS logs, payments, payment
+                      requests and Shopier V2 sessions. Orders an account is
+                      still reserved for are skipped (and counted); the
+                      payment failure flow releases those.
+
+Only documents created before the cutoff (--older-than; 1d for test data) are
+selected. Dependents are removed before their parents, so an interrupted run
+leaves nothing orphaned and selects the rest again next time.
+
+Nothing is written without --execute: the default is a dry run that prints
+what would go per collection and how long it would take at the budget.
+Deletes are batched DeleteOne bulk_writes by _id, paced to --max-ops
+documents per second; when a batch takes longer than --max-batch-ms the tool
+backs off, because that is the first sign the primary is busy. --archive
+copies each batch to <collection>_archive (upserted, so re-runs are safe)
+before deleting it.
+
+Usage:
+    python -m tools.data_cleanup test-users tagged
+    python -m tools.data_cleanup test-users --pattern '@qa\\.pinly\\.com$' --execute
+    python -m tools.data_cleanup abandoned-orders --older-than 60d --archive --max-ops 200 --execute
+
+Requires: pymongo
+"""
+
+import argparse
+import json
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+from pymongo import DeleteOne, ReplaceOne
+
+from tools.db import chunked, get_db
+from tools.scale_fixtures import COLLECTIONS as FIXTURE_COLLECTIONS
+
+DEFAULT_TEST_PATTERNS = [r"@test\.com$", r"@example\.com$"]
+DEFAULT_AGE = {"test-users": "1d", "tagged": "1d", "abandoned-orders": "30d"}
+TAGGED_COLLECTIONS = sorted(set(FIXTURE_COLLECTIONS) | {"products", "accounts", "payment_security_logs"})
+DURATION = re.compile(r"^(\d+)([mhd])$")
+UNITS = {"m": "minutes", "h": "hours", "d": "days"}
+
+
+def parse_age(value):
+    match = DURATION.match(value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"expected e.g. 30m, 12h or 7d, got {value!r}")
+    return timedelta(**{UNITS[match[2]]: int(match[1])})
+
+
+class Plan:
+    """Ordered (collection, reason, _ids) steps; children are added before their parents"""
+
+    def __init__(self, db):
+        self.db = db
+        self.steps = []
+        self.planned = {}
+        self.skipped = {}
+
+    def ids(self, collection, query, field="_id"):
+        return [doc[field] for doc in self.db[collection].find(query, {field: 1}) if doc.get(field) is not None]
+
+    def ids_in(self, collection, fields, values, field="_id"):
+        """Values of `field` for documents whose `fields` match any of `values` (chunked $in)"""
+        found = []
+        for batch in chunked(values, 1000):
+            query = {"$or": [{f: {"$in": batch}} for f in fields]} if len(fields) > 1 else {fields[0]: {"$in": batch}}
+            found.extend(self.ids(collection, query, field))
+        return found
+
+    def add(self, collection, reason, object_ids):
+        already = self.planned.setdefault(collection, set())
+        fresh = [i for i in dict.fromkeys(object_ids) if i not in already]
+        already.update(fresh)
+        if fresh:
+            self.steps.append({"collection": collection, "reason": reason, "ids": fresh})
+
+
+def plan_test_users(plan, cutoff, patterns):
+    query = {
+        "role": {"$ne": "admin"},
+        "createdAt": {"$lt": cutoff},
+        "$or": [{"email": {"$regex": p, "$options": "i"}} for p in patterns] + [{"loadTestRunId": {"$exists": True}}],
+    }
+    users = list(plan.db.users.find(query, {"_id": 1, "id": 1}))
+    user_ids = [u["id"] for u in users if u.get("id")]
+    order_ids = plan.ids_in("orders", ["userId"], user_ids, "id")
+    account_order_ids = plan.ids_in("account_orders", ["userId"], user_ids, "id")
+    all_order_ids = order_ids + account_order_ids
+    ticket_ids = plan.ids_in("tickets", ["userId"], user_ids, "id")
+    support_ticket_ids = plan.ids_in("support_tickets", ["userId"], user_ids, "id")
+
+    reason = "test user"
+    plan.add("ticket_messages", reason, plan.ids_in("ticket_messages", ["ticketId"], ticket_ids + support_ticket_ids))
+    plan.add("tickets", reason, plan.ids_in("tickets", ["userId"], user_ids))
+    plan.add("support_tickets", reason, plan.ids_in("support_tickets", ["userId"], user_ids))
+    # spin_history stored the user id as `oderId` before migration 007 added `userId`
+    plan.add("spin_history", reason, plan.ids_in("spin_history", ["oderId", "userId"], user_ids))
+    plan.add("risk_logs", reason, plan.ids_in("risk_logs", ["userId", "orderId"], user_ids + all_order_ids))
+    plan.add("email_logs", reason, plan.ids_in("email_logs", ["userId", "orderId"], user_ids + all_order_ids))
+    plan.add("sms_logs", reason, plan.ids_in("sms_logs", ["orderId"], all_order_ids))
+    plan.add("payments", reason, plan.ids_in("payments", ["orderId"], all_order_ids))
+    plan.add("payment_requests", reason, plan.ids_in("payment_requests", ["orderId"], all_order_ids))
+    plan.add("shopierv2_sessions", reason, plan.ids_in("shopierv2_sessions", ["orderId"], all_order_ids))
+    plan.add("balance_transactions", reason, plan.ids_in("balance_transactions", ["userId"], user_ids))
+    plan.add("password_resets", reason, plan.ids_in("password_resets", ["userId"], user_ids))
+    plan.add("orders", reason, plan.ids_in("orders", ["id"], order_ids))
+    plan.add("account_orders", reason, plan.ids_in("account_orders", ["id"], account_order_ids))
+    plan.add("users", reason, [u["_id"] for u in users])
+
+
+def plan_tagged(plan, cutoff):
+    query = {"loadTestRunId": {"$exists": True},
+             "$or": [{"createdAt": {"$lt": cutoff}}, {"createdAt": {"$exists": False}}]}
+    # Logs and orders before the users and products they point at
+    for collection in sorted(TAGGED_COLLECTIONS, key=lambda c: (c in ("users", "products", "accounts"), c)):
+        plan.add(collection, "fixture", plan.ids(collection, query))
+
+
+def plan_abandoned_orders(plan, cutoff):
+    order_ids = plan.ids("orders", {"status": "pending", "createdAt": {"$lt": cutoff}}, "id")
+    # Deleting these would leave the account reserved for an order that no longer exists
+    reserving = set(plan.ids_in("accounts", ["reservedByOrderId"], order_ids, "reservedByOrderId"))
+    if reserving:
+        plan.skipped["abandoned orders holding an account reservation"] = len(reserving)
+        order_ids = [i for i in order_ids if i not in reserving]
+
+    reason = "abandoned order"
+    for collection in ["risk_logs", "email_logs", "sms_logs", "payments", "payment_requests", "shopierv2_sessions"]:
+        plan.add(collection, reason, plan.ids_in(collection, ["orderId"], order_ids))
+    plan.add("orders", reason, plan.ids_in("orders", ["id"], order_ids))
+
+
+class Throttle:
+    """Paces work to an ops/second budget and backs off while batches are slow"""
+
+    def __init__(self, ops_per_second, max_batch_ms):
+        self.ops_per_second = ops_per_second
+        self.max_batch_ms = max_batch_ms
+        self.next_at = time.monotonic()
+        self.backoff = 0.0
+        self.slow_batches = 0
+
+    def spend(self, ops, batch_ms):
+        now = time.monotonic()
+        self.next_at = max(self.next_at, now) + ops / self.ops_per_second
+        if batch_ms > self.max_batch_ms:
+            self.slow_batches += 1
+            self.backoff = min(max(self.backoff * 2, 0.5), 30.0)
+        else:
+            self.backoff = 0.0
+        time.sleep(max(0.0, self.next_at - now) + self.backoff)
+
+
+def execute(db, step, batch_size, throttle, archive):
+    collection = db[step["collection"]]
+    archive_collection = db[f"{step['collection']}_archive"]
+    deleted = archived = 0
+    start = time.perf_counter()
+    for batch in chunked(step["ids"], batch_size):
+        batch_start = time.perf_counter()
+        ops = len(batch)
+        if archive:
+            now = datetime.now(timezone.utc)
+            docs = list(collection.find({"_id": {"$in": batch}}))
+            if docs:
+                archive_collection.bulk_write([ReplaceOne({"_id": d["_id"]}, {**d, "archivedAt": now}, upsert=True)
+                                               for d in docs], ordered=False)
+                archived += len(docs)
+                ops += len(docs)
+        result = collection.bulk_write([DeleteOne({"_id": i}) for i in batch], ordered=False)
+        deleted += result.deleted_count
+        throttle.spend(ops, (time.perf_counter() - batch_start) * 1000)
+    return {"deleted": deleted, "archived": archived, "seconds": round(time.perf_counter() - start, 2)}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Throttled cleanup of test leftovers and abandoned data")
+    parser.add_argument("targets", nargs="+", choices=list(DEFAULT_AGE))
+    parser.add_argument("--older-than", type=parse_age, help="Cutoff age for every target, e.g. 12h, 7d")
+    parser.add_argument("--pattern", action="append", help="E-mail regex for test users (repeatable)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents per bulk_write")
+    parser.add_argument("--max-ops", type=float, default=500.0, help="Document writes per second budget")
+    parser.add_argument("--max-batch-ms", type=float, default=250.0,
+                        help="Back off while a batch takes longer than this")
+    parser.add_argument("--archive", action="store_true", help="Copy documents to <collection>_archive first")
+    parser.add_argument("--execute", action="store_true", help="Actually delete (default is a dry run)")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    if args.batch_size < 1 or args.max_ops <= 0:
+        parser.error("--batch-size and --max-ops must be positive")
+    for pattern in args.pattern or []:
+        if not pattern.strip():
+            parser.error("--pattern must not be empty")
+        re.compile(pattern)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    now = datetime.now(timezone.utc)
+    patterns = args.pattern or DEFAULT_TEST_PATTERNS
+    cutoffs = {target: now - (args.older_than or parse_age(DEFAULT_AGE[target])) for target in args.targets}
+
+    plan = Plan(db)
+    # Order matters: a fixture or abandoned order that belongs to a test user goes with the user's cascade
+    if "test-users" in args.targets:
+        plan_test_users(plan, cutoffs["test-users"], patterns)
+    if "tagged" in args.targets:
+        plan_tagged(plan, cutoffs["tagged"])
+    if "abandoned-orders" in args.targets:
+        plan_abandoned_orders(plan, cutoffs["abandoned-orders"])
+
+    total = sum(len(step["ids"]) for step in plan.steps)
+    writes = total * (2 if args.archive else 1)
+    print(f"🧹 {total:,} documents in {len(plan.steps)} steps; ~{writes / args.max_ops:.0f}s at "
+          f"{args.max_ops:g} ops/s{'' if args.execute else ' (dry run)'}", file=sys.stderr)
+    for reason, count in plan.skipped.items():
+        print(f"⏭️  Skipped {count:,} {reason}", file=sys.stderr)
+
+    throttle = Throttle(args.max_ops, args.max_batch_ms)
+    steps = []
+    for step in plan.steps:
+        entry = {"collection": step["collection"], "reason": step["reason"], "matched": len(step["ids"])}
+        if args.execute:
+            entry.update(execute(db, step, args.batch_size, throttle, args.archive))
+            print(f"   {step['collection']:<24} {entry['deleted']:>10,} deleted  ({entry['seconds']}s)",
+                  file=sys.stderr)
+        else:
+            entry["sample_ids"] = [str(i) for i in step["ids"][:5]]
+            print(f"   {step['collection']:<24} {entry['matched']:>10,}  ({step['reason']})", file=sys.stderr)
+        steps.append(entry)
+
+    report = {
+        "executed": args.execute,
+        "archive": args.archive,
+        "targets": args.targets,
+        "cutoffs": {target: cutoff.isoformat() for target, cutoff in cutoffs.items()},
+        "patterns": patterns if "test-users" in args.targets else None,
+        "documents": total,
+        "budget_ops_per_second": args.max_ops,
+        "estimated_seconds": round(writes / args.max_ops, 1),
+        "slow_batches": throttle.slow_batches,
+        "skipped": plan.skipped,
+        "steps": steps,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    if not args.execute and total:
+        print("ℹ️  Dry run; add --execute to delete", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+"""
+MongoDB access for the tooling. Uses the same MONGO_URL / DB_NAME environment
+variables as lib/api/core.js.
+
+Requires: pymongo
+"""
+
+import os
+
+from pymongo import MongoClient
+
+MONGO_URL = os.getenv("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.getenv("DB_NAME", "pinly_store")
+
+_clients = {}
+
+
+def get_client(url=None):
+    """Process-wide cached MongoClient (pymongo pools connections internally)"""
+    url = url or MONGO_URL
+    if url not in _clients:
+        _clients[url] = MongoClient(url, maxPoolSize=50)
+    return _clients[url]
+
+
+def get_db(url=None, name=None):
+    return get_client(url)[name or DB_NAME]
+
+
+def chunked(items, size):
+    """Yield successive lists of at most `size` items from any iterable"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+DijiPin API Stand-in
+Local HTTP server that answers the DijiPin endpoints lib/api/core.js calls
+(getDijipinBalance, createDijipinOrder, getDijipinOrderStatus) so the "60 UC" /
+"325 UC" auto-delivery path can be load tested without spending real balance.
+Latency, jitter, error rate, hung requests and balance depletion are
+configurable; /__stats reports what the app sent us.
+
+Usage:
+    python -m tools.dijipin_stub --port 4010 --latency-ms 800 --jitter-ms 400 --error-rate 0.05
+    DIJIPIN_API_URL=http://localhost:4010 DIJIPIN_API_TOKEN=stub DIJIPIN_API_KEY=stub yarn dev
+
+    curl localhost:4010/__stats          # request counts, latency, balance
+    curl -X POST localhost:4010/__reset  # restore balance, forget orders
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qs
+
+from tools.stub_server import StubHandler, StubState, add_fault_args, run_forever, serve
+
+# customerStoreProductID -> (title, unit price in TL); ids match DIJIPIN_PRODUCT_MAP in lib/api/core.js
+PRODUCTS = {
+    234: ("60 UC", 42.50),
+    235: ("325 UC", 212.50),
+}
+
+
+class DijipinState(StubState):
+    """Balance and orders shared by all handler threads"""
+
+    def reset(self):
+        with self.lock:
+            super().reset()
+            self.balance = self.args.balance
+            self.orders = {}
+            self.rejected_for_balance = 0
+
+    def create_order(self, basket):
+        """Charge the basket against the balance; returns (order, error_message, error_code)"""
+        lines, total = [], 0.0
+        for item in basket:
+            product_id = item.get("customerStoreProductID")
+            if product_id not in PRODUCTS:
+                return None, "Ürün bulunamadı", "PRODUCT_NOT_FOUND"
+            quantity = int(item.get("quantity") or 1)
+            player_id = next((r.get("value") for r in item.get("requireData") or []
+                              if r.get("identifier") == "user_id"), None)
+            if not player_id:
+                return None, "Oyuncu ID gerekli", "REQUIRE_DATA_MISSING"
+            title, price = PRODUCTS[product_id]
+            lines.append({"customerStoreProductID": product_id, "productName": title, "quantity": quantity,
+                          "unitPrice": price, "playerId": player_id})
+            total += price * quantity
+
+        with self.lock:
+            if total > self.balance:
+                self.rejected_for_balance += 1
+                return None, "Yetersiz bakiye", "INSUFFICIENT_BALANCE"
+            self.balance = round(self.balance - total, 2)
+            order_id = len(self.orders) + 100000
+            order = {
+                "orderID": order_id,
+                "status": "pending",
+                "totalPrice": round(total, 2),
+                "details": lines,
+                "createdAt": datetime.now(timezone.utc).isoformat(),
+                "_created": time.monotonic(),
+            }
+            self.orders[order_id] = order
+        return order, None, None
+
+    def order_status(self, order_id):
+        with self.lock:
+            order = self.orders.get(order_id)
+            if order is None:
+                return None
+            if order["status"] == "pending" and time.monotonic() - order["_created"] >= self.args.complete_after:
+                order["status"] = "completed"
+            return {k: v for k, v in order.items() if not k.startswith("_")}
+
+    def stats(self):
+        report = super().stats()
+        with self.lock:
+            statuses = {}
+            for order in self.orders.values():
+                statuses[order["status"]] = statuses.get(order["status"], 0) + 1
+            report.update({
+                "balance": self.balance,
+                "orders_created": len(self.orders),
+                "order_statuses": statuses,
+                "rejected_for_balance": self.rejected_for_balance,
+            })
+        return report
+
+
+class DijipinHandler(StubHandler):
+    injected_error = (503, {"success": False, "message": "Service Unavailable", "errorCode": "STUB_INJECTED"})
+
+    def authorized(self, path):
+        args = self.state.args
+        if args.token and self.headers.get("Authorization") != f"Bearer {args.token}":
+            return False
+        # getDijipinOrderStatus does not send Apikey, so only the token is checked there
+        if args.api_key and path != "/Order/Get" and self.headers.get("Apikey") != args.api_key:
+            return False
+        return True
+
+    def dispatch(self, method, url):
+        if not self.authorized(url.path):
+            return self.send_json(401, {"success": False, "message": "Unauthorized", "errorCode": "UNAUTHORIZED"})
+        route = f"{method} {url.path}"
+
+        if route == "GET /Customer/Get":
+            return self.send_json(200, {"success": True, "data": {
+                "balance": self.state.balance,
+                "currencyCode": "TL",
+                "firstName": "Pinly",
+                "lastName": "Stub",
+                "email": "stub@dijipin.local",
+            }})
+
+        if route == "POST /Order/Create":
+            basket = (self.read_json() or {}).get("basketData")
+            if not basket:
+                return self.send_json(400, {"success": False, "message": "basketData gerekli",
+                                            "errorCode": "INVALID_REQUEST"})
+            order, message, code = self.state.create_order(basket)
+            if order is None:
+                return self.send_json(200, {"success": False, "message": message, "errorCode": code})
+            return self.send_json(200, {"success": True, "message": "Sipariş oluşturuldu",
+                                        "data": {"orderID": order["orderID"], "details": order["details"]}})
+
+        if route == "GET /Order/Get":
+            try:
+                order_id = int(parse_qs(url.query).get("orderID", [""])[0])
+            except ValueError:
+                order_id = None
+            order = self.state.order_status(order_id)
+            if order is None:
+                return self.send_json(200, {"success": False, "message": "Sipariş bulunamadı",
+                                            "errorCode": "ORDER_NOT_FOUND"})
+            return self.send_json(200, {"success": True, "data": order})
+
+        self.send_json(404, {"success": False, "message": "Not Found"})
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local DijiPin API stand-in with latency and failure injection")
+    add_fault_args(parser, port=4010)
+    parser.add_argument("--balance", type=float, default=10000.0, help="Starting balance in TL")
+    parser.add_argument("--complete-after", type=float, default=5.0,
+                        help="Seconds before an order reports 'completed' on /Order/Get")
+    parser.add_argument("--token", help="Require this Bearer token (DIJIPIN_API_TOKEN)")
+    parser.add_argument("--api-key", help="Require this Apikey header (DIJIPIN_API_KEY)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    state = DijipinState(args)
+    server = serve(DijipinHandler, state)
+    print(f"🧪 DijiPin stub listening on http://{args.host}:{args.port} "
+          f"(balance {args.balance:.2f} TL, latency {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, "
+          f"error rate {args.error_rate:.0%})", file=sys.stderr)
+    print(f"   Point the app at it with DIJIPIN_API_URL=http://{args.host}:{args.port}", file=sys.stderr)
+    run_forever(server, state)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Email Throughput Benchmark
+Points email_settings at an in-process SMTP sink (tools.smtp_sink), then
+triggers sendEmail through the real endpoints and measures, per message, the
+time from the triggering request to the SMTP accept:
+
+    welcome        POST /api/auth/register
+    order_created  POST /api/orders (IBAN)
+    delivered      POST /api/admin/orders/{id}/approve on seeded paid orders held for review
+
+sendEmail decrypts settings, builds a new nodemailer transport and reads
+site_settings for every message, so this is the baseline for mailer work.
+The app server must be able to reach --smtp-host:--smtp-port.
+
+Usage:
+    python -m tools.email_bench --users 100 --concurrency 20
+    python -m tools.email_bench --users 50 --phases welcome,order_created --output email.json
+
+Requires: aiohttp, pymongo
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+
+from tools.api_client import BASE_URL, AsyncApiClient
+from tools.db import chunked, get_db
+from tools.loadtest import virtual_ip
+from tools.smtp_sink import SmtpSink
+from tools.stats import Recorder, summarize
+
+PHASES = ["welcome", "order_created", "delivered"]
+SOURCE_TAG = "email_bench"
+
+# Subjects from sendWelcomeEmail / sendOrderCreatedEmail / sendDeliveredEmail; orders end in id.slice(-8)
+SUBJECT_TYPES = [
+    ("welcome", re.compile(r"^Hos geldin ")),
+    ("order_created", re.compile(r"^Siparisiniz alindi - (?P<ref>\S{8})$")),
+    ("delivered", re.compile(r"^Teslimat tamamlandi - (?P<ref>\S{8})$")),
+]
+
+
+def message_key(message):
+    """(type, ref) a sink message answers to; ref is the recipient for welcome, the order id suffix otherwise"""
+    for kind, pattern in SUBJECT_TYPES:
+        match = pattern.match(message["subject"])
+        if match:
+            ref = match.groupdict().get("ref") or (message["rcpt_to"][0].lower() if message["rcpt_to"] else None)
+            return kind, ref
+    return None, None
+
+
+def order_created_key(body):
+    order_id = (body.get("data") or {}).get("orderId")
+    return ("order_created", order_id[-8:]) if order_id else None
+
+
+def enable_email(db, host, port):
+    """Route sendEmail to the sink; returns the previous settings document for restore_email()"""
+    previous = db.email_settings.find_one({"id": "main"})
+    db.email_settings.update_one({"id": "main"}, {"$set": {
+        "enableEmail": True,
+        "smtpHost": host,
+        "smtpPort": str(port),
+        "smtpSecure": False,
+        "smtpUser": "loadtest",
+        # Empty so getEmailSettings skips decrypt(). The sink does not offer AUTH,
+        # so nodemailer sends without trying these credentials.
+        "smtpPass": "",
+        "fromName": "PINLY",
+        "fromEmail": "noreply@pinly.local",
+    }}, upsert=True)
+    return previous
+
+
+def restore_email(db, previous):
+    if previous is None:
+        db.email_settings.delete_one({"id": "main"})
+    else:
+        db.email_settings.replace_one({"id": "main"}, previous)
+
+
+class EmailBench:
+    def __init__(self, args, sink):
+        self.args = args
+        self.sink = sink
+        self.recorder = Recorder()
+        self.api = None
+        self.run_id = uuid.uuid4().hex[:8]
+        self.triggers = {}  # (type, ref) -> perf_counter at request start
+        self.users = []     # {"id", "email", "token", "ip"}
+        self.orders = []    # order ids created through the API or seeded
+        self.product = None
+
+    def on_call(self, event):
+        status = event["status"]
+        error = event["error"] or (f"http_{status}" if status and status >= 400 else None)
+        self.recorder.record(event["label"], event["elapsed_ms"], status, error)
+
+    async def call(self, semaphore, step, method, path, key=None, **kwargs):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await self.api.request(method, path, label=step, **kwargs)
+                body = response.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                return None, {}
+            if key and response.status_code == 200:
+                # key may depend on the response, e.g. the order id it created
+                key = key(body) if callable(key) else key
+                if key:
+                    self.triggers[key] = started
+            return response.status_code, body
+
+    async def register(self, semaphore, i):
+        email = f"email-bench-{i}+{self.run_id}@test.com"
+        ip = virtual_ip(i + 1)
+        status, body = await self.call(semaphore, "register", "POST", "/auth/register", key=("welcome", email),
+                                       headers={"X-Forwarded-For": ip}, json={
+                                           "firstName": f"Mail{i}", "lastName": "Bench", "email": email,
+                                           "phone": f"5{random.randint(0, 999999999):09d}", "password": "Test123!",
+                                       })
+        data = body.get("data") or {}
+        if status == 200 and data.get("token"):
+            self.users.append({"id": data["user"]["id"], "email": email, "token": data["token"], "ip": ip})
+
+    async def create_order(self, semaphore, user, i):
+        status, body = await self.call(semaphore, "create_order", "POST", "/orders", key=order_created_key, headers={
+            "X-Forwarded-For": user["ip"], **self.api.auth_headers(user["token"]),
+        }, json={
+            "productId": self.product["id"],
+            "playerId": f"{700000000 + i}",
+            "playerName": f"MailBench{i}",
+            "paymentMethod": "iban",
+            "termsAccepted": True,
+        })
+        order_id = (body.get("data") or {}).get("orderId")
+        if status == 200 and order_id:
+            self.orders.append(order_id)
+
+    async def approve(self, semaphore, admin_token, order_id):
+        await self.call(semaphore, "approve", "POST", f"/admin/orders/{order_id}/approve",
+                        key=("delivered", order_id[-8:]), headers=self.api.auth_headers(admin_token))
+
+    async def run_phase(self, phase, semaphore, db):
+        if phase == "welcome":
+            await asyncio.gather(*(self.register(semaphore, i) for i in range(self.args.users)))
+        elif phase == "order_created":
+            await asyncio.gather(*(self.create_order(semaphore, u, i) for i, u in enumerate(self.users)))
+        elif phase == "delivered":
+            admin_token = await self.api.admin_token()
+            if not admin_token:
+                print("⚠️  Admin login failed - skipping delivered phase", file=sys.stderr)
+                return
+            order_ids = seed_held_orders(db, self.run_id, self.users, self.product)
+            self.orders.extend(order_ids)
+            await asyncio.gather(*(self.approve(semaphore, admin_token, o) for o in order_ids))
+
+    async def wait_for_messages(self, kind, expected):
+        deadline = time.perf_counter() + self.args.settle
+        while time.perf_counter() < deadline:
+            received = sum(1 for m in self.sink.snapshot() if message_key(m)[0] == kind)
+            if received >= expected:
+                return
+            await asyncio.sleep(0.2)
+
+    async def run(self, db):
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+        self.api = AsyncApiClient(f"{self.args.base_url.rstrip('/')}/api", pool_size=self.args.concurrency,
+                                  max_retries=0, hooks=[self.on_call])
+        async with self.api:
+            _, body = await self.call(semaphore, "get_products", "GET", "/products")
+            products = body.get("data") or body.get("products") or []
+            if self.args.product_id:
+                products = [p for p in products if p.get("id") == self.args.product_id]
+            if not products:
+                raise SystemExit("❌ No product available to order")
+            self.product = products[0]
+            # Welcome emails go to the users the later phases reuse, so registration always runs
+            phases = ["welcome"] + [p for p in self.args.phases if p != "welcome"]
+            for phase in phases:
+                print(f"✉️  Triggering {phase} emails...", file=sys.stderr)
+                await self.run_phase(phase, semaphore, db)
+                expected = sum(1 for kind, _ in self.triggers if kind == phase)
+                await self.wait_for_messages(phase, expected)
+        self.recorder.stop()
+
+    def build_report(self):
+        messages = self.sink.snapshot()
+        phases = {}
+        for phase in self.args.phases:
+            keys = {key: t for key, t in self.triggers.items() if key[0] == phase}
+            latencies, accepted_at = [], []
+            for message in messages:
+                key = message_key(message)
+                if key in keys:
+                    latencies.append((message["received_at"] - keys[key]) * 1000)
+                    accepted_at.append(message["received_at"])
+            span = (max(accepted_at) - min(keys.values())) if accepted_at else 0
+            phases[phase] = {
+                "triggered": len(keys),
+                "received": len(latencies),
+                "missing": len(keys) - len(latencies),
+                "messages_per_second": round(len(latencies) / span, 2) if span > 0 else None,
+                "trigger_to_accept_ms": summarize(latencies),
+            }
+        return {
+            "run_id": self.run_id,
+            "config": {"users": self.args.users, "concurrency": self.args.concurrency, "phases": self.args.phases,
+                       "smtp_latency_ms": self.args.smtp_latency_ms},
+            "phases": phases,
+            "smtp_connections": self.sink.connections,
+            "unmatched_messages": sum(1 for m in messages if message_key(m)[0] is None),
+            "requests": self.recorder.report(),
+        }
+
+
+def seed_held_orders(db, run_id, users, product):
+    """One paid order per user held for manual approval, plus a stock code each (consumed first: oldest createdAt)"""
+    now = datetime.now(timezone.utc)
+    orders, stock = [], []
+    for i, user in enumerate(users):
+        order_id = str(uuid.uuid4())
+        orders.append({
+            "id": order_id,
+            "userId": user["id"],
+            "productId": product["id"],
+            "productTitle": product.get("title"),
+            "playerId": f"{800000000 + i}",
+            "status": "paid",
+            "amount": product.get("price"),
+            "totalAmount": product.get("price"),
+            "quantity": 1,
+            "paymentMethod": "shopier",
+            "delivery": {"status": "hold", "items": []},
+            "createdAt": now,
+            "updatedAt": now,
+            "loadTestRunId": run_id,
+        })
+        stock.append({
+            "id": str(uuid.uuid4()),
+            "productId": product["id"],
+            "value": f"MAIL-{run_id}-{i:06d}",
+            "status": "available",
+            "createdAt": datetime(2000, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=i),
+            "loadTestRunId": run_id,
+        })
+    for batch in chunked(orders, 1000):
+        db.orders.insert_many(batch, ordered=False)
+    for batch in chunked(stock, 1000):
+        db.stock.insert_many(batch, ordered=False)
+    return [o["id"] for o in orders]
+
+
+def cleanup(db, run_id, user_ids, order_ids):
+    for batch in chunked(user_ids, 1000):
+        db.email_logs.delete_many({"userId": {"$in": batch}})
+        db.orders.delete_many({"userId": {"$in": batch}})
+        db.users.delete_many({"id": {"$in": batch}})
+    for batch in chunked(order_ids, 1000):
+        db.audit_logs.delete_many({"entityId": {"$in": batch}})
+    for collection in ["orders", "stock"]:
+        db[collection].delete_many({"loadTestRunId": run_id})
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk sendEmail throughput through the real endpoints")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--users", type=int, default=50, help="Users to register (one email of each type per user)")
+    parser.add_argument("--concurrency", type=int, default=20, help="Maximum in-flight trigger requests")
+    parser.add_argument("--phases", default=",".join(PHASES), help=f"Comma separated subset of {', '.join(PHASES)}")
+    parser.add_argument("--product-id", help="Product to order (default: first listed)")
+    parser.add_argument("--smtp-host", default="127.0.0.1", help="Address the sink binds to and the app connects to")
+    parser.add_argument("--smtp-port", type=int, default=2525)
+    parser.add_argument("--smtp-latency-ms", type=float, default=0, help="Simulated relay delay before accepting DATA")
+    parser.add_argument("--settle", type=float, default=30.0, help="Max seconds to wait for each phase's messages")
+    parser.add_argument("--keep", action="store_true", help="Keep users, orders, stock and email_logs")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    args.phases = [p.strip() for p in args.phases.split(",") if p.strip()]
+    unknown = set(args.phases) - set(PHASES)
+    if unknown:
+        parser.error(f"unknown phases: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    sink = SmtpSink(args.smtp_host, args.smtp_port, args.smtp_latency_ms).start()
+    previous = enable_email(db, args.smtp_host, args.smtp_port)
+    print(f"📬 SMTP sink on {args.smtp_host}:{args.smtp_port}; email_settings pointed at it", file=sys.stderr)
+
+    bench = EmailBench(args, sink)
+    try:
+        asyncio.run(bench.run(db))
+        report = bench.build_report()
+    finally:
+        restore_email(db, previous)
+        sink.stop()
+        if not args.keep:
+            cleanup(db, bench.run_id, [u["id"] for u in bench.users], bench.orders)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    missing = sum(p["missing"] for p in report["phases"].values())
+    for phase, result in report["phases"].items():
+        print(f"   {phase:<14} {result['received']}/{result['triggered']} received, "
+              f"p95 {result['trigger_to_accept_ms']['p95']} ms", file=sys.stderr)
+    return 0 if missing == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
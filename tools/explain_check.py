@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Explain-Plan Checker
+Holds a catalogue of the query and sort shapes lib/api/routes/*.js
+and lib/shopierv2 issue, runs explain() for each one and fails (exit code 1)
+when a shape is answered by a COLLSCAN or an in-memory SORT. Add a shape here
+whenever an endpoint adds a query so a new full scan can't slip in unnoticed.
+
+Plan choice only depends on data once several indexes compete, so the check is
+meaningful against any database that has the production indexes; --seed-orders
+grows it with tools.scale_fixtures first (removed afterwards) so the planner
+sees realistic cardinalities. Collections that don't exist yet are reported as
+skipped rather than passed.
+
+Failing shapes come with a suggested index in equality -> sort -> range order.
+
+Usage:
+    python -m tools.explain_check
+    python -m tools.explain_check --seed-orders 100k --suggest
+    python -m tools.explain_check --only orders,blacklist --output explain.json
+
+Requires: pymongo
+"""
+
+import argparse
+import json
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from tools import scale_fixtures
+from tools.db import get_db
+
+# Operators that bound a field to a range rather than a single value
+RANGE_OPERATORS = {"$gt", "$gte", "$lt", "$lte", "$ne", "$nin", "$regex", "$exists"}
+
+FULL_SCAN_STAGES = {"COLLSCAN"}
+BLOCKING_SORT_STAGES = {"SORT", "SORT_KEY_GENERATOR"}
+
+
+def shape(name, collection, query, sort=None, op="find", limit=None, source=""):
+    return {"name": name, "collection": collection, "op": op, "filter": query,
+            "sort": sort, "limit": limit, "source": source}
+
+
+def catalogue():
+    """Every query shape the API issues, with representative values"""
+    now = datetime.now(timezone.utc)
+    hour_ago = now - timedelta(hours=1)
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    user_id = order_id = "00000000-0000-4000-8000-000000000000"
+    ip = "203.0.113.7"
+    return [
+        # users
+        shape("users.by_id", "users", {"id": user_id}, op="findOne", source="auth, order and ticket handlers"),
+        shape("users.by_ids", "users", {"id": {"$in": [user_id]}}, source="GET /api/admin/orders user join"),
+        shape("users.by_email", "users", {"email": "user@example.com"}, op="findOne", source="login / register"),
+        shape("users.admin_login", "users", {"email": "admin@example.com", "role": "admin"}, op="findOne",
+              source="POST /api/admin/login"),
+        shape("users.same_phone", "users", {"phone": {"$regex": "5551234567"}, "id": {"$ne": user_id}},
+              op="count", source="calculateRiskScore"),
+        shape("users.same_ip", "users", {"meta.lastIP": ip, "id": {"$ne": user_id}}, op="count",
+              source="calculateRiskScore"),
+        shape("users.admin_list", "users", {}, sort={"createdAt": -1}, limit=50, source="GET /api/admin/users"),
+        shape("users.registered_since", "users", {"createdAt": {"$gte": day_start}}, op="count",
+              source="GET /api/admin/users, /api/admin/dashboard"),
+
+        # orders
+        shape("orders.by_id", "orders", {"id": order_id}, op="findOne", source="order handlers"),
+        shape("orders.by_id_and_user", "orders", {"id": order_id, "userId": user_id}, op="findOne",
+              source="GET /api/account/orders/{id}"),
+        shape("orders.by_ids", "orders", {"id": {"$in": [order_id]}}, source="GET /api/admin/risk-logs"),
+        shape("orders.user_history", "orders", {"userId": user_id}, sort={"createdAt": -1},
+              source="GET /api/account/orders"),
+        shape("orders.user_open", "orders", {"userId": user_id, "status": {"$in": ["pending", "paid"]}},
+              op="count", source="calculateRiskScore"),
+        shape("orders.same_ip_last_hour", "orders",
+              {"meta.ip": ip, "createdAt": {"$gte": hour_ago}, "id": {"$ne": order_id}}, op="count",
+              source="calculateRiskScore"),
+        shape("orders.admin_list", "orders", {}, sort={"createdAt": -1}, source="GET /api/admin/orders"),
+        shape("orders.admin_list_status", "orders", {"status": "paid"}, sort={"createdAt": -1},
+              source="GET /api/admin/orders?status="),
+        shape("orders.admin_list_risk", "orders", {"risk.status": "FLAGGED"}, sort={"createdAt": -1},
+              source="GET /api/admin/orders?riskStatus="),
+        shape("orders.admin_list_delivery", "orders", {"delivery.status": "hold"}, sort={"createdAt": -1},
+              source="GET /api/admin/orders?deliveryStatus="),
+        shape("orders.flagged_on_hold", "orders", {"risk.status": "FLAGGED", "delivery.status": "hold"},
+              op="count", source="GET /api/admin/orders flagged badge"),
+        shape("account_orders.flagged_on_hold", "account_orders",
+              {"risk.status": "FLAGGED", "delivery.status": "hold"}, op="count",
+              source="GET /api/admin/orders flagged badge"),
+        shape("orders.pending_verification", "orders",
+              {"verification.required": True, "verification.status": "pending",
+               "verification.submittedAt": {"$ne": None}},
+              sort={"verification.submittedAt": -1}, source="GET /api/admin/orders/pending-verification"),
+        shape("orders.recent", "orders", {}, sort={"createdAt": -1}, limit=5, source="GET /api/admin/dashboard"),
+        shape("orders.since", "orders", {"createdAt": {"$gte": day_start}}, op="count",
+              source="GET /api/admin/dashboard"),
+        shape("orders.by_status", "orders", {"status": "paid"}, op="count", source="GET /api/admin/dashboard"),
+        shape("orders.revenue", "orders", {"status": "paid"}, op="aggregate",
+              source="GET /api/admin/dashboard revenue $match"),
+        shape("orders.dijipin", "orders", {"delivery.method": "dijipin_auto"}, sort={"createdAt": -1},
+              source="GET /api/admin/dijipin/orders"),
+        shape("orders.abandoned_cron", "orders",
+              {"status": "pending", "createdAt": {"$gte": now - timedelta(minutes=20),
+                                                  "$lte": now - timedelta(minutes=15)},
+               "abandonedSmsSent": {"$ne": True}}, source="GET /api/cron/abandoned-sms"),
+        shape("orders.payment_cron", "orders",
+              {"status": {"$in": ["paid", "delivered"]}, "createdAt": {"$gte": now - timedelta(minutes=30)},
+               "paymentSmsSent": {"$ne": True}}, source="GET /api/cron/payment-sms"),
+
+        # account_orders share the admin listing with orders
+        shape("account_orders.by_id", "account_orders", {"id": order_id}, op="findOne",
+              source="account order handlers"),
+        shape("account_orders.admin_list", "account_orders", {}, sort={"createdAt": -1},
+              source="GET /api/admin/orders"),
+        shape("account_orders.admin_list_status", "account_orders", {"status": "paid"}, sort={"createdAt": -1},
+              source="GET /api/admin/orders?status="),
+        shape("account_orders.user_history", "account_orders", {"userId": user_id}, sort={"createdAt": -1},
+              source="GET /api/account/orders"),
+
+        # stock
+        shape("stock.assign", "stock", {"productId": "product-1", "status": "available"},
+              sort={"createdAt": 1}, op="findOneAndUpdate", source="stock assignment on payment / approve"),
+        shape("stock.reserve", "stock", {"productId": "product-1", "status": "available"}, limit=1,
+              source="Shopier callback stock reservation"),
+        shape("stock.admin_list", "stock", {"productId": "product-1"}, sort={"createdAt": -1},
+              source="GET /api/admin/products/{id}/stock"),
+        shape("account_stock.available", "account_stock", {"accountId": "account-1", "status": "available"},
+              op="findOneAndUpdate", source="account stock assignment"),
+        shape("account_stock.admin_list", "account_stock", {"accountId": "account-1"}, sort={"createdAt": -1},
+              source="GET /api/admin/accounts/{id}/stock"),
+
+        # blacklist lookups run on every order
+        shape("blacklist.exact", "blacklist", {"type": "email", "value": "user@example.com", "isActive": True},
+              op="findOne", source="checkBlacklist (email, domain, ip, playerId)"),
+        shape("blacklist.phone", "blacklist", {"type": "phone", "value": {"$regex": "5551234567"},
+                                               "isActive": True},
+              op="findOne", source="checkBlacklist (phone)"),
+        shape("blacklist.duplicate", "blacklist", {"type": "ip", "value": ip}, op="findOne",
+              source="POST /api/admin/blacklist"),
+        shape("blacklist.admin_list", "blacklist", {"type": "ip"}, sort={"createdAt": -1}, limit=50,
+              source="GET /api/admin/blacklist"),
+
+        # logs
+        shape("audit_logs.admin_list", "audit_logs", {}, sort={"createdAt": -1}, limit=50,
+              source="GET /api/admin/audit-logs"),
+        shape("audit_logs.by_action", "audit_logs", {"action": "order.status_change"}, sort={"createdAt": -1},
+              limit=50, source="GET /api/admin/audit-logs?action="),
+        shape("audit_logs.by_entity", "audit_logs", {"entityType": "order"}, sort={"createdAt": -1}, limit=50,
+              source="GET /api/admin/audit-logs?entityType="),
+        shape("audit_logs.by_actor", "audit_logs", {"actorId": user_id}, sort={"createdAt": -1}, limit=50,
+              source="GET /api/admin/audit-logs?actorId="),
+        shape("audit_logs.actions", "audit_logs", {}, op="distinct:action", source="GET /api/admin/audit-logs"),
+        shape("audit_logs.entity_types", "audit_logs", {}, op="distinct:entityType",
+              source="GET /api/admin/audit-logs"),
+        shape("risk_logs.admin_list", "risk_logs", {"createdAt": {"$gte": day_start}}, sort={"createdAt": -1},
+              limit=50, source="GET /api/admin/risk-logs"),
+        shape("risk_logs.by_status", "risk_logs", {"status": "FLAGGED"}, sort={"createdAt": -1}, limit=50,
+              source="GET /api/admin/risk-logs?status="),
+        shape("email_logs.sent", "email_logs", {"type": "order_created", "userId": user_id, "orderId": order_id},
+              op="findOne", source="checkEmailSent"),
+        shape("email_logs.admin_list", "email_logs", {}, sort={"createdAt": -1}, limit=50,
+              source="GET /api/admin/email/logs"),
+        shape("sms_logs.admin_list", "sms_logs", {}, sort={"createdAt": -1}, limit=50,
+              source="GET /api/admin/sms/logs"),
+
+        # payments
+        shape("payments.by_order", "payments", {"orderId": order_id}, op="findOne",
+              source="GET /api/orders/{id}"),
+        shape("payment_requests.by_order", "payment_requests", {"orderId": order_id, "provider": "shoppiyen"},
+              op="updateOne", source="Shoppiyen success callback"),
+        shape("shopierv2_sessions.open", "shopierv2_sessions",
+              {"orderId": order_id, "status": {"$in": ["pending", "active"]}}, op="findOne",
+              source="lib/shopierv2 createPaymentSession"),
+        shape("shopierv2_sessions.latest", "shopierv2_sessions", {"orderId": order_id}, sort={"createdAt": -1},
+              op="findOne", source="lib/shopierv2 getSessionStatus"),
+        shape("shopierv2_sessions.callback", "shopierv2_sessions",
+              {"$or": [{"shopierOrderId": "SHP-1"}, {"reference": "ref-1"}]}, op="findOne",
+              source="lib/shopierv2 handleCallback"),
+        shape("shopierv2_sessions.paid", "shopierv2_sessions", {"orderId": order_id, "status": "paid"},
+              op="findOne", source="lib/shopierv2 refund"),
+        shape("shopierv2_sessions.expire", "shopierv2_sessions",
+              {"status": "pending", "expiresAt": {"$lt": now}}, op="updateMany",
+              source="lib/shopierv2 expireSessions"),
+
+        # auth and support
+        shape("password_resets.token", "password_resets",
+              {"token": "reset-token", "used": False, "expiresAt": {"$gt": now}}, op="findOne",
+              source="POST /api/auth/reset-password"),
+        shape("tickets.user_recent", "tickets", {"userId": user_id, "createdAt": {"$gte": hour_ago}},
+              op="count", source="POST /api/support/tickets rate limit"),
+        shape("tickets.open", "tickets", {"status": {"$ne": "closed"}}, op="count",
+              source="GET /api/admin/dashboard"),
+        shape("tickets.user_open", "tickets", {"userId": user_id, "status": {"$ne": "closed"}}, op="count",
+              source="POST /api/support/tickets"),
+        shape("tickets.user_list", "tickets", {"userId": user_id}, sort={"updatedAt": -1},
+              source="GET /api/support/tickets"),
+        shape("tickets.admin_list", "tickets", {"status": "open"}, sort={"updatedAt": -1},
+              source="GET /api/admin/support/tickets"),
+        shape("ticket_messages.thread", "ticket_messages", {"ticketId": "ticket-1"}, sort={"createdAt": 1},
+              source="GET /api/support/tickets/{id}"),
+        shape("balance_transactions.user", "balance_transactions", {"userId": user_id}, sort={"createdAt": -1},
+              source="GET /api/account/balance"),
+
+        # catalogue
+        shape("products.active", "products", {"active": True}, sort={"sortOrder": 1}, source="GET /api/products"),
+        shape("accounts.available", "accounts", {"active": True, "status": "available"}, sort={"order": 1},
+              source="GET /api/accounts"),
+        shape("reviews.game", "reviews", {"game": "pubg", "approved": True}, sort={"createdAt": -1},
+              source="GET /api/reviews, /api/homepage"),
+        shape("daily_deals.active", "daily_deals",
+              {"productId": "product-1", "active": True, "endTime": {"$gt": now}}, op="findOne",
+              source="POST /api/admin/daily-deals"),
+        shape("legal_pages.slug", "legal_pages", {"slug": "kvkk", "isActive": True}, op="findOne",
+              source="GET /api/legal/{slug}"),
+        shape("blog_posts.slug", "blog_posts", {"slug": "post"}, op="findOne", source="GET /api/blog/{slug}"),
+    ]
+
+
+def explain_command(entry):
+    coll, query, sort = entry["collection"], entry["filter"], entry["sort"]
+    op = entry["op"]
+    if op in ("find", "findOne"):
+        command = {"find": coll, "filter": query}
+        if sort:
+            command["sort"] = sort
+        if op == "findOne" or entry["limit"]:
+            command["limit"] = 1 if op == "findOne" else entry["limit"]
+        return command
+    if op == "count":
+        return {"count": coll, "query": query}
+    if op == "findOneAndUpdate":
+        command = {"findAndModify": coll, "query": query, "update": {"$set": {"status": "assigned"}}}
+        if sort:
+            command["sort"] = sort
+        return command
+    if op in ("updateOne", "updateMany"):
+        return {"update": coll, "updates": [{"q": query, "u": {"$set": {"status": "expired"}},
+                                             "multi": op == "updateMany"}]}
+    if op == "aggregate":
+        return {"aggregate": coll, "pipeline": [{"$match": query}], "cursor": {}}
+    if op.startswith("distinct:"):
+        return {"distinct": coll, "key": op.split(":", 1)[1], "query": query}
+    raise ValueError(f"unknown op {op!r}")
+
+
+def winning_plans(explain):
+    """Every winningPlan in an explain result (aggregate nests them per stage / shard)"""
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                # SBE plans wrap the classic tree in queryPlan
+                yield value.get("queryPlan", value)
+            else:
+                yield from winning_plans(value)
+    elif isinstance(explain, list):
+        for item in explain:
+            yield from winning_plans(item)
+
+
+def plan_stages(plan):
+    stages = [plan.get("stage")]
+    for child in plan.get("inputStages", []) + ([plan["inputStage"]] if "inputStage" in plan else []):
+        stages.extend(plan_stages(child))
+    return [s for s in stages if s]
+
+
+def suggest_indexes(entry):
+    """Equality fields, then sort fields, then range fields; one index per $or branch"""
+    if "$or" in entry["filter"]:
+        return [index for branch in entry["filter"]["$or"]
+                for index in suggest_indexes({**entry, "filter": branch, "sort": None})]
+    equality, ranges = [], []
+    for field, value in entry["filter"].items():
+        if isinstance(value, dict) and RANGE_OPERATORS & set(value):
+            ranges.append(field)
+        else:
+            equality.append(field)
+    keys = {field: 1 for field in equality}
+    for field, direction in (entry["sort"] or {}).items():
+        keys.setdefault(field, direction)
+    for field in ranges:
+        keys.setdefault(field, 1)
+    if entry["op"].startswith("distinct:"):
+        keys.setdefault(entry["op"].split(":", 1)[1], 1)
+    return [keys] if keys else []
+
+
+def check(db, entry, existing):
+    result = {"name": entry["name"], "collection": entry["collection"], "op": entry["op"],
+              "source": entry["source"]}
+    if entry["collection"] not in existing:
+        result["status"] = "skipped"
+        return result
+    explain = db.command({"explain": explain_command(entry), "verbosity": "queryPlanner"})
+    stages = [stage for plan in winning_plans(explain) for stage in plan_stages(plan)]
+    problems = []
+    if FULL_SCAN_STAGES & set(stages):
+        problems.append("COLLSCAN")
+    if BLOCKING_SORT_STAGES & set(stages):
+        problems.append("in-memory SORT")
+    result["stages"] = stages
+    result["status"] = "fail" if problems else "ok"
+    if problems:
+        result["problems"] = problems
+        result["suggested_indexes"] = suggest_indexes(entry)
+    return result
+
+
+def create_index_statement(collection, keys):
+    fields = ", ".join(f"'{field}': {direction}" for field, direction in keys.items())
+    return f"db.collection('{collection}').createIndex({{ {fields} }})"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fail on query shapes that COLLSCAN or sort in memory")
+    parser.add_argument("--only", help="Comma separated collections or shape names to check")
+    parser.add_argument("--seed-orders", help="Seed this many orders (e.g. 100k) with tools.scale_fixtures first")
+    parser.add_argument("--workers", type=int, default=4, help="Seeding processes")
+    parser.add_argument("--suggest", action="store_true", help="Print createIndex statements for failing shapes")
+    parser.add_argument("--output", help="Write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    shapes = catalogue()
+    if args.only:
+        wanted = {w.strip() for w in args.only.split(",") if w.strip()}
+        shapes = [s for s in shapes if s["collection"] in wanted or s["name"] in wanted]
+
+    run_id = None
+    if args.seed_orders:
+        run_id = uuid.uuid4().hex[:8]
+        counts = scale_fixtures.plan_counts(scale_fixtures.parse_size(args.seed_orders), {})
+        products, accounts = scale_fixtures.catalogue(db)
+        ctx = scale_fixtures.make_context(run_id, "explain", counts, 365, products, accounts, 5000)
+        print(f"🌱 Seeding {counts['orders']:,} orders and related fixtures (run {run_id})", file=sys.stderr)
+        scale_fixtures.seed(ctx, scale_fixtures.COLLECTIONS, args.workers)
+
+    try:
+        existing = set(db.list_collection_names())
+        results = [check(db, entry, existing) for entry in shapes]
+    finally:
+        if run_id:
+            print("🧹 Removing fixtures...", file=sys.stderr)
+            scale_fixtures.cleanup(db, run_id)
+
+    failures = [r for r in results if r["status"] == "fail"]
+    skipped = [r for r in results if r["status"] == "skipped"]
+    report = {
+        "checked": len(results) - len(skipped),
+        "failed": len(failures),
+        "skipped": [r["name"] for r in skipped],
+        "shapes": results,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    for r in failures:
+        print(f"❌ {r['name']}: {', '.join(r['problems'])} ({r['source']})", file=sys.stderr)
+        if args.suggest:
+            for keys in r["suggested_indexes"]:
+                print(f"   {create_index_statement(r['collection'], keys)}", file=sys.stderr)
+    if skipped:
+        print(f"⚠️  {len(skipped)} shapes skipped, collection missing: "
+              f"{', '.join(sorted({r['collection'] for r in skipped}))}", file=sys.stderr)
+    if not failures:
+        print(f"✅ {report['checked']} shapes use an index", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Async Load Test - IBAN Payment Flow
+Replays the steps of backend_test.py's test_iban_payment_flow as N concurrent
+virtual users (register -> products -> IBAN order -> notify -> admin approve)
+and reports per-step p50/p95/p99 latency, status codes and throughput as JSON.
+
+Usage:
+    python -m tools.loadtest --users 50 --ramp-up 30 --think-time 1 --output load.json
+
+Requires: aiohttp
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import uuid
+
+import aiohttp
+
+from tools.api_client import BASE_URL, AsyncApiClient
+from tools.stats import Recorder
+
+
+class StepFailed(Exception):
+    """Raised when a flow step returns an unexpected response; aborts that user's flow"""
+
+
+def virtual_ip(vu_id):
+    """Deterministic, distinct X-Forwarded-For address per virtual user"""
+    return f"10.{(vu_id >> 16) & 255}.{(vu_id >> 8) & 255}.{vu_id & 255}"
+
+
+class LoadTest:
+    def __init__(self, args):
+        self.args = args
+        self.api_base = f"{args.base_url.rstrip('/')}/api"
+        self.recorder = Recorder()
+        self.api = None
+        self.admin_token = None
+        self.flows_completed = 0
+        self.flows_failed = 0
+        self.run_id = uuid.uuid4().hex[:8]
+
+    def on_call(self, event):
+        """AsyncApiClient hook: record every attempt under its step label"""
+        status = event["status"]
+        error = event["error"] or (f"http_{status}" if status and status >= 400 else None)
+        self.recorder.record(event["label"], event["elapsed_ms"], status, error)
+
+    async def call(self, step, method, path, headers=None, **kwargs):
+        """Perform one request and return (status, json_body); latency is recorded by on_call"""
+        try:
+            response = await self.api.request(method, path, label=step, headers=headers, **kwargs)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return None, {}
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, {}
+
+    async def think(self):
+        if self.args.think_time > 0:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * self.args.think_time)
+
+    async def run_flow(self, vu_id, iteration):
+        """One pass of the IBAN flow for a single virtual user"""
+        headers = {"User-Agent": "Mozilla/5.0 (PINLY load test; virtual user)"}
+        if not self.args.shared_ip:
+            headers["X-Forwarded-For"] = virtual_ip(vu_id)
+
+        # Step 1: User Registration
+        user_data = {
+            "firstName": "Load",
+            "lastName": f"User{vu_id}",
+            "email": f"load-{self.run_id}-{vu_id}-{iteration}@test.com",
+            "phone": f"5{random.randint(0, 999999999):09d}",
+            "password": "Test123!",
+        }
+        status, data = await self.call("register", "POST", "/auth/register", headers=headers, json=user_data)
+        if status != 200 or not data.get("data", {}).get("token"):
+            raise StepFailed("register")
+        user_headers = {**headers, "Authorization": f"Bearer {data['data']['token']}"}
+        await self.think()
+
+        # Step 2: Get Products
+        status, data = await self.call("get_products", "GET", "/products", headers=headers)
+        products = data.get("data") or data.get("products") or []
+        if status != 200 or not products:
+            raise StepFailed("get_products")
+        product_id = self.args.product_id or products[0]["id"]
+        await self.think()
+
+        # Step 3: Create IBAN Order
+        order_data = {
+            "productId": product_id,
+            "playerId": f"{random.randint(100000000, 999999999)}",
+            "playerName": f"LoadPlayer{vu_id}",
+            "paymentMethod": "iban",
+            "termsAccepted": True,
+        }
+        status, data = await self.call("create_order", "POST", "/orders", headers=user_headers, json=order_data)
+        order_id = data.get("data", {}).get("orderId")
+        if status != 200 or not order_id:
+            raise StepFailed("create_order")
+        await self.think()
+
+        # Step 4: Verify Order Status
+        status, _ = await self.call("get_order", "GET", f"/account/orders/{order_id}", headers=user_headers)
+        if status != 200:
+            raise StepFailed("get_order")
+
+        # Step 5: IBAN Payment Notification
+        status, _ = await self.call("iban_notify", "POST", f"/orders/{order_id}/iban-notify",
+                                    headers=user_headers, json={"senderName": f"Load User{vu_id}"})
+        if status != 200:
+            raise StepFailed("iban_notify")
+        await self.think()
+
+        if self.args.skip_approve or not self.admin_token:
+            return
+
+        # Step 6: Admin Approve IBAN Payment
+        admin_headers = {**headers, "Authorization": f"Bearer {self.admin_token}"}
+        status, _ = await self.call("approve_iban", "POST", f"/admin/orders/{order_id}/approve-iban",
+                                    headers=admin_headers)
+        if status != 200:
+            raise StepFailed("approve_iban")
+
+        # Step 7: Verify Order Status Changed to "paid"
+        status, data = await self.call("verify_paid", "GET", f"/account/orders/{order_id}", headers=user_headers)
+        order = data.get("data") or data.get("order") or {}
+        if status != 200 or order.get("status") != "paid":
+            raise StepFailed("verify_paid")
+
+    async def virtual_user(self, vu_id):
+        # Spread user start times evenly across the ramp-up window
+        if self.args.ramp_up > 0 and self.args.users > 1:
+            await asyncio.sleep(self.args.ramp_up * vu_id / self.args.users)
+        for iteration in range(self.args.iterations):
+            try:
+                await self.run_flow(vu_id, iteration)
+                self.flows_completed += 1
+            except StepFailed:
+                self.flows_failed += 1
+
+    async def run(self):
+        # 429s are part of what we measure, so the client must not retry them
+        self.api = AsyncApiClient(self.api_base, pool_size=self.args.max_connections, timeout=self.args.timeout,
+                                  max_retries=0, hooks=[self.on_call])
+        async with self.api:
+            if not self.args.skip_approve:
+                self.admin_token = await self.api.admin_token()
+                if not self.admin_token:
+                    print("⚠️  Admin login failed - approve steps will be skipped", file=sys.stderr)
+            self.recorder = Recorder()  # Exclude setup from measured throughput
+            await asyncio.gather(*(self.virtual_user(vu_id) for vu_id in range(self.args.users)))
+        self.recorder.stop()
+        return self.build_report()
+
+    def build_report(self):
+        report = self.recorder.report()
+        elapsed = report["elapsed_seconds"]
+        total_flows = self.flows_completed + self.flows_failed
+        report["config"] = {
+            "base_url": self.args.base_url,
+            "users": self.args.users,
+            "iterations": self.args.iterations,
+            "ramp_up_seconds": self.args.ramp_up,
+            "think_time_seconds": self.args.think_time,
+            "shared_ip": self.args.shared_ip,
+        }
+        report["flows"] = {
+            "completed": self.flows_completed,
+            "failed": self.flows_failed,
+            "success_rate": round(self.flows_completed / total_flows, 4) if total_flows else 0,
+            "flows_per_second": round(self.flows_completed / elapsed, 3) if elapsed > 0 else None,
+        }
+        return report
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent IBAN payment flow load test")
+    parser.add_argument("--base-url", default=BASE_URL, help="Site base URL (default: NEXT_PUBLIC_BASE_URL)")
+    parser.add_argument("--users", type=int, default=10, help="Number of virtual users")
+    parser.add_argument("--iterations", type=int, default=1, help="Flows per virtual user")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="Seconds over which users are started")
+    parser.add_argument("--think-time", type=float, default=1.0, help="Mean pause between steps in seconds (0 disables)")
+    parser.add_argument("--product-id", help="Order this product instead of the first listed one")
+    parser.add_argument("--skip-approve", action="store_true", help="Stop after the IBAN notification step")
+    parser.add_argument("--shared-ip", action="store_true",
+                        help="Do not send a distinct X-Forwarded-For per user (exercises per-IP rate limits)")
+    parser.add_argument("--max-connections", type=int, default=100, help="Connection pool size")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"🚀 Load testing IBAN flow: {args.users} users x {args.iterations} iterations against {args.base_url}",
+          file=sys.stderr)
+    report = asyncio.run(LoadTest(args).run())
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0 if report["flows"]["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
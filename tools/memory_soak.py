@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Memory Soak Driver
+Sweeps the server with requests that each create a new key in one of the
+in-process stores in lib/api/core.js, the way a bot rotating addresses would:
+
+    login     POST /api/auth/login, new X-Forwarded-For and e-mail per request
+              -> one rateLimitStore entry (per IP) and one bruteForceStore entry
+    reviews   GET /api/reviews?page=N, new page per request -> one cache entry
+    homepage  GET /api/homepage?game=X, new game per request -> one cache entry
+              (runs the full homepage aggregation each time, so keep --rate low)
+
+Meanwhile it samples the Node process through GET /api/admin/debug/memory
+(RSS, heap, heap limit and the three store sizes). It fits heap and RSS growth
+per key sent and projects how many keys it would take to reach the V8 heap
+limit. After the sweep it keeps sampling for --idle-seconds. With an eviction
+fix in place, the store sizes and heap should then fall back once the rate
+limit windows and cache TTLs have passed.
+
+Usage:
+    python -m tools.memory_soak --keys 1000000 --rate 2000 --vectors login
+    python -m tools.memory_soak --keys 200000 --vectors login,reviews --idle-seconds 900 \\
+        --csv soak.csv --plot soak.png
+
+Requires: aiohttp (matplotlib for --plot)
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import sys
+import time
+import uuid
+
+import aiohttp
+
+from tools.api_client import BASE_URL, AsyncApiClient
+from tools.loadtest import virtual_ip
+from tools.stats import Recorder
+
+VECTORS = {
+    "login": "POST /auth/login",
+    "reviews": "GET /reviews",
+    "homepage": "GET /homepage",
+}
+
+SAMPLE_FIELDS = ["elapsed_s", "phase", "keys_sent", "rss", "heap_used", "heap_total", "external",
+                 "rate_limit", "brute_force", "cache"]
+
+MB = 1024 * 1024
+
+
+def slope(points, x_key, y_key):
+    """Least-squares dy/dx; None with fewer than two distinct x values"""
+    xy = [(p[x_key], p[y_key]) for p in points if p.get(y_key) is not None]
+    if len(xy) < 2:
+        return None
+    mean_x = sum(x for x, _ in xy) / len(xy)
+    mean_y = sum(y for _, y in xy) / len(xy)
+    var_x = sum((x - mean_x) ** 2 for x, _ in xy)
+    if not var_x:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in xy) / var_x
+
+
+class Soak:
+    def __init__(self, args):
+        self.args = args
+        self.run_id = uuid.uuid4().hex[:8]
+        self.recorder = Recorder()
+        self.samples = []
+        self.heap_limit = None
+        self.keys_sent = 0
+        self.phase = "baseline"
+        self.started = None
+
+    def on_call(self, event):
+        if event["label"] not in VECTORS:
+            return
+        status = event["status"]
+        error = event["error"] or (f"http_{status}" if status and status >= 500 else None)
+        self.recorder.record(event["label"], event["elapsed_ms"], status, error)
+
+    async def send(self, api, index, semaphore):
+        vector = self.args.vectors[index % len(self.args.vectors)]
+        try:
+            if vector == "login":
+                # A fresh address bypasses the 5/minute login limit, so every request adds keys
+                await api.post("/auth/login", label=vector, headers={"X-Forwarded-For": virtual_ip(index + 1)},
+                               json={"email": f"soak-{self.run_id}-{index}@test.invalid", "password": "wrong"})
+            elif vector == "reviews":
+                await api.get(f"/reviews?game=pubg&page={index + 1}&limit=5", label=vector)
+            else:
+                await api.get(f"/homepage?game=soak-{self.run_id}-{index}", label=vector)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass  # recorded by on_call
+        finally:
+            self.keys_sent += 1
+            semaphore.release()
+
+    async def sample(self, api, headers):
+        try:
+            response = await api.get("/admin/debug/memory", label="debug_memory", headers=headers)
+            data = response.json().get("data") if response.status_code == 200 else None
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+            data = None
+        if not data:
+            print("⚠️  Memory sample failed", file=sys.stderr)
+            return
+        memory, stores = data["memory"], data["stores"]
+        self.heap_limit = memory.get("heapSizeLimit")
+        point = {
+            "elapsed_s": round(time.monotonic() - self.started, 1),
+            "phase": self.phase,
+            "keys_sent": self.keys_sent,
+            "rss": memory["rss"],
+            "heap_used": memory["heapUsed"],
+            "heap_total": memory["heapTotal"],
+            "external": memory["external"],
+            "rate_limit": stores["rateLimit"],
+            "brute_force": stores["bruteForce"],
+            "cache": stores["cache"],
+        }
+        self.samples.append(point)
+        print(f"   {point['elapsed_s']:>8.0f}s {point['phase']:<6} {point['keys_sent']:>10,} keys  "
+              f"rss {point['rss'] / MB:8.1f} MB  heap {point['heap_used'] / MB:8.1f} MB  "
+              f"maps {point['rate_limit']:,}/{point['brute_force']:,}/{point['cache']:,}", file=sys.stderr)
+
+    async def sampler(self, api, headers, stop):
+        while not stop.is_set():
+            await self.sample(api, headers)
+            try:
+                await asyncio.wait_for(stop.wait(), self.args.sample_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def drive(self, api):
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        pending = set()
+        for index in range(self.args.keys):
+            if self.args.duration and loop.time() - start > self.args.duration:
+                break
+            delay = start + index / self.args.rate - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await semaphore.acquire()
+            task = asyncio.create_task(self.send(api, index, semaphore))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def run(self):
+        api = AsyncApiClient(f"{self.args.base_url.rstrip('/')}/api", pool_size=self.args.concurrency + 1,
+                             timeout=self.args.timeout, max_retries=0, hooks=[self.on_call])
+        async with api:
+            token = await api.admin_token()
+            if not token:
+                raise SystemExit("❌ Admin login failed")
+            headers = api.auth_headers(token)
+            self.started = time.monotonic()
+            await self.sample(api, headers)
+            if not self.samples:
+                raise SystemExit("❌ /api/admin/debug/memory is not available on this server")
+
+            stop = asyncio.Event()
+            sampler = asyncio.create_task(self.sampler(api, headers, stop))
+            self.phase = "sweep"
+            print(f"🧪 Sweeping {self.args.keys:,} keys at {self.args.rate:g}/s via "
+                  f"{', '.join(self.args.vectors)} (run {self.run_id})", file=sys.stderr)
+            await self.drive(api)
+            self.recorder.stop()
+            await self.sample(api, headers)
+            self.phase = "idle"
+            if self.args.idle_seconds:
+                print(f"💤 Idling {self.args.idle_seconds:g}s to watch for eviction", file=sys.stderr)
+                await asyncio.sleep(self.args.idle_seconds)
+            stop.set()
+            await sampler
+            await self.sample(api, headers)
+        return self.report()
+
+    def report(self):
+        baseline, final = self.samples[0], self.samples[-1]
+        sweep = [s for s in self.samples if s["phase"] != "idle"]
+        end_of_sweep = sweep[-1] if sweep else final
+        heap_per_key = slope(sweep, "keys_sent", "heap_used")
+        rss_per_key = slope(sweep, "keys_sent", "rss")
+        headroom = self.heap_limit - end_of_sweep["heap_used"] if self.heap_limit else None
+        stores = {}
+        for name in ["rate_limit", "brute_force", "cache"]:
+            peak = max(s[name] for s in self.samples)
+            stores[name] = {"baseline": baseline[name], "peak": peak, "final": final[name],
+                            "evicted": peak - final[name]}
+        return {
+            "run_id": self.run_id,
+            "vectors": self.args.vectors,
+            "keys_sent": self.keys_sent,
+            "requests": self.recorder.report(),
+            "heap_size_limit": self.heap_limit,
+            "heap_bytes_per_key": round(heap_per_key, 1) if heap_per_key is not None else None,
+            "rss_bytes_per_key": round(rss_per_key, 1) if rss_per_key is not None else None,
+            "keys_to_heap_limit": int(headroom / heap_per_key) if headroom and heap_per_key and heap_per_key > 0
+            else None,
+            "heap_used": {"baseline": baseline["heap_used"], "end_of_sweep": end_of_sweep["heap_used"],
+                          "final": final["heap_used"]},
+            "rss": {"baseline": baseline["rss"], "end_of_sweep": end_of_sweep["rss"], "final": final["rss"]},
+            "stores": stores,
+            "samples": self.samples,
+        }
+
+
+def write_csv(path, samples):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=SAMPLE_FIELDS)
+        writer.writeheader()
+        writer.writerows(samples)
+
+
+def plot(path, report):
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("⚠️  matplotlib is not installed; skipping --plot (use --csv instead)", file=sys.stderr)
+        return
+    samples = report["samples"]
+    t = [s["elapsed_s"] for s in samples]
+    fig, (memory_ax, stores_ax) = plt.subplots(2, 1, sharex=True, figsize=(10, 7))
+    memory_ax.plot(t, [s["rss"] / MB for s in samples], label="RSS")
+    memory_ax.plot(t, [s["heap_used"] / MB for s in samples], label="heap used")
+    if report["heap_size_limit"]:
+        memory_ax.axhline(report["heap_size_limit"] / MB, color="red", linestyle="--", label="heap limit")
+    memory_ax.set_ylabel("MB")
+    memory_ax.legend()
+    for name in ["rate_limit", "brute_force", "cache"]:
+        stores_ax.plot(t, [s[name] for s in samples], label=name)
+    idle = next((s["elapsed_s"] for s in samples if s["phase"] == "idle"), None)
+    if idle is not None:
+        for ax in (memory_ax, stores_ax):
+            ax.axvline(idle, color="grey", linestyle=":")
+    stores_ax.set_ylabel("entries")
+    stores_ax.set_xlabel("seconds")
+    stores_ax.legend()
+    fig.suptitle(f"Memory soak {report['run_id']}: {', '.join(report['vectors'])}")
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"📈 Plot written to {path}", file=sys.stderr)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Grow the in-process Maps and sample server memory")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--vectors", default="login", help=f"Comma separated: {', '.join(VECTORS)}")
+    parser.add_argument("--keys", type=int, default=100000, help="Distinct keys (requests) to send")
+    parser.add_argument("--rate", type=float, default=500, help="Requests per second")
+    parser.add_argument("--concurrency", type=int, default=200, help="Maximum requests in flight")
+    parser.add_argument("--duration", type=float, help="Stop the sweep after this many seconds")
+    parser.add_argument("--sample-interval", type=float, default=5.0, help="Seconds between memory samples")
+    parser.add_argument("--idle-seconds", type=float, default=0, help="Keep sampling this long after the sweep")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--csv", help="Write the samples as CSV here")
+    parser.add_argument("--plot", help="Write a PNG of memory and Map sizes over time here")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    args.vectors = [v.strip() for v in args.vectors.split(",") if v.strip()]
+    unknown = set(args.vectors) - set(VECTORS)
+    if unknown or not args.vectors:
+        parser.error(f"unknown vectors: {', '.join(sorted(unknown)) or '(none given)'}")
+    # /api/admin is limited to 60 requests/minute per route and admin
+    args.sample_interval = max(args.sample_interval, 2.0)
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(Soak(args).run())
+    if args.csv:
+        write_csv(args.csv, report["samples"])
+        print(f"✅ Samples written to {args.csv}", file=sys.stderr)
+    if args.plot:
+        plot(args.plot, report)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    print(f"📊 {report['keys_sent']:,} keys: heap {report['heap_bytes_per_key']} B/key, "
+          f"RSS {report['rss_bytes_per_key']} B/key", file=sys.stderr)
+    if report["keys_to_heap_limit"] is not None:
+        print(f"   ~{report['keys_to_heap_limit']:,} more keys would reach the heap limit", file=sys.stderr)
+    for name, store in report["stores"].items():
+        print(f"   {name:<12} peak {store['peak']:,}  final {store['final']:,}  evicted {store['evicted']:,}",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
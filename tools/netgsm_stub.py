@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+NetGSM API Stand-in
+Local HTTP server compatible with the two NetGSM v2 endpoints lib/api/core.js calls:
+POST /sms/rest/v2/send (sendSms) and GET /sms/rest/v2/msgheader (admin
+header lookup). Latency and failures are tunable so the SMS crons can be
+timed without sending real messages.
+
+Usage:
+    python -m tools.netgsm_stub --port 4020 --latency-ms 250 --jitter-ms 100
+    NETGSM_API_URL=http://localhost:4020 yarn dev
+
+    curl localhost:4020/__stats          # request counts, latency, messages accepted
+    curl -X POST localhost:4020/__reset
+"""
+
+import argparse
+import base64
+import sys
+
+from tools.stub_server import StubHandler, StubState, add_fault_args, run_forever, serve
+
+
+class NetgsmState(StubState):
+    def reset(self):
+        with self.lock:
+            super().reset()
+            self.jobs = 0
+            self.messages = 0
+            self.recipients = set()
+
+    def accept(self, messages):
+        with self.lock:
+            self.jobs += 1
+            self.messages += len(messages)
+            self.recipients.update(m.get("no") for m in messages)
+            return f"{self.jobs + 1000000000}"
+
+    def stats(self):
+        report = super().stats()
+        with self.lock:
+            report.update({
+                "jobs": self.jobs,
+                "messages": self.messages,
+                "unique_recipients": len(self.recipients),
+            })
+        return report
+
+
+class NetgsmHandler(StubHandler):
+    # Gateway outage; sendSms still parses the body and logs the send as failed
+    injected_error = (503, {"code": "70", "description": "Service Unavailable"})
+
+    def usercode(self):
+        auth = self.headers.get("Authorization") or ""
+        if not auth.startswith("Basic "):
+            return None
+        try:
+            return base64.b64decode(auth[6:]).decode("utf-8").partition(":")[0]
+        except ValueError:
+            return None
+
+    def dispatch(self, method, url):
+        usercode = self.usercode()
+        if not usercode or (self.state.args.usercode and usercode != self.state.args.usercode):
+            return self.send_json(200, {"code": "30", "description": "Invalid credentials"})
+        route = f"{method} {url.path}"
+
+        if route == "POST /sms/rest/v2/send":
+            body = self.read_json() or {}
+            messages = [m for m in body.get("messages") or [] if m.get("no") and m.get("msg")]
+            if not messages:
+                return self.send_json(200, {"code": "70", "description": "Invalid parameters"})
+            jobid = self.state.accept(messages)
+            return self.send_json(200, {"code": "00", "jobid": jobid, "description": "queued"})
+
+        if route == "GET /sms/rest/v2/msgheader":
+            return self.send_json(200, {"code": "00", "msgheader": [self.state.args.msgheader]})
+
+        self.send_json(404, {"code": "70", "description": "Not Found"})
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Local NetGSM API stand-in with tunable latency")
+    add_fault_args(parser, port=4020)
+    parser.add_argument("--usercode", help="Only accept this NetGSM usercode (default: any)")
+    parser.add_argument("--msgheader", default="PINLY", help="Sender header returned by /msgheader")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    state = NetgsmState(args)
+    server = serve(NetgsmHandler, state)
+    print(f"📱 NetGSM stub listening on http://{args.host}:{args.port} "
+          f"(latency {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, error rate {args.error_rate:.0%})", file=sys.stderr)
+    print(f"   Point the app at it with NETGSM_API_URL=http://{args.host}:{args.port}", file=sys.stderr)
+    run_forever(server, state)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Shopier V2 OSB Webhook Benchmark
+Seeds pending orders with Shopier V2 sessions, then delivers the same signed
+OSB notification for each order several times concurrently to
+/api/payment/shopierv2/osb (shopierV2Service.handleWebhookCallback), the way
+Shopier retries when we answer slowly. Reports throughput and latency, and
+counts how often a duplicate delivery re-ran the paid flow (risk scoring,
+SMS/e-mail, stock assignment) instead of being absorbed as a no-op.
+
+Usage:
+    python -m tools.osb_webhook_bench --orders 200 --duplicates 5 --workers 50
+    python backend_test_shopierv2_simple.py --benchmark --orders 200
+
+Requires: aiohttp, pymongo
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+
+from tools.api_client import BASE_URL, AsyncApiClient
+from tools.db import chunked, get_db
+from tools.signing import osb_signature
+from tools.stats import Recorder
+
+OSB_PATH = "/payment/shopierv2/osb"
+OSB_KEY = os.getenv("SHOPIER_V2_OSB_KEY", "b4bfe50c039d9a9935b0b77c565d0a2c")
+REFERENCE_PREFIX = os.getenv("SHOPIER_V2_REFERENCE_PREFIX", "SV2")
+SOURCE_TAG = "osb_bench"
+
+# Side-effect collections written once per execution of the paid flow
+SIDE_EFFECTS = ["risk_logs", "sms_logs", "email_logs", "payments"]
+
+
+def seed(db, run_id, count, amount, with_stock):
+    """Insert a fixture user plus `count` pending orders, each with a pending shopierv2 session"""
+    now = datetime.now(timezone.utc)
+    user = {
+        "id": str(uuid.uuid4()),
+        "firstName": "Osb",
+        "lastName": "Bench",
+        "email": f"osb-bench+{run_id}@test.com",
+        "phone": "5550000001",
+        "createdAt": now - timedelta(days=30),
+        "updatedAt": now,
+        "source": SOURCE_TAG,
+        "loadTestRunId": run_id,
+    }
+    db.users.insert_one(user)
+    product_id = f"osb-product-{run_id}"
+    orders, sessions = [], []
+    for i in range(count):
+        order_id = str(uuid.uuid4())
+        orders.append({
+            "id": order_id,
+            "userId": user["id"],
+            "productId": product_id,
+            "productTitle": "325 UC",
+            "playerId": f"{500000000 + i}",
+            "playerName": f"OsbBench#{i}",
+            "status": "pending",
+            "amount": amount,
+            "totalAmount": amount,
+            "quantity": 1,
+            "currency": "TRY",
+            "paymentMethod": "shopierv2",
+            "createdAt": now,
+            "updatedAt": now,
+            "loadTestRunId": run_id,
+        })
+        sessions.append({
+            "sessionId": str(uuid.uuid4()),
+            "orderId": order_id,
+            "userId": user["id"],
+            "shopierOrderId": f"shopier-bench-{run_id}-{i}",
+            "reference": f"{REFERENCE_PREFIX}-{order_id}",
+            "paymentUrl": "https://payment.shopier.com/bench",
+            "amount": amount,
+            "currency": "TRY",
+            "status": "pending",
+            "expiresAt": now + timedelta(hours=1),
+            "createdAt": now,
+            "updatedAt": now,
+            "loadTestRunId": run_id,
+        })
+    for batch in chunked(orders, 1000):
+        db.orders.insert_many(batch, ordered=False)
+    for batch in chunked(sessions, 1000):
+        db.shopierv2_sessions.insert_many(batch, ordered=False)
+    if with_stock:
+        db.stock.insert_many([{
+            "id": str(uuid.uuid4()),
+            "productId": product_id,
+            "value": f"OSB-{run_id}-{i:06d}",
+            "status": "available",
+            "createdAt": now,
+            "loadTestRunId": run_id,
+        } for i in range(with_stock)])
+    return sessions
+
+
+def notification(session, key, status="paid"):
+    amount = f"{session['amount']:.2f}"
+    payload = {
+        "order_id": session["shopierOrderId"],
+        "reference": session["reference"],
+        "amount": amount,
+        "currency": "TRY",
+        "status": status,
+    }
+    payload["signature"] = osb_signature(payload["order_id"], payload["reference"], amount, "TRY", status, key)
+    return payload
+
+
+class OsbBench:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = Recorder()
+        self.api = None
+
+    def on_call(self, event):
+        status = event["status"]
+        error = event["error"] or (f"http_{status}" if status and status >= 400 else None)
+        self.recorder.record(event["label"], event["elapsed_ms"], status, error)
+
+    async def deliver(self, semaphore, payload):
+        async with semaphore:
+            try:
+                await self.api.post(OSB_PATH, json=payload, label="osb_delivery")
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass  # Recorded by on_call
+
+    async def replay(self, semaphore, session):
+        """Fire every copy of one order's notification at once"""
+        payload = notification(session, self.args.osb_key)
+        await asyncio.gather(*(self.deliver(semaphore, payload) for _ in range(self.args.duplicates)))
+
+    async def run(self, sessions):
+        semaphore = asyncio.Semaphore(self.args.workers)
+        self.api = AsyncApiClient(f"{self.args.base_url.rstrip('/')}/api", pool_size=self.args.workers,
+                                  max_retries=0, hooks=[self.on_call])
+        async with self.api:
+            await asyncio.gather(*(self.replay(semaphore, s) for s in sessions))
+        self.recorder.stop()
+
+
+def count_by_order(db, collection, order_ids):
+    counts = Counter()
+    for batch in chunked(order_ids, 1000):
+        for row in db[collection].aggregate([{"$match": {"orderId": {"$in": batch}}},
+                                             {"$group": {"_id": "$orderId", "n": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["n"]
+    return counts
+
+
+def measure_redundancy(db, order_ids, duplicates):
+    """Per side-effect collection: how many executions beyond the first one per order"""
+    result = {}
+    for collection in SIDE_EFFECTS + ["stock"]:
+        counts = count_by_order(db, collection, order_ids)
+        redundant = sum(max(0, n - 1) for n in counts.values())
+        result[collection] = {
+            "orders_with_effect": len(counts),
+            "total_entries": sum(counts.values()),
+            "redundant_entries": redundant,
+            "max_per_order": max(counts.values()) if counts else 0,
+        }
+    statuses = Counter()
+    for batch in chunked(order_ids, 1000):
+        for doc in db.orders.find({"id": {"$in": batch}}, {"_id": 0, "status": 1}):
+            statuses[doc.get("status")] += 1
+
+    duplicate_deliveries = len(order_ids) * (duplicates - 1)
+    # risk_logs gets exactly one row per run of the paid flow, so it is the cleanest signal
+    redundant_runs = result["risk_logs"]["redundant_entries"]
+    return {
+        "order_statuses": dict(statuses),
+        "duplicate_deliveries": duplicate_deliveries,
+        "redundant_paid_flow_runs": redundant_runs,
+        "redundant_work_rate": round(redundant_runs / duplicate_deliveries, 4) if duplicate_deliveries else 0,
+        "side_effects": result,
+    }
+
+
+def cleanup(db, run_id, order_ids):
+    for batch in chunked(order_ids, 1000):
+        for collection in SIDE_EFFECTS:
+            db[collection].delete_many({"orderId": {"$in": batch}})
+        db.audit_logs.delete_many({"entityId": {"$in": batch}})
+    for collection in ["orders", "shopierv2_sessions", "stock", "users"]:
+        db[collection].delete_many({"loadTestRunId": run_id})
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent duplicate-delivery benchmark for the Shopier V2 OSB webhook")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--orders", type=int, default=100, help="Distinct notifications (orders) to deliver")
+    parser.add_argument("--duplicates", type=int, default=5, help="Concurrent copies of each notification")
+    parser.add_argument("--workers", type=int, default=50, help="Maximum in-flight deliveries")
+    parser.add_argument("--amount", type=float, default=89.99, help="Order amount (>= 3000 takes the verification path)")
+    parser.add_argument("--with-stock", type=int, default=0, help="Fixture stock codes to make available")
+    parser.add_argument("--osb-key", default=OSB_KEY, help="OSB key the server verifies with (SHOPIER_V2_OSB_KEY)")
+    parser.add_argument("--settle", type=float, default=3.0,
+                        help="Seconds to wait for fire-and-forget SMS/e-mail logging before counting")
+    parser.add_argument("--keep", action="store_true", help="Keep fixture data and side effects")
+    parser.add_argument("--output", help="Write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    run_id = uuid.uuid4().hex[:8]
+
+    print(f"🌱 Seeding {args.orders} orders with Shopier V2 sessions (run {run_id})...", file=sys.stderr)
+    sessions = seed(db, run_id, args.orders, args.amount, args.with_stock)
+    order_ids = [s["orderId"] for s in sessions]
+
+    print(f"🔔 Delivering each notification x{args.duplicates} with {args.workers} workers...", file=sys.stderr)
+    bench = OsbBench(args)
+    try:
+        asyncio.run(bench.run(sessions))
+        time.sleep(args.settle)
+        redundancy = measure_redundancy(db, order_ids, args.duplicates)
+    finally:
+        if not args.keep:
+            cleanup(db, run_id, order_ids)
+
+    report = bench.recorder.report()
+    elapsed = report["elapsed_seconds"]
+    report.update({
+        "run_id": run_id,
+        "config": {"orders": args.orders, "duplicates": args.duplicates, "workers": args.workers,
+                   "amount": args.amount},
+        "notifications_per_second": round(args.orders / elapsed, 2) if elapsed > 0 else None,
+        "idempotency": redundancy,
+    })
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    print(f"♻️  Redundant paid-flow runs: {redundancy['redundant_paid_flow_runs']} of "
+          f"{redundancy['duplicate_deliveries']} duplicate deliveries", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+Payment Hash Reconciler
+Streams payment_security_logs with a batched cursor, joins each batch to its
+orders, and recomputes the hash the callback should have carried across a
+worker pool. Every logged mismatch ends up in one category:
+
+    genuine          received hash does not match the current secret (correct rejection)
+    false_positive   received hash is valid for the current secret
+    amount_format    valid once the amount is formatted differently ("20" vs "20.00")
+    stale_secret     the logged expectedHash does not reproduce (secret rotated since)
+    order_missing    the log points at an order that no longer exists
+    unverifiable     no received hash or no usable secret for the provider
+
+Orders that still ended up paid after a mismatch are counted separately. The
+exit code is 1 when any valid callback was rejected.
+
+Only the Shopinext callback (lib/api/routes/payments.js) writes
+payment_security_logs today. The Shopier branch (legacy_shopier_hash) covers
+rows from older deployments and is waiting on the Shopier callback to log its
+mismatches; until then it usually sees no rows.
+
+Provider secrets are read from shopier_settings / shopinext_settings and
+decrypted in-process (tools.crypto, same format as lib/crypto.js), with the
+SHOPINEXT_CLIENT_ID / SHOPINEXT_CLIENT_SECRET environment override the route
+uses. The report also lists which encrypted settings fields decrypt with the
+given MASTER_ENCRYPTION_KEY.
+
+Usage:
+    MASTER_ENCRYPTION_KEY=... python -m tools.payment_audit --since 2024-06-01 --until 2024-06-02
+    python -m tools.payment_audit --master-key "$KEY" --provider shopinext --samples 20
+    python -m tools.payment_audit --settings-only
+
+Requires: pymongo, cryptography
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+from tools import crypto
+from tools.db import chunked, get_db
+from tools.signing import legacy_shopier_hash, shopinext_hash
+
+CATEGORIES = ["genuine", "false_positive", "amount_format", "stale_secret", "order_missing", "unverifiable"]
+
+SETTINGS_FIELDS = {
+    "shopier_settings": ["merchantId", "apiKey", "apiSecret"],
+    "shopinext_settings": ["clientId", "clientSecret"],
+}
+
+LOG_PROJECTION = {"_id": 0, "orderId": 1, "provider": 1, "event": 1, "expectedHash": 1, "receivedHash": 1}
+ORDER_PROJECTION = {"_id": 0, "id": 1, "amount": 1, "totalAmount": 1, "status": 1}
+
+
+def js_number(value):
+    """How a JS template literal renders a stored amount: 20 -> "20", 19.99 -> "19.99" """
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def amount_variants(order):
+    """The amount as the server formats it first, then the formats clients have been seen to send"""
+    variants = []
+    for value in (order.get("amount"), order.get("totalAmount")):
+        if value is None:
+            continue
+        candidates = [js_number(value)]
+        try:
+            number = float(value)
+            candidates += [f"{number:.2f}", str(number), str(int(number))]
+        except (TypeError, ValueError):
+            pass
+        for candidate in candidates:
+            if candidate not in variants:
+                variants.append(candidate)
+    return variants
+
+
+def hash_matcher(stored):
+    """Logs keep only a prefix of received hashes ("0123456789abcdef0123...")"""
+    if not stored:
+        return None
+    if stored.endswith("..."):
+        prefix = stored[:-3]
+        return lambda candidate: candidate.startswith(prefix)
+    return lambda candidate: candidate == stored
+
+
+def classify(row, secrets):
+    order = row["order"]
+    if order is None:
+        return "order_missing"
+    received = hash_matcher(row.get("receivedHash"))
+    if received is None:
+        return "unverifiable"
+
+    if row["provider"] == "shopinext":
+        if not secrets.get("shopinext"):
+            return "unverifiable"
+        return "false_positive" if received(shopinext_hash(*secrets["shopinext"])) else "genuine"
+
+    # The Shopier callback writes no payment_security_logs yet, so only old rows reach this
+    secret = secrets.get("shopier")
+    variants = amount_variants(order)
+    if not secret or not variants:
+        return "unverifiable"
+    hashes = [legacy_shopier_hash(row["orderId"], amount, secret) for amount in variants]
+    if received(hashes[0]):
+        return "false_positive"
+    if any(received(h) for h in hashes[1:]):
+        return "amount_format"
+    expected = hash_matcher(row.get("expectedHash"))
+    if expected is not None and not expected(hashes[0]):
+        return "stale_secret"
+    return "genuine"
+
+
+def verify_batch(task):
+    """Classify one batch of joined log rows (runs in a pool worker)"""
+    secrets, rows = task
+    return [(classify(row, secrets), row["provider"], row["orderId"],
+             bool(row["order"]) and row["order"].get("status") in ("paid", "delivered"))
+            for row in rows]
+
+
+def joined_batches(db, query, batch_size):
+    """payment_security_logs in batches, each row carrying its order (or None)"""
+    cursor = db.payment_security_logs.find(query, LOG_PROJECTION, batch_size=batch_size)
+    for logs in chunked(cursor, batch_size):
+        order_ids = list({log.get("orderId") for log in logs if log.get("orderId")})
+        orders = {o["id"]: o for o in db.orders.find({"id": {"$in": order_ids}}, ORDER_PROJECTION)}
+        missing = [i for i in order_ids if i not in orders]
+        if missing:
+            orders.update({o["id"]: o for o in db.account_orders.find({"id": {"$in": missing}}, ORDER_PROJECTION)})
+        yield [{**log, "provider": log.get("provider") or "shopier", "order": orders.get(log.get("orderId"))}
+               for log in logs]
+
+
+def load_settings(db, key):
+    """Decrypted provider secrets plus a per-field report of what decrypts"""
+    report, plain = {}, {}
+    for collection, fields in SETTINGS_FIELDS.items():
+        doc = db[collection].find_one({"isActive": True}) or {}
+        for field in fields:
+            name = f"{collection}.{field}"
+            if not doc.get(field):
+                report[name] = {"status": "missing"}
+                continue
+            try:
+                plain[name] = crypto.decrypt(doc[field], key) if key else None
+                report[name] = {"status": "ok" if key else "no_key",
+                                "value": crypto.mask(plain[name]) if key else None}
+            except ValueError:
+                report[name] = {"status": "undecryptable"}
+
+    secrets = {}
+    if plain.get("shopier_settings.apiSecret"):
+        secrets["shopier"] = plain["shopier_settings.apiSecret"]
+    env_id, env_secret = os.getenv("SHOPINEXT_CLIENT_ID"), os.getenv("SHOPINEXT_CLIENT_SECRET")
+    if env_id and env_secret:
+        secrets["shopinext"] = (env_id, env_secret)
+    elif plain.get("shopinext_settings.clientId") and plain.get("shopinext_settings.clientSecret"):
+        secrets["shopinext"] = (plain["shopinext_settings.clientId"], plain["shopinext_settings.clientSecret"])
+    return secrets, report
+
+
+def build_query(args):
+    query = {}
+    if args.since or args.until:
+        window = {}
+        if args.since:
+            window["$gte"] = datetime.fromisoformat(args.since)
+        if args.until:
+            window["$lt"] = datetime.fromisoformat(args.until)
+        # Shopinext logs stamp `timestamp`, older Shopier logs `createdAt`
+        query["$or"] = [{"timestamp": window}, {"createdAt": window}]
+    if args.provider == "shopier":
+        # Logs written before the provider field existed are Shopier callbacks
+        query["provider"] = {"$in": ["shopier", None]}
+    elif args.provider:
+        query["provider"] = args.provider
+    if args.event:
+        query["event"] = args.event
+    return query
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Recompute payment callback hashes for logged mismatches")
+    parser.add_argument("--master-key", default=os.getenv("MASTER_ENCRYPTION_KEY"),
+                        help="MASTER_ENCRYPTION_KEY (default: environment)")
+    parser.add_argument("--since", help="ISO date/time, inclusive")
+    parser.add_argument("--until", help="ISO date/time, exclusive")
+    parser.add_argument("--provider", choices=["shopier", "shopinext"])
+    parser.add_argument("--event", help="Only this payment_security_logs event (e.g. hash_mismatch)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Hashing processes (0 = inline)")
+    parser.add_argument("--batch-size", type=int, default=2000)
+    parser.add_argument("--samples", type=int, default=10, help="Order ids to list per category")
+    parser.add_argument("--settings-only", action="store_true", help="Only report which settings decrypt")
+    parser.add_argument("--output", help="Write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    key = crypto.master_key(args.master_key) if args.master_key else None
+    if key is None:
+        print("⚠️  No MASTER_ENCRYPTION_KEY; only Shopinext env credentials can be checked", file=sys.stderr)
+    secrets, settings = load_settings(db, key)
+    for name, field in settings.items():
+        if field["status"] == "undecryptable":
+            print(f"❌ {name} does not decrypt with this key", file=sys.stderr)
+
+    report = {"settings": settings, "providers_checked": sorted(secrets)}
+    if not args.settings_only:
+        categories = Counter()
+        by_provider = defaultdict(Counter)
+        samples = defaultdict(list)
+        paid = 0
+        start = time.perf_counter()
+        tasks = ((secrets, rows) for rows in joined_batches(db, build_query(args), args.batch_size))
+        if args.workers > 0:
+            pool = multiprocessing.get_context("spawn").Pool(args.workers)
+            results = pool.imap_unordered(verify_batch, tasks)
+        else:
+            pool, results = None, map(verify_batch, tasks)
+        try:
+            for batch in results:
+                for category, provider, order_id, order_paid in batch:
+                    categories[category] += 1
+                    by_provider[provider][category] += 1
+                    paid += order_paid
+                    if len(samples[category]) < args.samples:
+                        samples[category].append(order_id)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+        elapsed = time.perf_counter() - start
+        total = sum(categories.values())
+        report.update({
+            "records": total,
+            "elapsed_seconds": round(elapsed, 3),
+            "records_per_second": round(total / elapsed, 1) if elapsed > 0 else None,
+            "categories": {c: categories[c] for c in CATEGORIES},
+            "by_provider": {p: dict(c) for p, c in by_provider.items()},
+            "paid_after_mismatch": paid,
+            "samples": dict(samples),
+        })
+
+    output = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    if args.settings_only:
+        return 1 if any(f["status"] == "undecryptable" for f in settings.values()) else 0
+
+    print(f"🔎 {report['records']:,} logs in {report['elapsed_seconds']}s", file=sys.stderr)
+    for category in CATEGORIES:
+        if report["categories"][category]:
+            print(f"   {category:<15} {report['categories'][category]:,}", file=sys.stderr)
+    if report["paid_after_mismatch"]:
+        print(f"   {report['paid_after_mismatch']:,} of the logged orders are paid", file=sys.stderr)
+    rejected = report["categories"]["false_positive"] + report["categories"]["amount_format"]
+    if rejected:
+        print(f"❌ {rejected} valid callbacks were rejected", file=sys.stderr)
+    return 1 if rejected else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
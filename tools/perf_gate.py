@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Per-Route Performance Gate
+Replays a fixed, seeded mix of read requests (public, signed-in user and
+admin routes) against a local instance with a fixed number of concurrent
+workers, records p50/p95/p99 and requests per second per route, and compares
+them with a versioned JSON baseline. Exits 1 when any route regresses beyond
+the tolerance, so a slow change to lib/api is caught before deploy.
+
+The mix is issued in rounds; every round sends each route its MIX count, in
+an order shuffled by --seed, so two runs with the same settings issue the
+same requests. Admin routes get one request per round because /api/admin is
+rate limited to 60 requests/minute per route and admin; keep --rounds at or
+below 60 (or the run longer than a minute) so no 429s are measured.
+
+Baselines carry a format version, the mix fingerprint and the git commit
+they were recorded at. A baseline recorded with another mix or format is
+refused rather than compared.
+
+Usage:
+    python -m tools.perf_gate --save-baseline                # record tools/baselines/perf_gate.json
+    python -m tools.perf_gate                                # compare against it
+    python -m tools.perf_gate --seed-orders 50k --rounds 50 --concurrency 20 --tolerance 0.3
+
+Requires: aiohttp (pymongo with --seed-orders)
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import random
+import subprocess
+import sys
+import uuid
+from datetime import datetime, timezone
+
+import aiohttp
+
+from tools.api_client import BASE_URL, AsyncApiClient, scoped_email
+from tools.stats import Recorder
+
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "perf_gate.json")
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# route -> (path, auth: None | "user" | "admin", requests per round)
+MIX = {
+    "products": ("/products", None, 4),
+    "homepage": ("/homepage", None, 4),
+    "reviews": ("/reviews?game=pubg", None, 2),
+    "accounts": ("/accounts", None, 2),
+    "blog": ("/blog", None, 2),
+    "site_settings": ("/site/settings", None, 2),
+    "payment_methods": ("/payment-methods", None, 2),
+    "daily_deals": ("/daily-deals", None, 1),
+    "regions": ("/regions", None, 1),
+    "health": ("/health", None, 1),
+    "account_me": ("/account/me", "user", 2),
+    "account_orders": ("/account/orders", "user", 2),
+    "account_transactions": ("/account/balance/transactions", "user", 1),
+    "admin_orders": ("/admin/orders", "admin", 1),
+    "admin_dashboard": ("/admin/dashboard", "admin", 1),
+    "admin_users": ("/admin/users", "admin", 1),
+    "admin_audit_logs": ("/admin/audit-logs", "admin", 1),
+}
+
+METRICS = ["p50", "p95", "p99"]
+
+
+def mix_fingerprint():
+    return hashlib.sha256(json.dumps(MIX, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def schedule(rounds, seed):
+    """The request sequence: every round holds each route MIX-count times, shuffled"""
+    rng = random.Random(seed)
+    sequence = []
+    for _ in range(rounds):
+        batch = [name for name, (_, _, count) in MIX.items() for _ in range(count)]
+        rng.shuffle(batch)
+        sequence.extend(batch)
+    return sequence
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class Gate:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = Recorder()
+        self.recording = False
+        self.headers = {}
+
+    def on_call(self, event):
+        if not self.recording:
+            return
+        status = event["status"]
+        error = event["error"] or (f"http_{status}" if status and status >= 400 else None)
+        self.recorder.record(event["label"], event["elapsed_ms"], status, error)
+
+    async def login(self, api):
+        admin = await api.admin_token()
+        if not admin:
+            raise SystemExit("❌ Admin login failed")
+        user = await api.user_token(scoped_email("perf-gate@test.com"), "Test123!", register_data={
+            "firstName": "Perf", "lastName": "Gate", "phone": "5550000000"})
+        if not user:
+            raise SystemExit("❌ Could not sign in or register the perf-gate user")
+        self.headers = {None: {}, "user": api.auth_headers(user), "admin": api.auth_headers(admin)}
+
+    async def replay(self, api, sequence):
+        queue = asyncio.Queue()
+        for name in sequence:
+            queue.put_nowait(name)
+
+        async def worker():
+            while not queue.empty():
+                name = queue.get_nowait()
+                path, auth, _ = MIX[name]
+                try:
+                    await api.get(path, label=name, headers=self.headers[auth])
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    pass  # recorded by on_call
+
+        await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+
+    async def run(self):
+        api = AsyncApiClient(f"{self.args.base_url.rstrip('/')}/api", pool_size=self.args.concurrency,
+                             timeout=self.args.timeout, max_retries=0, hooks=[self.on_call])
+        async with api:
+            await self.login(api)
+            if self.args.warmup_rounds:
+                print(f"🔥 Warm-up: {self.args.warmup_rounds} rounds", file=sys.stderr)
+                await self.replay(api, schedule(self.args.warmup_rounds, f"{self.args.seed}:warmup"))
+            sequence = schedule(self.args.rounds, self.args.seed)
+            print(f"⏱  Replaying {len(sequence)} requests over {len(MIX)} routes "
+                  f"with {self.args.concurrency} workers", file=sys.stderr)
+            self.recorder = Recorder()
+            self.recording = True
+            await self.replay(api, sequence)
+            self.recorder.stop()
+        return self.recorder.report()
+
+
+def route_results(report):
+    return {name: {**{m: step[m] for m in METRICS}, "rps": step["throughput_rps"], "count": step["count"],
+                   "error_rate": step["error_rate"]}
+            for name, step in report["steps"].items()}
+
+
+def compare(routes, baseline, tolerance, min_delta_ms):
+    """Routes whose latency rose or throughput fell beyond `tolerance` (relative) against the baseline"""
+    regressions = []
+    for name, current in routes.items():
+        base = baseline["routes"].get(name)
+        if not base:
+            continue
+        for metric in METRICS:
+            before, after = base.get(metric), current.get(metric)
+            if before and after and after > before * (1 + tolerance) and after - before >= min_delta_ms:
+                regressions.append({"route": name, "metric": metric, "baseline": before, "current": after})
+        if base.get("rps") and current.get("rps") and current["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append({"route": name, "metric": "rps", "baseline": base["rps"], "current": current["rps"]})
+        if current["error_rate"] > base.get("error_rate", 0):
+            regressions.append({"route": name, "metric": "error_rate", "baseline": base.get("error_rate", 0),
+                                "current": current["error_rate"]})
+    return regressions
+
+
+def load_baseline(path):
+    """The stored baseline, or None; exits when it was recorded with another format or mix"""
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BASELINE_VERSION:
+        raise SystemExit(f"❌ {path} has baseline format {baseline.get('version')}, expected {BASELINE_VERSION}; "
+                         f"re-record it with --save-baseline")
+    if baseline.get("mix") != mix_fingerprint():
+        raise SystemExit(f"❌ {path} was recorded with a different request mix; re-record it with --save-baseline")
+    return baseline
+
+
+def seed_fixtures(orders, workers):
+    from tools import scale_fixtures
+    from tools.db import get_db
+
+    db = get_db()
+    run_id = uuid.uuid4().hex[:8]
+    counts = scale_fixtures.plan_counts(scale_fixtures.parse_size(orders), {})
+    products, accounts = scale_fixtures.catalogue(db)
+    ctx = scale_fixtures.make_context(run_id, "perf_gate", counts, 365, products, accounts, 5000)
+    print(f"🌱 Seeding {counts['orders']:,} orders and related fixtures (run {run_id})", file=sys.stderr)
+    scale_fixtures.seed(ctx, scale_fixtures.COLLECTIONS, workers)
+    return lambda: scale_fixtures.cleanup(db, run_id)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Fail when a route regresses against the stored baseline")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--rounds", type=int, default=50, help="Rounds of the request mix to measure")
+    parser.add_argument("--warmup-rounds", type=int, default=2, help="Unmeasured rounds first")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent workers")
+    parser.add_argument("--seed", default="perf-gate", help="Shuffle seed for the request order")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed-orders", help="Seed this many orders (e.g. 50k) with tools.scale_fixtures first")
+    parser.add_argument("--workers", type=int, default=4, help="Seeding processes")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed relative latency increase / throughput drop (0.25 = 25%%)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0,
+                        help="Ignore latency increases smaller than this, however large relatively")
+    parser.add_argument("--output", help="Write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    baseline = None if args.save_baseline else load_baseline(args.baseline)
+    cleanup = seed_fixtures(args.seed_orders, args.workers) if args.seed_orders else None
+    try:
+        report = asyncio.run(Gate(args).run())
+    finally:
+        if cleanup:
+            print("🧹 Removing fixtures...", file=sys.stderr)
+            cleanup()
+
+    routes = route_results(report)
+    result = {
+        "version": BASELINE_VERSION,
+        "mix": mix_fingerprint(),
+        "git_commit": git_commit(),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        "config": {"rounds": args.rounds, "concurrency": args.concurrency, "seed": args.seed,
+                   "seed_orders": args.seed_orders},
+        "requests_per_second": report["requests_per_second"],
+        "routes": routes,
+    }
+    regressions = compare(routes, baseline, args.tolerance, args.min_delta_ms) if baseline else []
+    if baseline and baseline.get("config") != result["config"]:
+        print("⚠️  Baseline was recorded with different --rounds/--concurrency/--seed/--seed-orders", file=sys.stderr)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        print(f"💾 Baseline written to {args.baseline}", file=sys.stderr)
+
+    output = json.dumps({**result, "baseline_commit": baseline.get("git_commit") if baseline else None,
+                         "regressions": regressions}, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    for name, route in routes.items():
+        print(f"   {name:<22} p50 {route['p50']} / p95 {route['p95']} / p99 {route['p99']} ms  "
+              f"{route['rps']} req/s", file=sys.stderr)
+    for r in regressions:
+        print(f"❌ {r['route']}: {r['metric']} {r['baseline']} -> {r['current']}", file=sys.stderr)
+    if baseline and not regressions:
+        print(f"✅ No route regressed beyond {args.tolerance:.0%} of baseline {baseline.get('git_commit')}",
+              file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,497 @@
+#!/usr/bin/env python3
+"""
+Risk Weight Simulator
+Re-scores historical orders under candidate risk settings offline, so weight
+and threshold changes can be reviewed before touching risk_settings.
+
+Orders, users, risk_logs and the blacklist are pulled once into columns and
+turned into a 0/1 feature matrix with one column per calculateOrderRisk rule
+(PHONE_EMPTY, DISPOSABLE_EMAIL, ACCOUNT_VERY_NEW, IP_MULTI_ORDER, ...).
+Scoring a settings candidate is then a single matrix-vector product,
+min(features @ weights, 100), followed by the thresholds, which is what
+makes re-scoring millions of orders take seconds. --cache keeps the matrix
+on disk between runs.
+
+Features are evaluated at the time the order was scored (risk.calculatedAt):
+account age, earlier paid/completed orders of the user, and orders from the
+same IP in the preceding hour. What cannot be reconstructed is taken from
+what was logged: FAST_CHECKOUT (lastLoginAt is overwritten on every login)
+and the user agent/IP from risk_logs when the order has none. Blacklist, phone
+and IP-sharing rules use today's blacklist and users.
+
+Weights follow the server's `weights.x || default` semantics: a weight of 0
+falls back to the default, except emailNotVerified, which 0 disables.
+
+The server scores an order after marking it paid, so its own first-order
+check counts the order itself and FIRST_ORDER never fires. The simulator
+uses "no earlier paid/completed order"; --as-server reproduces the current
+behaviour.
+
+Baseline is the live risk_settings (or DEFAULT_RISK_SETTINGS); each candidate
+is a JSON file with any of {"name", "weights", "thresholds", "hardBlocks",
+"isEnabled"} (or a list of those) merged onto it. The report has the
+CLEAR/SUSPICIOUS/FLAGGED/BLOCKED distribution per candidate, the transition
+counts from the baseline, and how well the baseline recompute matches the
+logged statuses and reason codes.
+
+Usage:
+    python -m tools.risk_sim --candidate candidates.json
+    python -m tools.risk_sim --since 2024-01-01 --cache risk-features.npz --candidate a.json --candidate b.json
+    python -m tools.risk_sim --as-server --output risk-sim.json
+
+Requires: numpy, pandas, pymongo
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from tools.db import get_db
+
+# Mirror of DISPOSABLE_EMAIL_DOMAINS in lib/api/core.js
+DISPOSABLE_EMAIL_DOMAINS = {
+    "10minutemail.com", "10minmail.com", "tempmail.com", "temp-mail.org",
+    "guerrillamail.com", "guerrillamail.org", "throwaway.email", "mailinator.com",
+    "yopmail.com", "sharklasers.com", "spam4.me", "trashmail.com",
+    "fakeinbox.com", "getnada.com", "dispostable.com", "maildrop.cc",
+    "mohmal.com", "tempail.com", "emailondeck.com", "mintemail.com",
+    "tempr.email", "discard.email", "mailnesia.com", "mt2009.com",
+    "mytemp.email", "tmpmail.org", "tmpmail.net", "tempinbox.com",
+    "burnermail.io", "throwawaymail.com", "mailcatch.com", "temp-mail.io",
+    "fakemailgenerator.com", "emailfake.com", "generator.email", "inboxkitten.com",
+}
+
+# Mirror of DEFAULT_RISK_SETTINGS in lib/api/core.js
+DEFAULT_SETTINGS = {
+    "isEnabled": True,
+    "thresholds": {"cleanMax": 29, "suspiciousMax": 59, "riskyMin": 60},
+    "weights": {
+        "phoneEmpty": 40, "phoneTRNotStartsWith5": 30, "phoneInvalidLength": 20, "phoneMultipleAccounts": 50,
+        "disposableEmail": 40, "emailNotVerified": 20,
+        "accountAgeLess10Min": 30, "accountAgeLess1Hour": 20, "firstOrder": 10, "fastCheckout": 20,
+        "emptyUserAgent": 20, "multipleAccountsSameIP": 30, "multipleOrdersSameIP1Hour": 40,
+        "amountOver300": 10, "amountOver750": 20, "amountOver1500": 35, "firstOrderHighAmount": 25,
+        "blacklistHit": 100,
+    },
+    "hardBlocks": {"invalidPhone": True, "blacklistHit": True},
+}
+
+# Reason code -> weight key, in feature matrix column order
+FEATURES = [
+    ("PHONE_EMPTY", "phoneEmpty"),
+    ("PHONE_TR_FORMAT", "phoneTRNotStartsWith5"),
+    ("PHONE_LENGTH", "phoneInvalidLength"),
+    ("PHONE_MULTI_ACCOUNT", "phoneMultipleAccounts"),
+    ("DISPOSABLE_EMAIL", "disposableEmail"),
+    ("EMAIL_NOT_VERIFIED", "emailNotVerified"),
+    ("ACCOUNT_VERY_NEW", "accountAgeLess10Min"),
+    ("ACCOUNT_NEW", "accountAgeLess1Hour"),
+    ("FIRST_ORDER", "firstOrder"),
+    ("FAST_CHECKOUT", "fastCheckout"),
+    ("SUSPICIOUS_UA", "emptyUserAgent"),
+    ("IP_MULTI_ACCOUNT", "multipleAccountsSameIP"),
+    ("IP_MULTI_ORDER", "multipleOrdersSameIP1Hour"),
+    ("HIGH_AMOUNT_1500", "amountOver1500"),
+    ("HIGH_AMOUNT_750", "amountOver750"),
+    ("MEDIUM_AMOUNT", "amountOver300"),
+    ("FIRST_ORDER_HIGH", "firstOrderHighAmount"),
+    ("BLACKLIST", "blacklistHit"),
+]
+CODES = [code for code, _ in FEATURES]
+COLUMN = {code: i for i, code in enumerate(CODES)}
+STATUSES = ["CLEAR", "SUSPICIOUS", "FLAGGED", "BLOCKED"]
+PAID_STATUSES = ["paid", "completed"]
+PHONE_NOISE = r"[\s\-\(\)\+]"
+CACHE_VERSION = 1
+
+
+def frame(cursor, columns):
+    """DataFrame from a cursor of flat documents, with every column present even when empty"""
+    df = pd.DataFrame(list(cursor))
+    for column in columns:
+        if column not in df:
+            df[column] = None
+    return df[columns]
+
+
+def to_utc(series):
+    return pd.to_datetime(series, utc=True, errors="coerce")
+
+
+def load(db, since=None, until=None):
+    """Every order with its latest risk log, the scored subset, users and the active blacklist by type"""
+    all_orders = frame(db.orders.aggregate([
+        {"$project": {"_id": 0, "id": 1, "userId": 1, "status": 1, "createdAt": 1,
+                      "amount": {"$ifNull": ["$amount", 0]}, "playerId": 1,
+                      "ip": "$meta.ip", "userAgent": "$meta.userAgent",
+                      "scoredAt": "$risk.calculatedAt", "loggedScore": "$risk.score",
+                      "loggedStatus": {"$ifNull": ["$risk.actualStatus", "$risk.status"]},
+                      "loggedCodes": "$risk.reasons.code"}},
+    ], allowDiskUse=True, batchSize=10000),
+        ["id", "userId", "status", "createdAt", "amount", "playerId", "ip", "userAgent",
+         "scoredAt", "loggedScore", "loggedStatus", "loggedCodes"])
+    all_orders["createdAt"] = to_utc(all_orders["createdAt"])
+    all_orders["scoredAt"] = to_utc(all_orders["scoredAt"])
+
+    users = frame(db.users.aggregate([
+        {"$project": {"_id": 0, "id": 1, "email": 1, "phone": 1, "emailVerified": 1, "createdAt": 1,
+                      "lastIP": "$meta.lastIP"}},
+    ], allowDiskUse=True, batchSize=10000), ["id", "email", "phone", "emailVerified", "createdAt", "lastIP"])
+    users["createdAt"] = to_utc(users["createdAt"])
+
+    logs = frame(db.risk_logs.aggregate([
+        {"$sort": {"createdAt": -1}},
+        {"$group": {"_id": "$orderId", "logIp": {"$first": "$ip"}, "logUserAgent": {"$first": "$userAgent"},
+                    "logCodes": {"$first": "$reasons.code"}, "logStatus": {"$first": "$status"},
+                    "logScore": {"$first": "$score"}, "logAt": {"$first": "$createdAt"}}},
+        {"$project": {"_id": 0, "orderId": "$_id", "logIp": 1, "logUserAgent": 1, "logCodes": 1,
+                      "logStatus": 1, "logScore": 1, "logAt": 1}},
+    ], allowDiskUse=True, batchSize=10000),
+        ["orderId", "logIp", "logUserAgent", "logCodes", "logStatus", "logScore", "logAt"])
+    logs["logAt"] = to_utc(logs["logAt"])
+
+    blacklist = {}
+    for entry in db.blacklist.find({"isActive": True}, {"_id": 0, "type": 1, "value": 1}):
+        if entry.get("value") is not None:
+            blacklist.setdefault(entry["type"], set()).add(str(entry["value"]).lower())
+
+    # Velocity and first-order checks look at every order, scored or not
+    all_orders = all_orders.merge(logs, how="left", left_on="id", right_on="orderId")
+    all_orders["ip"] = all_orders["ip"].where(all_orders["ip"].notna() & (all_orders["ip"] != ""),
+                                              all_orders["logIp"])
+    all_orders["userAgent"] = all_orders["userAgent"].fillna(all_orders["logUserAgent"]).fillna("")
+    all_orders["scoredAt"] = all_orders["scoredAt"].fillna(all_orders["logAt"]).fillna(all_orders["createdAt"])
+    all_orders["loggedStatus"] = all_orders["loggedStatus"].fillna(all_orders["logStatus"])
+    all_orders["loggedCodes"] = all_orders["loggedCodes"].where(all_orders["loggedCodes"].notna(),
+                                                                all_orders["logCodes"])
+    scored = all_orders["loggedStatus"].notna()
+    if since:
+        scored &= all_orders["createdAt"] >= pd.Timestamp(since)
+    if until:
+        scored &= all_orders["createdAt"] < pd.Timestamp(until)
+    return all_orders, all_orders[scored].copy(), users, blacklist
+
+
+def clean_phone(series):
+    return series.fillna("").astype(str).str.replace(PHONE_NOISE, "", regex=True)
+
+
+def build_features(all_orders, orders, users, blacklist, as_server=False):
+    """0/1 feature matrix (orders x FEATURES) plus the columns the report needs"""
+    users = users.copy()
+    users["phoneClean"] = clean_phone(users["phone"])
+    users["phoneTail"] = users["phoneClean"].str[-10:]
+    users["domain"] = users["email"].fillna("").astype(str).str.split("@").str[1].fillna("").str.lower()
+    # Same phone on another account: the server regex-matches the last ten digits
+    long_phone = users["phoneClean"].str.len() >= 10
+    tail_counts = users.loc[long_phone, "phoneTail"].value_counts()
+    users["phoneShared"] = long_phone & (users["phoneTail"].map(tail_counts).fillna(0) > 1)
+
+    df = orders.merge(users, how="inner", left_on="userId", right_on="id", suffixes=("", "_user"))
+    n = len(df)
+    features = np.zeros((n, len(FEATURES)), dtype=np.uint8)
+
+    def set_feature(code, mask):
+        features[:, COLUMN[code]] = np.asarray(mask, dtype=bool)
+
+    # Phone rules
+    phone = df["phoneClean"]
+    empty = phone == ""
+    national = phone.str.replace(r"^(90|0)", "", regex=True)
+    set_feature("PHONE_EMPTY", empty)
+    set_feature("PHONE_TR_FORMAT", ~empty & ~national.str.startswith("5"))
+    set_feature("PHONE_LENGTH", ~empty & (national.str.len() != 10))
+    set_feature("PHONE_MULTI_ACCOUNT", df["phoneShared"])
+
+    # Email rules (active blacklisted domains count as disposable too)
+    disposable = DISPOSABLE_EMAIL_DOMAINS | blacklist.get("domain", set())
+    set_feature("DISPOSABLE_EMAIL", df["domain"].isin(disposable))
+    set_feature("EMAIL_NOT_VERIFIED", df["emailVerified"].map(lambda v: v is False))
+
+    # Account age at scoring time
+    age = (df["scoredAt"] - df["createdAt_user"]).dt.total_seconds()
+    very_new = age < 600
+    set_feature("ACCOUNT_VERY_NEW", very_new)
+    set_feature("ACCOUNT_NEW", ~very_new & (age < 3600))
+
+    # Earlier paid/completed orders of the same user
+    if as_server:
+        first_order = np.zeros(n, dtype=bool)
+    else:
+        first_order = ~earlier_paid_order(df, all_orders)
+    set_feature("FIRST_ORDER", first_order)
+
+    logged_codes = df["loggedCodes"].map(lambda codes: set(codes) if isinstance(codes, list) else set())
+    set_feature("FAST_CHECKOUT", logged_codes.map(lambda codes: "FAST_CHECKOUT" in codes))
+    set_feature("SUSPICIOUS_UA", df["userAgent"].astype(str).str.len() < 20)
+
+    # IP rules
+    ip = df["ip"].fillna("").astype(str)
+    has_ip = (ip != "") & (ip != "unknown")
+    ip_users = users["lastIP"].dropna().value_counts()
+    others_on_ip = ip.map(ip_users).fillna(0) - (df["lastIP"].fillna("") == ip).astype(int)
+    set_feature("IP_MULTI_ACCOUNT", has_ip & (others_on_ip >= 2))
+    set_feature("IP_MULTI_ORDER", has_ip & (orders_from_ip_last_hour(df, all_orders) >= 3))
+
+    # Amount bands
+    amount = pd.to_numeric(df["amount"], errors="coerce").fillna(0)
+    set_feature("HIGH_AMOUNT_1500", amount >= 1500)
+    set_feature("HIGH_AMOUNT_750", (amount >= 750) & (amount < 1500))
+    set_feature("MEDIUM_AMOUNT", (amount >= 300) & (amount < 750))
+    set_feature("FIRST_ORDER_HIGH", np.asarray(first_order) & (amount >= 750))
+
+    # Blacklist (today's entries)
+    hit = df["email"].fillna("").astype(str).str.lower().isin(blacklist.get("email", set()))
+    hit |= df["domain"].isin(blacklist.get("domain", set()))
+    phone_tails = {re.sub(PHONE_NOISE, "", value)[-10:] for value in blacklist.get("phone", set())}
+    hit |= (df["phoneTail"] != "") & df["phoneTail"].isin(phone_tails)
+    hit |= has_ip & ip.str.lower().isin(blacklist.get("ip", set()))
+    hit |= df["playerId"].fillna("").astype(str).str.lower().isin(blacklist.get("playerId", set()))
+    set_feature("BLACKLIST", hit)
+
+    logged = np.array([status if status in STATUSES else "" for status in df["loggedStatus"].fillna("")])
+    logged_matrix = np.zeros_like(features)
+    for i, codes in enumerate(logged_codes):
+        for code in codes:
+            column = COLUMN.get("BLACKLIST" if code.startswith("BLACKLIST_") else code)
+            if column is not None:
+                logged_matrix[i, column] = 1
+    return features, logged, logged_matrix, len(orders) - n
+
+
+def earlier_paid_order(df, all_orders):
+    """Per order: does the same user have a paid/completed order created strictly before it"""
+    paid = all_orders[all_orders["status"].isin(PAID_STATUSES)][["userId", "createdAt"]].dropna()
+    first = df["userId"].map(paid.groupby("userId")["createdAt"].min())
+    return (first.notna() & (first < df["createdAt"])).to_numpy()
+
+
+def orders_from_ip_last_hour(df, all_orders):
+    """Orders from the same IP created in the hour before each order was scored, excluding itself"""
+    pool = all_orders[["ip", "createdAt"]].dropna()
+    pool = pool[pool["ip"] != ""]
+    codes, uniques = pd.factorize(pd.concat([pool["ip"], df["ip"].fillna("")], ignore_index=True))
+    pool_codes, own_codes = codes[:len(pool)], codes[len(pool):]
+    seconds = pool["createdAt"].astype("int64").to_numpy() // 10**9
+    # One sorted key per (ip, second) so a window is two binary searches
+    span = np.int64(1 << 34)
+    keys = np.sort(pool_codes.astype(np.int64) * span + seconds)
+    scored = df["scoredAt"].astype("int64").to_numpy() // 10**9
+    own = own_codes.astype(np.int64) * span
+    lo = np.searchsorted(keys, own + scored - 3600, side="left")
+    hi = np.searchsorted(keys, own + scored, side="right")
+    created = df["createdAt"].astype("int64").to_numpy() // 10**9
+    self_in_window = (created >= scored - 3600) & (created <= scored)
+    return hi - lo - self_in_window.astype(np.int64)
+
+
+def merge_settings(base, candidate):
+    merged = {key: (dict(value) if isinstance(value, dict) else value) for key, value in base.items()}
+    for key in ("weights", "thresholds", "hardBlocks"):
+        merged[key] = {**(base.get(key) or {}), **(candidate.get(key) or {})}
+    if "isEnabled" in candidate:
+        merged["isEnabled"] = candidate["isEnabled"]
+    merged["name"] = candidate.get("name", "candidate")
+    return merged
+
+
+def weight_vector(settings):
+    """Effective points per feature, with the server's `weights.x || default` fallback"""
+    weights = settings.get("weights") or DEFAULT_SETTINGS["weights"]
+    vector, warnings = [], []
+    for code, key in FEATURES:
+        value = weights.get(key)
+        if key == "emailNotVerified":
+            vector.append(value if value and value > 0 else 0)
+            continue
+        if not value:
+            if key in weights:
+                warnings.append(f"{key}=0 falls back to {DEFAULT_SETTINGS['weights'][key]} on the server")
+            value = DEFAULT_SETTINGS["weights"][key]
+        vector.append(value)
+    return np.array(vector, dtype=np.int32), warnings
+
+
+def score(features, settings):
+    """(scores, status index into STATUSES) for every order"""
+    n = features.shape[0]
+    if not settings.get("isEnabled", True):
+        return np.zeros(n, dtype=np.int32), np.zeros(n, dtype=np.int8)
+    weights, _ = weight_vector(settings)
+    thresholds = settings.get("thresholds") or DEFAULT_SETTINGS["thresholds"]
+    scores = np.minimum(features @ weights, 100)
+    status = np.select([scores <= thresholds["cleanMax"], scores <= thresholds["suspiciousMax"]], [0, 1], 2)
+    blocked = features[:, COLUMN["BLACKLIST"]].astype(bool)
+    if (settings.get("hardBlocks") or {}).get("blacklistHit"):
+        status = np.where(blocked, 3, status)
+        scores = np.where(blocked, 100, scores)
+    return scores, status.astype(np.int8)
+
+
+def distribution(status):
+    counts = np.bincount(status, minlength=len(STATUSES))
+    total = max(int(counts.sum()), 1)
+    return {name: {"count": int(c), "pct": round(100 * c / total, 2)} for name, c in zip(STATUSES, counts)}
+
+
+def transitions(before, after):
+    matrix = np.zeros((len(STATUSES), len(STATUSES)), dtype=np.int64)
+    np.add.at(matrix, (before, after), 1)
+    return {STATUSES[i]: {STATUSES[j]: int(matrix[i, j]) for j in range(len(STATUSES)) if matrix[i, j]}
+            for i in range(len(STATUSES)) if matrix[i].any()}
+
+
+def validation(features, logged, logged_matrix, baseline_status):
+    """How closely the offline recompute matches what the server logged"""
+    known = logged != ""
+    recomputed = np.array(STATUSES)[baseline_status]
+    per_code = {}
+    for code in CODES:
+        column = COLUMN[code]
+        computed, seen = features[:, column].astype(bool), logged_matrix[:, column].astype(bool)
+        per_code[code] = {
+            "computed_rate": round(float(computed.mean()), 4) if len(computed) else None,
+            "logged_rate": round(float(seen.mean()), 4) if len(seen) else None,
+            "agreement": round(float((computed == seen).mean()), 4) if len(seen) else None,
+        }
+    return {
+        "orders_with_logged_status": int(known.sum()),
+        "status_agreement": round(float((recomputed[known] == logged[known]).mean()), 4) if known.any() else None,
+        "features": per_code,
+    }
+
+
+def live_settings(db):
+    settings = db.risk_settings.find_one({"id": "main"}, {"_id": 0}) or {}
+    return merge_settings(DEFAULT_SETTINGS, {**settings, "name": "current"})
+
+
+def load_candidates(paths):
+    candidates = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        for i, candidate in enumerate(data if isinstance(data, list) else [data]):
+            candidate.setdefault("name", f"{os.path.splitext(os.path.basename(path))[0]}#{i + 1}")
+            candidates.append(candidate)
+    return candidates
+
+
+def parse_date(value):
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Re-score historical orders under candidate risk settings")
+    parser.add_argument("--candidate", action="append", default=[], help="Settings JSON (object or list), repeatable")
+    parser.add_argument("--since", type=parse_date, help="Orders created at or after this ISO date")
+    parser.add_argument("--until", type=parse_date, help="Orders created before this ISO date")
+    parser.add_argument("--as-server", action="store_true",
+                        help="Reproduce the server's first-order check (never fires) instead of the intended one")
+    parser.add_argument("--cache", help="Feature matrix cache (.npz); built on first use")
+    parser.add_argument("--refresh", action="store_true", help="Rebuild the --cache file")
+    parser.add_argument("--output", help="Write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    candidates = load_candidates(args.candidate)
+    key = {"version": CACHE_VERSION, "codes": CODES, "since": str(args.since), "until": str(args.until),
+           "as_server": args.as_server}
+
+    start = time.perf_counter()
+    cached = None
+    if args.cache and os.path.exists(args.cache) and not args.refresh:
+        cached = np.load(args.cache, allow_pickle=False)
+        if json.loads(str(cached["key"])) != key:
+            print(f"⚠️  {args.cache} was built with other options; rebuilding", file=sys.stderr)
+            cached = None
+    if cached is not None:
+        features, logged, logged_matrix = cached["features"], cached["logged"], cached["logged_matrix"]
+        skipped = int(cached["skipped"])
+        print(f"📦 {len(features):,} orders from {args.cache}", file=sys.stderr)
+    else:
+        all_orders, orders, users, blacklist = load(db, args.since, args.until)
+        loaded = time.perf_counter()
+        print(f"📥 {len(all_orders):,} orders ({len(orders):,} scored), {len(users):,} users "
+              f"in {loaded - start:.1f}s", file=sys.stderr)
+        features, logged, logged_matrix, skipped = build_features(all_orders, orders, users, blacklist,
+                                                                  args.as_server)
+        print(f"🧮 Feature matrix {features.shape[0]:,} x {features.shape[1]} in "
+              f"{time.perf_counter() - loaded:.1f}s", file=sys.stderr)
+        if args.cache:
+            np.savez_compressed(args.cache, features=features, logged=logged, logged_matrix=logged_matrix,
+                                skipped=skipped, key=json.dumps(key))
+    if not len(features):
+        print("❌ No scored orders in the selected range", file=sys.stderr)
+        return 1
+
+    baseline = live_settings(db)
+    scoring_start = time.perf_counter()
+    base_scores, base_status = score(features, baseline)
+    runs = []
+    for candidate in candidates:
+        settings = merge_settings(baseline, candidate)
+        _, warnings = weight_vector(settings)
+        scores, status = score(features, settings)
+        runs.append({
+            "name": settings["name"],
+            "settings": {k: settings[k] for k in ("isEnabled", "weights", "thresholds", "hardBlocks")},
+            "warnings": warnings,
+            "distribution": distribution(status),
+            "mean_score": round(float(scores.mean()), 2),
+            "changed": int((status != base_status).sum()),
+            "transitions": transitions(base_status, status),
+        })
+    scoring_seconds = time.perf_counter() - scoring_start
+
+    report = {
+        "orders": int(features.shape[0]),
+        "skipped_without_user": skipped,
+        "window": {"since": str(args.since) if args.since else None, "until": str(args.until) if args.until else None},
+        "as_server": args.as_server,
+        "feature_rates": {code: round(float(features[:, COLUMN[code]].mean()), 4) for code in CODES},
+        "baseline": {
+            "settings": {k: baseline[k] for k in ("isEnabled", "weights", "thresholds", "hardBlocks")},
+            "distribution": distribution(base_status),
+            "mean_score": round(float(base_scores.mean()), 2),
+            "validation": validation(features, logged, logged_matrix, base_status),
+        },
+        "candidates": runs,
+        "scoring_seconds": round(scoring_seconds, 3),
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    agreement = report["baseline"]["validation"]["status_agreement"]
+    print(f"📊 {report['orders']:,} orders, {len(runs) + 1} settings scored in {scoring_seconds:.2f}s; "
+          f"baseline matches logged status for {agreement:.1%}" if agreement is not None else
+          f"📊 {report['orders']:,} orders, {len(runs) + 1} settings scored in {scoring_seconds:.2f}s",
+          file=sys.stderr)
+    print(f"   {'':<24}" + "".join(f"{name:>12}" for name in STATUSES), file=sys.stderr)
+    for name, dist in [("current", report["baseline"]["distribution"])] + [(r["name"], r["distribution"])
+                                                                           for r in runs]:
+        print(f"   {name[:24]:<24}" + "".join(f"{dist[s]['pct']:>11}%" for s in STATUSES), file=sys.stderr)
+    for run in runs:
+        for warning in run["warnings"]:
+            print(f"⚠️  {run['name']}: {warning}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
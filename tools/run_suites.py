@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Parallel Test Suite Runner
+Discovers the top-level test scripts and runs them in a process pool. Each
+worker gets its own PINLY_TEST_RUN_ID (unique throwaway users via
+tools.api_client.scoped_email) and its own X-Forwarded-For address, so
+parallel scripts neither collide on identities nor share the per-IP
+RATE_LIMITS buckets (e.g. 3 registrations/minute on /api/auth/register).
+The addresses come from the RFC 5737 documentation ranges 192.0.2.0/24,
+198.51.100.0/24 and 203.0.113.0/24.
+
+Discovery finds the eight *_test.py / test_*.py / backend_test*.py scripts.
+check_secret.py and debug_hash.py are not suites (one-off Shopier hash
+diagnostics against a hard-coded order) and are left out.
+
+Usage:
+    python -m tools.run_suites                       # all scripts, one worker each
+    python -m tools.run_suites -j 4 backend_test.py  # selected scripts, 4 workers
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SCRIPT_PATTERNS = ["*_test.py", "test_*.py", "backend_test*.py"]
+
+# The scripts report checks with emoji markers and mostly exit 0 even when a check fails
+PASS_MARKER = re.compile(r"^\s*(?:\[[\d:]+\]\s*)?✅", re.M)
+FAIL_MARKER = re.compile(r"^\s*(?:\[[\d:]+\]\s*)?❌", re.M)
+
+
+def discover_scripts(root=REPO_ROOT):
+    found = set()
+    for pattern in SCRIPT_PATTERNS:
+        found.update(glob.glob(os.path.join(root, pattern)))
+    return sorted(os.path.basename(path) for path in found)
+
+
+# Documentation-only ranges (RFC 5737), so audit and risk logs never hold a real address
+DOCUMENTATION_NETS = ["192.0.2", "198.51.100", "203.0.113"]
+
+
+def worker_ip(index, run_id):
+    """Distinct documentation-range address per worker; the run id shifts repeated runs apart"""
+    salt = int(run_id[:2], 16)
+    slot = (salt + index) % (254 * len(DOCUMENTATION_NETS))
+    return f"{DOCUMENTATION_NETS[slot // 254]}.{slot % 254 + 1}"
+
+
+def run_script(script, index, run_id, base_url, timeout, log_dir):
+    """Run one script in a subprocess with isolated identity settings (executes in a pool worker)"""
+    worker_run_id = f"{run_id}w{index}"
+    env = dict(os.environ)
+    env["PINLY_TEST_RUN_ID"] = worker_run_id
+    env["PINLY_TEST_FORWARDED_FOR"] = worker_ip(index, run_id)
+    env["PYTHONUNBUFFERED"] = "1"
+    if base_url:
+        env["NEXT_PUBLIC_BASE_URL"] = base_url
+
+    start = time.perf_counter()
+    timed_out = False
+    try:
+        proc = subprocess.run([sys.executable, script], cwd=REPO_ROOT, env=env, capture_output=True,
+                              text=True, timeout=timeout)
+        returncode, stdout, stderr = proc.returncode, proc.stdout, proc.stderr
+    except subprocess.TimeoutExpired as e:
+        timed_out = True
+        returncode = None
+        stdout = e.stdout.decode(errors="replace") if isinstance(e.stdout, bytes) else (e.stdout or "")
+        stderr = e.stderr.decode(errors="replace") if isinstance(e.stderr, bytes) else (e.stderr or "")
+    duration = time.perf_counter() - start
+
+    log_path = os.path.join(log_dir, f"{os.path.splitext(script)[0]}.log")
+    with open(log_path, "w", encoding="utf-8") as f:
+        f.write(stdout)
+        if stderr:
+            f.write("\n--- stderr ---\n")
+            f.write(stderr)
+
+    passed = len(PASS_MARKER.findall(stdout))
+    failed = len(FAIL_MARKER.findall(stdout))
+    ok = not timed_out and returncode == 0 and failed == 0
+    return {
+        "script": script,
+        "status": "passed" if ok else ("timeout" if timed_out else "failed"),
+        "returncode": returncode,
+        "duration_seconds": round(duration, 2),
+        "checks_passed": passed,
+        "checks_failed": failed,
+        "run_id": worker_run_id,
+        "forwarded_for": env["PINLY_TEST_FORWARDED_FOR"],
+        "log": os.path.relpath(log_path, REPO_ROOT),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Python test scripts in parallel with isolated identities")
+    parser.add_argument("scripts", nargs="*", help="Scripts to run (default: discover all)")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="Worker processes (default: one per script)")
+    parser.add_argument("--base-url", help="Override NEXT_PUBLIC_BASE_URL for every script")
+    parser.add_argument("--timeout", type=float, default=600, help="Per-script timeout in seconds")
+    parser.add_argument("--output-dir", default=os.path.join(REPO_ROOT, "test_reports"),
+                        help="Directory for per-script logs and the combined report")
+    args = parser.parse_args(argv)
+
+    scripts = args.scripts or discover_scripts()
+    if not scripts:
+        print("❌ No test scripts found")
+        return 1
+
+    run_id = uuid.uuid4().hex[:8]
+    log_dir = os.path.join(args.output_dir, run_id)
+    os.makedirs(log_dir, exist_ok=True)
+    jobs = args.jobs or len(scripts)
+
+    print(f"🧪 Running {len(scripts)} scripts with {jobs} workers (run {run_id})")
+    started_at = datetime.now()
+    wall_start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(run_script, script, index, run_id, args.base_url, args.timeout, log_dir): script
+            for index, script in enumerate(scripts)
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            symbol = "✅" if result["status"] == "passed" else "❌"
+            print(f"{symbol} {result['script']:<36} {result['status']:<8} {result['duration_seconds']:>7.1f}s "
+                  f"({result['checks_passed']} passed, {result['checks_failed']} failed)")
+    wall_time = time.perf_counter() - wall_start
+
+    results.sort(key=lambda r: r["script"])
+    serial_time = sum(r["duration_seconds"] for r in results)
+    report = {
+        "run_id": run_id,
+        "started_at": started_at.isoformat(),
+        "workers": jobs,
+        "wall_time_seconds": round(wall_time, 2),
+        "serial_time_seconds": round(serial_time, 2),
+        "slowest_script_seconds": max(r["duration_seconds"] for r in results),
+        "passed": sum(1 for r in results if r["status"] == "passed"),
+        "failed": sum(1 for r in results if r["status"] != "passed"),
+        "results": results,
+    }
+    report_path = os.path.join(log_dir, "report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print()
+    print(f"⏱  Wall time {wall_time:.1f}s vs {serial_time:.1f}s sequential")
+    print(f"📄 Combined report: {os.path.relpath(report_path, REPO_ROOT)}")
+    return 0 if report["failed"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+Scale Fixture Generator
+Seeds production-sized volumes of users, orders, account_orders, stock,
+account_stock, audit_logs, risk_logs, email_logs, sms_logs, reviews and
+blacklist with the field shapes lib/api/routes/*.js read and queries (meta.ip,
+meta.lastIP, risk.status, delivery.status, paymentSmsSent, ...). Work is
+split into index ranges and inserted with batched insert_many from a
+process pool.
+
+Documents are generated deterministically from (--seed, collection, index),
+so cross references (order -> user, stock -> order, risk_logs -> order) line
+up across workers without any shared state, and the same arguments always
+produce the same distributions. Ids and e-mails are scoped to the run id so
+runs can coexist; every document carries loadTestRunId for cleanup.
+
+Other collections are sized from --orders with RATIOS unless overridden
+with --count. Fixture users get a placeholder password hash and cannot log in.
+
+Usage:
+    python -m tools.scale_fixtures --orders 1M --workers 8
+    python -m tools.scale_fixtures --orders 10k --count users=50k --count blacklist=0
+    python -m tools.scale_fixtures --cleanup 3f9a1c2e
+
+Requires: pymongo
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from tools.db import get_db
+
+SOURCE_TAG = "scale_fixture"
+
+# Sizes relative to --orders
+RATIOS = {
+    "users": 0.2,
+    "orders": 1.0,
+    "account_orders": 0.05,
+    "stock": 0.5,
+    "account_stock": 0.05,
+    "audit_logs": 1.5,
+    "risk_logs": 0.6,
+    "email_logs": 1.2,
+    "sms_logs": 0.8,
+    "reviews": 0.01,
+    "blacklist": 0.001,
+}
+COLLECTIONS = list(RATIOS)
+
+FIRST_NAMES = ["Ahmet", "Mehmet", "Ayse", "Fatma", "Emre", "Zeynep", "Burak", "Elif", "Can", "Merve", "Mert", "Ece"]
+LAST_NAMES = ["Yilmaz", "Kaya", "Demir", "Sahin", "Celik", "Yildiz", "Aydin", "Ozturk", "Arslan", "Dogan"]
+EMAIL_DOMAINS = ["gmail.com"] * 12 + ["hotmail.com"] * 5 + ["outlook.com"] * 2 + ["yahoo.com", "icloud.com",
+                                                                              "tempmail.com", "10minutemail.com"]
+USER_AGENTS = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_2 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148",
+    "Mozilla/5.0 (Linux; Android 14; SM-A546E) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0 Mobile Safari/537.36",
+    "okhttp/4.9.2",
+]
+FALLBACK_PRODUCTS = [(f"fixture-product-{uc}", f"{uc} UC", price)
+                     for uc, price in [(60, 42.5), (325, 212.5), (660, 420.0), (1800, 1050.0), (3850, 2100.0), (8100, 4200.0)]]
+FALLBACK_ACCOUNTS = [(f"fixture-account-{n}", f"Hesap #{n}", 250.0 + 150 * n) for n in range(1, 9)]
+
+# (value, weight) tables
+ORDER_STATUSES = [("paid", 55), ("pending", 30), ("failed", 8), ("cancelled", 5), ("refunded", 2)]
+DELIVERY_STATUSES = [("delivered", 85), ("pending", 6), ("hold", 5), ("verification_required", 2), ("partial", 2)]
+RISK_STATUSES = [("CLEAR", 85), ("SUSPICIOUS", 10), ("FLAGGED", 5)]
+PAYMENT_METHODS = [("shopierv2", 45), ("shopier", 20), ("iban", 20), ("balance", 10), ("card", 5)]
+AUDIT_ACTIONS = [("user.login", 40), ("order.status_change", 20), ("stock.assign", 15), ("user.create", 10),
+                 ("user.login_failed", 6), ("admin.login", 4), ("order.risk_flag", 2), ("order.manual_approve", 2),
+                 ("ticket.create", 1)]
+EMAIL_TYPES = [("order_created", 40), ("paid", 25), ("delivered", 25), ("welcome", 10)]
+SMS_TYPES = [("payment_success", 75), ("abandoned_order", 20), ("payment_failed", 5)]
+BLACKLIST_TYPES = [("ip", 35), ("email", 25), ("phone", 20), ("playerId", 15), ("domain", 5)]
+
+
+def parse_size(value):
+    """'10k' -> 10000, '1M' -> 1000000, '2.5m' -> 2500000"""
+    value = value.strip().lower().replace("_", "")
+    multiplier = 1
+    if value[-1:] in ("k", "m"):
+        multiplier = 1000 if value[-1] == "k" else 1000000
+        value = value[:-1]
+    return int(float(value) * multiplier)
+
+
+def plan_counts(orders, overrides):
+    counts = {name: int(round(orders * ratio)) for name, ratio in RATIOS.items()}
+    counts["users"] = max(counts["users"], 1)
+    counts.update(overrides)
+    return counts
+
+
+def fixture_id(ctx, collection, index):
+    """Deterministic UUID4-shaped id, so workers can reference each other's documents"""
+    digest = hashlib.md5(f"{ctx['seed']}:{ctx['run_id']}:{collection}:{index}".encode()).digest()
+    return str(uuid.UUID(bytes=digest, version=4))
+
+
+def mix(index, salt):
+    """Cheap deterministic float in [0, 1) for cross references (multiplicative hash)"""
+    return (((index + 1) * 2654435761 + salt * 40503) % 4294967296) / 4294967296
+
+
+def pick(rng, table):
+    return rng.choices([v for v, _ in table], weights=[w for _, w in table])[0]
+
+
+def created_at(ctx, rng):
+    """Skewed towards recent dates over the last --days days"""
+    return ctx["now"] - timedelta(seconds=ctx["days"] * 86400 * rng.random() ** 2)
+
+
+def ip_for(ctx, user_index):
+    # A pool smaller than the user count, so meta.lastIP / meta.ip collide like NAT and mobile carriers do
+    n = int(ctx["ip_pool"] * mix(user_index, 7))
+    return f"78.{160 + (n >> 16) % 64}.{(n >> 8) & 255}.{n & 255}"
+
+
+def user_fields(ctx, index):
+    """Name, e-mail and phone of fixture user `index`, shared by users and every order snapshot"""
+    first = FIRST_NAMES[index % len(FIRST_NAMES)]
+    last = LAST_NAMES[(index // len(FIRST_NAMES)) % len(LAST_NAMES)]
+    domain = EMAIL_DOMAINS[int(mix(index, 3) * len(EMAIL_DOMAINS))]
+    # Every 50th phone repeats an earlier one, which PHONE_MULTI_ACCOUNT looks for
+    phone_source = index - 1 if index % 50 == 49 else index
+    phone = f"5{(phone_source * 7919 + 30000000) % 1000000000:09d}"
+    return {
+        "firstName": first,
+        "lastName": last,
+        "email": f"{first.lower()}.{last.lower()}{index}.{ctx['run_id']}@{domain}",
+        "phone": phone,
+    }
+
+
+def order_user(ctx, index, salt=11):
+    """User index for an order: skewed so a minority of users place most orders"""
+    return int(ctx["counts"]["users"] * mix(index, salt) ** 2)
+
+
+def order_status(index):
+    """Status of order `index`, also used by the logs that reference it"""
+    u = mix(index, 5) * 100
+    for status, weight in ORDER_STATUSES:
+        if u < weight:
+            return status
+        u -= weight
+    return ORDER_STATUSES[-1][0]
+
+
+def build_user(ctx, rng, i):
+    created = created_at(ctx, rng)
+    return {
+        "id": fixture_id(ctx, "users", i),
+        **user_fields(ctx, i),
+        "passwordHash": "$2a$10$fixture.fixture.fixture.fixture.fixture.fixture.fixtu",
+        "emailVerified": rng.random() < 0.7,
+        "balance": round(rng.choice([0, 0, 0, 25, 100, 250.5]), 2),
+        "meta": {"lastIP": ip_for(ctx, i), "lastUserAgent": rng.choice(USER_AGENTS)},
+        "lastLoginAt": created + timedelta(days=rng.random() * 30),
+        "createdAt": created,
+        "updatedAt": created,
+    }
+
+
+def _risk(rng, created):
+    status = pick(rng, RISK_STATUSES)
+    score = {"CLEAR": rng.randint(0, 30), "SUSPICIOUS": rng.randint(31, 60), "FLAGGED": rng.randint(61, 100)}[status]
+    return {"score": score, "status": status, "actualStatus": status, "reasons": [], "calculatedAt": created,
+            "isTestMode": False}
+
+
+def build_order(ctx, rng, i):
+    user_index = order_user(ctx, i)
+    product_id, title, price = rng.choice(ctx["products"])
+    quantity = 1 if rng.random() < 0.9 else rng.randint(2, 5)
+    amount = round(price * quantity, 2)
+    status = order_status(i)
+    created = created_at(ctx, rng)
+    customer = user_fields(ctx, user_index)
+    order = {
+        "id": fixture_id(ctx, "orders", i),
+        "userId": fixture_id(ctx, "users", user_index),
+        "productId": product_id,
+        "productTitle": title,
+        "productImageUrl": None,
+        "playerId": f"{5000000000 + user_index * 13 % 999999999}",
+        "playerName": f"{customer['firstName']}#{user_index % 10000}",
+        "customer": customer,
+        "status": status,
+        "amount": amount,
+        "totalAmount": amount,
+        "quantity": quantity,
+        "currency": "TRY",
+        "paymentMethod": pick(rng, PAYMENT_METHODS),
+        "termsAccepted": True,
+        "termsAcceptedAt": created,
+        "createdAt": created,
+        "updatedAt": created + timedelta(minutes=rng.randint(0, 30)),
+    }
+    if status in ("paid", "refunded"):
+        order["meta"] = {"ip": ip_for(ctx, user_index), "userAgent": rng.choice(USER_AGENTS)}
+        order["risk"] = _risk(rng, created)
+        delivery = pick(rng, DELIVERY_STATUSES)
+        if order["risk"]["status"] == "FLAGGED":
+            delivery = "hold"
+        order["delivery"] = {"status": delivery, "items": [], "assignedAt": created if delivery == "delivered" else None}
+        order["paymentSmsSent"] = rng.random() < 0.95
+    elif status == "pending":
+        order["delivery"] = {"status": "pending", "message": "Ödeme bekleniyor...", "items": []}
+        order["abandonedSmsSent"] = rng.random() < 0.6
+    return order
+
+
+def build_account_order(ctx, rng, i):
+    user_index = order_user(ctx, i, salt=13)
+    account_id, title, price = rng.choice(ctx["accounts"])
+    status = order_status(i + 7)
+    created = created_at(ctx, rng)
+    order = {
+        "id": fixture_id(ctx, "account_orders", i),
+        "type": "account",
+        "userId": fixture_id(ctx, "users", user_index),
+        "accountId": account_id,
+        "accountTitle": title,
+        "customer": user_fields(ctx, user_index),
+        "status": status,
+        "paymentMethod": "card",
+        "amount": price,
+        "totalAmount": price,
+        "currency": "TRY",
+        "delivery": {"status": "pending", "message": "Ödeme bekleniyor...", "credentials": None},
+        "createdAt": created,
+        "updatedAt": created,
+    }
+    if status == "paid":
+        order["risk"] = _risk(rng, created)
+        order["meta"] = {"ip": ip_for(ctx, user_index), "userAgent": rng.choice(USER_AGENTS)}
+        order["delivery"] = {"status": "hold" if order["risk"]["status"] == "FLAGGED" else "delivered",
+                             "credentials": f"user{i}:pass{i}", "deliveredAt": created}
+    return order
+
+
+def build_stock(ctx, rng, i):
+    product_id = ctx["products"][i % len(ctx["products"])][0]
+    created = created_at(ctx, rng)
+    doc = {
+        "id": fixture_id(ctx, "stock", i),
+        "productId": product_id,
+        "value": f"FX{i:010d}-{rng.getrandbits(32):08X}",
+        "status": "available",
+        "orderId": None,
+        "assignedAt": None,
+        "createdAt": created,
+    }
+    if rng.random() < 0.6 and ctx["counts"]["orders"]:
+        doc.update(status="assigned", orderId=fixture_id(ctx, "orders", int(ctx["counts"]["orders"] * mix(i, 17))),
+                   assignedAt=created + timedelta(days=rng.random() * 10))
+    return doc
+
+
+def build_account_stock(ctx, rng, i):
+    account_id = ctx["accounts"][i % len(ctx["accounts"])][0]
+    created = created_at(ctx, rng)
+    doc = {
+        "id": fixture_id(ctx, "account_stock", i),
+        "accountId": account_id,
+        "credentials": f"fixture{i}@mail.com:{rng.getrandbits(40):010x}",
+        "status": "available",
+        "orderId": None,
+        "assignedAt": None,
+        "createdAt": created,
+        "createdBy": "admin",
+    }
+    if rng.random() < 0.5 and ctx["counts"]["account_orders"]:
+        doc.update(status="assigned", assignedAt=created,
+                   orderId=fixture_id(ctx, "account_orders", int(ctx["counts"]["account_orders"] * mix(i, 19))))
+    return doc
+
+
+def build_audit_log(ctx, rng, i):
+    action = pick(rng, AUDIT_ACTIONS)
+    user_index = int(ctx["counts"]["users"] * mix(i, 23))
+    if action.startswith("order.") or action == "stock.assign":
+        entity_type, entity_id = "order", fixture_id(ctx, "orders", int(ctx["counts"]["orders"] * mix(i, 29)))
+    else:
+        entity_type, entity_id = "user", fixture_id(ctx, "users", user_index)
+    return {
+        "id": fixture_id(ctx, "audit_logs", i),
+        "action": action,
+        "actorId": "admin" if action.startswith("admin.") else fixture_id(ctx, "users", user_index),
+        "entityType": entity_type,
+        "entityId": entity_id,
+        "ip": ip_for(ctx, user_index),
+        "userAgent": rng.choice(USER_AGENTS),
+        "meta": {},
+        "createdAt": created_at(ctx, rng),
+    }
+
+
+def build_risk_log(ctx, rng, i):
+    order_index = int(ctx["counts"]["orders"] * mix(i, 31))
+    user_index = order_user(ctx, order_index)
+    risk = _risk(rng, None)
+    return {
+        "id": fixture_id(ctx, "risk_logs", i),
+        "orderId": fixture_id(ctx, "orders", order_index),
+        "userId": fixture_id(ctx, "users", user_index),
+        "score": risk["score"],
+        "status": risk["status"],
+        "reasons": [] if risk["status"] == "CLEAR" else [
+            {"code": "FIRST_ORDER", "label": "İlk sipariş", "points": 10},
+            {"code": "IP_MULTI_ACCOUNT", "label": "Aynı IP'den 3 hesap", "points": 30},
+        ],
+        "ip": ip_for(ctx, user_index),
+        "userAgent": rng.choice(USER_AGENTS),
+        "isTestMode": False,
+        "createdAt": created_at(ctx, rng),
+    }
+
+
+def build_email_log(ctx, rng, i):
+    kind = pick(rng, EMAIL_TYPES)
+    order_index = int(ctx["counts"]["orders"] * mix(i, 37))
+    user_index = order_user(ctx, order_index)
+    failed = rng.random() < 0.02
+    return {
+        "id": fixture_id(ctx, "email_logs", i),
+        "type": kind,
+        "userId": fixture_id(ctx, "users", user_index),
+        "orderId": None if kind == "welcome" else fixture_id(ctx, "orders", order_index),
+        "ticketId": None,
+        "to": user_fields(ctx, user_index)["email"],
+        "status": "failed" if failed else "sent",
+        "error": "Connection timeout" if failed else None,
+        "createdAt": created_at(ctx, rng),
+    }
+
+
+def build_sms_log(ctx, rng, i):
+    kind = pick(rng, SMS_TYPES)
+    order_index = int(ctx["counts"]["orders"] * mix(i, 41))
+    phone = "90" + user_fields(ctx, order_user(ctx, order_index))["phone"]
+    sent = rng.random() < 0.97
+    return {
+        "id": fixture_id(ctx, "sms_logs", i),
+        "phone": phone,
+        "message": "Merhaba siparisin onaylandi lutfen siparislerim kismindaki kodunu aktif et. - PINLY",
+        "type": kind,
+        "orderId": fixture_id(ctx, "orders", order_index),
+        "status": "sent" if sent else "failed",
+        "response": json.dumps({"code": "00" if sent else "70", "jobid": str(rng.getrandbits(30))}),
+        "jobId": str(rng.getrandbits(30)) if sent else None,
+        "createdAt": created_at(ctx, rng),
+    }
+
+
+def build_review(ctx, rng, i):
+    return {
+        "id": fixture_id(ctx, "reviews", i),
+        "game": "pubg" if rng.random() < 0.8 else "valorant",
+        "userName": f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[i % len(LAST_NAMES)][0]}.",
+        "rating": rng.choices([5, 4, 3, 2, 1], weights=[70, 18, 6, 3, 3])[0],
+        "comment": rng.choice(["Hızlı teslimat, teşekkürler", "Sorunsuz", "Kod anında geldi", "Biraz geç geldi"]),
+        "approved": rng.random() < 0.9,
+        "createdBy": "admin",
+        "createdAt": created_at(ctx, rng),
+    }
+
+
+def build_blacklist(ctx, rng, i):
+    kind = pick(rng, BLACKLIST_TYPES)
+    user_index = int(ctx["counts"]["users"] * mix(i, 43))
+    fields = user_fields(ctx, user_index)
+    value = {
+        "ip": ip_for(ctx, user_index),
+        "email": fields["email"],
+        "phone": fields["phone"],
+        "playerId": f"{5000000000 + user_index * 13 % 999999999}",
+        "domain": f"spam{i}.example",
+    }[kind]
+    return {
+        "id": fixture_id(ctx, "blacklist", i),
+        "type": kind,
+        "value": value.lower(),
+        "reason": "Chargeback",
+        "isActive": rng.random() < 0.9,
+        "createdAt": created_at(ctx, rng),
+        "createdBy": "admin",
+    }
+
+
+BUILDERS = {
+    "users": build_user,
+    "orders": build_order,
+    "account_orders": build_account_order,
+    "stock": build_stock,
+    "account_stock": build_account_stock,
+    "audit_logs": build_audit_log,
+    "risk_logs": build_risk_log,
+    "email_logs": build_email_log,
+    "sms_logs": build_sms_log,
+    "reviews": build_review,
+    "blacklist": build_blacklist,
+}
+
+
+def insert_range(task):
+    """Build and insert documents [start, end) of one collection (runs in a pool worker)"""
+    ctx, collection, start, end = task
+    rng = random.Random(f"{ctx['seed']}:{collection}:{start}")
+    build = BUILDERS[collection]
+    db = get_db()
+    started = time.perf_counter()
+    inserted = 0
+    for batch_start in range(start, end, ctx["batch_size"]):
+        docs = []
+        for i in range(batch_start, min(batch_start + ctx["batch_size"], end)):
+            doc = build(ctx, rng, i)
+            doc["loadTestRunId"] = ctx["run_id"]
+            doc["source"] = SOURCE_TAG
+            docs.append(doc)
+        db[collection].insert_many(docs, ordered=False, bypass_document_validation=True)
+        inserted += len(docs)
+    return collection, inserted, time.perf_counter() - started
+
+
+def catalogue(db):
+    """Real products/accounts when the database has them, so product pages and stock lookups hit fixture data"""
+    products = [(p["id"], p.get("title") or "UC", float(p.get("price") or 100))
+                for p in db.products.find({"id": {"$exists": True}}, {"_id": 0, "id": 1, "title": 1, "price": 1}).limit(50)]
+    accounts = [(a["id"], a.get("title") or "Hesap", float(a.get("price") or 500))
+                for a in db.accounts.find({"id": {"$exists": True}}, {"_id": 0, "id": 1, "title": 1, "price": 1}).limit(50)]
+    return products or FALLBACK_PRODUCTS, accounts or FALLBACK_ACCOUNTS
+
+
+def cleanup(db, run_id):
+    removed = {}
+    for collection in COLLECTIONS:
+        removed[collection] = db[collection].delete_many({"loadTestRunId": run_id, "source": SOURCE_TAG}).deleted_count
+    return removed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Seed production-scale fixture data")
+    parser.add_argument("--orders", type=parse_size, default=parse_size("10k"), help="Target orders, e.g. 10k, 1M, 10M")
+    parser.add_argument("--count", action="append", default=[], metavar="COLLECTION=N",
+                        help="Override one collection's size (repeatable), e.g. users=2M")
+    parser.add_argument("--only", help="Comma separated collections to seed (default: all)")
+    parser.add_argument("--days", type=float, default=365, help="Spread createdAt over this many days")
+    parser.add_argument("--seed", default="pinly", help="Generator seed; same seed and sizes give the same data")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--batch-size", type=int, default=5000, help="Documents per insert_many")
+    parser.add_argument("--cleanup", metavar="RUN_ID", help="Delete the fixtures of an earlier run and exit")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+
+    overrides = {}
+    for item in args.count:
+        name, _, size = item.partition("=")
+        if name not in RATIOS or not size:
+            parser.error(f"--count expects COLLECTION=N with COLLECTION one of {', '.join(COLLECTIONS)}")
+        overrides[name] = parse_size(size)
+    args.counts = plan_counts(args.orders, overrides)
+    args.only = [c.strip() for c in args.only.split(",")] if args.only else COLLECTIONS
+    unknown = set(args.only) - set(COLLECTIONS)
+    if unknown:
+        parser.error(f"unknown collections: {', '.join(sorted(unknown))}")
+    return args
+
+
+def make_context(run_id, seed, counts, days, products, accounts, batch_size):
+    return {
+        "run_id": run_id,
+        "seed": seed,
+        "counts": counts,
+        "now": datetime.now(timezone.utc),
+        "days": days,
+        "ip_pool": max(1, int(counts["users"] * 0.6)),
+        "products": products,
+        "accounts": accounts,
+        "batch_size": batch_size,
+    }
+
+
+def seed(ctx, collections, workers, start_counts=None, progress=True):
+    """Insert documents [start_counts[c], ctx["counts"][c]) of each collection.
+
+    Growing an existing run: pass the previous counts as start_counts with the same run_id and seed;
+    every cross reference resolves once the call returns. Returns per-collection stats.
+    """
+    start_counts = start_counts or {}
+    # Several batches per task keeps the pool busy without huge pickled task lists
+    span = ctx["batch_size"] * 4
+    tasks = [(ctx, collection, start, min(start + span, ctx["counts"][collection]))
+             for collection in collections
+             for start in range(start_counts.get(collection, 0), ctx["counts"][collection], span)]
+    total = sum(end - start for _, _, start, end in tasks)
+
+    per_collection = {c: {"documents": 0, "worker_seconds": 0.0} for c in collections}
+    done = 0
+    started = time.perf_counter()
+    # spawn: every worker opens its own MongoClient (pymongo clients are not fork safe)
+    with multiprocessing.get_context("spawn").Pool(workers) as pool:
+        for collection, inserted, seconds in pool.imap_unordered(insert_range, tasks):
+            per_collection[collection]["documents"] += inserted
+            per_collection[collection]["worker_seconds"] += seconds
+            done += inserted
+            if progress:
+                elapsed = time.perf_counter() - started
+                print(f"\r⏳ {done:,}/{total:,} documents ({done / elapsed:,.0f}/s)", end="", file=sys.stderr)
+    elapsed = time.perf_counter() - started
+    if progress:
+        print(file=sys.stderr)
+
+    for stats in per_collection.values():
+        seconds = stats.pop("worker_seconds")
+        stats["docs_per_worker_second"] = round(stats["documents"] / seconds) if seconds else None
+    return {
+        "elapsed_seconds": round(elapsed, 2),
+        "documents": done,
+        "docs_per_second": round(done / elapsed) if elapsed else None,
+        "collections": per_collection,
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    if args.cleanup:
+        removed = cleanup(db, args.cleanup)
+        print(json.dumps({"run_id": args.cleanup, "removed": removed}, indent=2))
+        return 0
+
+    run_id = uuid.uuid4().hex[:8]
+    products, accounts = catalogue(db)
+    ctx = make_context(run_id, args.seed, args.counts, args.days, products, accounts, args.batch_size)
+    total = sum(args.counts[c] for c in args.only)
+    print(f"🌱 Seeding {total:,} documents with {args.workers} workers (run {run_id})", file=sys.stderr)
+    for collection in args.only:
+        print(f"   {collection:<15} {args.counts[collection]:>12,}", file=sys.stderr)
+
+    report = {"run_id": run_id, "seed": args.seed, **seed(ctx, args.only, args.workers)}
+    report["cleanup"] = f"python -m tools.scale_fixtures --cleanup {run_id}"
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
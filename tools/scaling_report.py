@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Endpoint Scaling Report
+Grows the database in steps with tools.scale_fixtures (e.g. 1k -> 10k -> 100k
+orders, other collections in proportion) and samples the admin and homepage
+endpoints at each step, producing a latency-vs-size curve per endpoint.
+
+Each curve gets a growth exponent k from a log-log fit (latency ~ orders^k):
+~0 flat, ~1 linear (e.g. the unpaginated orders + account_orders merge in
+/api/admin/orders), >1 superlinear. Endpoints whose exponent or latency
+exceeds the stored baseline are reported as regressions (exit code 1), as
+is linear or worse growth unless the baseline already recorded it.
+
+/api/homepage sits behind the 60s in-memory cache, so before its first sample
+at each step the tool waits out the TTL and fits the curve on that cold
+request.
+
+Usage:
+    python -m tools.scaling_report --steps 1k,10k,100k
+    python -m tools.scaling_report --steps 1k,10k,100k,1M --save-baseline
+    python -m tools.scaling_report --steps 1k,10k --baseline tools/baselines/scaling.json --output scaling.json
+
+Requires: pymongo
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import uuid
+
+import requests
+
+from tools import scale_fixtures
+from tools.api_client import BASE_URL, ApiClient
+from tools.db import get_db
+from tools.stats import summarize
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "scaling.json")
+
+# name -> (path, requires admin token, in-memory cache TTL in seconds)
+ENDPOINTS = {
+    "admin_orders": ("/admin/orders", True, 0),
+    "admin_dashboard": ("/admin/dashboard", True, 0),
+    "admin_users": ("/admin/users", True, 0),
+    "admin_audit_logs": ("/admin/audit-logs", True, 0),
+    "admin_system_status": ("/admin/system-status", True, 0),
+    "homepage": ("/homepage", False, 60),
+}
+
+# Growth exponent bands
+FLAT, SUBLINEAR, LINEAR = 0.2, 0.7, 1.3
+
+
+def growth_exponent(points, key):
+    """Least-squares slope of log(latency) over log(orders); None with fewer than two usable points"""
+    xy = [(math.log(p["orders"]), math.log(p[key])) for p in points if p["orders"] > 0 and p.get(key)]
+    if len(xy) < 2:
+        return None
+    mean_x = sum(x for x, _ in xy) / len(xy)
+    mean_y = sum(y for _, y in xy) / len(xy)
+    var_x = sum((x - mean_x) ** 2 for x, _ in xy)
+    if not var_x:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in xy) / var_x, 3)
+
+
+def classify(exponent):
+    if exponent is None:
+        return "unknown"
+    if exponent < FLAT:
+        return "flat"
+    if exponent < SUBLINEAR:
+        return "sublinear"
+    if exponent < LINEAR:
+        return "linear"
+    return "superlinear"
+
+
+class Sampler:
+    def __init__(self, args):
+        self.args = args
+        self.api = ApiClient(f"{args.base_url.rstrip('/')}/api", timeout=args.timeout, max_retries=0)
+        self.token = None
+        self.last_hit = {}  # endpoint -> monotonic time of the last request (cache expiry tracking)
+
+    def login(self):
+        self.token = self.api.admin_token()
+        if not self.token:
+            raise SystemExit("❌ Admin login failed")
+
+    def request(self, name):
+        path, admin, _ = ENDPOINTS[name]
+        headers = self.api.auth_headers(self.token) if admin else {}
+        start = time.perf_counter()
+        try:
+            response = self.api.get(path, headers=headers, label=name)
+        except requests.exceptions.RequestException:
+            return None, None, 0
+        finally:
+            self.last_hit[name] = time.monotonic()
+        return (time.perf_counter() - start) * 1000, response.status_code, len(response.content)
+
+    def measure(self, name):
+        _, _, ttl = ENDPOINTS[name]
+        if ttl and name in self.last_hit:
+            wait = ttl - (time.monotonic() - self.last_hit[name]) + 1
+            if wait > 0:
+                print(f"   ⏳ waiting {wait:.0f}s for the {name} cache entry to expire", file=sys.stderr)
+                time.sleep(wait)
+        first_ms, status, size = self.request(name)
+        for _ in range(self.args.warmup):
+            self.request(name)
+        samples, errors = [], 0
+        for _ in range(self.args.samples):
+            elapsed, code, _ = self.request(name)
+            if elapsed is None or code != 200:
+                errors += 1
+            else:
+                samples.append(elapsed)
+        stats = summarize(samples)
+        return {
+            "first_ms": round(first_ms, 2) if first_ms is not None else None,
+            "p50": stats["p50"],
+            "p95": stats["p95"],
+            "mean": stats["mean"],
+            "status": status,
+            "errors": errors,
+            "response_bytes": size,
+        }
+
+
+def curve_key(name):
+    """Cached endpoints are only slow on a miss, so fit their curve on the first (cold) request"""
+    return "first_ms" if ENDPOINTS[name][2] else "p50"
+
+
+def compare(curves, baseline, slope_tolerance, latency_tolerance):
+    """Regressions of `curves` against `baseline`, plus linear growth the baseline has not already accepted"""
+    regressions = []
+    for name, curve in curves.items():
+        base = (baseline or {}).get("endpoints", {}).get(name)
+        if curve["growth"] in ("linear", "superlinear") and (not base or base.get("growth") != curve["growth"]):
+            regressions.append({"endpoint": name, "kind": "growth",
+                                "detail": f"{curve['growth']} growth (k={curve['exponent']})"})
+        if not base:
+            continue
+        if curve["exponent"] is not None and base.get("exponent") is not None \
+                and curve["exponent"] > base["exponent"] + slope_tolerance:
+            regressions.append({"endpoint": name, "kind": "exponent",
+                                "detail": f"k {base['exponent']} -> {curve['exponent']}"})
+        key = curve_key(name)
+        base_points = {p["orders"]: p for p in base.get("points", [])}
+        for point in curve["points"]:
+            before = base_points.get(point["orders"])
+            if before and before.get(key) and point.get(key) \
+                    and point[key] > before[key] * (1 + latency_tolerance):
+                regressions.append({"endpoint": name, "kind": "latency",
+                                    "detail": f"{key} at {point['orders']:,} orders: "
+                                              f"{before[key]} -> {point[key]} ms"})
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Latency vs data size for admin and homepage endpoints")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--steps", default="1k,10k,100k", help="Comma separated order counts, ascending")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Subset of endpoints to sample")
+    parser.add_argument("--samples", type=int, default=10, help="Measured requests per endpoint per step")
+    parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests after the first one")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4, help="Seeding processes")
+    parser.add_argument("--seed", default="scaling")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write this run's curves to --baseline")
+    parser.add_argument("--slope-tolerance", type=float, default=0.25, help="Allowed growth exponent increase")
+    parser.add_argument("--latency-tolerance", type=float, default=0.5,
+                        help="Allowed relative latency increase at the same step (0.5 = +50%%)")
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded fixtures")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    args.steps = sorted(scale_fixtures.parse_size(s) for s in args.steps.split(",") if s.strip())
+    args.endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    unknown = set(args.endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    sampler = Sampler(args)
+    sampler.login()
+
+    run_id = uuid.uuid4().hex[:8]
+    products, accounts = scale_fixtures.catalogue(db)
+    previous_counts = {}
+    points = {name: [] for name in args.endpoints}
+    try:
+        for step in args.steps:
+            counts = scale_fixtures.plan_counts(step, {})
+            ctx = scale_fixtures.make_context(run_id, args.seed, counts, 365, products, accounts, 5000)
+            print(f"🌱 Growing fixtures to {step:,} orders (run {run_id})", file=sys.stderr)
+            scale_fixtures.seed(ctx, scale_fixtures.COLLECTIONS, args.workers, start_counts=previous_counts)
+            previous_counts = counts
+            for name in args.endpoints:
+                point = {"orders": step, **sampler.measure(name)}
+                points[name].append(point)
+                print(f"   {name:<20} p50 {point['p50']} ms  first {point['first_ms']} ms  "
+                      f"{point['response_bytes']:,} bytes", file=sys.stderr)
+    finally:
+        sampler.api.close()
+        if not args.keep:
+            print("🧹 Removing fixtures...", file=sys.stderr)
+            scale_fixtures.cleanup(db, run_id)
+
+    curves = {}
+    for name, curve_points in points.items():
+        exponent = growth_exponent(curve_points, curve_key(name))
+        curves[name] = {"exponent": exponent, "growth": classify(exponent), "fit_on": curve_key(name),
+                        "points": curve_points}
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    regressions = compare(curves, baseline, args.slope_tolerance, args.latency_tolerance)
+    report = {
+        "run_id": run_id,
+        "steps": args.steps,
+        "baseline": args.baseline if baseline else None,
+        "endpoints": curves,
+        "regressions": regressions,
+    }
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"steps": args.steps, "endpoints": curves}, f, indent=2, ensure_ascii=False)
+        print(f"💾 Baseline written to {args.baseline}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    for name, curve in curves.items():
+        print(f"   {name:<20} k={curve['exponent']} ({curve['growth']})", file=sys.stderr)
+    for regression in regressions:
+        print(f"❌ {regression['endpoint']}: {regression['detail']}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
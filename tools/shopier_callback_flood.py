@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Shopier Callback Flood Generator
+Pre-creates pending Shopier orders directly in MongoDB, then fires signed and
+mis-signed callbacks at /api/payment/shopier/callback at a controlled rate,
+including duplicate deliveries and out-of-order status transitions (the shape
+of a payment-provider retry storm). Afterwards it reads `orders`, `payments`,
+`stock` and `payment_security_logs` in bulk and checks that every order ended
+in exactly one, expected final state.
+
+Two kinds of result are reported:
+
+    problems           consistency under load (wrong state for a plain success,
+                       failure, duplicate or late failure, missing or duplicate
+                       payment records, over-assigned stock); any of these
+                       makes the exit code 1
+    security_findings  what the callback handler does not enforce yet: it has
+                       no signature check (invalid_signature ends paid/failed,
+                       not pending), lets a failed order become paid
+                       (out_of_order) and writes no payment_security_logs.
+                       Reported, but they don't decide the exit code, so the
+                       flood stays usable as a load check until they are fixed
+
+Usage:
+    python -m tools.shopier_callback_flood --orders 5000 --rate 200 --concurrency 100
+    python -m tools.shopier_callback_flood --cleanup RUN_ID
+
+Requires: aiohttp, pymongo
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import aiohttp
+
+from tools.api_client import BASE_URL, AsyncApiClient
+from tools.db import chunked, get_db
+from tools.signing import shopier_signature
+from tools.stats import Recorder, summarize
+
+CALLBACK_PATH = "/payment/shopier/callback"
+DEFAULT_SECRET = os.getenv("SHOPIER_API_SECRET", "test_secret_abcdef")
+SOURCE_TAG = "callback_flood"
+
+# scenario -> (callbacks to send, expected final order status)
+SCENARIOS = {
+    "success": (["success"], "paid"),
+    "failure": (["failed"], "failed"),
+    "duplicate": (["success", "success", "success"], "paid"),
+    "invalid_signature": (["bad_signature"], "pending"),
+    "out_of_order": (["failed", "success"], "failed"),  # failed must not flip to paid
+    "late_failure": (["success", "failed"], "paid"),  # paid must not flip to failed
+}
+# Outcomes app/api/payment/shopier/callback/route.js is known not to enforce yet
+SECURITY_SCENARIOS = {"invalid_signature", "out_of_order"}
+DEFAULT_MIX = "success=50,failure=10,duplicate=20,invalid_signature=5,out_of_order=10,late_failure=5"
+
+REDIRECT_RE = re.compile(r"url=[^\"'>]*?/payment/(success|failed)(?:\?reason=([a-z_]+))?")
+
+
+def parse_mix(mix):
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f"Unknown scenario '{name}' (choose from {', '.join(SCENARIOS)})")
+        weights[name] = float(weight or 1)
+    return weights
+
+
+def seed_orders(db, run_id, count, with_stock):
+    """Insert one fixture user, `count` pending Shopier orders and optional stock for a fixture product"""
+    now = datetime.now(timezone.utc)
+    user = {
+        "id": str(uuid.uuid4()),
+        "firstName": "Flood",
+        "lastName": "Test",
+        "email": f"callback-flood+{run_id}@test.com",
+        "phone": "5550000000",
+        "createdAt": now,
+        "updatedAt": now,
+        "source": SOURCE_TAG,
+        "loadTestRunId": run_id,
+    }
+    db.users.insert_one(user)
+    product_id = f"flood-product-{run_id}"
+    orders = []
+    for i in range(count):
+        amount = round(random.choice([19.99, 89.99, 179.99, 449.99]), 2)
+        orders.append({
+            "id": str(uuid.uuid4()),
+            "userId": user["id"],
+            "productId": product_id,
+            "productTitle": "60 UC",
+            "playerId": f"{random.randint(100000000, 999999999)}",
+            "playerName": f"Flood#{i}",
+            "customer": {"firstName": user["firstName"], "lastName": user["lastName"],
+                         "email": user["email"], "phone": user["phone"]},
+            "status": "pending",
+            "amount": amount,
+            "totalAmount": amount,
+            "quantity": 1,
+            "currency": "TRY",
+            "paymentMethod": "shopier",
+            "createdAt": now,
+            "updatedAt": now,
+            "source": SOURCE_TAG,
+            "loadTestRunId": run_id,
+        })
+    for batch in chunked(orders, 1000):
+        db.orders.insert_many(batch, ordered=False)
+    if with_stock:
+        stock = [{
+            "id": str(uuid.uuid4()),
+            "productId": product_id,
+            "value": f"FLOOD-{run_id}-{i:07d}",
+            "status": "available",
+            "createdAt": now,
+            "loadTestRunId": run_id,
+        } for i in range(with_stock)]
+        for batch in chunked(stock, 1000):
+            db.stock.insert_many(batch, ordered=False)
+    return [o["id"] for o in orders]
+
+
+def build_schedule(order_ids, weights, rate, reorder_gap, duplicate_spread):
+    """Assign a scenario to each order and lay out (send_at, order_id, kind, scenario) events"""
+    names = list(weights)
+    scenario_of = dict(zip(order_ids, random.choices(names, weights=[weights[n] for n in names], k=len(order_ids))))
+    events = []
+    for index, order_id in enumerate(order_ids):
+        base = index / rate
+        kinds, _ = SCENARIOS[scenario_of[order_id]]
+        for seq, kind in enumerate(kinds):
+            if scenario_of[order_id] == "duplicate":
+                offset = random.uniform(0, duplicate_spread)  # Retry storm: copies land almost together
+            else:
+                offset = seq * reorder_gap
+            events.append((base + offset, order_id, kind, scenario_of[order_id]))
+    events.sort(key=lambda e: e[0])
+    return scenario_of, events
+
+
+def callback_payload(order_id, kind, secret):
+    random_nr = str(random.randint(100000, 999999))
+    signature = shopier_signature(random_nr, order_id, secret)
+    if kind == "bad_signature":
+        signature = shopier_signature(random_nr, order_id, secret + "-wrong")
+    return {
+        "platform_order_id": order_id,
+        "status": "failed" if kind == "failed" else "success",
+        "payment_id": f"FLOOD{random.randint(10 ** 9, 10 ** 10 - 1)}",
+        "installment": "0",
+        "random_nr": random_nr,
+        "signature": signature,
+    }
+
+
+class CallbackFlood:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = Recorder()
+        self.outcomes = Counter()
+        self.first_sent = {}
+        self.api = None
+
+    def on_call(self, event):
+        status = event["status"]
+        error = event["error"] or (f"http_{status}" if status and status >= 400 else None)
+        self.recorder.record(event["label"], event["elapsed_ms"], status, error)
+
+    async def fire(self, semaphore, start, send_at, order_id, kind):
+        delay = start + send_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with semaphore:
+            self.first_sent.setdefault(order_id, datetime.now(timezone.utc))
+            try:
+                response = await self.api.post(CALLBACK_PATH, data=callback_payload(order_id, kind, self.args.secret),
+                                               label=f"callback_{kind}")
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                self.outcomes[f"{kind}:transport_error"] += 1
+                return
+            match = REDIRECT_RE.search(response.text)
+            outcome = (match.group(1) + (f":{match.group(2)}" if match.group(2) else "")) if match else "unknown"
+            self.outcomes[f"{kind}->{outcome}"] += 1
+
+    async def run(self, events):
+        semaphore = asyncio.Semaphore(self.args.concurrency)
+        self.api = AsyncApiClient(f"{self.args.base_url.rstrip('/')}/api", pool_size=self.args.concurrency,
+                                  max_retries=0, hooks=[self.on_call])
+        async with self.api:
+            start = time.perf_counter()
+            await asyncio.gather(*(self.fire(semaphore, start, send_at, order_id, kind)
+                                   for send_at, order_id, kind, _ in events))
+        self.recorder.stop()
+
+
+def verify(db, order_ids, scenario_of, first_sent):
+    """Bulk-read final state for every order and classify mismatches"""
+    orders = {}
+    payments = Counter()
+    security_logs = Counter()
+    stock_assigned = Counter()
+    for batch in chunked(order_ids, 1000):
+        for doc in db.orders.find({"id": {"$in": batch}},
+                                  {"_id": 0, "id": 1, "status": 1, "quantity": 1, "delivery.status": 1, "updatedAt": 1}):
+            orders[doc["id"]] = doc
+        for row in db.payments.aggregate([{"$match": {"orderId": {"$in": batch}}},
+                                          {"$group": {"_id": "$orderId", "n": {"$sum": 1}}}]):
+            payments[row["_id"]] = row["n"]
+        for row in db.payment_security_logs.aggregate([{"$match": {"orderId": {"$in": batch}}},
+                                                       {"$group": {"_id": "$orderId", "n": {"$sum": 1}}}]):
+            security_logs[row["_id"]] = row["n"]
+        for row in db.stock.aggregate([{"$match": {"orderId": {"$in": batch}}},
+                                       {"$group": {"_id": "$orderId", "n": {"$sum": 1}}}]):
+            stock_assigned[row["_id"]] = row["n"]
+
+    problems = Counter()
+    examples = defaultdict(list)
+    findings = Counter()
+    finding_examples = defaultdict(list)
+    final_states = Counter()
+    settle_ms = []
+
+    def flag(category, order_id):
+        problems[category] += 1
+        if len(examples[category]) < 5:
+            examples[category].append(order_id)
+
+    def finding(category, order_id):
+        findings[category] += 1
+        if len(finding_examples[category]) < 5:
+            finding_examples[category].append(order_id)
+
+    for order_id in order_ids:
+        scenario = scenario_of[order_id]
+        expected = SCENARIOS[scenario][1]
+        doc = orders.get(order_id)
+        if not doc:
+            flag("order_missing", order_id)
+            continue
+        status = doc.get("status")
+        final_states[f"{scenario}:{status}"] += 1
+        if status != expected:
+            if scenario == "invalid_signature":
+                finding("unsigned_callback_accepted", order_id)
+            elif scenario in SECURITY_SCENARIOS:
+                finding(f"wrong_final_state:{scenario}", order_id)
+            else:
+                flag(f"wrong_final_state:{scenario}", order_id)
+        if scenario == "invalid_signature" and security_logs[order_id] == 0:
+            finding("missing_security_log", order_id)
+        if status == "paid" and payments[order_id] == 0:
+            flag("missing_payment_record", order_id)
+        if payments[order_id] > 1:
+            flag("duplicate_payment_records", order_id)
+        if stock_assigned[order_id] > (doc.get("quantity") or 1):
+            flag("over_assigned_stock", order_id)
+        if status != "pending" and order_id in first_sent and doc.get("updatedAt"):
+            updated = doc["updatedAt"]
+            if updated.tzinfo is None:
+                updated = updated.replace(tzinfo=timezone.utc)
+            settle_ms.append((updated - first_sent[order_id]).total_seconds() * 1000)
+
+    return {
+        "orders_checked": len(order_ids),
+        "final_states": dict(final_states),
+        "problems": dict(problems),
+        "problem_examples": dict(examples),
+        "security_findings": dict(findings),
+        "security_finding_examples": dict(finding_examples),
+        "settle_latency_ms": summarize(settle_ms),
+        "payment_records": sum(payments.values()),
+        "security_log_entries": sum(security_logs.values()),
+    }
+
+
+def cleanup(db, run_id):
+    order_ids = [o["id"] for o in db.orders.find({"loadTestRunId": run_id}, {"id": 1})]
+    removed = {"orders": 0, "payments": 0, "payment_security_logs": 0}
+    for batch in chunked(order_ids, 1000):
+        removed["payments"] += db.payments.delete_many({"orderId": {"$in": batch}}).deleted_count
+        removed["payment_security_logs"] += db.payment_security_logs.delete_many({"orderId": {"$in": batch}}).deleted_count
+    removed["orders"] = db.orders.delete_many({"loadTestRunId": run_id}).deleted_count
+    removed["stock"] = db.stock.delete_many({"loadTestRunId": run_id}).deleted_count
+    removed["users"] = db.users.delete_many({"loadTestRunId": run_id}).deleted_count
+    return removed
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Flood /api/payment/shopier/callback with signed callbacks")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--orders", type=int, default=1000, help="Pending orders to pre-create")
+    parser.add_argument("--rate", type=float, default=100.0, help="New orders called back per second")
+    parser.add_argument("--concurrency", type=int, default=50, help="Maximum in-flight callbacks")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Scenario weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--reorder-gap", type=float, default=0.5,
+                        help="Seconds between the first and second callback of out-of-order scenarios")
+    parser.add_argument("--duplicate-spread", type=float, default=0.05,
+                        help="Window in seconds over which duplicate deliveries are fired")
+    parser.add_argument("--secret", default=DEFAULT_SECRET, help="Shopier API secret used for signing")
+    parser.add_argument("--with-stock", type=int, default=0, help="Fixture stock codes to make available")
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds to wait before verifying")
+    parser.add_argument("--keep", action="store_true", help="Keep fixture data (default: removed after the run)")
+    parser.add_argument("--cleanup", metavar="RUN_ID", help="Only remove the fixtures of an earlier kept run")
+    parser.add_argument("--output", help="Write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+
+    if args.cleanup:
+        print(json.dumps(cleanup(db, args.cleanup), indent=2))
+        return 0
+
+    weights = parse_mix(args.mix)
+    run_id = uuid.uuid4().hex[:8]
+    print(f"🌱 Seeding {args.orders} pending orders (run {run_id})...", file=sys.stderr)
+    order_ids = seed_orders(db, run_id, args.orders, args.with_stock)
+    scenario_of, events = build_schedule(order_ids, weights, args.rate, args.reorder_gap, args.duplicate_spread)
+
+    print(f"🌊 Firing {len(events)} callbacks at ~{args.rate:g} orders/s...", file=sys.stderr)
+    flood = CallbackFlood(args)
+    try:
+        asyncio.run(flood.run(events))
+        time.sleep(args.settle)
+        verification = verify(db, order_ids, scenario_of, flood.first_sent)
+    finally:
+        if not args.keep:
+            cleanup(db, run_id)
+
+    report = flood.recorder.report()
+    report.update({
+        "run_id": run_id,
+        "config": {"orders": args.orders, "rate": args.rate, "concurrency": args.concurrency, "mix": weights,
+                   "callbacks": len(events), "kept": args.keep},
+        "scenarios": dict(Counter(scenario_of.values())),
+        "callback_outcomes": dict(flood.outcomes),
+        "verification": verification,
+    })
+    output = json.dumps(report, indent=2, ensure_ascii=False, default=str)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if verification["security_findings"]:
+        print(f"⚠️  Security findings (not counted as failures): {verification['security_findings']}",
+              file=sys.stderr)
+    if verification["problems"]:
+        print(f"❌ {sum(verification['problems'].values())} consistency problems: {verification['problems']}",
+              file=sys.stderr)
+        return 1
+    print("✅ Every order ended in exactly one expected state", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Payment callback signatures and auth tokens, matching what the server verifies.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import os
+import time
+
+# Same fallback as JWT_SECRET in lib/api/core.js
+JWT_SECRET = os.getenv("JWT_SECRET", "pnly-x9k2m-secret-jwt-2025-!@#$%^&*")
+
+
+def shopier_signature(random_nr, order_id, secret):
+    """Shopier callback signature, same as generateShopierHash in lib/crypto.js:
+    base64(HMAC-SHA256(random_nr + platform_order_id, apiSecret))
+    """
+    digest = hmac.new(secret.encode("utf-8"), f"{random_nr}{order_id}".encode("utf-8"), hashlib.sha256).digest()
+    return base64.b64encode(digest).decode("ascii")
+
+
+def legacy_shopier_hash(order_id, amount, secret):
+    """Older SHA256(orderId + amount + secret) scheme used by callback_test.py and payment_security_logs"""
+    return hashlib.sha256(f"{order_id}{amount}{secret}".encode("utf-8")).hexdigest()
+
+
+def osb_signature(order_id, reference, amount, currency, status, key):
+    """Shopier V2 OSB webhook signature, same as verifyOsbSignature in lib/shopierv2/client.js:
+    hex(HMAC-SHA256(order_id + reference + amount + currency + status, osbKey))
+    """
+    data = f"{order_id}{reference}{amount}{currency}{status}"
+    return hmac.new(key.encode("utf-8"), data.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def shopinext_hash(client_id, client_secret):
+    """Shopinext callback hash, same as generateShopinextHash in lib/api/core.js: hex(SHA256(client_id + client_secret))"""
+    return hashlib.sha256(f"{client_id}{client_secret}".encode("utf-8")).hexdigest()
+
+
+def _b64url(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def mint_jwt(payload, secret=None, expires_in=7 * 24 * 3600):
+    """HS256 token as jwt.sign(payload, JWT_SECRET, { expiresIn }) issues it, without a login round trip"""
+    now = int(time.time())
+    claims = {**payload, "iat": now, "exp": now + int(expires_in)}
+    header = _b64url(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode("utf-8"))
+    body = _b64url(json.dumps(claims, separators=(",", ":")).encode("utf-8"))
+    signing_input = f"{header}.{body}".encode("ascii")
+    key = (secret or JWT_SECRET).encode("utf-8")
+    return f"{header}.{body}.{_b64url(hmac.new(key, signing_input, hashlib.sha256).digest())}"
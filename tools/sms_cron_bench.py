@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+SMS Cron Throughput Benchmark
+Seeds orders that qualify for /api/cron/abandoned-sms (pending, 15-20 minutes
+old) or /api/cron/payment-sms (paid within the last 30 minutes), triggers one
+cron run and times it end to end. Both crons send one SMS per order in
+sequence, so the run time divided by the order count tells how many orders
+a single tick can clear before the backlog spills into the next window.
+
+Run the app with NETGSM_API_URL pointing at tools.netgsm_stub so no real
+messages are sent:
+
+Usage:
+    python -m tools.netgsm_stub --latency-ms 250 &
+    python -m tools.sms_cron_bench --cron payment-sms --orders 500 --enable-sms
+    python -m tools.sms_cron_bench --cron abandoned-sms --orders 300 --window 300
+
+Note: the crons process every qualifying order in the database, not only the
+seeded ones. Run against a test database.
+
+Requires: pymongo
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from tools.api_client import BASE_URL, ApiClient
+from tools.db import chunked, get_db
+
+SOURCE_TAG = "sms_cron_bench"
+
+# Cron schedules documented next to the handlers in lib/api/routes/cron.js
+CRONS = {
+    "abandoned-sms": {"window_seconds": 300, "sent_flag": "abandonedSmsSent", "sms_type": "abandoned_order"},
+    "payment-sms": {"window_seconds": 120, "sent_flag": "paymentSmsSent", "sms_type": "payment_success"},
+}
+
+
+def seed(db, run_id, cron, count):
+    """One user with a phone per order, so every order reaches sendSms"""
+    now = datetime.now(timezone.utc)
+    if cron == "abandoned-sms":
+        # Middle of the cron's 15-20 minute window
+        created_at, status = now - timedelta(minutes=17, seconds=30), "pending"
+    else:
+        created_at, status = now - timedelta(minutes=5), "paid"
+
+    users, orders = [], []
+    for i in range(count):
+        user_id = str(uuid.uuid4())
+        users.append({
+            "id": user_id,
+            "firstName": f"Sms{i}",
+            "lastName": "Bench",
+            "email": f"sms-bench-{i}+{run_id}@test.com",
+            "phone": f"55{i:08d}",
+            "createdAt": now - timedelta(days=30),
+            "updatedAt": now,
+            "source": SOURCE_TAG,
+            "loadTestRunId": run_id,
+        })
+        orders.append({
+            "id": str(uuid.uuid4()),
+            "userId": user_id,
+            "productTitle": "60 UC",
+            "playerId": f"{600000000 + i}",
+            "status": status,
+            "amount": 42.50,
+            "totalAmount": 42.50,
+            "quantity": 1,
+            "paymentMethod": "shopier",
+            "createdAt": created_at,
+            "updatedAt": created_at,
+            "loadTestRunId": run_id,
+        })
+    for batch in chunked(users, 1000):
+        db.users.insert_many(batch, ordered=False)
+    for batch in chunked(orders, 1000):
+        db.orders.insert_many(batch, ordered=False)
+    return [o["id"] for o in orders]
+
+
+def enable_sms(db):
+    """Turn on SMS with stand-in credentials; returns the previous settings document for restore_sms()"""
+    previous = db.sms_settings.find_one({"id": "main"})
+    db.sms_settings.update_one({"id": "main"}, {"$set": {
+        "enabled": True,
+        "sendOnPayment": True,
+        "usercode": "loadtest",
+        # Not encrypted: getSmsSettings falls back to the plain value when decrypt fails
+        "password": "loadtest",
+        "msgheader": "PINLY",
+    }}, upsert=True)
+    return previous
+
+
+def restore_sms(db, previous):
+    if previous is None:
+        db.sms_settings.delete_one({"id": "main"})
+    else:
+        db.sms_settings.replace_one({"id": "main"}, previous)
+
+
+def already_qualifying(db, cron):
+    """Orders outside this run the cron will also pick up"""
+    now = datetime.now(timezone.utc)
+    if cron == "abandoned-sms":
+        query = {"status": "pending", "abandonedSmsSent": {"$ne": True},
+                 "createdAt": {"$gte": now - timedelta(minutes=20), "$lte": now - timedelta(minutes=15)}}
+    else:
+        query = {"status": {"$in": ["paid", "delivered"]}, "paymentSmsSent": {"$ne": True},
+                 "createdAt": {"$gte": now - timedelta(minutes=30)}}
+    return db.orders.count_documents(query)
+
+
+def outcome(db, cron, order_ids):
+    """How many seeded orders were flagged and how their SMS went"""
+    flag = CRONS[cron]["sent_flag"]
+    flagged = 0
+    sms = Counter()
+    for batch in chunked(order_ids, 1000):
+        flagged += db.orders.count_documents({"id": {"$in": batch}, flag: True})
+        for row in db.sms_logs.aggregate([{"$match": {"orderId": {"$in": batch}}},
+                                          {"$group": {"_id": "$status", "n": {"$sum": 1}}}]):
+            sms[row["_id"]] += row["n"]
+    return {"flagged": flagged, "sms_logs": dict(sms)}
+
+
+def cleanup(db, run_id, order_ids):
+    for batch in chunked(order_ids, 1000):
+        db.sms_logs.delete_many({"orderId": {"$in": batch}})
+    for collection in ["orders", "users"]:
+        db[collection].delete_many({"loadTestRunId": run_id})
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Time one SMS cron run over a seeded backlog")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--cron", choices=sorted(CRONS), default="payment-sms")
+    parser.add_argument("--orders", type=int, default=200, help="Qualifying orders to seed")
+    parser.add_argument("--window", type=float,
+                        help="Seconds between cron ticks (default: 300 abandoned-sms, 120 payment-sms)")
+    parser.add_argument("--enable-sms", action="store_true",
+                        help="Temporarily enable sms_settings with stand-in credentials (restored afterwards)")
+    parser.add_argument("--timeout", type=float, default=1800, help="Cron request timeout in seconds")
+    parser.add_argument("--keep", action="store_true", help="Keep seeded orders, users and sms_logs")
+    parser.add_argument("--output", help="Write the JSON report here")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    run_id = uuid.uuid4().hex[:8]
+    window = args.window or CRONS[args.cron]["window_seconds"]
+
+    others = already_qualifying(db, args.cron)
+    if others:
+        print(f"⚠️  {others} orders outside this run already qualify and will be processed too", file=sys.stderr)
+
+    previous_sms = enable_sms(db) if args.enable_sms else None
+    print(f"🌱 Seeding {args.orders} orders for /api/cron/{args.cron} (run {run_id})...", file=sys.stderr)
+    order_ids = seed(db, run_id, args.cron, args.orders)
+
+    api = ApiClient(f"{args.base_url.rstrip('/')}/api", timeout=args.timeout, max_retries=0)
+    try:
+        print(f"⏱  Triggering /api/cron/{args.cron}...", file=sys.stderr)
+        start = time.perf_counter()
+        try:
+            response = api.get(f"/cron/{args.cron}")
+            status = response.status_code
+            try:
+                cron_result = response.json().get("data") or {}
+            except ValueError:
+                cron_result = {}
+        except requests.exceptions.RequestException as e:
+            status, cron_result = None, {"error": type(e).__name__}
+        elapsed = time.perf_counter() - start
+        seeded = outcome(db, args.cron, order_ids)
+    finally:
+        api.close()
+        if args.enable_sms:
+            restore_sms(db, previous_sms)
+        if not args.keep:
+            cleanup(db, run_id, order_ids)
+
+    checked = cron_result.get("checked") or 0
+    per_order_ms = elapsed * 1000 / checked if checked else None
+    capacity = int(window * 1000 / per_order_ms) if per_order_ms else None
+    report = {
+        "run_id": run_id,
+        "cron": args.cron,
+        "status": status,
+        "elapsed_seconds": round(elapsed, 3),
+        "cron_result": cron_result,
+        "seeded_orders": args.orders,
+        "other_qualifying_orders": others,
+        "seeded_outcome": seeded,
+        "ms_per_order": round(per_order_ms, 2) if per_order_ms else None,
+        "orders_per_second": round(checked / elapsed, 2) if elapsed > 0 and checked else None,
+        "window_seconds": window,
+        "orders_per_window": capacity,
+        "fits_in_window": elapsed <= window,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    symbol = "✅" if report["fits_in_window"] else "❌"
+    print(f"{symbol} {checked} orders in {elapsed:.1f}s; one {window:.0f}s tick clears ~{capacity or 0} orders",
+          file=sys.stderr)
+    return 0 if status == 200 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+SMTP Sink
+Minimal in-process SMTP server that accepts every message (no AUTH, no TLS)
+and timestamps it, so sendEmail's nodemailer transport can be pointed at it
+instead of a real relay. AUTH is deliberately not advertised: nodemailer then
+sends without logging in, whatever smtpUser/smtpPass hold (it rejects an
+empty password with EAUTH before sending anything when AUTH is offered).
+Used by tools.email_bench; can also run standalone to eyeball what the
+app sends.
+
+Usage:
+    python -m tools.smtp_sink --port 2525
+    # then set email_settings.smtpHost/smtpPort to 127.0.0.1:2525 in the admin panel
+
+    from tools.smtp_sink import SmtpSink
+    with SmtpSink(port=2525) as sink:
+        ...
+        sink.messages  # [{"received_at", "mail_from", "rcpt_to", "subject", "size"}, ...]
+"""
+
+import argparse
+import asyncio
+import email
+import email.policy
+import json
+import sys
+import threading
+import time
+import uuid
+
+from tools.stats import summarize
+
+
+class _Session:
+    """One SMTP conversation"""
+
+    def __init__(self, sink, reader, writer):
+        self.sink = sink
+        self.reader = reader
+        self.writer = writer
+        self.mail_from = None
+        self.rcpt_to = []
+
+    async def reply(self, line):
+        self.writer.write(f"{line}\r\n".encode("ascii"))
+        await self.writer.drain()
+
+    async def readline(self):
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionResetError
+        return line.rstrip(b"\r\n")
+
+    async def read_data(self):
+        lines = []
+        while True:
+            line = await self.readline()
+            if line == b".":
+                return b"\r\n".join(lines) + b"\r\n"
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+    async def run(self):
+        await self.reply(f"220 {self.sink.hostname} ESMTP sink")
+        while True:
+            line = (await self.readline()).decode("utf-8", "replace")
+            command, _, arg = line.partition(" ")
+            command = command.upper()
+            if command == "EHLO":
+                await self.reply(f"250-{self.sink.hostname}\r\n250-8BITMIME\r\n250 SIZE 52428800")
+            elif command == "HELO":
+                await self.reply(f"250 {self.sink.hostname}")
+            elif command == "MAIL":
+                self.mail_from = arg.partition(":")[2].split(" ")[0].strip("<>")
+                self.rcpt_to = []
+                await self.reply("250 2.1.0 Ok")
+            elif command == "RCPT":
+                self.rcpt_to.append(arg.partition(":")[2].split(" ")[0].strip("<>"))
+                await self.reply("250 2.1.5 Ok")
+            elif command == "DATA":
+                await self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = await self.read_data()
+                if self.sink.latency_ms:
+                    await asyncio.sleep(self.sink.latency_ms / 1000)
+                queue_id = self.sink.accept(self.mail_from, self.rcpt_to, data)
+                self.mail_from, self.rcpt_to = None, []
+                await self.reply(f"250 2.0.0 Ok: queued as {queue_id}")
+            elif command == "RSET":
+                self.mail_from, self.rcpt_to = None, []
+                await self.reply("250 2.0.0 Ok")
+            elif command == "NOOP":
+                await self.reply("250 2.0.0 Ok")
+            elif command == "QUIT":
+                await self.reply("221 2.0.0 Bye")
+                return
+            else:
+                await self.reply("502 5.5.2 Command not recognized")
+
+
+class SmtpSink:
+    """Accept-all SMTP server on a background thread with its own event loop"""
+
+    def __init__(self, host="127.0.0.1", port=2525, latency_ms=0, on_message=None, hostname="pinly-sink"):
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.on_message = on_message
+        self.hostname = hostname
+        self.messages = []
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._loop = None
+        self._server = None
+        self._thread = None
+        self._started = threading.Event()
+
+    def accept(self, mail_from, rcpt_to, data):
+        """Record one message; received_at is time.perf_counter() so callers in this process can diff against it"""
+        received_at = time.perf_counter()
+        parsed = email.message_from_bytes(data, policy=email.policy.default)
+        message = {
+            "id": uuid.uuid4().hex[:12],
+            "received_at": received_at,
+            "mail_from": mail_from,
+            "rcpt_to": list(rcpt_to),
+            "subject": str(parsed.get("subject", "")),
+            "size": len(data),
+        }
+        with self._lock:
+            self.messages.append(message)
+        if self.on_message:
+            self.on_message(message)
+        return message["id"]
+
+    async def _handle(self, reader, writer):
+        with self._lock:
+            self.connections += 1
+        try:
+            await _Session(self, reader, writer).run()
+        except (ConnectionResetError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        self._started.set()
+        self._loop.run_forever()
+        self._server.close()
+        self._loop.run_until_complete(self._server.wait_closed())
+        self._loop.close()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="smtp-sink", daemon=True)
+        self._thread.start()
+        if not self._started.wait(5):
+            raise RuntimeError(f"SMTP sink did not start on {self.host}:{self.port}")
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(5)
+            self._loop = None
+
+    def snapshot(self):
+        with self._lock:
+            return list(self.messages)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Accept-all SMTP sink")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay before acknowledging DATA")
+    args = parser.parse_args(argv)
+
+    def show(message):
+        print(f"📨 {', '.join(message['rcpt_to'])}: {message['subject']} ({message['size']} bytes)", file=sys.stderr)
+
+    sink = SmtpSink(args.host, args.port, args.latency_ms, on_message=show).start()
+    print(f"📬 SMTP sink listening on {args.host}:{args.port}", file=sys.stderr)
+    start = time.perf_counter()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sink.stop()
+    messages = sink.snapshot()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "messages": len(messages),
+        "connections": sink.connections,
+        "size_bytes": summarize([m["size"] for m in messages]),
+        "messages_per_second": round(len(messages) / elapsed, 2) if elapsed > 0 else None,
+    }, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+"""
+Latency statistics helpers shared by the load and benchmark tools.
+"""
+
+import threading
+import time
+from collections import Counter, defaultdict
+
+
+def percentile(sorted_values, pct):
+    """Return the pct-th percentile (0-100) of an already sorted list, linear interpolation"""
+    if not sorted_values:
+        return None
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    rank = (pct / 100.0) * (len(sorted_values) - 1)
+    low = int(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    fraction = rank - low
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * fraction
+
+
+def summarize(latencies_ms):
+    """Summarize a list of latencies (milliseconds) into count/min/mean/p50/p95/p99/max"""
+    values = sorted(latencies_ms)
+    if not values:
+        return {"count": 0, "min": None, "mean": None, "p50": None, "p95": None, "p99": None, "max": None}
+    return {
+        "count": len(values),
+        "min": round(values[0], 2),
+        "mean": round(sum(values) / len(values), 2),
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(values[-1], 2),
+    }
+
+
+class Recorder:
+    """Collects per-step latency samples, status codes and errors.
+
+    Thread safe, so it can be shared by asyncio tasks and worker threads alike.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.status_codes = defaultdict(Counter)
+        self.errors = defaultdict(Counter)
+        self.started_at = time.perf_counter()
+        self.finished_at = None
+
+    def record(self, step, latency_ms, status=None, error=None):
+        with self._lock:
+            self.latencies[step].append(latency_ms)
+            self.status_codes[step][str(status) if status is not None else "none"] += 1
+            if error:
+                self.errors[step][error] += 1
+
+    def stop(self):
+        self.finished_at = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    def report(self):
+        """Build a JSON-serializable report of everything recorded so far"""
+        elapsed = self.elapsed
+        steps = {}
+        total_requests = 0
+        total_errors = 0
+        with self._lock:
+            for step, values in self.latencies.items():
+                error_count = sum(self.errors[step].values())
+                total_requests += len(values)
+                total_errors += error_count
+                steps[step] = {
+                    **summarize(values),
+                    "errors": error_count,
+                    "error_rate": round(error_count / len(values), 4) if values else 0,
+                    "status_codes": dict(self.status_codes[step]),
+                    "error_types": dict(self.errors[step]),
+                    "throughput_rps": round(len(values) / elapsed, 2) if elapsed > 0 else None,
+                }
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "total_requests": total_requests,
+            "total_errors": total_errors,
+            "requests_per_second": round(total_requests / elapsed, 2) if elapsed > 0 else None,
+            "steps": steps,
+        }
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Bulk Stock Importer
+Streams a supplier code file (one code per line, .gz allowed, - for stdin)
+into a product's stock (POST /api/admin/products/{id}/stock) or an account's
+credential stock (POST /api/admin/accounts/{id}/stock) in bounded parallel
+chunks, instead of pasting tens of thousands of codes into one admin request.
+
+The endpoints insertMany whatever they get, so the importer dedupes first:
+
+    in_file    the same code earlier in the file (after trimming, like the server)
+    existing   already in stock.value / account_stock.credentials, for this
+               product/account or with --global for any of them
+
+A chunk that errors or times out may still have been inserted, so before a
+retry the importer looks its codes up and only resends the ones that are
+missing. Codes that still fail after --retries go to --failed-file. Because
+existing codes are always skipped, re-running the same file (or the failed
+file) after an interruption resumes where the last run stopped.
+
+All chunks post to the same path, which /api/admin limits to 60 requests per
+minute per admin; 429s wait out Retry-After, so the ceiling is about
+60 x --chunk-size codes per minute.
+
+Usage:
+    python -m tools.stock_import --product 2b6f... codes.txt
+    python -m tools.stock_import --product 2b6f... codes.txt.gz --chunk-size 2000 --workers 4 --global
+    python -m tools.stock_import --account 91ce... credentials.txt --dry-run
+
+Requires: requests, pymongo
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+
+from tools.api_client import BASE_URL, ApiClient
+from tools.db import chunked, get_db
+
+# kind -> (parent collection, stock collection, code field, parent field, admin path)
+TARGETS = {
+    "product": ("products", "stock", "value", "productId", "/admin/products/{}/stock"),
+    "account": ("accounts", "account_stock", "credentials", "accountId", "/admin/accounts/{}/stock"),
+}
+
+
+def open_codes(path):
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8-sig")
+    return open(path, encoding="utf-8-sig")
+
+
+def read_codes(lines, existing, stats):
+    """Trimmed codes that are neither blank, repeated in the file nor already in stock"""
+    seen = set()
+    for line in lines:
+        code = line.strip()
+        stats["lines"] += 1
+        if not code:
+            stats["blank"] += 1
+        elif code in seen:
+            stats["duplicate_in_file"] += 1
+        elif code in existing:
+            seen.add(code)
+            stats["existing"] += 1
+        else:
+            seen.add(code)
+            stats["new"] += 1
+            yield code
+
+
+class Importer:
+    def __init__(self, args, db, kind, target_id):
+        self.args = args
+        self.db = db
+        _, stock, field, parent_field, path = TARGETS[kind]
+        self.stock = db[stock]
+        self.field = field
+        self.parent = {parent_field: target_id}
+        self.path = path.format(target_id)
+        self.stats = Counter()
+        self.lock = threading.Lock()
+        self.failed = []
+
+    def existing_codes(self):
+        """Every code already stocked (for this target, or anywhere with --global)"""
+        query = {} if self.args.global_dedupe else self.parent
+        return {doc[self.field] for doc in self.stock.find(query, {"_id": 0, self.field: 1}, batch_size=10000)
+                if doc.get(self.field)}
+
+    def landed(self, codes):
+        """Codes of a chunk that are already in stock, e.g. from a request that timed out after inserting"""
+        found = set()
+        for batch in chunked(codes, 1000):
+            query = {**self.parent, self.field: {"$in": batch}}
+            found.update(doc[self.field] for doc in self.stock.find(query, {"_id": 0, self.field: 1}))
+        return found
+
+    def count(self, key, n=1):
+        with self.lock:
+            self.stats[key] += n
+
+    def upload(self, api, headers, codes):
+        for attempt in range(self.args.retries + 1):
+            try:
+                response = api.post(self.path, label="stock_import", headers=headers, json={"items": codes})
+                if response.status_code == 200 and response.json().get("success"):
+                    self.count("uploaded", len(codes))
+                    self.count("chunks")
+                    return
+                if 400 <= response.status_code < 500 and response.status_code != 429:
+                    self.count(f"http_{response.status_code}")
+                    break
+            except (requests.exceptions.RequestException, ValueError):
+                pass
+            self.count("chunk_retries")
+            present = self.landed(codes)
+            if present:
+                self.count("uploaded", len(present))
+                codes = [code for code in codes if code not in present]
+                if not codes:
+                    self.count("chunks")
+                    return
+            if attempt < self.args.retries:
+                time.sleep(min(30, 2 ** attempt))
+        with self.lock:
+            self.failed.extend(codes)
+
+    def run(self, codes):
+        api = ApiClient(f"{self.args.base_url.rstrip('/')}/api", pool_size=self.args.workers,
+                        timeout=self.args.timeout)
+        token = api.admin_token()
+        if not token:
+            raise SystemExit("❌ Admin login failed")
+        headers = api.auth_headers(token)
+        start = time.perf_counter()
+        last_report = start
+        with ThreadPoolExecutor(max_workers=self.args.workers) as pool:
+            pending = set()
+            for chunk in chunked(codes, self.args.chunk_size):
+                # Bounded read-ahead: never hold more than two chunks per worker in memory
+                if len(pending) >= self.args.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+                pending.add(pool.submit(self.upload, api, headers, chunk))
+                if time.perf_counter() - last_report >= 10:
+                    last_report = time.perf_counter()
+                    rate = self.stats["uploaded"] / (last_report - start)
+                    print(f"   {self.stats['uploaded']:,} uploaded, {rate:,.0f} codes/s", file=sys.stderr)
+            for future in pending:
+                future.result()
+        return time.perf_counter() - start
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a code file into product or account stock")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--product", help="Product id (stock)")
+    target.add_argument("--account", help="Account id (account_stock)")
+    parser.add_argument("file", help="One code per line (.gz allowed, - for stdin)")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Codes per request")
+    parser.add_argument("--workers", type=int, default=4, help="Parallel requests")
+    parser.add_argument("--retries", type=int, default=3, help="Retries per chunk before giving up on it")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--global", dest="global_dedupe", action="store_true",
+                        help="Skip codes stocked for any product/account, not only this one")
+    parser.add_argument("--failed-file", help="Where to write codes that could not be uploaded "
+                                              "(default: <file>.failed)")
+    parser.add_argument("--dry-run", action="store_true", help="Only read and dedupe")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.workers < 1:
+        parser.error("--chunk-size and --workers must be positive")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    kind, target_id = ("product", args.product) if args.product else ("account", args.account)
+    db = get_db()
+    parent_collection = TARGETS[kind][0]
+    target = db[parent_collection].find_one({"id": target_id}, {"_id": 0, "title": 1})
+    if not target:
+        print(f"❌ No {kind} with id {target_id}", file=sys.stderr)
+        return 1
+
+    importer = Importer(args, db, kind, target_id)
+    existing = importer.existing_codes()
+    print(f"📦 {target.get('title', target_id)}: {len(existing):,} codes already stocked"
+          f"{' (all ' + parent_collection + ')' if args.global_dedupe else ''}", file=sys.stderr)
+
+    with open_codes(args.file) as f:
+        codes = read_codes(f, existing, importer.stats)
+        if args.dry_run:
+            for _ in codes:
+                pass
+            elapsed = 0.0
+        else:
+            elapsed = importer.run(codes)
+
+    failed_file = None
+    if importer.failed:
+        failed_file = args.failed_file or f"{args.file if args.file != '-' else 'stdin'}.failed"
+        with open(failed_file, "w", encoding="utf-8") as f:
+            f.writelines(code + "\n" for code in importer.failed)
+
+    stats = importer.stats
+    report = {
+        "kind": kind,
+        "target": target_id,
+        "file": args.file,
+        "dry_run": args.dry_run,
+        "lines": stats["lines"],
+        "blank": stats["blank"],
+        "duplicate_in_file": stats["duplicate_in_file"],
+        "existing": stats["existing"],
+        "new": stats["new"],
+        "uploaded": stats["uploaded"],
+        "failed": len(importer.failed),
+        "failed_file": failed_file,
+        "chunks": stats["chunks"],
+        "chunk_retries": stats["chunk_retries"],
+        "rejected": {k: v for k, v in stats.items() if k.startswith("http_")},
+        "elapsed_seconds": round(elapsed, 3),
+        "codes_per_second": round(stats["uploaded"] / elapsed, 1) if elapsed > 0 else None,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    print(f"📊 {report['lines']:,} lines: {report['new']:,} new, {report['existing']:,} already stocked, "
+          f"{report['duplicate_in_file']:,} repeated in file", file=sys.stderr)
+    if not args.dry_run:
+        print(f"{'❌' if report['failed'] else '✅'} {report['uploaded']:,} uploaded in {elapsed:.1f}s "
+              f"({report['codes_per_second']} codes/s), {report['failed']:,} failed"
+              f"{' -> ' + failed_file if failed_file else ''}", file=sys.stderr)
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
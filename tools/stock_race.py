@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Stock Assignment Race Harness
+Seeds paid orders plus exactly as many stock items as the orders need (or
+--spare extra), then fires --parallel simultaneous stock assignment calls per
+order across many orders:
+
+    uc       POST /api/admin/orders/{id}/assign-stock           (stock)
+    account  POST /api/admin/account-orders/{id}/assign-stock   (account_stock)
+
+With --with-approve, UC orders are seeded on hold and one call per order goes
+to POST /api/admin/orders/{id}/approve instead, which assigns stock through
+its own read-then-update path (the same interleaving as an admin racing the
+approve flow).
+
+Both handlers read the order, findOneAndUpdate a stock item, then write the
+order, so concurrent calls can each take an item. The bulk check afterwards
+reads every seeded order and stock item and counts:
+
+    unassigned       order ended without a code
+    multi_assigned   more than one stock item points at the same order
+    duplicate_codes  the same code was delivered to more than one order
+    leaked_stock     item taken from the pool but not the code its order holds
+
+plus request throughput and latency per endpoint. Exit code 1 on any finding.
+
+Usage:
+    python -m tools.stock_race --orders 500 --parallel 4
+    python -m tools.stock_race --kind account --orders 200 --parallel 3 --concurrency 100
+    python -m tools.stock_race --orders 300 --parallel 3 --with-approve --spare 50
+
+Requires: aiohttp, pymongo
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta, timezone
+
+import aiohttp
+
+from tools.api_client import BASE_URL, AsyncApiClient
+from tools.db import chunked, get_db
+from tools.stats import Recorder
+
+SOURCE_TAG = "stock_race"
+
+
+def seed(db, run_id, kind, count, spare, on_hold):
+    """A throwaway inactive product/account, `count` paid orders and count + spare stock items"""
+    now = datetime.now(timezone.utc)
+    item_id = f"race-{run_id}"
+    tag = {"source": SOURCE_TAG, "loadTestRunId": run_id}
+    if kind == "uc":
+        db.products.insert_one({"id": item_id, "title": f"Race {run_id}", "active": False, "price": 1,
+                                "game": "pubg", "createdAt": now, **tag})
+    else:
+        db.accounts.insert_one({"id": item_id, "title": f"Race {run_id}", "active": False, "status": "available",
+                                "price": 1, "createdAt": now, **tag})
+
+    orders, stock = [], []
+    for i in range(count):
+        order = {
+            "id": str(uuid.uuid4()),
+            # No matching user, so the handlers skip the delivery e-mail and SMS
+            "userId": f"race-user-{run_id}",
+            "status": "paid",
+            "amount": 1,
+            "totalAmount": 1,
+            "quantity": 1,
+            "paymentMethod": "balance",
+            "createdAt": now,
+            "updatedAt": now,
+            **tag,
+        }
+        if kind == "uc":
+            order["productId"] = item_id
+            if on_hold:
+                order["delivery"] = {"status": "hold"}
+        else:
+            order.update({"type": "account", "accountId": item_id, "accountTitle": f"Race {run_id}"})
+        orders.append(order)
+    for i in range(count + spare):
+        # Distinct, strictly increasing createdAt so the FIFO sort is deterministic
+        item = {"id": str(uuid.uuid4()), "value": f"RACE-{run_id}-{i:07d}", "status": "available",
+                "createdAt": now - timedelta(days=1) + timedelta(milliseconds=i), **tag}
+        if kind == "uc":
+            item["productId"] = item_id
+        else:
+            item.update({"accountId": item_id, "credentials": item["value"]})
+        stock.append(item)
+
+    stock_collection = db.stock if kind == "uc" else db.account_stock
+    for batch in chunked(orders, 1000):
+        db.orders.insert_many(batch, ordered=False)
+    for batch in chunked(stock, 1000):
+        stock_collection.insert_many(batch, ordered=False)
+    return [o["id"] for o in orders]
+
+
+def delivered_codes(kind, order):
+    delivery = order.get("delivery") or {}
+    if kind == "account":
+        return [delivery["credentials"]] if delivery.get("credentials") else []
+    codes = []
+    for item in delivery.get("items") or []:
+        # approve stores whatever findOneAndUpdate handed back; assign-stock stores the code
+        codes.append(item.get("value") if isinstance(item, dict) else item)
+    return [c for c in codes if c]
+
+
+def verify(db, run_id, kind):
+    """Bulk consistency check of every seeded order and stock item"""
+    stock_collection = db.stock if kind == "uc" else db.account_stock
+    orders = {o["id"]: o for o in db.orders.find({"loadTestRunId": run_id}, {"_id": 0, "id": 1, "delivery": 1})}
+    taken_by_order = defaultdict(list)
+    pool = Counter()
+    for item in stock_collection.find({"loadTestRunId": run_id}, {"_id": 0, "value": 1, "status": 1, "orderId": 1}):
+        pool[item["status"]] += 1
+        if item["status"] != "available":
+            taken_by_order[item.get("orderId")].append(item["value"])
+
+    code_owners = defaultdict(list)
+    unassigned, multi_assigned, samples = 0, 0, defaultdict(list)
+    for order_id, order in orders.items():
+        codes = delivered_codes(kind, order)
+        for code in codes:
+            code_owners[code].append(order_id)
+        if not codes:
+            unassigned += 1
+            samples["unassigned"].append(order_id)
+        if len(taken_by_order.get(order_id, [])) > 1:
+            multi_assigned += 1
+            samples["multi_assigned"].append(order_id)
+
+    duplicate_codes = [code for code, owners in code_owners.items() if len(owners) > 1]
+    held = {code for code in code_owners}
+    leaked = [code for codes in taken_by_order.values() for code in codes if code not in held]
+    samples["duplicate_codes"] = duplicate_codes
+    samples["leaked_stock"] = leaked
+    return {
+        "orders": len(orders),
+        "stock": dict(pool),
+        "unassigned": unassigned,
+        "multi_assigned": multi_assigned,
+        "duplicate_codes": len(duplicate_codes),
+        "leaked_stock": len(leaked),
+        "samples": {k: v[:10] for k, v in samples.items() if v},
+    }
+
+
+def cleanup(db, run_id, order_ids):
+    for batch in chunked(order_ids, 1000):
+        db.audit_logs.delete_many({"entityId": {"$in": batch}})
+    for collection in ["orders", "stock", "account_stock", "products", "accounts"]:
+        db[collection].delete_many({"loadTestRunId": run_id})
+
+
+class Race:
+    def __init__(self, args):
+        self.args = args
+        self.recorder = Recorder()
+        self.outcomes = Counter()
+
+    def on_call(self, event):
+        status = event["status"]
+        error = event["error"] or (f"http_{status}" if status and status >= 500 else None)
+        self.recorder.record(event["label"], event["elapsed_ms"], status, error)
+
+    def calls(self, order_id):
+        """(label, path) for the simultaneous calls against one order"""
+        if self.args.kind == "account":
+            path = f"/admin/account-orders/{order_id}/assign-stock"
+            return [("account_assign_stock", path)] * self.args.parallel
+        calls = [("assign_stock", f"/admin/orders/{order_id}/assign-stock")] * self.args.parallel
+        if self.args.with_approve:
+            calls[-1] = ("approve", f"/admin/orders/{order_id}/approve")
+        return calls
+
+    async def race_order(self, api, headers, semaphore, order_id):
+        async with semaphore:
+            start = asyncio.Event()
+
+            async def one(label, path):
+                await start.wait()
+                try:
+                    response = await api.post(path, label=label, headers=headers, json={})
+                    body = response.json()
+                except (aiohttp.ClientError, asyncio.TimeoutError, ValueError):
+                    return "error"
+                return "assigned" if response.status_code == 200 and body.get("success") else "refused"
+
+            tasks = [asyncio.create_task(one(label, path)) for label, path in self.calls(order_id)]
+            await asyncio.sleep(0)
+            start.set()
+            results = await asyncio.gather(*tasks)
+            assigned = results.count("assigned")
+            self.outcomes["orders_with_multiple_successes" if assigned > 1 else
+                          "orders_with_one_success" if assigned == 1 else "orders_with_no_success"] += 1
+            for result in results:
+                self.outcomes[f"calls_{result}"] += 1
+
+    async def run(self, order_ids):
+        api = AsyncApiClient(f"{self.args.base_url.rstrip('/')}/api", timeout=self.args.timeout, max_retries=0,
+                             pool_size=self.args.concurrency * self.args.parallel, hooks=[self.on_call])
+        async with api:
+            token = await api.admin_token()
+            if not token:
+                raise SystemExit("❌ Admin login failed")
+            headers = api.auth_headers(token)
+            semaphore = asyncio.Semaphore(self.args.concurrency)
+            self.recorder = Recorder()
+            await asyncio.gather(*(self.race_order(api, headers, semaphore, order_id) for order_id in order_ids))
+            self.recorder.stop()
+        return self.recorder.report()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent stock assignment consistency check")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--kind", choices=["uc", "account"], default="uc")
+    parser.add_argument("--orders", type=int, default=200, help="Paid orders to seed")
+    parser.add_argument("--parallel", type=int, default=3, help="Simultaneous calls per order")
+    parser.add_argument("--concurrency", type=int, default=50, help="Orders raced at the same time")
+    parser.add_argument("--spare", type=int, default=0, help="Stock items beyond one per order")
+    parser.add_argument("--with-approve", action="store_true",
+                        help="UC only: seed orders on hold and race /approve against assign-stock")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded orders and stock")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    if args.with_approve and args.kind != "uc":
+        parser.error("--with-approve only applies to --kind uc")
+    # /api/admin allows 60 requests/minute per path and admin; each order has its own path
+    if args.parallel > 60:
+        parser.error("--parallel above 60 hits the /api/admin rate limit")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    db = get_db()
+    run_id = uuid.uuid4().hex[:8]
+    print(f"🌱 Seeding {args.orders} paid {args.kind} orders and {args.orders + args.spare} stock items "
+          f"(run {run_id})", file=sys.stderr)
+    order_ids = seed(db, run_id, args.kind, args.orders, args.spare, args.with_approve)
+
+    try:
+        print(f"🏁 {args.parallel} simultaneous calls per order, {args.concurrency} orders at a time",
+              file=sys.stderr)
+        race = Race(args)
+        start = time.perf_counter()
+        requests_report = asyncio.run(race.run(order_ids))
+        elapsed = time.perf_counter() - start
+        consistency = verify(db, run_id, args.kind)
+    finally:
+        if not args.keep:
+            cleanup(db, run_id, order_ids)
+
+    findings = sum(consistency[k] for k in ["unassigned", "multi_assigned", "duplicate_codes", "leaked_stock"])
+    report = {
+        "run_id": run_id,
+        "kind": args.kind,
+        "orders": args.orders,
+        "parallel": args.parallel,
+        "with_approve": args.with_approve,
+        "elapsed_seconds": round(elapsed, 3),
+        "orders_per_second": round(args.orders / elapsed, 2) if elapsed > 0 else None,
+        "outcomes": dict(race.outcomes),
+        "consistency": consistency,
+        "requests": requests_report,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    print(f"📊 {args.orders} orders in {elapsed:.1f}s ({report['orders_per_second']} orders/s)", file=sys.stderr)
+    for key in ["unassigned", "multi_assigned", "duplicate_codes", "leaked_stock"]:
+        symbol = "❌" if consistency[key] else "✅"
+        print(f"{symbol} {key}: {consistency[key]}", file=sys.stderr)
+    return 1 if findings else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
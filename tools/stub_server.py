@@ -0,0 +1,139 @@
+"""
+Shared plumbing for the local third-party API stand-ins (tools.dijipin_stub,
+tools.netgsm_stub): a threaded JSON server, latency/jitter/hang/error
+injection and per-route timing for /__stats.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from tools.stats import Recorder
+
+
+def add_fault_args(parser, port):
+    """Options every stand-in shares"""
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=port)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Base response latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503")
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="Fraction of requests that stall for --hang-seconds")
+    parser.add_argument("--hang-seconds", type=float, default=60.0)
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+
+
+class StubState:
+    """Base for the state shared by all handler threads; subclasses extend reset() and stats()"""
+
+    def __init__(self, args):
+        self.args = args
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.recorder = Recorder()
+
+    def stats(self):
+        return self.recorder.report()
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Subclasses implement dispatch(method, url) and answer through send_json()"""
+
+    state = None  # StubState, set by serve()
+    protocol_version = "HTTP/1.1"
+    # Answer for requests picked by --error-rate
+    injected_error = (503, {"success": False, "message": "Service Unavailable"})
+
+    def log_message(self, fmt, *args):
+        if self.state.args.verbose:
+            super().log_message(fmt, *args)
+
+    def send_json(self, status, body):
+        self.status = status
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def read_body(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def read_json(self):
+        """Parsed request body; {} when empty, None when it is not JSON"""
+        body = self.read_body()
+        if not body:
+            return {}
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+    def inject_faults(self):
+        """Apply latency, hangs and random failures. Returns True if the request was already answered."""
+        args = self.state.args
+        delay = max(0.0, args.latency_ms + random.uniform(-args.jitter_ms, args.jitter_ms)) / 1000
+        if args.hang_rate and random.random() < args.hang_rate:
+            delay = args.hang_seconds
+        if delay:
+            time.sleep(delay)
+        if args.error_rate and random.random() < args.error_rate:
+            self.send_json(*self.injected_error)
+            return True
+        return False
+
+    def handle_method(self, method):
+        url = urlparse(self.path)
+        if method == "POST" and url.path == "/__reset":
+            self.state.reset()
+            return self.send_json(200, {"success": True})
+        if method == "GET" and url.path == "/__stats":
+            return self.send_json(200, self.state.stats())
+
+        route = f"{method} {url.path}"
+        start = time.perf_counter()
+        self.status = None
+        try:
+            if not self.inject_faults():
+                self.dispatch(method, url)
+        except (BrokenPipeError, ConnectionResetError):
+            self.status = None  # Client gave up (timeout) while we were sleeping
+        finally:
+            status = self.status
+            error = None if status and status < 400 else (f"http_{status}" if status else "client_disconnected")
+            self.state.recorder.record(route, (time.perf_counter() - start) * 1000, status, error)
+
+    def dispatch(self, method, url):
+        raise NotImplementedError
+
+    def do_GET(self):
+        self.handle_method("GET")
+
+    def do_POST(self):
+        self.handle_method("POST")
+
+
+def serve(handler_cls, state):
+    """Bind a threaded server for handler_cls sharing `state`; call serve_forever() on the result"""
+    handler_cls.state = state
+    server = ThreadingHTTPServer((state.args.host, state.args.port), handler_cls)
+    server.daemon_threads = True
+    return server
+
+
+def run_forever(server, state):
+    """Serve until Ctrl+C, then print the final stats as JSON"""
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(state.stats(), indent=2, ensure_ascii=False))
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Traffic Capture
+Turns web server access logs (Apache/LiteSpeed/nginx "combined" format, as
+written on the cPanel host; .gz files are read directly) into a sanitized
+request trace for tools.traffic_replay.
+
+Only /api/ requests are kept. Nothing that identifies a customer survives:
+
+    client IPs     -> client index in order of first appearance
+    UUID segments  -> {uuid:N} placeholders (same id, same N)
+    player ids     -> {player:N} placeholders
+    query strings  -> only SAFE_PARAMS are kept (game, page, limit, ...);
+                      tokens, e-mails, phones, hashes etc. are dropped
+
+Each request is tagged public / user / admin by its path, so the replayer can
+attach a token minted for a seeded user. Access logs hold no bodies, so
+writes are kept in the trace but only replayed on request.
+
+Trace format (JSON lines): a header {"version", "requests", "clients",
+"duration_s", ...} followed by one {"t", "method", "path", "route", "client",
+"auth", "status", "bytes"} per request, t in seconds from the first request.
+
+Usage:
+    python -m tools.traffic_capture access_log access_log.1.gz -o trace.jsonl
+    python -m tools.traffic_capture /var/log/apache2/pinly-access.log --since 2024-06-01T18:00:00+03:00 \\
+        --until 2024-06-01T20:00:00+03:00 -o instagram-burst.jsonl
+"""
+
+import argparse
+import gzip
+import json
+import re
+import sys
+from collections import Counter
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+TRACE_VERSION = 1
+
+LOG_LINE = re.compile(
+    r'^(?P<ip>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<target>\S+)[^"]*" '
+    r'(?P<status>\d{3}) (?P<bytes>\d+|-)'
+)
+UUID = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+NUMERIC = re.compile(r"^\d{4,}$")
+
+# Query parameters that describe the request rather than the customer
+SAFE_PARAMS = {"game", "page", "limit", "status", "type", "category", "sort", "region", "riskStatus",
+               "deliveryStatus", "action", "entityType", "provider", "lang"}
+PLAYER_PARAMS = {"playerId", "id"}
+
+ADMIN_PREFIXES = ("/api/admin",)
+PUBLIC_ADMIN_PATHS = {"/api/admin/login"}
+USER_PREFIXES = ("/api/account", "/api/support", "/api/user", "/api/orders/", "/api/auth/logout-all",
+                 "/api/spin-wheel/spin", "/api/payment/shopierv2/status")
+
+
+def open_log(path):
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def auth_for(path, method):
+    if path.startswith(ADMIN_PREFIXES) and path not in PUBLIC_ADMIN_PATHS:
+        return "admin"
+    if path.startswith(USER_PREFIXES) or (path == "/api/orders" and method == "POST"):
+        return "user"
+    return "public"
+
+
+class Sanitizer:
+    """Stable placeholders per trace, so repeated polling of one order stays one id"""
+
+    def __init__(self):
+        self.clients = {}
+        self.uuids = {}
+        self.players = {}
+
+    @staticmethod
+    def _index(mapping, value):
+        return mapping.setdefault(value, len(mapping))
+
+    def client(self, ip):
+        return self._index(self.clients, ip)
+
+    def request(self, target):
+        """(sanitized path with query, route template)"""
+        parts = urlsplit(target)
+        segments, route = [], []
+        for segment in parts.path.split("/"):
+            if UUID.match(segment):
+                segments.append(f"{{uuid:{self._index(self.uuids, segment.lower())}}}")
+                route.append("{id}")
+            elif NUMERIC.match(segment):
+                segments.append(segment)
+                route.append("{n}")
+            else:
+                segments.append(segment)
+                route.append(segment)
+        path = "/".join(segments)
+        query = []
+        for key, value in parse_qsl(parts.query, keep_blank_values=True):
+            if key in SAFE_PARAMS:
+                query.append((key, value))
+            elif key in PLAYER_PARAMS and parts.path.startswith("/api/player/"):
+                query.append((key, f"{{player:{self._index(self.players, value)}}}"))
+        if query:
+            path = f"{path}?{urlencode(query, safe='{}:')}"
+        return path, "/".join(route)
+
+
+def parse_time(value):
+    return datetime.strptime(value, "%d/%b/%Y:%H:%M:%S %z")
+
+
+def capture(paths, prefix="/api/", since=None, until=None):
+    """Sanitized records, sorted by time, plus parse statistics"""
+    sanitizer = Sanitizer()
+    records, stats = [], Counter()
+    for log_path in paths:
+        with open_log(log_path) as f:
+            for line in f:
+                match = LOG_LINE.match(line)
+                if not match:
+                    stats["unparsed"] += 1
+                    continue
+                target = match["target"]
+                if not target.startswith(prefix):
+                    stats["skipped_prefix"] += 1
+                    continue
+                when = parse_time(match["time"])
+                if (since and when < since) or (until and when >= until):
+                    stats["skipped_window"] += 1
+                    continue
+                path, route = sanitizer.request(target)
+                records.append({
+                    "when": when,
+                    "method": match["method"],
+                    "path": path,
+                    "route": route,
+                    "client": sanitizer.client(match["ip"]),
+                    "auth": auth_for(urlsplit(target).path, match["method"]),
+                    "status": int(match["status"]),
+                    "bytes": int(match["bytes"]) if match["bytes"] != "-" else 0,
+                })
+                stats["kept"] += 1
+    records.sort(key=lambda r: r["when"])
+    if records:
+        first = records[0]["when"]
+        for record in records:
+            record["t"] = round((record.pop("when") - first).total_seconds(), 3)
+    return records, sanitizer, stats
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Access logs -> sanitized request trace")
+    parser.add_argument("logs", nargs="+", help="Access log files (.gz allowed, - for stdin)")
+    parser.add_argument("-o", "--output", required=True, help="Trace file (JSON lines)")
+    parser.add_argument("--prefix", default="/api/", help="Only keep request paths starting with this")
+    parser.add_argument("--since", help="ISO date/time with offset, inclusive")
+    parser.add_argument("--until", help="ISO date/time with offset, exclusive")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    since = datetime.fromisoformat(args.since) if args.since else None
+    until = datetime.fromisoformat(args.until) if args.until else None
+    records, sanitizer, stats = capture(args.logs, args.prefix, since, until)
+    if not records:
+        print("❌ No matching requests found", file=sys.stderr)
+        return 1
+
+    header = {
+        "version": TRACE_VERSION,
+        "requests": len(records),
+        "clients": len(sanitizer.clients),
+        "ids": len(sanitizer.uuids),
+        "players": len(sanitizer.players),
+        "duration_s": records[-1]["t"],
+        "methods": dict(Counter(r["method"] for r in records)),
+        "auth": dict(Counter(r["auth"] for r in records)),
+        "captured_at": datetime.now().astimezone().isoformat(),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(json.dumps(header) + "\n")
+        for record in records:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    print(f"✅ {len(records):,} requests from {header['clients']:,} clients over {header['duration_s']:.0f}s "
+          f"written to {args.output}", file=sys.stderr)
+    if stats["unparsed"]:
+        print(f"⚠️  {stats['unparsed']:,} lines did not look like combined log format", file=sys.stderr)
+    top = Counter(r["route"] for r in records).most_common(10)
+    for route, count in top:
+        print(f"   {count:>8,}  {route}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Traffic Replay
+Plays a trace from tools.traffic_capture against a local instance at one or
+more speeds (1x, 5x, 20x, ...). Inter-arrival timing is preserved, scaled
+by the speed, so homepage bursts and polling loops keep their shape. Reports
+per-route latency and status codes for each speed, and how far the replayer
+fell behind its schedule.
+
+Every trace client keeps its own X-Forwarded-For address, so the per-IP rate
+limits see the same population as production. User requests are signed with
+tokens minted (HS256, JWT_SECRET) for throwaway users seeded into the
+database; admin requests get a minted admin token. {uuid:N} placeholders
+become stable synthetic ids (so order lookups 404 just as cheaply for every
+poll), or existing local order ids with --map-ids. {player:N} become
+synthetic player ids (/api/player/resolve answers locally when RAPIDAPI_KEY
+is unset).
+
+Access logs carry no bodies: writes are skipped unless --include-writes,
+which sends them with an empty JSON body (exercising validation only).
+
+Usage:
+    python -m tools.traffic_replay trace.jsonl --speed 1,5,20
+    python -m tools.traffic_replay trace.jsonl --speed 5 --start 3600 --duration 900 --map-ids --output replay.json
+
+Requires: aiohttp, pymongo
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+
+import aiohttp
+
+from tools.api_client import BASE_URL, AsyncApiClient
+from tools.db import chunked, get_db
+from tools.loadtest import virtual_ip
+from tools.signing import mint_jwt
+from tools.stats import Recorder, summarize
+from tools.traffic_capture import TRACE_VERSION
+
+PLACEHOLDER = re.compile(r"\{(uuid|player):(\d+)\}")
+SOURCE_TAG = "traffic_replay"
+
+
+def load_trace(path, start=0.0, duration=None):
+    """Header and the records in [start, start + duration), re-based to t=0"""
+    with open(path, encoding="utf-8") as f:
+        header = json.loads(f.readline())
+        if header.get("version") != TRACE_VERSION:
+            raise SystemExit(f"❌ {path} is trace format {header.get('version')}, expected {TRACE_VERSION}")
+        records = []
+        for line in f:
+            record = json.loads(line)
+            if record["t"] < start or (duration is not None and record["t"] >= start + duration):
+                continue
+            record["t"] -= start
+            records.append(record)
+    return header, records
+
+
+class Identities:
+    """Seeded users and minted tokens standing in for the trace's clients"""
+
+    def __init__(self, db, run_id, user_count):
+        self.db = db
+        self.run_id = run_id
+        now = datetime.now(timezone.utc)
+        self.users = [{
+            "id": str(uuid.uuid4()),
+            "email": f"replay-{i}+{run_id}@test.com",
+            "firstName": "Replay",
+            "lastName": f"User{i}",
+            "phone": f"55{i:08d}",
+            "role": "user",
+            "createdAt": now,
+            "updatedAt": now,
+            "source": SOURCE_TAG,
+            "loadTestRunId": run_id,
+        } for i in range(user_count)]
+        self.tokens = [mint_jwt({"id": u["id"], "email": u["email"], "type": "user"}) for u in self.users]
+        self.admin_token = mint_jwt({"id": f"replay-admin-{run_id}", "username": "replay", "role": "admin"},
+                                    expires_in=24 * 3600)
+
+    def seed(self):
+        for batch in chunked(self.users, 1000):
+            self.db.users.insert_many(batch, ordered=False)
+
+    def cleanup(self):
+        self.db.users.delete_many({"loadTestRunId": self.run_id})
+
+    def headers(self, record):
+        headers = {"X-Forwarded-For": virtual_ip(record["client"] + 1)}
+        if record["auth"] == "user" and self.tokens:
+            headers["Authorization"] = f"Bearer {self.tokens[record['client'] % len(self.tokens)]}"
+        elif record["auth"] == "admin":
+            headers["Authorization"] = f"Bearer {self.admin_token}"
+        return headers
+
+
+class Placeholders:
+    def __init__(self, run_id, order_ids=None):
+        self.namespace = uuid.uuid5(uuid.NAMESPACE_URL, f"pinly-replay:{run_id}")
+        self.order_ids = order_ids or []
+
+    def fill(self, path):
+        def replace(match):
+            kind, index = match[1], int(match[2])
+            if kind == "player":
+                return str(500000000 + index)
+            if self.order_ids:
+                return self.order_ids[index % len(self.order_ids)]
+            return str(uuid.uuid5(self.namespace, str(index)))
+
+        return PLACEHOLDER.sub(replace, path)
+
+
+class Replay:
+    def __init__(self, args, identities, placeholders):
+        self.args = args
+        self.identities = identities
+        self.placeholders = placeholders
+
+    async def play(self, records, speed):
+        recorder = Recorder()
+        lag_ms = []
+        skipped = Counter()
+
+        def on_call(event):
+            status = event["status"]
+            error = event["error"] or (f"http_{status}" if status and status >= 500 else None)
+            recorder.record(event["label"], event["elapsed_ms"], status, error)
+
+        api = AsyncApiClient(self.args.base_url.rstrip("/"), pool_size=self.args.max_in_flight,
+                             timeout=self.args.timeout, max_retries=0, hooks=[on_call])
+        semaphore = asyncio.Semaphore(self.args.max_in_flight)
+
+        async def send(record, label):
+            try:
+                kwargs = {"json": {}} if record["method"] != "GET" else {}
+                await api.request(record["method"], self.placeholders.fill(record["path"]), label=label,
+                                  headers=self.identities.headers(record), **kwargs)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass  # recorded by on_call
+            finally:
+                semaphore.release()
+
+        async with api:
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            pending = set()
+            for record in records:
+                if record["method"] != "GET" and not self.args.include_writes:
+                    skipped[record["method"]] += 1
+                    continue
+                due = start + record["t"] / speed
+                delay = due - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await semaphore.acquire()
+                lag_ms.append(max(0.0, (loop.time() - due) * 1000))
+                task = asyncio.create_task(send(record, f"{record['method']} {record['route']}"))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+            recorder.stop()
+
+        report = recorder.report()
+        original = defaultdict(Counter)
+        for record in records:
+            original[f"{record['method']} {record['route']}"][str(record["status"])] += 1
+        for label, step in report["steps"].items():
+            step["original_status_codes"] = dict(original[label])
+        return {
+            "speed": speed,
+            "requests": report["total_requests"],
+            "elapsed_seconds": report["elapsed_seconds"],
+            "requests_per_second": report["requests_per_second"],
+            "errors": report["total_errors"],
+            "rate_limited": sum(step["status_codes"].get("429", 0) for step in report["steps"].values()),
+            "schedule_lag_ms": summarize(lag_ms),
+            "skipped_writes": dict(skipped),
+            "routes": report["steps"],
+        }
+
+
+def local_order_ids(db, limit):
+    return [o["id"] for o in db.orders.find({}, {"_id": 0, "id": 1}).sort("createdAt", -1).limit(limit)]
+
+
+async def check_tokens(base_url, identities):
+    """Minted tokens only work when JWT_SECRET matches the server's"""
+    if not identities.tokens:
+        return True
+    async with AsyncApiClient(f"{base_url.rstrip('/')}/api", max_retries=0) as api:
+        response = await api.get("/account/me", label="token_check",
+                                 headers={"Authorization": f"Bearer {identities.tokens[0]}"})
+        return response.status_code == 200
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a captured trace with its original timing")
+    parser.add_argument("trace", help="Trace file from tools.traffic_capture")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--speed", default="1", help="Comma separated speed factors, e.g. 1,5,20")
+    parser.add_argument("--start", type=float, default=0.0, help="Skip the first N seconds of the trace")
+    parser.add_argument("--duration", type=float, help="Only replay N seconds of the trace (at 1x)")
+    parser.add_argument("--users", type=int, default=200,
+                        help="Seeded users behind the trace's signed-in clients (clients share them round robin)")
+    parser.add_argument("--map-ids", action="store_true", help="Fill {uuid:N} with existing local order ids")
+    parser.add_argument("--include-writes", action="store_true", help="Send non-GET requests with an empty body")
+    parser.add_argument("--max-in-flight", type=int, default=500, help="Cap on concurrent requests")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--keep", action="store_true", help="Keep the seeded users")
+    parser.add_argument("--output", help="Write the JSON report here")
+    args = parser.parse_args(argv)
+    args.speed = [float(s) for s in args.speed.split(",") if s.strip()]
+    if not args.speed or min(args.speed) <= 0:
+        parser.error("--speed needs positive factors")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    header, records = load_trace(args.trace, args.start, args.duration)
+    if not records:
+        print("❌ No requests in the selected part of the trace", file=sys.stderr)
+        return 1
+
+    db = get_db()
+    run_id = uuid.uuid4().hex[:8]
+    user_clients = {r["client"] for r in records if r["auth"] == "user"}
+    identities = Identities(db, run_id, min(args.users, len(user_clients)))
+    placeholders = Placeholders(run_id, local_order_ids(db, header.get("ids") or 1000) if args.map_ids else None)
+    identities.seed()
+    results = []
+    try:
+        if not asyncio.run(check_tokens(args.base_url, identities)):
+            raise SystemExit("❌ Minted tokens were rejected; set JWT_SECRET to the server's value")
+        replay = Replay(args, identities, placeholders)
+        for speed in args.speed:
+            print(f"▶️  {len(records):,} requests at {speed:g}x "
+                  f"(~{records[-1]['t'] / speed:.0f}s)", file=sys.stderr)
+            start = time.perf_counter()
+            result = asyncio.run(replay.play(records, speed))
+            results.append(result)
+            print(f"   {result['requests_per_second']} req/s, {result['errors']} errors, "
+                  f"{result['rate_limited']} rate limited, p95 lag {result['schedule_lag_ms']['p95']} ms "
+                  f"({time.perf_counter() - start:.0f}s)", file=sys.stderr)
+    finally:
+        if not args.keep:
+            identities.cleanup()
+
+    report = {
+        "run_id": run_id,
+        "trace": args.trace,
+        "trace_header": header,
+        "window": {"start": args.start, "duration": args.duration, "requests": len(records)},
+        "seeded_users": len(identities.users),
+        "runs": results,
+    }
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output)
+        print(f"✅ Report written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    for result in results:
+        slowest = sorted(result["routes"].items(), key=lambda item: item[1]["p95"] or 0, reverse=True)[:5]
+        print(f"📊 {result['speed']:g}x slowest routes (p95):", file=sys.stderr)
+        for route, step in slowest:
+            print(f"   {step['p95']:>9} ms  {step['count']:>7,}  {route}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())